@@ -0,0 +1,30 @@
+"""Add worker lease columns and claim index to fulfillment tasks."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260108_63_fulfillment_task_leases"
+down_revision: Union[str, None] = "20260107_62_guardrail_followup_attachments"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.add_column("fulfillment_tasks", sa.Column("lease_owner", sa.String(length=128), nullable=True))
+    op.add_column("fulfillment_tasks", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_fulfillment_tasks_status_scheduled_at",
+        "fulfillment_tasks",
+        ["status", "scheduled_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fulfillment_tasks_status_scheduled_at", table_name="fulfillment_tasks")
+    op.drop_column("fulfillment_tasks", "lease_expires_at")
+    op.drop_column("fulfillment_tasks", "lease_owner")
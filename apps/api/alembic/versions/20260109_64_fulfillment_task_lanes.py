@@ -0,0 +1,35 @@
+"""Add fair-share lane and priority columns to fulfillment tasks."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260109_64_fulfillment_task_lanes"
+down_revision: Union[str, None] = "20260108_63_fulfillment_task_leases"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.add_column("fulfillment_tasks", sa.Column("lane", sa.String(length=128), nullable=True))
+    op.add_column(
+        "fulfillment_tasks",
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Existing rows fall into their task-type lane (enum labels are the upper-cased values).
+    op.execute("UPDATE fulfillment_tasks SET lane = lower(CAST(task_type AS VARCHAR)) WHERE lane IS NULL")
+    op.create_index(
+        "ix_fulfillment_tasks_status_lane_priority",
+        "fulfillment_tasks",
+        ["status", "lane", "priority", "scheduled_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fulfillment_tasks_status_lane_priority", table_name="fulfillment_tasks")
+    op.drop_column("fulfillment_tasks", "priority")
+    op.drop_column("fulfillment_tasks", "lane")
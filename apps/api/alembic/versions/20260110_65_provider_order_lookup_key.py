@@ -0,0 +1,45 @@
+"""Add an indexed order lookup key to fulfillment provider orders."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260110_65_provider_order_lookup_key"
+down_revision: Union[str, None] = "20260109_64_fulfillment_task_lanes"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "fulfillment_provider_orders",
+        sa.Column("order_lookup_key", sa.String(length=32), nullable=True),
+    )
+    # Same normalization the lookups used to apply on every query: dash-less lower-case hex.
+    op.execute(
+        "UPDATE fulfillment_provider_orders "
+        "SET order_lookup_key = replace(lower(CAST(order_id AS VARCHAR)), '-', '') "
+        "WHERE order_lookup_key IS NULL"
+    )
+    op.create_index(
+        "ix_fulfillment_provider_orders_order_lookup_key",
+        "fulfillment_provider_orders",
+        ["order_lookup_key", "created_at"],
+    )
+    # Keeps the dual-read fallback (rows written by pre-upgrade replicas) off a full scan.
+    op.create_index(
+        "ix_fulfillment_provider_orders_lookup_pending",
+        "fulfillment_provider_orders",
+        ["created_at"],
+        postgresql_where=sa.text("order_lookup_key IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fulfillment_provider_orders_lookup_pending", table_name="fulfillment_provider_orders")
+    op.drop_index("ix_fulfillment_provider_orders_order_lookup_key", table_name="fulfillment_provider_orders")
+    op.drop_column("fulfillment_provider_orders", "order_lookup_key")
@@ -0,0 +1,138 @@
+"""Promote scheduled provider replays to their own table."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Union
+from uuid import uuid4
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20260111_66_provider_replay_schedules"
+down_revision: Union[str, None] = "20260110_65_provider_order_lookup_key"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+replay_status_enum = sa.Enum(
+    "scheduled",
+    "in_progress",
+    "executed",
+    "failed",
+    name="fulfillment_provider_replay_status_enum",
+)
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _parse_amount(value: Any) -> Decimal | None:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fulfillment_provider_replay_schedules",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "provider_order_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("fulfillment_provider_orders.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("entry_id", sa.String(length=64), nullable=False),
+        sa.Column("provider_id", sa.String(length=64), nullable=False),
+        sa.Column("status", replay_status_enum, nullable=False, server_default="scheduled"),
+        sa.Column("scheduled_for", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("requested_amount", sa.Numeric(12, 2), nullable=True),
+        sa.Column("performed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("lease_owner", sa.String(length=128), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint(
+            "provider_order_id",
+            "entry_id",
+            name="uq_fulfillment_provider_replay_schedules_entry",
+        ),
+    )
+    op.create_index(
+        "ix_fulfillment_provider_replay_schedules_status_due",
+        "fulfillment_provider_replay_schedules",
+        ["status", "scheduled_for"],
+    )
+
+    # Backfill pending entries from the JSON payloads the worker used to scan.
+    bind = op.get_bind()
+    orders = sa.table(
+        "fulfillment_provider_orders",
+        sa.column("id", postgresql.UUID(as_uuid=True)),
+        sa.column("provider_id", sa.String),
+        sa.column("payload", sa.JSON),
+    )
+    schedules = sa.table(
+        "fulfillment_provider_replay_schedules",
+        sa.column("id", postgresql.UUID(as_uuid=True)),
+        sa.column("provider_order_id", postgresql.UUID(as_uuid=True)),
+        sa.column("entry_id", sa.String),
+        sa.column("provider_id", sa.String),
+        sa.column("status", sa.String),
+        sa.column("scheduled_for", sa.DateTime(timezone=True)),
+        sa.column("requested_amount", sa.Numeric(12, 2)),
+    )
+    now = datetime.now(timezone.utc)
+    rows: list[dict[str, Any]] = []
+    result = bind.execute(
+        sa.select(orders.c.id, orders.c.provider_id, orders.c.payload).where(orders.c.payload.isnot(None))
+    )
+    for order_id, provider_id, payload in result:
+        schedule = payload.get("scheduledReplays") if isinstance(payload, dict) else None
+        if not isinstance(schedule, list):
+            continue
+        seen: set[str] = set()
+        for entry in schedule:
+            if not isinstance(entry, dict) or not entry.get("id"):
+                continue
+            if entry.get("status", "scheduled") != "scheduled" or str(entry["id"]) in seen:
+                continue
+            seen.add(str(entry["id"]))
+            rows.append(
+                {
+                    "id": uuid4(),
+                    "provider_order_id": order_id,
+                    "entry_id": str(entry["id"]),
+                    "provider_id": provider_id,
+                    "status": "scheduled",
+                    "scheduled_for": _parse_timestamp(entry.get("scheduledFor")) or now,
+                    "requested_amount": _parse_amount(entry.get("requestedAmount")),
+                }
+            )
+    if rows:
+        op.bulk_insert(schedules, rows)
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_fulfillment_provider_replay_schedules_status_due",
+        table_name="fulfillment_provider_replay_schedules",
+    )
+    op.drop_table("fulfillment_provider_replay_schedules")
+    replay_status_enum.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""Add the provider catalog change log that versions the registry cache."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260112_67_fulfillment_catalog_changes"
+down_revision: Union[str, None] = "20260111_66_provider_replay_schedules"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fulfillment_catalog_changes",
+        sa.Column("version", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("entity_type", sa.String(length=16), nullable=False),
+        sa.Column("entity_id", sa.String(length=64), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("fulfillment_catalog_changes")
@@ -0,0 +1,25 @@
+"""Index provider platform contexts by recency for per-provider top-N reads."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+
+
+revision: str = "20260113_68_provider_platform_context_recency"
+down_revision: Union[str, None] = "20260112_67_fulfillment_catalog_changes"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_provider_platform_context_recent",
+        "provider_platform_context_cache",
+        ["provider_id", "last_seen_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_provider_platform_context_recent", table_name="provider_platform_context_cache")
@@ -0,0 +1,25 @@
+"""Index provider orders by updated_at for incremental automation telemetry."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+
+
+revision: str = "20260114_69_provider_order_updated_at_index"
+down_revision: Union[str, None] = "20260113_68_provider_platform_context_recency"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_fulfillment_provider_orders_updated_at",
+        "fulfillment_provider_orders",
+        ["updated_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fulfillment_provider_orders_updated_at", table_name="fulfillment_provider_orders")
@@ -0,0 +1,66 @@
+"""Add provider status callback ingestion."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20260115_70_provider_callbacks"
+down_revision: Union[str, None] = "20260114_69_provider_order_updated_at_index"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "fulfillment_provider_orders",
+        sa.Column("provider_reference", sa.String(length=128), nullable=True),
+    )
+    # Callbacks address orders by the provider order id the order endpoint returned.
+    op.execute(
+        "UPDATE fulfillment_provider_orders "
+        "SET provider_reference = left(payload->>'providerOrderId', 128) "
+        "WHERE provider_reference IS NULL AND payload->>'providerOrderId' IS NOT NULL"
+    )
+    op.create_index(
+        "ix_fulfillment_provider_orders_provider_reference",
+        "fulfillment_provider_orders",
+        ["provider_id", "provider_reference"],
+    )
+
+    op.create_table(
+        "fulfillment_provider_callbacks",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("provider_id", sa.String(length=64), nullable=False),
+        sa.Column("event_id", sa.String(length=128), nullable=False),
+        sa.Column("provider_reference", sa.String(length=128), nullable=False),
+        sa.Column("status", sa.String(length=64), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("received_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("outcome", sa.String(length=16), nullable=True),
+        sa.Column("applied_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("lease_owner", sa.String(length=128), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("provider_id", "event_id", name="uq_fulfillment_provider_callbacks_event"),
+    )
+    op.create_index(
+        "ix_fulfillment_provider_callbacks_pending",
+        "fulfillment_provider_callbacks",
+        ["received_at"],
+        postgresql_where=sa.text("applied_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fulfillment_provider_callbacks_pending", table_name="fulfillment_provider_callbacks")
+    op.drop_table("fulfillment_provider_callbacks")
+    op.drop_index(
+        "ix_fulfillment_provider_orders_provider_reference",
+        table_name="fulfillment_provider_orders",
+    )
+    op.drop_column("fulfillment_provider_orders", "provider_reference")
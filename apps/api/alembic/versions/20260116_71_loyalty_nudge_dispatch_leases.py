@@ -0,0 +1,40 @@
+"""Index loyalty nudge dispatch selection and add dispatch leases."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260116_71_loyalty_nudge_dispatch_leases"
+down_revision: Union[str, None] = "20260115_70_provider_callbacks"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.add_column("loyalty_nudges", sa.Column("next_dispatch_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("loyalty_nudges", sa.Column("lease_owner", sa.String(length=128), nullable=True))
+    op.add_column("loyalty_nudges", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+    # Carry existing cooldowns over; the dispatcher used to derive them from last_triggered_at.
+    op.execute(
+        "UPDATE loyalty_nudges "
+        "SET next_dispatch_at = last_triggered_at + make_interval(hours => COALESCE("
+        "(SELECT NULLIF(c.frequency_cap_hours, 0) FROM loyalty_nudge_campaigns c "
+        "WHERE c.slug = loyalty_nudges.campaign_slug), 12)) "
+        "WHERE last_triggered_at IS NOT NULL"
+    )
+    op.create_index(
+        "ix_loyalty_nudges_dispatch",
+        "loyalty_nudges",
+        ["status", "next_dispatch_at", "priority"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_loyalty_nudges_dispatch", table_name="loyalty_nudges")
+    op.drop_column("loyalty_nudges", "lease_expires_at")
+    op.drop_column("loyalty_nudges", "lease_owner")
+    op.drop_column("loyalty_nudges", "next_dispatch_at")
@@ -0,0 +1,35 @@
+"""Track each loyalty member's next point expiration and index due expirations."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260117_72_loyalty_expiration_pointer"
+down_revision: Union[str, None] = "20260116_71_loyalty_nudge_dispatch_leases"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.add_column("loyalty_members", sa.Column("next_expiration_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_loyalty_point_expirations_due",
+        "loyalty_point_expirations",
+        ["expires_at"],
+        postgresql_where=sa.text("status = 'scheduled'"),
+    )
+    op.execute(
+        "UPDATE loyalty_members SET next_expiration_at = ("
+        "SELECT min(e.expires_at) FROM loyalty_point_expirations e "
+        "WHERE e.member_id = loyalty_members.id AND e.status = 'scheduled' "
+        "AND e.consumed_points < e.points)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_loyalty_point_expirations_due", table_name="loyalty_point_expirations")
+    op.drop_column("loyalty_members", "next_expiration_at")
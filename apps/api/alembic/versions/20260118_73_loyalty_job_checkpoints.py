@@ -0,0 +1,42 @@
+"""Add loyalty job checkpoints and index streak-bonus selection."""
+
+from __future__ import annotations
+
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20260118_73_loyalty_job_checkpoints"
+down_revision: Union[str, None] = "20260117_72_loyalty_expiration_pointer"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "loyalty_job_checkpoints",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("job_name", sa.String(length=64), nullable=False),
+        sa.Column("run_started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("cursor_member_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("processed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("job_name", name="uq_loyalty_job_checkpoints_job_name"),
+    )
+    op.create_index(
+        "ix_loyalty_ledger_entries_member_type_created",
+        "loyalty_ledger_entries",
+        ["member_id", "entry_type", "created_at"],
+    )
+    op.create_index("ix_loyalty_members_updated_at", "loyalty_members", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_loyalty_members_updated_at", table_name="loyalty_members")
+    op.drop_index("ix_loyalty_ledger_entries_member_type_created", table_name="loyalty_ledger_entries")
+    op.drop_table("loyalty_job_checkpoints")
@@ -14,6 +14,7 @@ from .endpoints import (
     catalog_experiments,
     catalog_pricing,
     fulfillment,
+    fulfillment_provider_callbacks,
     fulfillment_providers,
     health,
     instagram,
@@ -55,6 +56,7 @@ router.include_router(catalog_merchandising.router)
 router.include_router(observability.router)
 router.include_router(fulfillment.router, tags=["Fulfillment"])
 router.include_router(fulfillment_providers.router)
+router.include_router(fulfillment_provider_callbacks.router)
 router.include_router(instagram.router)
 router.include_router(trust.router)
 router.include_router(loyalty.router)
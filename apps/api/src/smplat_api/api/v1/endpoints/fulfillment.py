@@ -1,6 +1,9 @@
 from fastapi import APIRouter, HTTPException, Request
 
+from smplat_api.core.loop_monitor import get_loop_lag_monitor
 from smplat_api.observability.fulfillment import get_fulfillment_store
+from smplat_api.services.fulfillment.metric_executor import get_metric_executor
+from smplat_api.services.fulfillment.provider_limits import get_provider_guard
 
 router = APIRouter()
 
@@ -28,5 +31,8 @@ async def fulfillment_health(request: Request) -> dict[str, object]:
 async def fulfillment_observability() -> dict[str, object]:
     """Return aggregated fulfillment metrics suitable for dashboards/alerts."""
     store = get_fulfillment_store()
-    snapshot = store.snapshot()
-    return snapshot.as_dict()
+    snapshot = store.snapshot().as_dict()
+    snapshot["provider_limits"] = get_provider_guard().snapshot()
+    snapshot["event_loop"] = get_loop_lag_monitor().snapshot()
+    snapshot["metrics_executor"] = get_metric_executor().snapshot()
+    return snapshot
@@ -0,0 +1,59 @@
+"""Status callback ingestion for push-capable fulfillment providers."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from smplat_api.core.settings import settings
+from smplat_api.db.session import get_session
+from smplat_api.domain.fulfillment import provider_registry
+from smplat_api.services.fulfillment.provider_callbacks import (
+    SIGNATURE_HEADER,
+    callback_config,
+    callback_secret,
+    ingest_callbacks,
+    parse_callback_events,
+    verify_callback_signature,
+)
+from smplat_api.services.fulfillment.provider_probe_schedule import get_probe_scheduler
+
+router = APIRouter(prefix="/fulfillment/providers", tags=["fulfillment-provider-callbacks"])
+
+
+@router.post("/{provider_id}/callbacks", status_code=status.HTTP_202_ACCEPTED)
+async def provider_status_callback(
+    provider_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_session),
+) -> dict[str, int]:
+    """Authenticate a provider callback and append its events for the callback worker."""
+
+    payload_bytes = await request.body()
+    await provider_registry.refresh_catalog(db)
+    provider = provider_registry.get_provider(provider_id)
+    config = callback_config(provider.metadata) if provider else None
+    secret = callback_secret(provider.credentials) if provider else None
+    if provider is None or config is None or secret is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider callbacks are not enabled")
+    if not verify_callback_signature(secret, payload_bytes, request.headers.get(SIGNATURE_HEADER)):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid callback signature")
+
+    try:
+        body = json.loads(payload_bytes)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid payload body") from exc
+
+    events = parse_callback_events(body, config)
+    if len(events) > settings.provider_callback_max_events:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.provider_callback_max_events} events per callback",
+        )
+    accepted = await ingest_callbacks(db, provider_id, events, received_at=datetime.now(timezone.utc))
+    # A provider pushing updates is reachable; let that defer its next active health probe.
+    get_probe_scheduler().record_call_outcome(provider_id, success=True)
+    return {"received": len(events), "accepted": accepted, "duplicates": len(events) - accepted}
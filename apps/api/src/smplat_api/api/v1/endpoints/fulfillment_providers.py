@@ -44,6 +44,7 @@ from smplat_api.services.fulfillment.automation_status_service import Automation
 from smplat_api.tasks.provider_replay import run_scheduled_replays
 from smplat_api.tasks.provider_alerts import run_provider_alerts
 from smplat_api.services.fulfillment.provider_endpoints import ProviderEndpointError
+from smplat_api.services.fulfillment.provider_limits import ProviderThrottledError
 from smplat_api.services.providers.platform_context_cache import ProviderPlatformContextCacheService
 from smplat_api.services.orders.state_machine import OrderStateMachine, OrderStateEventTypeEnum, OrderStateActorTypeEnum
 
@@ -370,6 +371,12 @@ async def trigger_provider_refill(
         raise HTTPException(status_code=404, detail="Provider order not found")
     try:
         entry = await automation.trigger_refill(provider_order, amount=payload.amount)
+    except ProviderThrottledError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
     except ProviderEndpointError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except ValueError as exc:
@@ -457,6 +464,12 @@ async def replay_provider_order(
             entry = await automation.replay_provider_order(provider_order, amount=payload.amount)
             event_type = OrderStateEventTypeEnum.REPLAY_EXECUTED
             event_notes = None
+    except ProviderThrottledError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
     except ProviderEndpointError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except ValueError as exc:
@@ -7,11 +7,13 @@ from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 
 from smplat_api.api.dependencies.security import require_checkout_api_key
+from smplat_api.core.loop_monitor import get_loop_lag_monitor
 from smplat_api.observability.catalog import get_catalog_store
 from smplat_api.observability.fulfillment import get_fulfillment_store
 from smplat_api.observability.loyalty import get_loyalty_store
 from smplat_api.observability.payments import get_payment_store
 from smplat_api.observability.scheduler import get_catalog_scheduler_store
+from smplat_api.services.fulfillment.provider_limits import CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, get_provider_guard
 
 
 router = APIRouter(prefix="/observability", tags=["Observability"])
@@ -95,6 +97,46 @@ async def get_prometheus_metrics() -> PlainTextResponse:
     lines.extend(
         _format_metric("smplat_fulfillment_tasks_retried_total", "Fulfillment tasks scheduled for retry", totals.get("retried", 0))
     )
+    lines.extend(
+        _format_metric("smplat_fulfillment_tasks_deferred_total", "Fulfillment tasks deferred by provider limits", totals.get("deferred", 0))
+    )
+
+    provider_limits = get_provider_guard().snapshot()
+    circuit_levels = {CIRCUIT_OPEN: 2, CIRCUIT_HALF_OPEN: 1}
+    for scope, circuit in provider_limits.get("circuits", {}).items():
+        lines.extend(
+            _format_metric(
+                "smplat_provider_circuit_state",
+                "Provider circuit breaker state (0 closed, 1 half-open, 2 open)",
+                circuit_levels.get(circuit.get("state"), 0),
+                labels={"scope": scope},
+            )
+        )
+    for scope, limit in provider_limits.get("rate_limits", {}).items():
+        lines.extend(
+            _format_metric(
+                "smplat_provider_rate_limited_total",
+                "Provider calls held back by the rate limiter",
+                limit.get("throttled", 0),
+                labels={"scope": scope},
+            )
+        )
+
+    loop_lag = get_loop_lag_monitor().snapshot()
+    lines.extend(
+        _format_metric(
+            "smplat_event_loop_lag_seconds",
+            "Most recent event loop scheduling delay",
+            loop_lag.get("last_lag_seconds") or 0,
+        )
+    )
+    lines.extend(
+        _format_metric(
+            "smplat_event_loop_lag_max_seconds",
+            "Worst event loop scheduling delay since start",
+            loop_lag.get("max_lag_seconds") or 0,
+        )
+    )
 
     per_type: dict[str, dict[str, int]] = fulfillment_snapshot.get("per_task_type", {})
     for bucket, counts in per_type.items():
@@ -5,13 +5,17 @@ from pathlib import Path
 from fastapi import FastAPI
 from loguru import logger
 
+from smplat_api.core.loop_monitor import get_loop_lag_monitor
 from smplat_api.core.settings import settings
+from smplat_api.core.work_signals import RedisWakeupBridge
 from smplat_api.db.session import async_session
 from smplat_api.domain.fulfillment import provider_registry
 from .api.routes import api_router
 from .core.logging import configure_logging
 from .observability.tracing import configure_tracing
 from .services.fulfillment import TaskProcessor
+from .services.fulfillment.http_clients import close_http_client_registry
+from .services.fulfillment.metric_executor import shutdown_metric_executor
 from .services.notifications import WeeklyDigestScheduler
 from .scheduling import CatalogJobScheduler
 from .workers import (
@@ -19,6 +23,7 @@ from .workers import (
     HostedSessionRecoveryWorker,
     JourneyRuntimeWorker,
     ProviderAutomationAlertWorker,
+    ProviderCallbackWorker,
     ProviderOrderReplayWorker,
     ReceiptStorageProbeWorker,
 )
@@ -37,6 +42,10 @@ async def lifespan(app: FastAPI):
         session_factory=_session_factory,
         poll_interval_seconds=settings.fulfillment_poll_interval_seconds,
         batch_size=settings.fulfillment_batch_size,
+        concurrency=settings.fulfillment_worker_concurrency,
+        lease_seconds=settings.fulfillment_task_lease_seconds,
+        batch_writes=settings.fulfillment_worker_batch_writes,
+        lane_weights=settings.fulfillment_lane_weights,
     )
     recovery_worker = HostedSessionRecoveryWorker(
         session_factory=_session_factory,
@@ -55,12 +64,21 @@ async def lifespan(app: FastAPI):
         session_factory=_session_factory,
         interval_seconds=settings.provider_replay_worker_interval_seconds,
         limit=settings.provider_replay_worker_limit,
+        lease_seconds=settings.provider_replay_worker_lease_seconds,
+        concurrency=settings.provider_replay_worker_concurrency,
+        per_provider_concurrency=settings.provider_replay_worker_per_provider_concurrency,
     )
     provider_alert_worker = ProviderAutomationAlertWorker(
         session_factory=_session_factory,
         interval_seconds=settings.provider_automation_alert_interval_seconds,
         snapshot_limit=settings.provider_automation_alert_snapshot_limit,
     )
+    provider_callback_worker = ProviderCallbackWorker(
+        session_factory=_session_factory,
+        interval_seconds=settings.provider_callback_worker_interval_seconds,
+        batch_size=settings.provider_callback_batch_size,
+        lease_seconds=settings.provider_callback_lease_seconds,
+    )
     journey_runtime_worker = JourneyRuntimeWorker(
         session_factory=_session_factory,
         interval_seconds=settings.journey_runtime_poll_interval_seconds,
@@ -95,14 +113,32 @@ async def lifespan(app: FastAPI):
     app.state.bundle_experiment_guardrail_worker = guardrail_worker
     app.state.provider_replay_worker = provider_replay_worker
     app.state.provider_automation_alert_worker = provider_alert_worker
+    app.state.provider_callback_worker = provider_callback_worker
     app.state.journey_runtime_worker = journey_runtime_worker
     app.state.catalog_job_scheduler = job_scheduler
     app.state.receipt_storage_probe_worker = receipt_storage_probe_worker
 
+    wakeup_bridge: RedisWakeupBridge | None = None
+    if settings.worker_wakeup_redis_enabled:
+        wakeup_bridge = RedisWakeupBridge()
+        wakeup_bridge.start()
+        logger.info("Worker wake-up bridge enabled", prefix=settings.worker_wakeup_channel_prefix)
+
+    loop_monitor = get_loop_lag_monitor()
+    if settings.event_loop_lag_monitor_enabled:
+        loop_monitor.start()
+
     if settings.fulfillment_worker_enabled:
         worker_task = asyncio.create_task(processor.start())
         app.state.fulfillment_worker_task = worker_task
-        logger.info("Fulfillment worker enabled", poll_interval=processor.poll_interval, batch_size=processor.batch_size)
+        logger.info(
+            "Fulfillment worker enabled",
+            poll_interval=processor.poll_interval,
+            batch_size=processor.batch_size,
+            concurrency=processor.concurrency,
+            worker_id=processor.worker_id,
+            batch_writes=processor.batch_writes,
+        )
     else:
         app.state.fulfillment_worker_task = None
         logger.info(
@@ -202,6 +238,20 @@ async def lifespan(app: FastAPI):
             reason="provider_automation_alert_worker_enabled is false",
         )
 
+    provider_callbacks_enabled = settings.provider_callback_worker_enabled
+    if provider_callbacks_enabled:
+        provider_callback_worker.start()
+        logger.info(
+            "Provider callback worker enabled",
+            interval_seconds=provider_callback_worker.interval_seconds,
+            batch_size=settings.provider_callback_batch_size,
+        )
+    else:
+        logger.info(
+            "Provider callback worker disabled",
+            reason="provider_callback_worker_enabled is false",
+        )
+
     receipt_probe_enabled = settings.receipt_storage_probe_worker_enabled
     if receipt_probe_enabled:
         receipt_storage_probe_worker.start()
@@ -254,10 +304,17 @@ async def lifespan(app: FastAPI):
             await provider_replay_worker.stop()
         if provider_alerts_enabled and provider_alert_worker.is_running:
             await provider_alert_worker.stop()
+        if provider_callbacks_enabled and provider_callback_worker.is_running:
+            await provider_callback_worker.stop()
         if receipt_probe_enabled and receipt_storage_probe_worker.is_running:
             await receipt_storage_probe_worker.stop()
         if runtime_worker_started and journey_runtime_worker.is_running:
             await journey_runtime_worker.stop()
+        if wakeup_bridge is not None:
+            await wakeup_bridge.stop()
+        await loop_monitor.stop()
+        shutdown_metric_executor()
+        await close_http_client_registry()
 
 
 def create_app() -> FastAPI:
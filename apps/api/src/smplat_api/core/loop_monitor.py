@@ -0,0 +1,98 @@
+"""Event-loop responsiveness probe.
+
+``EventLoopLagMonitor`` sleeps for a fixed interval in a background task and
+records how late it wakes up. The overshoot is the time other callbacks held
+the loop, so a rising lag means something is running CPU-bound work on the
+event loop (for example a metric aggregation that should go through
+``MetricExecutor``). The latest, maximum and smoothed lag are exposed on
+``/fulfillment/observability`` and as ``smplat_event_loop_lag_seconds``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from time import perf_counter
+from typing import Any
+
+from smplat_api.core.settings import settings
+
+# Exponential moving average factor for smoothed lag.
+_LAG_SMOOTHING = 0.1
+
+
+class EventLoopLagMonitor:
+    """Measures scheduling delay of the running event loop."""
+
+    def __init__(self, interval_seconds: float | None = None) -> None:
+        self.interval_seconds = max(
+            float(interval_seconds if interval_seconds is not None else settings.event_loop_lag_interval_seconds),
+            0.001,
+        )
+        self.samples = 0
+        self.last_lag_seconds: float | None = None
+        self.max_lag_seconds = 0.0
+        self.avg_lag_seconds: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def record(self, lag_seconds: float) -> None:
+        lag = max(lag_seconds, 0.0)
+        self.samples += 1
+        self.last_lag_seconds = lag
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+        if self.avg_lag_seconds is None:
+            self.avg_lag_seconds = lag
+        else:
+            self.avg_lag_seconds += _LAG_SMOOTHING * (lag - self.avg_lag_seconds)
+
+    def reset(self) -> None:
+        self.samples = 0
+        self.last_lag_seconds = None
+        self.max_lag_seconds = 0.0
+        self.avg_lag_seconds = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "interval_seconds": self.interval_seconds,
+            "samples": self.samples,
+            "last_lag_seconds": round(self.last_lag_seconds, 6) if self.last_lag_seconds is not None else None,
+            "max_lag_seconds": round(self.max_lag_seconds, 6),
+            "avg_lag_seconds": round(self.avg_lag_seconds, 6) if self.avg_lag_seconds is not None else None,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            started = perf_counter()
+            await asyncio.sleep(self.interval_seconds)
+            self.record(perf_counter() - started - self.interval_seconds)
+
+
+_MONITOR: EventLoopLagMonitor | None = None
+
+
+def get_loop_lag_monitor() -> EventLoopLagMonitor:
+    global _MONITOR
+    if _MONITOR is None:
+        _MONITOR = EventLoopLagMonitor()
+    return _MONITOR
+
+
+__all__ = ["EventLoopLagMonitor", "get_loop_lag_monitor"]
@@ -51,6 +51,56 @@ class Settings(BaseSettings):
     fulfillment_worker_enabled: bool = False
     fulfillment_poll_interval_seconds: int = 30
     fulfillment_batch_size: int = 25
+    fulfillment_worker_concurrency: int = 4
+    fulfillment_task_lease_seconds: int = 300
+    fulfillment_worker_batch_writes: bool = False
+    # Fair-share lanes (JSON): weight per lane ("follower_growth", "follower_growth@provider-id")
+    # or per task type; unlisted lanes weigh 1. Tier slug -> priority boost for loyalty members.
+    fulfillment_lane_weights: dict[str, float] = Field(default_factory=dict)
+    fulfillment_loyalty_tier_priorities: dict[str, int] = Field(default_factory=dict)
+
+    # Trust metric aggregation runs off the event loop: process | thread | inline.
+    fulfillment_metrics_executor: str = "process"
+    fulfillment_metrics_executor_workers: int = 2
+    # Expired trust metrics are served for this long while a background refresh runs;
+    # snapshots older than ratio * TTL are refreshed before they expire.
+    fulfillment_metric_stale_grace_minutes: int = 60
+    fulfillment_metric_refresh_ahead_ratio: float = 0.8
+    event_loop_lag_monitor_enabled: bool = True
+    event_loop_lag_interval_seconds: float = 0.5
+
+    # Worker wake-ups: poll intervals above are the idle ceiling; workers drain
+    # full batches immediately and wake early on notify_work signals.
+    worker_idle_backoff_min_seconds: float = 0.5
+    worker_wakeup_redis_enabled: bool = False
+    worker_wakeup_channel_prefix: str = "smplat:worker-wakeup:"
+
+    # Pooled provider HTTP clients (per-provider overrides live in metadata["http"])
+    provider_http_max_connections: int = 20
+    provider_http_max_keepalive_connections: int = 10
+    provider_http_keepalive_expiry_seconds: float = 30.0
+    provider_http_timeout_seconds: float = 10.0
+    provider_http2_enabled: bool = True
+
+    # Provider rate limits (descriptor rate_limit_per_minute) and circuit breakers
+    provider_rate_limit_redis_enabled: bool = False
+    provider_rate_limit_key_prefix: str = "smplat:provider-rate:"
+    provider_circuit_failure_threshold: int = 5
+    provider_circuit_reset_seconds: float = 30.0
+    # Adaptive health probes: unhealthy providers every min interval, healthy ones from
+    # the base interval doubling up to the max (see services/fulfillment/provider_probe_schedule.py).
+    provider_probe_min_interval_seconds: float = 60.0
+    provider_probe_base_interval_seconds: float = 900.0
+    provider_probe_max_interval_seconds: float = 3600.0
+    # Also match provider orders whose order_lookup_key has not been backfilled yet.
+    # Turn off once the 20260110 migration has run everywhere.
+    provider_order_lookup_dual_read: bool = True
+    # Provider automation snapshots are cached until a provider order write commits;
+    # the TTL bounds staleness for writes committed by other replicas.
+    provider_automation_snapshot_ttl_seconds: float = 30.0
+    # Minimum spacing of provider catalog version checks; a local commit (or one
+    # relayed by the Redis wake-up bridge) triggers the next check immediately.
+    provider_catalog_version_check_seconds: float = 1.0
 
     # Internal API security
     checkout_api_key: str = ""
@@ -64,6 +114,17 @@ class Settings(BaseSettings):
     referral_member_reward_points: float = 500.0
     referral_member_max_active_invites: int = 5
     referral_member_invite_cooldown_seconds: int = 300
+    # Active tiers/rewards/campaigns are cached per process and reloaded after catalog
+    # commits; the TTL bounds staleness for writes that bypass the ORM.
+    loyalty_catalog_cache_ttl_seconds: float = 300.0
+    # Nudge dispatchers lease their batch so concurrent runs claim disjoint nudges;
+    # each run delivers with at most this many sends in flight.
+    loyalty_nudge_dispatch_lease_seconds: int = 300
+    loyalty_nudge_dispatch_concurrency: int = 8
+    # Due point expirations are swept in chunks of this many members, one transaction each.
+    loyalty_expiration_sweep_chunk_size: int = 500
+    # Streak bonuses are granted in pages of this many members, checkpointed after each page.
+    loyalty_streak_bonus_batch_size: int = 1000
 
     # Billing rollout
     billing_rollout_stage: Literal["disabled", "pilot", "ga"] = "pilot"
@@ -121,6 +182,24 @@ class Settings(BaseSettings):
     provider_replay_worker_enabled: bool = False
     provider_replay_worker_interval_seconds: int = 300
     provider_replay_worker_limit: int = 25
+    provider_replay_worker_lease_seconds: int = 300
+    # Replays run concurrently; per-provider slots keep one slow provider from
+    # occupying the whole sweep.
+    provider_replay_worker_concurrency: int = 8
+    provider_replay_worker_per_provider_concurrency: int = 2
+    # Provider status callbacks (POST /fulfillment/providers/{id}/callbacks) are appended
+    # to an ingest table and folded into provider orders in batches by the callback worker.
+    provider_callback_worker_enabled: bool = False
+    provider_callback_worker_interval_seconds: int = 30
+    provider_callback_batch_size: int = 500
+    provider_callback_lease_seconds: int = 60
+    provider_callback_max_events: int = 1000
+    # Callbacks can race the commit of the provider order they reference; unmatched ones
+    # are retried every retry interval until the grace period runs out.
+    provider_callback_unmatched_retry_seconds: int = 30
+    provider_callback_unmatched_grace_seconds: int = 900
+    # Applied callbacks are kept this long to deduplicate redeliveries.
+    provider_callback_retention_hours: int = 72
     provider_automation_replay_task_queue: str = "provider-replay"
     provider_automation_alert_worker_enabled: bool = False
     provider_automation_alert_interval_seconds: int = 15 * 60
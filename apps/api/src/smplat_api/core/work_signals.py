@@ -0,0 +1,204 @@
+"""Wake-up signals and adaptive polling for in-process background workers.
+
+Workers such as ``TaskProcessor`` and ``JourneyRuntimeWorker`` used to sleep a
+fixed interval between batches. They now drain immediately while batches come
+back full, back off exponentially while idle, and wake early when producers call
+``notify_work`` after committing new work. Signals are in-process by default;
+when ``WORKER_WAKEUP_REDIS_ENABLED`` is set, ``RedisWakeupBridge`` fans them out
+to other API replicas over Redis pub/sub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from smplat_api.core.settings import settings
+
+FULFILLMENT_TASKS = "fulfillment_tasks"
+JOURNEY_RUNS = "journey_runs"
+# Raised after a commit that wrote providers/services; see ``provider_registry``.
+PROVIDER_CATALOG = "provider_catalog"
+# Raised after provider status callbacks are appended; see ``provider_callbacks``.
+PROVIDER_CALLBACKS = "provider_callbacks"
+# Raised after a commit that wrote loyalty tiers, rewards or campaigns; see ``catalog_cache``.
+LOYALTY_CATALOG = "loyalty_catalog"
+
+
+class WorkSignal:
+    """Level-triggered wake-up flag for one queue."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._event = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.notifications = 0
+
+    def wake(self) -> None:
+        self.notifications += 1
+        self._event.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds; return True when woken by a signal."""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio.Event binds to the first loop that waits on it; CLI runs and
+            # tests spin up fresh loops, so carry the flag over to a new event.
+            pending = self._event.is_set()
+            self._event = asyncio.Event()
+            if pending:
+                self._event.set()
+            self._loop = loop
+        if timeout <= 0:
+            return self._consume()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self._consume()
+
+    def _consume(self) -> bool:
+        woken = self._event.is_set()
+        self._event.clear()
+        return woken
+
+
+@dataclass
+class AdaptivePollBackoff:
+    """Delay policy: drain while full, exponential backoff while idle."""
+
+    min_seconds: float
+    max_seconds: float
+    factor: float = 2.0
+    current_seconds: float = field(init=False, default=0.0)
+
+    def next_delay(self, processed: int, capacity: int) -> float:
+        if capacity > 0 and processed >= capacity:
+            self.current_seconds = 0.0
+        elif processed > 0:
+            self.current_seconds = min(self.min_seconds, self.max_seconds)
+        elif self.current_seconds <= 0:
+            self.current_seconds = min(self.min_seconds, self.max_seconds)
+        else:
+            self.current_seconds = min(self.current_seconds * self.factor, self.max_seconds)
+        return self.current_seconds
+
+    @classmethod
+    def for_interval(cls, max_seconds: float) -> "AdaptivePollBackoff":
+        return cls(
+            min_seconds=settings.worker_idle_backoff_min_seconds,
+            max_seconds=max(float(max_seconds), 0.0),
+        )
+
+
+_SIGNALS: Dict[str, WorkSignal] = {}
+_BRIDGE: "RedisWakeupBridge | None" = None
+
+
+def get_work_signal(name: str) -> WorkSignal:
+    signal = _SIGNALS.get(name)
+    if signal is None:
+        signal = WorkSignal(name)
+        _SIGNALS[name] = signal
+    return signal
+
+
+def notify_work(name: str) -> None:
+    """Wake local workers for ``name`` and, when bridged, workers on other replicas."""
+
+    get_work_signal(name).wake()
+    if _BRIDGE is not None:
+        _BRIDGE.publish_nowait(name)
+
+
+class RedisWakeupBridge:
+    """Relays work signals between processes through Redis pub/sub."""
+
+    def __init__(self, redis_client: Redis | None = None, *, prefix: str | None = None) -> None:
+        self._redis = redis_client or Redis.from_url(
+            settings.redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+        self._prefix = prefix or settings.worker_wakeup_channel_prefix
+        self._listener: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._listener is not None and not self._listener.done()
+
+    def publish_nowait(self, name: str) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._publish(name))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _publish(self, name: str) -> None:
+        try:
+            await self._redis.publish(f"{self._prefix}{name}", "1")
+        except Exception as exc:  # pragma: no cover - best effort fan-out
+            logger.warning("Failed to publish worker wake-up", signal=name, error=str(exc))
+
+    def start(self) -> None:
+        global _BRIDGE
+        if self.is_running:
+            return
+        self._listener = asyncio.create_task(self._listen())
+        _BRIDGE = self
+
+    async def stop(self) -> None:
+        global _BRIDGE
+        if _BRIDGE is self:
+            _BRIDGE = None
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.psubscribe(f"{self._prefix}*")
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    channel = str(message.get("channel") or "")
+                    if channel.startswith(self._prefix):
+                        get_work_signal(channel[len(self._prefix):]).wake()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - reconnect on broker hiccups
+                logger.warning("Worker wake-up listener disconnected", error=str(exc))
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:  # pragma: no cover - defensive cleanup
+                    pass
+
+
+__all__ = [
+    "AdaptivePollBackoff",
+    "FULFILLMENT_TASKS",
+    "JOURNEY_RUNS",
+    "LOYALTY_CATALOG",
+    "PROVIDER_CALLBACKS",
+    "PROVIDER_CATALOG",
+    "RedisWakeupBridge",
+    "WorkSignal",
+    "get_work_signal",
+    "notify_work",
+]
@@ -0,0 +1,22 @@
+"""Lease-owner ids for background workers.
+
+Workers that claim rows with a lease (fulfillment tasks, provider callbacks and
+replays, loyalty nudge dispatch) record who holds each lease so an expired one
+can be told apart from a live one. ``default_worker_id`` gives every worker
+instance its own id, unique across hosts, processes and instances in a process.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+from uuid import uuid4
+
+
+def default_worker_id() -> str:
+    """Return a lease owner id unique to this process/worker instance."""
+
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+__all__ = ["default_worker_id"]
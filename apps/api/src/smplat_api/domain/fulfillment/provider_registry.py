@@ -1,21 +1,31 @@
 """Dynamic registry of fulfillment providers and services backed by persistence.
 
 This module maintains an in-process cache of provider/service metadata sourced
-from the database. Callers that mutate the catalog should trigger
-``refresh_catalog`` to keep the cache current.
+from the database. Every flush that writes providers or services appends to
+``fulfillment_catalog_changes``; the highest logged ``version`` is the catalog
+version. ``refresh_catalog`` compares it with the cached version (at most every
+``PROVIDER_CATALOG_VERSION_CHECK_SECONDS``, or right away once a commit raised the
+``provider_catalog`` work signal, which the Redis wake-up bridge relays to other
+replicas) and reloads only the entities changed since.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from itertools import chain
+from time import monotonic
 from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import delete, event, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from smplat_api.core.settings import settings
+from smplat_api.core.work_signals import PROVIDER_CATALOG, get_work_signal, notify_work
 from smplat_api.models.fulfillment import (
+    FulfillmentCatalogChange,
     FulfillmentProvider,
     FulfillmentProviderHealthStatusEnum,
     FulfillmentProviderStatusEnum,
@@ -24,6 +34,12 @@ from smplat_api.models.fulfillment import (
 )
 
 _CACHE_TTL_SECONDS = 900  # 15 minutes
+# Change-log versions are assigned at insert but may commit out of order, so each
+# check re-reads this many versions below the cached one and applies any not seen.
+_VERSION_LOOKBACK = 64
+# Full reloads happen at least every _CACHE_TTL_SECONDS, so older entries are unused.
+_CHANGE_RETENTION = timedelta(days=1)
+_CHANGED_KEY = "provider_catalog_changed"
 
 
 @dataclass(frozen=True, slots=True)
@@ -94,9 +110,12 @@ class _CatalogSnapshot:
     providers: Dict[str, FulfillmentProviderDescriptor]
     services: Dict[str, FulfillmentServiceDescriptor]
     loaded_at: datetime
+    version: int = 0
+    applied_versions: frozenset[int] = frozenset()
 
 
 _CATALOG: _CatalogSnapshot | None = None
+_LAST_VERSION_CHECK: float = float("-inf")
 
 
 def _enum_value(value: Any) -> str:
@@ -121,100 +140,226 @@ def _normalize_mapping(payload: Any) -> Dict[str, Any]:
     return {}
 
 
+def _provider_descriptor(provider: FulfillmentProvider) -> FulfillmentProviderDescriptor:
+    allowed_regions = _normalize_regions(getattr(provider, "allowed_regions", None))
+    credentials = getattr(provider, "credentials", None)
+    return FulfillmentProviderDescriptor(
+        id=provider.id,
+        name=provider.name,
+        region=allowed_regions[0] if allowed_regions else None,
+        base_url=getattr(provider, "base_url", None),
+        description=getattr(provider, "description", None),
+        status=_enum_value(getattr(provider, "status", FulfillmentProviderStatusEnum.INACTIVE)),
+        health_status=_enum_value(
+            getattr(provider, "health_status", FulfillmentProviderHealthStatusEnum.UNKNOWN)
+        ),
+        allowed_regions=allowed_regions,
+        rate_limit_per_minute=getattr(provider, "rate_limit_per_minute", None),
+        metadata=_normalize_mapping(getattr(provider, "metadata_json", None)),
+        credentials=dict(credentials) if isinstance(credentials, Mapping) else None,
+        last_health_check_at=getattr(provider, "last_health_check_at", None),
+        health_payload=_normalize_mapping(getattr(provider, "health_payload", None)),
+    )
+
+
+def _service_descriptor(service: FulfillmentService) -> FulfillmentServiceDescriptor:
+    credentials = getattr(service, "credentials", None)
+    return FulfillmentServiceDescriptor(
+        id=service.id,
+        provider_id=service.provider_id,
+        name=service.name,
+        action=service.action,
+        category=getattr(service, "category", None),
+        default_currency=getattr(service, "default_currency", None),
+        status=_enum_value(getattr(service, "status", FulfillmentServiceStatusEnum.ACTIVE)),
+        health_status=_enum_value(
+            getattr(service, "health_status", FulfillmentProviderHealthStatusEnum.UNKNOWN)
+        ),
+        allowed_regions=_normalize_regions(getattr(service, "allowed_regions", None)),
+        rate_limit_per_minute=getattr(service, "rate_limit_per_minute", None),
+        metadata=_normalize_mapping(getattr(service, "metadata_json", None)),
+        credentials=dict(credentials) if isinstance(credentials, Mapping) else None,
+        last_health_check_at=getattr(service, "last_health_check_at", None),
+        health_payload=_normalize_mapping(getattr(service, "health_payload", None)),
+    )
+
+
 async def refresh_catalog(session: AsyncSession, *, force: bool = False) -> _CatalogSnapshot:
-    """Refresh the in-memory catalog from persistence."""
+    """Refresh the in-memory catalog from persistence.
 
-    global _CATALOG
+    ``force`` (or an expired/missing cache) reloads everything; otherwise only the
+    providers and services logged in ``fulfillment_catalog_changes`` since the
+    cached version are reloaded.
+    """
+
+    global _LAST_VERSION_CHECK
     now = datetime.now(timezone.utc)
+    signalled = await get_work_signal(PROVIDER_CATALOG).wait(0)
     if (
-        not force
-        and _CATALOG is not None
-        and now - _CATALOG.loaded_at < timedelta(seconds=_CACHE_TTL_SECONDS)
+        force
+        or _CATALOG is None
+        or now - _CATALOG.loaded_at >= timedelta(seconds=_CACHE_TTL_SECONDS)
     ):
+        _LAST_VERSION_CHECK = monotonic()
+        return await _load_catalog(session, now)
+
+    if not signalled and monotonic() - _LAST_VERSION_CHECK < settings.provider_catalog_version_check_seconds:
         return _CATALOG
+    _LAST_VERSION_CHECK = monotonic()
+    latest = await _latest_version(session)
+    if latest < _CATALOG.version:
+        # The change log went backwards (database restored or recreated).
+        return await _load_catalog(session, now)
+    if latest == _CATALOG.version:
+        return _CATALOG
+    return await _apply_changes(session, _CATALOG, latest)
+
+
+async def _latest_version(session: AsyncSession) -> int:
+    result = await session.execute(select(func.max(FulfillmentCatalogChange.version)))
+    return int(result.scalar() or 0)
+
+
+async def _load_catalog(session: AsyncSession, now: datetime) -> _CatalogSnapshot:
+    global _CATALOG
+    # Read the version first: writes committed while loading are re-applied later.
+    version = await _latest_version(session)
+    recent_versions = await session.execute(
+        select(FulfillmentCatalogChange.version).where(
+            FulfillmentCatalogChange.version > version - _VERSION_LOOKBACK
+        )
+    )
 
     provider_result = await session.execute(select(FulfillmentProvider))
-    providers = provider_result.scalars().all()
+    provider_map = {provider.id: _provider_descriptor(provider) for provider in provider_result.scalars().all()}
 
     service_result = await session.execute(select(FulfillmentService))
-    services = service_result.scalars().all()
-
-    provider_map: Dict[str, FulfillmentProviderDescriptor] = {}
-    for provider in providers:
-        allowed_regions = _normalize_regions(getattr(provider, "allowed_regions", None))
-        metadata = _normalize_mapping(getattr(provider, "metadata_json", None))
-        credentials = getattr(provider, "credentials", None)
-        if isinstance(credentials, Mapping):
-            credentials_payload: Mapping[str, Any] | None = dict(credentials)
-        else:
-            credentials_payload = None
-        descriptor = FulfillmentProviderDescriptor(
-            id=provider.id,
-            name=provider.name,
-            region=allowed_regions[0] if allowed_regions else None,
-            base_url=getattr(provider, "base_url", None),
-            description=getattr(provider, "description", None),
-            status=_enum_value(getattr(provider, "status", FulfillmentProviderStatusEnum.INACTIVE)),
-            health_status=_enum_value(
-                getattr(provider, "health_status", FulfillmentProviderHealthStatusEnum.UNKNOWN)
-            ),
-            allowed_regions=allowed_regions,
-            rate_limit_per_minute=getattr(provider, "rate_limit_per_minute", None),
-            metadata=metadata,
-            credentials=credentials_payload,
-            last_health_check_at=getattr(provider, "last_health_check_at", None),
-            health_payload=_normalize_mapping(getattr(provider, "health_payload", None)),
-        )
-        provider_map[descriptor.id] = descriptor
-
-    service_map: Dict[str, FulfillmentServiceDescriptor] = {}
-    for service in services:
-        allowed_regions = _normalize_regions(getattr(service, "allowed_regions", None))
-        metadata = _normalize_mapping(getattr(service, "metadata_json", None))
-        credentials = getattr(service, "credentials", None)
-        if isinstance(credentials, Mapping):
-            credentials_payload: Mapping[str, Any] | None = dict(credentials)
-        else:
-            credentials_payload = None
-        descriptor = FulfillmentServiceDescriptor(
-            id=service.id,
-            provider_id=service.provider_id,
-            name=service.name,
-            action=service.action,
-            category=getattr(service, "category", None),
-            default_currency=getattr(service, "default_currency", None),
-            status=_enum_value(getattr(service, "status", FulfillmentServiceStatusEnum.ACTIVE)),
-            health_status=_enum_value(
-                getattr(service, "health_status", FulfillmentProviderHealthStatusEnum.UNKNOWN)
-            ),
-            allowed_regions=allowed_regions,
-            rate_limit_per_minute=getattr(service, "rate_limit_per_minute", None),
-            metadata=metadata,
-            credentials=credentials_payload,
-            last_health_check_at=getattr(service, "last_health_check_at", None),
-            health_payload=_normalize_mapping(getattr(service, "health_payload", None)),
-        )
-        service_map[descriptor.id] = descriptor
+    service_map = {service.id: _service_descriptor(service) for service in service_result.scalars().all()}
 
     snapshot = _CatalogSnapshot(
         providers=provider_map,
         services=service_map,
         loaded_at=now,
+        version=version,
+        applied_versions=frozenset(recent_versions.scalars().all()),
     )
     _CATALOG = snapshot
     logger.debug(
         "Fulfillment provider catalog refreshed",
         provider_count=len(provider_map),
         service_count=len(service_map),
+        version=version,
     )
     return snapshot
 
 
+async def _apply_changes(session: AsyncSession, current: _CatalogSnapshot, latest: int) -> _CatalogSnapshot:
+    global _CATALOG
+    result = await session.execute(
+        select(
+            FulfillmentCatalogChange.version,
+            FulfillmentCatalogChange.entity_type,
+            FulfillmentCatalogChange.entity_id,
+        ).where(
+            FulfillmentCatalogChange.version > current.version - _VERSION_LOOKBACK,
+            FulfillmentCatalogChange.version <= latest,
+        )
+    )
+    changes = [row for row in result.all() if row.version not in current.applied_versions]
+    provider_ids = {row.entity_id for row in changes if row.entity_type == "provider"}
+    service_ids = {row.entity_id for row in changes if row.entity_type == "service"}
+
+    providers = dict(current.providers)
+    services = dict(current.services)
+    if provider_ids:
+        rows = await session.execute(select(FulfillmentProvider).where(FulfillmentProvider.id.in_(provider_ids)))
+        loaded = {provider.id: _provider_descriptor(provider) for provider in rows.scalars().all()}
+        for provider_id in provider_ids:
+            if provider_id in loaded:
+                providers[provider_id] = loaded[provider_id]
+            else:
+                providers.pop(provider_id, None)
+    if service_ids:
+        rows = await session.execute(select(FulfillmentService).where(FulfillmentService.id.in_(service_ids)))
+        loaded_services = {service.id: _service_descriptor(service) for service in rows.scalars().all()}
+        for service_id in service_ids:
+            if service_id in loaded_services:
+                services[service_id] = loaded_services[service_id]
+            else:
+                services.pop(service_id, None)
+
+    applied = current.applied_versions | {row.version for row in changes}
+    snapshot = _CatalogSnapshot(
+        providers=providers,
+        services=services,
+        loaded_at=current.loaded_at,
+        version=latest,
+        applied_versions=frozenset(version for version in applied if version > latest - _VERSION_LOOKBACK),
+    )
+    _CATALOG = snapshot
+    logger.debug(
+        "Fulfillment provider catalog updated",
+        providers_changed=len(provider_ids),
+        services_changed=len(service_ids),
+        version=latest,
+    )
+    return snapshot
+
+
+@event.listens_for(Session, "after_flush")
+def _log_catalog_changes(session: Session, flush_context) -> None:  # type: ignore[no-untyped-def]
+    changes: set[tuple[str, str]] = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, FulfillmentProvider):
+            entity_type = "provider"
+        elif isinstance(obj, FulfillmentService):
+            entity_type = "service"
+        else:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if obj.id is not None:
+            changes.add((entity_type, str(obj.id)))
+    if not changes:
+        return
+    connection = session.connection()
+    connection.execute(
+        insert(FulfillmentCatalogChange),
+        [{"entity_type": entity_type, "entity_id": entity_id} for entity_type, entity_id in sorted(changes)],
+    )
+    connection.execute(
+        delete(FulfillmentCatalogChange).where(
+            FulfillmentCatalogChange.changed_at < datetime.now(timezone.utc) - _CHANGE_RETENTION
+        )
+    )
+    session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _announce_catalog_change(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        notify_work(PROVIDER_CATALOG)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_catalog_change(session: Session, previous_transaction) -> None:  # type: ignore[no-untyped-def]
+    session.info.pop(_CHANGED_KEY, None)
+
+
 def clear_cache() -> None:
     """Clear the cached provider catalog."""
 
-    global _CATALOG
+    global _CATALOG, _LAST_VERSION_CHECK
     _CATALOG = None
+    _LAST_VERSION_CHECK = float("-inf")
+
+
+def catalog_version() -> int:
+    """Return the change-log version of the cached catalog (0 when not loaded)."""
+
+    if _CATALOG is None:
+        return 0
+    return _CATALOG.version
 
 
 def list_providers() -> Iterable[FulfillmentProviderDescriptor]:
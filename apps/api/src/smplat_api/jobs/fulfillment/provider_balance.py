@@ -1,4 +1,9 @@
-"""Scheduled balance sync for fulfillment providers."""
+"""Scheduled balance sync for fulfillment providers.
+
+Balance endpoints are called concurrently (``concurrency`` in flight), each bounded by
+its timeout end to end and the sweep by ``sweep_budget_seconds``; the snapshots that
+came back are written in one commit.
+"""
 
 from __future__ import annotations
 
@@ -11,14 +16,17 @@ import httpx
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from smplat_api.models.fulfillment import FulfillmentProvider
 from smplat_api.services.fulfillment import ProviderCatalogService
 from smplat_api.services.fulfillment.provider_endpoints import (
     ProviderEndpointError,
     build_metadata_context,
     extract_balance_from_payload,
+    endpoint_template_key,
     extract_endpoint,
     invoke_provider_endpoint,
 )
+from smplat_api.services.fulfillment.http_clients import provider_http_limits
 
 SessionFactory = Callable[[], AsyncSession] | Callable[[], Awaitable[AsyncSession]]
 
@@ -36,6 +44,7 @@ async def run_provider_balance_snapshot(
     http_client: httpx.AsyncClient | None = None,
     timeout_seconds: float = 8.0,
     concurrency: int = 5,
+    sweep_budget_seconds: float = 120.0,
 ) -> Dict[str, Any]:
     """Fetch provider balances using configured automation endpoints."""
 
@@ -46,51 +55,63 @@ async def run_provider_balance_snapshot(
         catalog = ProviderCatalogService(managed_session)
         providers = await catalog.list_providers()
         if not providers:
-            return {"providers_checked": 0, "snapshots": 0}
+            return {"providers_checked": 0, "snapshots": 0, "timed_out": 0}
 
-        client = http_client or httpx.AsyncClient(timeout=timeout_seconds)
-        owns_client = http_client is None
         semaphore = asyncio.Semaphore(max(concurrency, 1))
         checked_at = datetime.now(timezone.utc)
-        snapshots = 0
 
-        try:
-            for provider in providers:
-                endpoint = extract_endpoint(provider.metadata_json, "balance")
-                if not endpoint:
-                    continue
-                result = await _fetch_balance(
+        tasks: dict[asyncio.Task, FulfillmentProvider] = {}
+        for provider in providers:
+            endpoint = extract_endpoint(provider.metadata_json, "balance")
+            if not endpoint:
+                continue
+            task = asyncio.create_task(
+                _fetch_balance(
+                    provider.id,
                     endpoint,
                     provider.metadata_json,
-                    client,
+                    http_client,
                     semaphore,
                     timeout_seconds,
+                    template_key=endpoint_template_key(provider.id, "balance", provider.updated_at),
                 )
-                if result is None:
-                    continue
-                await catalog.record_balance_snapshot(
-                    provider,
-                    amount=result.amount,
-                    currency=result.currency,
-                    payload=result.payload,
-                    retrieved_at=checked_at,
-                )
-                snapshots += 1
-
-            summary = {"providers_checked": len(providers), "snapshots": snapshots}
-            logger.bind(summary=summary).info("Fulfillment provider balance snapshot completed")
-            return summary
-        finally:
-            if owns_client:
-                await client.aclose()
+            )
+            tasks[task] = provider
+
+        pending: set[asyncio.Task] = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=max(sweep_budget_seconds, 0.0) or None)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        results = []
+        for task, provider in tasks.items():
+            if task in pending:
+                continue
+            if task.exception() is not None:
+                logger.opt(exception=task.exception()).warning("Provider balance request failed", provider_id=provider.id)
+                continue
+            result = task.result()
+            if result is not None:
+                results.append((provider, result.amount, result.currency, result.payload))
+        await catalog.record_balance_snapshots(results, retrieved_at=checked_at)
+
+        summary = {"providers_checked": len(providers), "snapshots": len(results), "timed_out": len(pending)}
+        logger.bind(summary=summary).info("Fulfillment provider balance snapshot completed")
+        return summary
 
 
 async def _fetch_balance(
+    provider_id: str,
     endpoint: Mapping[str, Any],
     metadata: Mapping[str, Any] | None,
-    client: httpx.AsyncClient,
+    client: httpx.AsyncClient | None,
     semaphore: asyncio.Semaphore,
     default_timeout: float,
+    *,
+    template_key: str | None = None,
 ) -> _BalanceResult | None:
     url_template = endpoint.get("url")
     if not isinstance(url_template, str) or not url_template.strip():
@@ -100,11 +121,18 @@ async def _fetch_balance(
 
     async with semaphore:
         try:
-            invocation = await invoke_provider_endpoint(
-                endpoint,
-                context=context,
-                http_client=client,
-                default_timeout=timeout_seconds,
+            # The client timeout applies per phase; wait_for bounds the whole call.
+            invocation = await asyncio.wait_for(
+                invoke_provider_endpoint(
+                    endpoint,
+                    context=context,
+                    http_client=client,
+                    default_timeout=timeout_seconds,
+                    client_key=provider_id,
+                    limits=provider_http_limits(metadata),
+                    template_key=template_key,
+                ),
+                timeout=float(timeout_seconds),
             )
             payload = invocation.payload
             amount, currency = extract_balance_from_payload(payload, endpoint)
@@ -112,6 +140,9 @@ async def _fetch_balance(
         except ProviderEndpointError as exc:
             logger.warning("Provider balance request failed", url=exc.url, error=str(exc))
             return None
+        except asyncio.TimeoutError:
+            logger.warning("Provider balance request timed out", provider_id=provider_id, timeout_seconds=timeout_seconds)
+            return None
 
 
 __all__ = ["run_provider_balance_snapshot"]
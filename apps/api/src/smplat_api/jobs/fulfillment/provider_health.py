@@ -1,4 +1,14 @@
-"""Scheduled health monitoring for fulfillment providers."""
+"""Scheduled health monitoring for fulfillment providers.
+
+Providers (and their services) are probed concurrently, bounded by ``concurrency``
+in-flight requests. Each request gets ``timeout_seconds`` end to end and the whole
+sweep ``sweep_budget_seconds``; providers still pending when the budget runs out keep
+their previous health and are counted as ``timed_out``. Results are written in one
+commit.
+
+With ``adaptive`` (set for the scheduled job) only the providers that
+``ProviderProbeScheduler`` reports as due are probed; the rest count as ``skipped``.
+"""
 
 from __future__ import annotations
 
@@ -15,6 +25,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from smplat_api.domain.fulfillment import provider_registry
 from smplat_api.models.fulfillment import FulfillmentProviderHealthStatusEnum, FulfillmentProvider, FulfillmentService
 from smplat_api.services.fulfillment import ProviderCatalogService
+from smplat_api.services.fulfillment.http_clients import HttpClientLimits, provider_client, provider_http_limits
+from smplat_api.services.fulfillment.provider_probe_schedule import get_probe_scheduler
 
 SessionFactory = Callable[[], AsyncSession] | Callable[[], Awaitable[AsyncSession]]
 
@@ -25,6 +37,16 @@ class _HealthResult:
     payload: Dict[str, Any]
 
 
+@dataclass
+class _Probe:
+    """Client routing for one provider's health checks (services share the provider pool)."""
+
+    key: str
+    client: httpx.AsyncClient | None
+    limits: HttpClientLimits
+    timeout_seconds: float
+
+
 @dataclass
 class _ProviderSnapshot:
     provider: FulfillmentProvider
@@ -38,6 +60,8 @@ async def run_provider_health_snapshot(
     http_client: httpx.AsyncClient | None = None,
     timeout_seconds: float = 8.0,
     concurrency: int = 5,
+    sweep_budget_seconds: float = 120.0,
+    adaptive: bool = False,
 ) -> Dict[str, Any]:
     """Ping provider/service health endpoints and persist the snapshot."""
 
@@ -51,40 +75,75 @@ async def run_provider_health_snapshot(
     async with session as managed_session:
         catalog = ProviderCatalogService(managed_session)
         providers = await catalog.list_providers()
+        skipped = 0
+        scheduler = get_probe_scheduler() if adaptive else None
+        if scheduler is not None and providers:
+            await provider_registry.refresh_catalog(managed_session)
+            due = set(scheduler.due_providers(provider_registry.list_providers(), provider_registry.list_services()))
+            skipped = sum(1 for provider in providers if provider.id not in due)
+            providers = [provider for provider in providers if provider.id in due]
         if not providers:
-            return {"providers_checked": 0, "healthy": 0, "degraded": 0, "offline": 0, "unknown": 0}
+            return {
+                "providers_checked": 0,
+                "healthy": 0,
+                "degraded": 0,
+                "offline": 0,
+                "unknown": 0,
+                "timed_out": 0,
+                "skipped": skipped,
+            }
 
-        client = http_client or httpx.AsyncClient(timeout=timeout_seconds)
-        owns_client = http_client is None
         semaphore = asyncio.Semaphore(max(concurrency, 1))
         checked_at = datetime.now(timezone.utc)
 
-        try:
-            snapshots = []
-            for provider in providers:
-                snapshot = await _evaluate_provider(provider, client, semaphore)
-                snapshots.append(snapshot)
-
-            summary = {"providers_checked": len(snapshots), "healthy": 0, "degraded": 0, "offline": 0, "unknown": 0}
-            for snapshot in snapshots:
-                status = snapshot.result.status
-                summary_key = _summarize_status(status)
-                summary[summary_key] += 1
-                await catalog.record_health_snapshot(
+        tasks = [
+            asyncio.create_task(_evaluate_provider(provider, http_client, semaphore, timeout_seconds))
+            for provider in providers
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=max(sweep_budget_seconds, 0.0) or None)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        snapshots: list[_ProviderSnapshot] = []
+        for provider, task in zip(providers, tasks):
+            if task not in done:
+                continue
+            if task.exception() is not None:
+                logger.opt(exception=task.exception()).warning("Provider health probe failed", provider_id=provider.id)
+                continue
+            snapshots.append(task.result())
+
+        summary = {
+            "providers_checked": len(snapshots),
+            "healthy": 0,
+            "degraded": 0,
+            "offline": 0,
+            "unknown": 0,
+            "timed_out": len(pending),
+            "skipped": skipped,
+        }
+        for snapshot in snapshots:
+            summary[_summarize_status(snapshot.result.status)] += 1
+            if scheduler is not None:
+                scheduler.record_probe(snapshot.provider.id, snapshot.result.status)
+
+        await catalog.record_health_snapshots(
+            [
+                (
                     snapshot.provider,
-                    provider_status=status,
-                    provider_payload=snapshot.result.payload,
-                    service_statuses={svc_id: (svc_result.status, svc_result.payload) for svc_id, svc_result in snapshot.services.items()},
-                    checked_at=checked_at,
-                    refresh_registry=False,
+                    snapshot.result.status,
+                    snapshot.result.payload,
+                    {svc_id: (svc_result.status, svc_result.payload) for svc_id, svc_result in snapshot.services.items()},
                 )
-
-            await provider_registry.refresh_catalog(managed_session, force=True)
-            logger.bind(summary=summary).info("Fulfillment provider health snapshot completed")
-            return summary
-        finally:
-            if owns_client:
-                await client.aclose()
+                for snapshot in snapshots
+            ],
+            checked_at=checked_at,
+        )
+        await provider_registry.refresh_catalog(managed_session)
+        logger.bind(summary=summary).info("Fulfillment provider health snapshot completed")
+        return summary
 
 
 def _summarize_status(status: FulfillmentProviderHealthStatusEnum) -> str:
@@ -99,14 +158,20 @@ def _summarize_status(status: FulfillmentProviderHealthStatusEnum) -> str:
 
 async def _evaluate_provider(
     provider: FulfillmentProvider,
-    client: httpx.AsyncClient,
+    client: httpx.AsyncClient | None,
     semaphore: asyncio.Semaphore,
+    timeout_seconds: float,
 ) -> _ProviderSnapshot:
-    provider_result = await _evaluate_entity(provider, provider.base_url, client, semaphore)
+    limits = provider_http_limits(getattr(provider, "metadata_json", None))
+    probe = _Probe(key=provider.id, client=client, limits=limits, timeout_seconds=timeout_seconds)
+    provider_services = list(getattr(provider, "services", []) or [])
+    base_url = getattr(provider, "base_url", None)
+    provider_result, *service_results = await asyncio.gather(
+        _evaluate_entity(provider, provider.base_url, probe, semaphore),
+        *(_evaluate_entity(service, base_url, probe, semaphore, default_endpoint=None) for service in provider_services),
+    )
     services: Dict[str, _HealthResult] = {}
-    for service in getattr(provider, "services", []) or []:
-        base_url = getattr(provider, "base_url", None)
-        result = await _evaluate_entity(service, base_url, client, semaphore, default_endpoint=None)
+    for service, result in zip(provider_services, service_results):
         if result and result.payload.get("reason") == "no_health_endpoint":
             result = None
         if result is None:
@@ -125,7 +190,7 @@ async def _evaluate_provider(
 async def _evaluate_entity(
     entity: FulfillmentProvider | FulfillmentService,
     base_url: str | None,
-    client: httpx.AsyncClient,
+    probe: "_Probe",
     semaphore: asyncio.Semaphore,
     *,
     default_endpoint: str | None = "/health",
@@ -153,10 +218,14 @@ async def _evaluate_entity(
             payload={"reason": "no_health_endpoint"},
         )
 
-    async with semaphore:
+    async with semaphore, provider_client(probe.key, http_client=probe.client, limits=probe.limits) as client:
         started = time.perf_counter()
         try:
-            response = await client.request(method, url, headers=headers)
+            # httpx timeouts apply per phase; wait_for bounds the whole request.
+            response = await asyncio.wait_for(
+                client.request(method, url, headers=headers, timeout=probe.timeout_seconds),
+                timeout=probe.timeout_seconds,
+            )
             latency_ms = round((time.perf_counter() - started) * 1000, 2)
             payload = {
                 "status_code": response.status_code,
@@ -170,7 +239,7 @@ async def _evaluate_entity(
                     payload["body_preview"] = response.text[:256]
             status = _classify_status(response.status_code, expected_statuses)
             return _HealthResult(status=status, payload=payload)
-        except httpx.TimeoutException as exc:
+        except (httpx.TimeoutException, asyncio.TimeoutError) as exc:
             latency_ms = round((time.perf_counter() - started) * 1000, 2)
             return _HealthResult(
                 status=FulfillmentProviderHealthStatusEnum.OFFLINE,
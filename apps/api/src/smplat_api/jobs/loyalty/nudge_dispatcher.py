@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 from typing import Any, Awaitable, Callable, Dict, List
 from uuid import UUID
@@ -9,6 +10,8 @@ from uuid import UUID
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from smplat_api.core.settings import settings
+from smplat_api.core.worker_identity import default_worker_id
 from smplat_api.models.loyalty import LoyaltyMember, LoyaltyNudge, LoyaltyNudgeChannel
 from smplat_api.observability.loyalty import get_loyalty_store
 from smplat_api.services.loyalty import LoyaltyService, LoyaltyNudgeDispatchCandidate
@@ -17,21 +20,30 @@ from smplat_api.services.notifications import NotificationService
 SessionFactory = Callable[[], AsyncSession] | Callable[[], Awaitable[AsyncSession]]
 
 
-async def dispatch_loyalty_nudges(*, session_factory: SessionFactory) -> Dict[str, Any]:
-    """Dispatch queued loyalty nudges honoring fallback escalation."""
+async def dispatch_loyalty_nudges(
+    *,
+    session_factory: SessionFactory,
+    limit: int = 100,
+    concurrency: int | None = None,
+) -> Dict[str, Any]:
+    """Dispatch queued loyalty nudges honoring fallback escalation.
 
-    maybe_session = session_factory()
-    if isinstance(maybe_session, AsyncSession):
-        session = maybe_session
-    else:
-        session = await maybe_session
+    The batch is leased in SQL, so overlapping runs (or several replicas)
+    deliver disjoint nudges; delivery runs with at most ``concurrency`` sends
+    in flight.
+    """
+
+    session = await _open_session(session_factory)
 
     async with session as managed_session:
-        notifications = NotificationService(managed_session)
-        service = LoyaltyService(managed_session, notification_service=notifications)
+        service = LoyaltyService(managed_session)
         now = dt.datetime.now(dt.timezone.utc)
 
-        batch = await service.collect_nudge_dispatch_batch(now=now)
+        batch = await service.collect_nudge_dispatch_batch(
+            limit=limit,
+            now=now,
+            worker_id=default_worker_id(),
+        )
         attempts = len(batch)
         if attempts == 0:
             logger.info("No loyalty nudges ready for dispatch")
@@ -43,10 +55,12 @@ async def dispatch_loyalty_nudges(*, session_factory: SessionFactory) -> Dict[st
 
         observability = get_loyalty_store()
         dispatched: List[LoyaltyNudgeDispatchCandidate] = []
+        undelivered: List[LoyaltyNudge] = []
         deliveries = 0
         fallback_deliveries = 0
         member_cache: dict[UUID, LoyaltyMember] = {}
 
+        deliverable: list[tuple[LoyaltyNudgeDispatchCandidate, LoyaltyMember]] = []
         for candidate in batch:
             nudge = candidate.nudge
             member = nudge.member
@@ -60,18 +74,21 @@ async def dispatch_loyalty_nudges(*, session_factory: SessionFactory) -> Dict[st
                             nudge_id=str(nudge.id),
                             member_id=str(nudge.member_id),
                         )
+                        undelivered.append(nudge)
                         continue
                     member_cache[nudge.member_id] = cached
                 member = cached
-
-            channel_used, used_fallback = await _dispatch_with_fallback(
-                notifications,
-                member,
-                nudge,
-                candidate.channels,
-            )
-
+            deliverable.append((candidate, member))
+
+        outcomes = await _deliver_batch(
+            session_factory,
+            deliverable,
+            concurrency or settings.loyalty_nudge_dispatch_concurrency,
+        )
+        for (candidate, _member), (channel_used, used_fallback) in zip(deliverable, outcomes):
+            nudge = candidate.nudge
             if channel_used is None:
+                undelivered.append(nudge)
                 continue
 
             deliveries += 1
@@ -88,9 +105,8 @@ async def dispatch_loyalty_nudges(*, session_factory: SessionFactory) -> Dict[st
 
         if dispatched:
             await service.mark_nudges_triggered(dispatched, now=now)
-            await managed_session.commit()
-        else:
-            await managed_session.rollback()
+        await service.release_nudge_dispatch_claims(undelivered)
+        await managed_session.commit()
 
         summary = {
             "dispatch_attempts": attempts,
@@ -101,6 +117,44 @@ async def dispatch_loyalty_nudges(*, session_factory: SessionFactory) -> Dict[st
         return summary
 
 
+async def _open_session(session_factory: SessionFactory) -> AsyncSession:
+    maybe_session = session_factory()
+    if isinstance(maybe_session, AsyncSession):
+        return maybe_session
+    return await maybe_session
+
+
+async def _deliver_batch(
+    session_factory: SessionFactory,
+    deliveries: list[tuple[LoyaltyNudgeDispatchCandidate, LoyaltyMember]],
+    concurrency: int,
+) -> list[tuple[LoyaltyNudgeChannel | None, bool]]:
+    """Deliver claimed nudges with at most ``concurrency`` senders, keeping input order.
+
+    Sends read contacts and preferences, so every sender owns a session; the
+    pool size therefore also bounds the connections a run holds.
+    """
+
+    results: list[tuple[LoyaltyNudgeChannel | None, bool]] = [(None, False)] * len(deliveries)
+    pending = iter(enumerate(deliveries))
+
+    async def _sender() -> None:
+        session = await _open_session(session_factory)
+        async with session as sender_session:
+            notifications = NotificationService(sender_session)
+            for index, (candidate, member) in pending:
+                results[index] = await _dispatch_with_fallback(
+                    notifications,
+                    member,
+                    candidate.nudge,
+                    candidate.channels,
+                )
+
+    senders = max(1, min(concurrency, len(deliveries)))
+    await asyncio.gather(*(_sender() for _ in range(senders)))
+    return results
+
+
 async def _dispatch_with_fallback(
     notifications: NotificationService,
     member: LoyaltyMember,
@@ -11,15 +11,25 @@ from typing import Any, Awaitable, Callable, Dict, List
 from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from smplat_api.models.loyalty import LoyaltyLedgerEntry, LoyaltyLedgerEntryType, LoyaltyMember
+from smplat_api.core.settings import settings
+from smplat_api.models.loyalty import LoyaltyJobCheckpoint
 from smplat_api.services.loyalty import LoyaltyService
 
 SessionFactory = Callable[[], AsyncSession] | Callable[[], Awaitable[AsyncSession]]
 
 
-async def run_loyalty_progression(*, session_factory: SessionFactory) -> Dict[str, Any]:
+STREAK_BONUS_JOB = "loyalty_streak_bonus"
+STREAK_BONUS_WINDOW = dt.timedelta(days=7)
+STREAK_BONUS_TTL = dt.timedelta(days=180)
+STREAK_BONUS_AMOUNT = Decimal("10")
+
+
+async def run_loyalty_progression(
+    *,
+    session_factory: SessionFactory,
+    batch_size: int | None = None,
+) -> Dict[str, Any]:
     """Grant streak bonuses, expire stale balances, and emit analytics events."""
 
     maybe_session = session_factory()
@@ -32,13 +42,19 @@ async def run_loyalty_progression(*, session_factory: SessionFactory) -> Dict[st
     async with session as managed_session:
         service = LoyaltyService(managed_session)
         now = dt.datetime.now(dt.timezone.utc)
-        bonuses_granted, events = await _grant_streak_bonuses(managed_session, service, now)
-        expired = await service.expire_scheduled_points(reference_time=now)
+        bonuses_granted, events = await _grant_streak_bonuses(
+            managed_session,
+            service,
+            now,
+            batch_size=batch_size or settings.loyalty_streak_bonus_batch_size,
+        )
+        expired = await service.sweep_point_expirations(reference_time=now)
         await managed_session.commit()
 
         summary = {
             "bonuses_granted": bonuses_granted,
-            "expired_points": len(expired),
+            "expired_points": expired.expirations,
+            "expired_members": expired.members,
             "events_emitted": len(events),
         }
         logger.bind(summary=summary, events=events).info("Loyalty progression sweep completed")
@@ -49,68 +65,88 @@ async def _grant_streak_bonuses(
     session: AsyncSession,
     service: LoyaltyService,
     now: dt.datetime,
+    *,
+    batch_size: int,
 ) -> tuple[int, List[Dict[str, Any]]]:
-    """Award a streak bonus to active members once per rolling window."""
-
-    window_start = now - dt.timedelta(days=7)
-    expires_at = now + dt.timedelta(days=180)
-
-    stmt_members = (
-        select(LoyaltyMember)
-        .options(selectinload(LoyaltyMember.current_tier))
-        .where(LoyaltyMember.updated_at >= window_start)
-    )
-    result = await session.execute(stmt_members)
-    members = result.scalars().all()
+    """Award a streak bonus to active members once per rolling window.
+
+    Members are granted in id-ordered pages, each committed together with the
+    checkpoint cursor. A run that stopped part-way resumes after the last
+    committed page with its original reference time, so a retry neither skips
+    nor double-grants members.
+    """
+
+    checkpoint = await _load_checkpoint(session, now)
+    run_at = checkpoint.run_started_at
+    window_start = run_at - STREAK_BONUS_WINDOW
+    expires_at = run_at + STREAK_BONUS_TTL
+    metadata = {
+        "kind": "streak_bonus",
+        "window_start": window_start.isoformat(),
+    }
 
     bonuses = 0
     events: List[Dict[str, Any]] = []
-    for member in members:
-        latest_bonus = await _fetch_latest_streak_bonus(session, member)
-        if latest_bonus and latest_bonus.created_at and latest_bonus.created_at >= window_start:
-            continue
-
-        bonus_amount = Decimal("10")
-        metadata = {
-            "kind": "streak_bonus",
-            "window_start": window_start.isoformat(),
-        }
-        await service.record_ledger_entry(
-            member,
-            entry_type=LoyaltyLedgerEntryType.TIER_BONUS,
-            amount=bonus_amount,
+    while True:
+        member_ids = await service.grant_bonus_batch(
+            window_start=window_start,
+            amount=STREAK_BONUS_AMOUNT,
+            expires_at=expires_at,
+            after_member_id=checkpoint.cursor_member_id,
+            limit=batch_size,
             description="Weekly loyalty streak bonus",
             metadata=metadata,
-            expires_at=expires_at,
         )
-        bonuses += 1
-        events.append(
+        if member_ids:
+            checkpoint.cursor_member_id = member_ids[-1]
+            checkpoint.processed_count = (checkpoint.processed_count or 0) + len(member_ids)
+        if len(member_ids) < batch_size:
+            checkpoint.completed_at = dt.datetime.now(dt.timezone.utc)
+        await session.commit()
+
+        bonuses += len(member_ids)
+        events.extend(
             {
                 "type": "loyalty.streak_bonus",
-                "member_id": str(member.id),
-                "amount": float(bonus_amount),
+                "member_id": str(member_id),
+                "amount": float(STREAK_BONUS_AMOUNT),
                 "window_start": window_start.isoformat(),
             }
+            for member_id in member_ids
         )
+        if checkpoint.completed_at is not None:
+            break
 
     return bonuses, events
 
 
-async def _fetch_latest_streak_bonus(
-    session: AsyncSession,
-    member: LoyaltyMember,
-) -> LoyaltyLedgerEntry | None:
-    stmt = (
-        select(LoyaltyLedgerEntry)
-        .where(
-            LoyaltyLedgerEntry.member_id == member.id,
-            LoyaltyLedgerEntry.entry_type == LoyaltyLedgerEntryType.TIER_BONUS,
+async def _load_checkpoint(session: AsyncSession, now: dt.datetime) -> LoyaltyJobCheckpoint:
+    """Return the streak-bonus checkpoint, resuming an unfinished recent run or starting a new one."""
+
+    stmt = select(LoyaltyJobCheckpoint).where(LoyaltyJobCheckpoint.job_name == STREAK_BONUS_JOB)
+    checkpoint = (await session.execute(stmt)).scalar_one_or_none()
+    if checkpoint is None:
+        checkpoint = LoyaltyJobCheckpoint(job_name=STREAK_BONUS_JOB, run_started_at=now)
+        session.add(checkpoint)
+    elif checkpoint.completed_at is None and _as_utc(checkpoint.run_started_at) > now - STREAK_BONUS_WINDOW:
+        logger.info(
+            "Resuming loyalty streak bonus run",
+            run_started_at=_as_utc(checkpoint.run_started_at).isoformat(),
+            processed=checkpoint.processed_count,
         )
-        .order_by(LoyaltyLedgerEntry.created_at.desc())
-        .limit(1)
-    )
-    result = await session.execute(stmt)
-    return result.scalar_one_or_none()
+        checkpoint.run_started_at = _as_utc(checkpoint.run_started_at)
+        return checkpoint
+    else:
+        checkpoint.run_started_at = now
+        checkpoint.completed_at = None
+    checkpoint.cursor_member_id = None
+    checkpoint.processed_count = 0
+    await session.flush()
+    return checkpoint
+
+
+def _as_utc(value: dt.datetime) -> dt.datetime:
+    return value if value.tzinfo else value.replace(tzinfo=dt.timezone.utc)
 
 
 __all__ = ["run_loyalty_progression"]
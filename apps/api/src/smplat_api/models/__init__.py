@@ -38,9 +38,13 @@ from .social_account import (  # noqa: F401
 )
 from .fulfillment import (  # noqa: F401
     CampaignActivity,
+    FulfillmentCatalogChange,
     FulfillmentProvider,
+    FulfillmentProviderCallback,
     FulfillmentProviderHealthStatusEnum,
     FulfillmentProviderOrder,
+    FulfillmentProviderReplaySchedule,
+    FulfillmentProviderReplayStatusEnum,
     FulfillmentProviderStatusEnum,
     FulfillmentService,
     FulfillmentServiceStatusEnum,
@@ -100,6 +104,7 @@ from .loyalty import (  # noqa: F401
     LoyaltyGuardrailAuditEvent,
     LoyaltyGuardrailOverride,
     LoyaltyGuardrailOverrideScope,
+    LoyaltyJobCheckpoint,
     LoyaltyLedgerEntry,
     LoyaltyLedgerEntryType,
     LoyaltyNudge,
@@ -1,7 +1,8 @@
 """Fulfillment and task tracking models."""
 
 from enum import Enum
-from uuid import uuid4
+from typing import Any
+from uuid import UUID as PyUUID, uuid4
 
 from sqlalchemy import (
     Column,
@@ -14,11 +15,13 @@ from sqlalchemy import (
     String,
     Text,
     Boolean,
+    Index,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 from smplat_api.db.base import Base
 
@@ -42,9 +45,18 @@ class FulfillmentTaskTypeEnum(str, Enum):
     CAMPAIGN_OPTIMIZATION = "campaign_optimization"
 
 
+def _default_task_lane(context) -> str | None:
+    task_type = context.get_current_parameters().get("task_type")
+    return getattr(task_type, "value", task_type)
+
+
 class FulfillmentTask(Base):
     """Individual fulfillment tasks for order items."""
     __tablename__ = "fulfillment_tasks"
+    __table_args__ = (
+        Index("ix_fulfillment_tasks_status_scheduled_at", "status", "scheduled_at"),
+        Index("ix_fulfillment_tasks_status_lane_priority", "status", "lane", "priority", "scheduled_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     order_item_id = Column(UUID(as_uuid=True), ForeignKey("order_items.id", ondelete="CASCADE"), nullable=False)
@@ -67,6 +79,13 @@ class FulfillmentTask(Base):
     scheduled_at = Column(DateTime(timezone=True), nullable=True)
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Worker lease: set when a processor claims the task, cleared on completion/retry
+    lease_owner = Column(String(128), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    # Scheduling: batches are shared fairly across lanes (task type, optionally
+    # "@provider"); within a lane higher priority claims first
+    lane = Column(String(128), nullable=True, default=_default_task_lane)
+    priority = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -330,6 +349,21 @@ class FulfillmentService(Base):
     provider = relationship("FulfillmentProvider", back_populates="services")
 
 
+class FulfillmentCatalogChange(Base):
+    """Append-only log of provider/service writes that versions the catalog cache.
+
+    ``version`` is the catalog version; each process compares its cached version
+    with ``max(version)`` and reloads only the entities logged since.
+    """
+
+    __tablename__ = "fulfillment_catalog_changes"
+
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String(16), nullable=False)
+    entity_id = Column(String(64), nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 class FulfillmentProviderBalance(Base):
     """Latest known wallet/balance snapshot for a provider."""
 
@@ -354,10 +388,36 @@ class FulfillmentProviderBalance(Base):
     provider = relationship("FulfillmentProvider", back_populates="balance_snapshot")
 
 
+def order_lookup_key(value: Any) -> str | None:
+    """Normalize an order id to the dash-less lower-case hex stored in ``order_lookup_key``."""
+    if value is None:
+        return None
+    if isinstance(value, PyUUID):
+        return value.hex
+    normalized = str(value).strip()
+    return normalized.replace("-", "").lower() or None
+
+
+def _default_order_lookup_key(context) -> str | None:
+    return order_lookup_key(context.get_current_parameters().get("order_id"))
+
+
 class FulfillmentProviderOrder(Base):
     """Recorded automation events between SmpLat and external providers."""
 
     __tablename__ = "fulfillment_provider_orders"
+    __table_args__ = (
+        Index("ix_fulfillment_provider_orders_order_lookup_key", "order_lookup_key", "created_at"),
+        Index(
+            "ix_fulfillment_provider_orders_lookup_pending",
+            "created_at",
+            postgresql_where=text("order_lookup_key IS NULL"),
+        ),
+        # Incremental automation telemetry reads orders changed since a watermark.
+        Index("ix_fulfillment_provider_orders_updated_at", "updated_at"),
+        # Provider callbacks address orders by the provider's own order id.
+        Index("ix_fulfillment_provider_orders_provider_reference", "provider_id", "provider_reference"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     order_id = Column(
@@ -370,8 +430,13 @@ class FulfillmentProviderOrder(Base):
         ForeignKey("order_items.id", ondelete="CASCADE"),
         nullable=False,
     )
+    # Indexed copy of order_id in normalized hex; NULL only on rows written before
+    # the 20260110 backfill (see PROVIDER_ORDER_LOOKUP_DUAL_READ).
+    order_lookup_key = Column(String(32), nullable=True, default=_default_order_lookup_key)
     provider_id = Column(String(64), nullable=False)
     provider_name = Column(String(255), nullable=True)
+    # Provider-side order id (payload["providerOrderId"]) that status callbacks reference.
+    provider_reference = Column(String(128), nullable=True)
     service_id = Column(String(64), nullable=False)
     service_action = Column(String(255), nullable=True)
     amount = Column(Numeric(12, 2), nullable=True)
@@ -382,3 +447,96 @@ class FulfillmentProviderOrder(Base):
 
     order = relationship("Order")
     order_item = relationship("OrderItem", back_populates="provider_orders")
+
+    @validates("order_id")
+    def _sync_order_lookup_key(self, key: str, value: Any) -> Any:
+        self.order_lookup_key = order_lookup_key(value)
+        return value
+
+
+class FulfillmentProviderReplayStatusEnum(str, Enum):
+    """Lifecycle of a scheduled provider order replay."""
+
+    SCHEDULED = "scheduled"
+    IN_PROGRESS = "in_progress"
+    EXECUTED = "executed"
+    FAILED = "failed"
+
+
+class FulfillmentProviderReplaySchedule(Base):
+    """Scheduled replay of a provider order, claimed by the replay worker.
+
+    Mirrors the ``scheduledReplays`` entries of ``FulfillmentProviderOrder.payload``
+    (kept as the denormalized view for the admin UI); ``entry_id`` is the entry ``id``.
+    """
+
+    __tablename__ = "fulfillment_provider_replay_schedules"
+    __table_args__ = (
+        UniqueConstraint(
+            "provider_order_id",
+            "entry_id",
+            name="uq_fulfillment_provider_replay_schedules_entry",
+        ),
+        Index("ix_fulfillment_provider_replay_schedules_status_due", "status", "scheduled_for"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    provider_order_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("fulfillment_provider_orders.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    entry_id = Column(String(64), nullable=False)
+    provider_id = Column(String(64), nullable=False)
+    status = Column(
+        SqlEnum(
+            FulfillmentProviderReplayStatusEnum,
+            name="fulfillment_provider_replay_status_enum",
+            values_callable=lambda enum: [member.value for member in enum],
+        ),
+        nullable=False,
+        server_default=FulfillmentProviderReplayStatusEnum.SCHEDULED.value,
+    )
+    scheduled_for = Column(DateTime(timezone=True), nullable=False)
+    requested_amount = Column(Numeric(12, 2), nullable=True)
+    performed_at = Column(DateTime(timezone=True), nullable=True)
+    # Worker lease: set when the replay worker claims the entry, cleared when it settles
+    lease_owner = Column(String(128), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    provider_order = relationship("FulfillmentProviderOrder")
+
+
+class FulfillmentProviderCallback(Base):
+    """Provider status callback appended by the ingest endpoint.
+
+    ``(provider_id, event_id)`` deduplicates redelivered callbacks. The callback
+    worker leases pending rows, folds them into ``FulfillmentProviderOrder`` in
+    batches and stamps ``applied_at``.
+    """
+
+    __tablename__ = "fulfillment_provider_callbacks"
+    __table_args__ = (
+        UniqueConstraint("provider_id", "event_id", name="uq_fulfillment_provider_callbacks_event"),
+        Index(
+            "ix_fulfillment_provider_callbacks_pending",
+            "received_at",
+            postgresql_where=text("applied_at IS NULL"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    provider_id = Column(String(64), nullable=False)
+    event_id = Column(String(128), nullable=False)
+    provider_reference = Column(String(128), nullable=False)
+    status = Column(String(64), nullable=True)
+    payload = Column(JSON, nullable=True)
+    received_at = Column(DateTime(timezone=True), nullable=False)
+    # applied | unmatched; NULL while pending
+    outcome = Column(String(16), nullable=True)
+    applied_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    lease_owner = Column(String(128), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
@@ -11,12 +11,14 @@ from sqlalchemy import (
     DateTime,
     Enum as SqlEnum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     JSON,
     func,
+    text,
     UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
@@ -61,6 +63,7 @@ class LoyaltyMember(Base):
     __tablename__ = "loyalty_members"
     __table_args__ = (
         UniqueConstraint("user_id", name="uq_loyalty_members_user_id"),
+        Index("ix_loyalty_members_updated_at", "updated_at"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -71,6 +74,9 @@ class LoyaltyMember(Base):
     lifetime_points = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
     referral_code = Column(String, nullable=True, unique=True)
     last_tier_upgrade_at = Column(DateTime(timezone=True), nullable=True)
+    # Earliest expiry among the member's scheduled expirations with points left (NULL: none),
+    # the starting point for FIFO consumption.
+    next_expiration_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -96,6 +102,9 @@ class LoyaltyLedgerEntry(Base):
     """Ledger entry storing loyalty point adjustments."""
 
     __tablename__ = "loyalty_ledger_entries"
+    __table_args__ = (
+        Index("ix_loyalty_ledger_entries_member_type_created", "member_id", "entry_type", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     member_id = Column(UUID(as_uuid=True), ForeignKey("loyalty_members.id", ondelete="CASCADE"), nullable=False)
@@ -311,6 +320,7 @@ class LoyaltyNudge(Base):
             "source_id",
             name="uq_loyalty_nudges_member_type_source",
         ),
+        Index("ix_loyalty_nudges_dispatch", "status", "next_dispatch_at", "priority"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -345,6 +355,10 @@ class LoyaltyNudge(Base):
     acknowledged_at = Column(DateTime(timezone=True), nullable=True)
     dismissed_at = Column(DateTime(timezone=True), nullable=True)
     expires_at = Column(DateTime(timezone=True), nullable=True)
+    # Earliest time the campaign frequency cap allows another dispatch (NULL: never dispatched).
+    next_dispatch_at = Column(DateTime(timezone=True), nullable=True)
+    lease_owner = Column(String(128), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
         DateTime(timezone=True),
@@ -448,6 +462,15 @@ class LoyaltyPointExpiration(Base):
     """Represents scheduled expiration of loyalty points."""
 
     __tablename__ = "loyalty_point_expirations"
+    __table_args__ = (
+        # Serves FIFO consumption, expiration windows and the member delete cascade.
+        Index("ix_loyalty_point_expirations_member_id_expires_at", "member_id", "expires_at"),
+        Index(
+            "ix_loyalty_point_expirations_due",
+            "expires_at",
+            postgresql_where=text("status = 'scheduled'"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     member_id = Column(
@@ -563,3 +586,21 @@ class LoyaltyAnalyticsSnapshot(Base):
     segments_json = Column("segments", JSON, nullable=False, default=dict)
     velocity_json = Column("velocity", JSON, nullable=False, default=dict)
 
+
+class LoyaltyJobCheckpoint(Base):
+    """Durable progress marker for resumable loyalty batch jobs."""
+
+    __tablename__ = "loyalty_job_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("job_name", name="uq_loyalty_job_checkpoints_job_name"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    job_name = Column(String(64), nullable=False)
+    # Reference time of the run in progress; a resumed run keeps evaluating against it.
+    run_started_at = Column(DateTime(timezone=True), nullable=False)
+    cursor_member_id = Column(UUID(as_uuid=True), nullable=True)
+    processed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, JSON, String, UniqueConstraint, func
+from sqlalchemy import Column, DateTime, Index, JSON, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 
 from smplat_api.db.base import Base
@@ -15,6 +15,8 @@ class ProviderPlatformContextCache(Base):
     __tablename__ = "provider_platform_context_cache"
     __table_args__ = (
         UniqueConstraint("provider_id", "platform_id", name="uq_provider_platform_context"),
+        # Serves the per-provider "most recently seen" reads.
+        Index("ix_provider_platform_context_recent", "provider_id", "last_seen_at"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -23,6 +23,8 @@ class FulfillmentEventLog:
     last_dead_letter_task: str | None = None
     last_retry_scheduled_at: datetime | None = None
     last_retry_delay_seconds: int | None = None
+    last_deferred_at: datetime | None = None
+    last_deferred_reason: str | None = None
 
 
 @dataclass
@@ -50,6 +52,10 @@ class FulfillmentMetricsSnapshot:
                 if self.events.last_retry_scheduled_at
                 else None,
                 "last_retry_delay_seconds": self.events.last_retry_delay_seconds,
+                "last_deferred_at": self.events.last_deferred_at.isoformat()
+                if self.events.last_deferred_at
+                else None,
+                "last_deferred_reason": self.events.last_deferred_reason,
             },
         }
 
@@ -66,6 +72,7 @@ class FulfillmentObservabilityStore:
             "failed": Counter(),
             "retried": Counter(),
             "dead_lettered": Counter(),
+            "deferred": Counter(),
         }
     )
     _events: FulfillmentEventLog = field(default_factory=FulfillmentEventLog)
@@ -89,6 +96,13 @@ class FulfillmentObservabilityStore:
             self._events.last_retry_scheduled_at = next_run_at
             self._events.last_retry_delay_seconds = delay_seconds
 
+    def record_deferred(self, task_type: str, reason: str) -> None:
+        with self._lock:
+            self._totals["deferred"] += 1
+            self._per_type["deferred"][task_type] += 1
+            self._events.last_deferred_at = _utcnow()
+            self._events.last_deferred_reason = reason
+
     def record_dead_letter(self, task_type: str) -> None:
         with self._lock:
             self._totals["dead_lettered"] += 1
@@ -107,6 +121,8 @@ class FulfillmentObservabilityStore:
                 last_dead_letter_task=self._events.last_dead_letter_task,
                 last_retry_scheduled_at=self._events.last_retry_scheduled_at,
                 last_retry_delay_seconds=self._events.last_retry_delay_seconds,
+                last_deferred_at=self._events.last_deferred_at,
+                last_deferred_reason=self._events.last_deferred_reason,
             )
         return FulfillmentMetricsSnapshot(totals=totals, per_type=per_type, events=events_copy)
 
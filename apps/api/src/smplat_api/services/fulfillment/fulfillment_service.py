@@ -1,15 +1,19 @@
 """Core fulfillment service for order processing and task management."""
 
-from typing import List, Dict, Any, Optional, Mapping
-from uuid import UUID
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Mapping, Sequence
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta, timezone
 
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, case, func, or_, select, true, update
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from loguru import logger
 
+from smplat_api.core.settings import settings
+from smplat_api.core.work_signals import FULFILLMENT_TASKS, notify_work
 from smplat_api.models.order import Order, OrderItem, OrderStatusEnum
 from smplat_api.models.fulfillment import (
     FulfillmentProviderOrder,
@@ -17,13 +21,19 @@ from smplat_api.models.fulfillment import (
     FulfillmentTaskStatusEnum,
     FulfillmentTaskTypeEnum,
 )
+from smplat_api.models.loyalty import LoyaltyMember, LoyaltyTier
 from smplat_api.models.product import Product
 from smplat_api.services.fulfillment.provider_endpoints import (
     ProviderEndpointError,
+    endpoint_template_key,
     extract_endpoint,
     extract_path,
     invoke_provider_endpoint,
 )
+from smplat_api.services.fulfillment.http_clients import provider_http_limits
+from smplat_api.services.fulfillment.provider_limits import ProviderThrottledError, get_provider_guard
+from smplat_api.services.fulfillment.scheduling import FairShareScheduler, task_lane
+from smplat_api.services.fulfillment.templating import config_fingerprint
 from smplat_api.services.notifications import NotificationService
 from smplat_api.domain.fulfillment import get_provider, get_service, provider_registry
 from .instagram_service import InstagramService
@@ -32,6 +42,23 @@ from smplat_api.services.providers.platform_context_cache import (
 )
 
 
+@dataclass
+class FulfillmentTaskOutcome:
+    """Terminal transition for a claimed task, written in bulk by ``apply_task_outcomes``.
+
+    ``status`` is COMPLETED, FAILED (dead letter) or PENDING (retry after
+    ``retry_delay_seconds``). ``deferred`` PENDING outcomes were never attempted
+    (provider throttled or circuit open) and do not consume a retry.
+    """
+
+    task: FulfillmentTask
+    status: FulfillmentTaskStatusEnum
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    retry_delay_seconds: int = 0
+    deferred: bool = False
+
+
 class FulfillmentService:
     """Service for managing order fulfillment and service delivery."""
     
@@ -89,11 +116,14 @@ class FulfillmentService:
             )
             
             # Process each order item
+            priority_boost = await self._resolve_loyalty_priority(order)
             for item in order.items:
-                await self._create_fulfillment_tasks_for_item(item)
+                await self._create_fulfillment_tasks_for_item(item, priority_boost=priority_boost)
 
             items_count = len(order.items)
+            await self._flush_platform_contexts()
             await self.db.commit()
+            notify_work(FULFILLMENT_TASKS)
 
             logger.info(
                 "Started fulfillment processing for order",
@@ -112,11 +142,26 @@ class FulfillmentService:
             await self.db.rollback()
             return False
             
-    async def _create_fulfillment_tasks_for_item(self, order_item: OrderItem) -> None:
+    async def _resolve_loyalty_priority(self, order: Order) -> int:
+        """Return the queue priority boost for the customer's loyalty tier."""
+
+        tier_priorities = settings.fulfillment_loyalty_tier_priorities
+        if not tier_priorities or not order.user_id:
+            return 0
+        stmt = (
+            select(LoyaltyTier.slug)
+            .join(LoyaltyMember, LoyaltyMember.current_tier_id == LoyaltyTier.id)
+            .where(LoyaltyMember.user_id == order.user_id)
+        )
+        tier_slug = (await self.db.execute(stmt)).scalar_one_or_none()
+        return int(tier_priorities.get(tier_slug, 0)) if tier_slug else 0
+
+    async def _create_fulfillment_tasks_for_item(self, order_item: OrderItem, *, priority_boost: int = 0) -> None:
         """Create fulfillment tasks for a specific order item.
         
         Args:
             order_item: Order item to create tasks for
+            priority_boost: Queue priority added to every task (loyalty tier)
         """
         # Get product details to determine service type
         if not order_item.product_id:
@@ -135,22 +180,29 @@ class FulfillmentService:
             
         # Configurable fulfillment overrides category defaults
         if product.fulfillment_config:
-            await self._create_configurable_fulfillment_tasks(order_item, product)
+            await self._create_configurable_fulfillment_tasks(order_item, product, priority_boost=priority_boost)
             return
 
         # Create tasks based on product category
         if product.category.lower() == "instagram":
-            await self._create_instagram_fulfillment_tasks(order_item, product)
+            await self._create_instagram_fulfillment_tasks(order_item, product, priority_boost=priority_boost)
         else:
             # Default fulfillment tasks for other categories
-            await self._create_generic_fulfillment_tasks(order_item, product)
+            await self._create_generic_fulfillment_tasks(order_item, product, priority_boost=priority_boost)
             
-    async def _create_instagram_fulfillment_tasks(self, order_item: OrderItem, product: Product) -> None:
+    async def _create_instagram_fulfillment_tasks(
+        self,
+        order_item: OrderItem,
+        product: Product,
+        *,
+        priority_boost: int = 0,
+    ) -> None:
         """Create Instagram-specific fulfillment tasks.
         
         Args:
             order_item: Order item for Instagram service
             product: Product details
+            priority_boost: Queue priority for the created tasks
         """
         tasks = [
             {
@@ -205,7 +257,8 @@ class FulfillmentService:
                 description=task_data["description"],
                 payload=task_data["payload"],
                 scheduled_at=task_data["scheduled_at"],
-                status=FulfillmentTaskStatusEnum.PENDING
+                status=FulfillmentTaskStatusEnum.PENDING,
+                priority=priority_boost,
             )
             self.db.add(task)
             
@@ -215,12 +268,19 @@ class FulfillmentService:
             tasks_count=len(tasks)
         )
         
-    async def _create_generic_fulfillment_tasks(self, order_item: OrderItem, product: Product) -> None:
+    async def _create_generic_fulfillment_tasks(
+        self,
+        order_item: OrderItem,
+        product: Product,
+        *,
+        priority_boost: int = 0,
+    ) -> None:
         """Create generic fulfillment tasks for non-Instagram services.
         
         Args:
             order_item: Order item
             product: Product details
+            priority_boost: Queue priority for the created task
         """
         task = FulfillmentTask(
             order_item_id=order_item.id,
@@ -233,7 +293,8 @@ class FulfillmentService:
                 "service_title": product.title
             },
             scheduled_at=datetime.utcnow() + timedelta(hours=24),
-            status=FulfillmentTaskStatusEnum.PENDING
+            status=FulfillmentTaskStatusEnum.PENDING,
+            priority=priority_boost,
         )
         
         self.db.add(task)
@@ -244,8 +305,19 @@ class FulfillmentService:
             product_category=product.category
         )
 
-    async def _create_configurable_fulfillment_tasks(self, order_item: OrderItem, product: Product) -> None:
-        """Create fulfillment tasks based on per-product configuration."""
+    async def _create_configurable_fulfillment_tasks(
+        self,
+        order_item: OrderItem,
+        product: Product,
+        *,
+        priority_boost: int = 0,
+    ) -> None:
+        """Create fulfillment tasks based on per-product configuration.
+
+        Task ``priority`` comes from the task config, then the product config, plus
+        ``priority_boost``; tasks whose execution names a ``provider_id`` get their
+        own fair-share lane.
+        """
         config = product.fulfillment_config or {}
         tasks_config = config.get("tasks")
 
@@ -254,10 +326,11 @@ class FulfillmentService:
                 "Product fulfillment config missing task definitions",
                 product_id=str(product.id),
             )
-            await self._create_generic_fulfillment_tasks(order_item, product)
+            await self._create_generic_fulfillment_tasks(order_item, product, priority_boost=priority_boost)
             return
 
         context = await self._build_task_context(order_item, product)
+        product_priority = self._resolve_priority(config)
 
         created = 0
         for task_index, task_config in enumerate(tasks_config):
@@ -289,6 +362,8 @@ class FulfillmentService:
                 "context": context,
                 "metadata": task_config.get("metadata"),
                 "raw_payload": task_config.get("payload"),
+                # Keys the processor's cached render plans, so executions skip fingerprinting.
+                "template_key": f"product:{product.id}:task:{task_index}:{config_fingerprint(task_config)}",
             }
 
             title = task_config.get("title") or f"{product.title} · {task_type.value.replace('_', ' ').title()}"
@@ -303,6 +378,8 @@ class FulfillmentService:
                 scheduled_at=scheduled_at,
                 status=FulfillmentTaskStatusEnum.PENDING,
                 max_retries=max_retries,
+                lane=task_lane(task_type, task_config.get("execution")),
+                priority=self._resolve_priority(task_config, product_priority) + priority_boost,
             )
 
             self.db.add(task)
@@ -313,7 +390,7 @@ class FulfillmentService:
                 "No valid fulfillment tasks were created from product configuration; falling back to generic task",
                 product_id=str(product.id),
             )
-            await self._create_generic_fulfillment_tasks(order_item, product)
+            await self._create_generic_fulfillment_tasks(order_item, product, priority_boost=priority_boost)
             return
 
         logger.info(
@@ -402,12 +479,15 @@ class FulfillmentService:
             if provider_response:
                 payload.update(provider_response)
             payload = {key: value for key, value in payload.items() if value is not None}
+            # Providers often return numeric ids; the column is String(128), matched by callbacks.
+            provider_order_id = payload.get("providerOrderId")
 
             record = FulfillmentProviderOrder(
                 order_id=order_item.order_id,
                 order_item_id=order_item.id,
                 provider_id=descriptor.provider_id,
                 provider_name=provider.name if provider else None,
+                provider_reference=str(provider_order_id)[:128] if provider_order_id is not None else None,
                 service_id=descriptor.id,
                 service_action=descriptor.action,
                 amount=override.get("amount"),
@@ -415,7 +495,7 @@ class FulfillmentService:
                 payload=payload,
             )
             self.db.add(record)
-            await self._cache_platform_context(descriptor.provider_id, order_item.platform_context)
+            self._cache_platform_context(descriptor.provider_id, order_item.platform_context)
 
     def _extract_service_overrides(self, order_item: OrderItem) -> List[Dict[str, Any]]:
         """Return normalized service override metadata from order item selections."""
@@ -490,12 +570,44 @@ class FulfillmentService:
         timeout_seconds = endpoint.get("timeoutSeconds") or 10
 
         try:
-            invocation = await invoke_provider_endpoint(
-                endpoint,
-                context=context,
-                http_client=self._http_client,
-                default_timeout=timeout_seconds,
+            async with get_provider_guard().guard(provider_descriptor.id, override.get("service_id")):
+                invocation = await invoke_provider_endpoint(
+                    endpoint,
+                    context=context,
+                    http_client=self._http_client,
+                    default_timeout=timeout_seconds,
+                    client_key=provider_descriptor.id,
+                    limits=provider_http_limits(provider_descriptor.metadata),
+                    template_key=endpoint_template_key(
+                        provider_descriptor.id, "order", provider_registry.catalog_version()
+                    ),
+                )
+        except ProviderThrottledError as exc:
+            # Hand the order to the scheduled replay worker instead of recording a failure.
+            run_at = datetime.now(timezone.utc) + timedelta(seconds=exc.retry_after)
+            logger.info(
+                "Provider order deferred",
+                provider_id=provider_descriptor.id,
+                scope=exc.scope,
+                reason=exc.reason,
+                retry_after_seconds=exc.retry_after,
             )
+            return {
+                "providerResponse": {
+                    "deferred": True,
+                    "reason": exc.reason,
+                    "retryAfterSeconds": exc.retry_after,
+                },
+                "scheduledReplays": [
+                    {
+                        "id": str(uuid4()),
+                        "requestedAmount": payload.get("requestedAmount"),
+                        "scheduledFor": run_at.isoformat(),
+                        "status": "scheduled",
+                        "deferredReason": exc.reason,
+                    }
+                ],
+            }
         except ProviderEndpointError as exc:
             logger.warning(
                 "Provider order endpoint failed",
@@ -634,6 +746,16 @@ class FulfillmentService:
             return int(max_retries)
         return 3
 
+    @staticmethod
+    def _resolve_priority(config: Dict[str, Any], default: int = 0) -> int:
+        """Normalize a queue priority (higher claims first) from configuration."""
+        priority = config.get("priority")
+        if isinstance(priority, bool):
+            return default
+        if isinstance(priority, (int, float)):
+            return int(priority)
+        return default
+
     @staticmethod
     def _serialize_order(order: Order | None) -> Dict[str, Any] | None:
         if order is None:
@@ -711,12 +833,226 @@ class FulfillmentService:
                 FulfillmentTaskStatusEnum.PENDING == FulfillmentTask.status,
                 FulfillmentTask.scheduled_at <= datetime.utcnow()
             )
-            .order_by(FulfillmentTask.scheduled_at)
+            .order_by(FulfillmentTask.priority.desc(), FulfillmentTask.scheduled_at)
             .limit(limit)
         )
         
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
+
+    async def claim_pending_tasks(
+        self,
+        worker_id: str,
+        *,
+        limit: int = 50,
+        lease_seconds: int = 300,
+        scheduler: FairShareScheduler | None = None,
+    ) -> List[FulfillmentTask]:
+        """Atomically claim due tasks for a worker and move them to IN_PROGRESS.
+
+        Tasks whose lease expired while IN_PROGRESS (crashed or stalled worker) are
+        claimable again; reclaiming one counts as a retry, and one that has already
+        spent ``max_retries`` is moved to FAILED instead, so a task that keeps
+        killing its worker cannot be re-leased forever. Postgres takes row locks with ``FOR UPDATE SKIP LOCKED`` so
+        concurrent replicas pick disjoint batches; SQLite ignores the lock clause and
+        relies on the guarded UPDATE, which only flips rows that are still claimable.
+        The batch is split across lanes by ``scheduler`` (weighted fair share);
+        within a lane tasks are taken by priority, then ``scheduled_at``.
+
+        Args:
+            worker_id: Lease owner recorded on the claimed rows
+            limit: Maximum number of tasks to claim
+            lease_seconds: How long the claim stays valid before others may reclaim
+            scheduler: Fair-share state to carry across batches (a fresh one otherwise)
+
+        Returns:
+            Claimed tasks with order item and order eagerly loaded
+        """
+        now = datetime.utcnow()
+        lease_expired = and_(
+            FulfillmentTask.status == FulfillmentTaskStatusEnum.IN_PROGRESS,
+            FulfillmentTask.lease_expires_at.isnot(None),
+            FulfillmentTask.lease_expires_at <= now,
+        )
+        claimable = or_(
+            and_(
+                FulfillmentTask.status == FulfillmentTaskStatusEnum.PENDING,
+                FulfillmentTask.scheduled_at <= now,
+            ),
+            lease_expired,
+        )
+
+        scheduler = scheduler or FairShareScheduler(settings.fulfillment_lane_weights)
+        candidate_ids = await self._select_fair_share_candidates(claimable, limit, now, scheduler)
+        if not candidate_ids:
+            await self.db.commit()
+            return []
+
+        exhausted = await self.db.execute(
+            update(FulfillmentTask)
+            .where(
+                FulfillmentTask.id.in_(candidate_ids),
+                lease_expired,
+                FulfillmentTask.retry_count >= FulfillmentTask.max_retries,
+            )
+            .values(
+                status=FulfillmentTaskStatusEnum.FAILED,
+                error_message="Task lease expired with no retries left",
+                completed_at=now,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        failed_order_ids: set[UUID] = set()
+        if exhausted.rowcount:
+            failed_order_ids = set(
+                (
+                    await self.db.execute(
+                        select(OrderItem.order_id)
+                        .join(FulfillmentTask, FulfillmentTask.order_item_id == OrderItem.id)
+                        .where(
+                            FulfillmentTask.id.in_(candidate_ids),
+                            FulfillmentTask.status == FulfillmentTaskStatusEnum.FAILED,
+                        )
+                    )
+                ).scalars()
+            )
+            logger.warning(
+                "Failed fulfillment tasks whose leases expired with no retries left",
+                worker_id=worker_id,
+                failed=exhausted.rowcount,
+            )
+
+        await self.db.execute(
+            update(FulfillmentTask)
+            .where(FulfillmentTask.id.in_(candidate_ids), claimable)
+            .values(
+                status=FulfillmentTaskStatusEnum.IN_PROGRESS,
+                started_at=now,
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                # An expired lease means the previous attempt died mid-run.
+                retry_count=case(
+                    (lease_expired, FulfillmentTask.retry_count + 1),
+                    else_=FulfillmentTask.retry_count,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        claimed_stmt = (
+            select(FulfillmentTask)
+            .options(
+                selectinload(FulfillmentTask.order_item).selectinload(OrderItem.order)
+            )
+            .where(
+                FulfillmentTask.id.in_(candidate_ids),
+                FulfillmentTask.lease_owner == worker_id,
+                FulfillmentTask.status == FulfillmentTaskStatusEnum.IN_PROGRESS,
+            )
+            .order_by(FulfillmentTask.priority.desc(), FulfillmentTask.scheduled_at)
+            .execution_options(populate_existing=True)
+        )
+        claimed = list((await self.db.execute(claimed_stmt)).scalars().all())
+        scheduler.record_claimed(
+            ((task.lane or task.task_type.value, task.scheduled_at) for task in claimed),
+            now,
+        )
+
+        order_ids = {
+            task.order_item.order_id for task in claimed if task.order_item is not None
+        } | failed_order_ids
+        for order_id in order_ids:
+            await self._sync_order_status_for_order(order_id)
+
+        await self.db.commit()
+
+        if claimed:
+            logger.info(
+                "Claimed fulfillment tasks",
+                worker_id=worker_id,
+                claimed=len(claimed),
+                candidates=len(candidate_ids),
+            )
+        return claimed
+
+    async def _select_fair_share_candidates(
+        self,
+        claimable: Any,
+        limit: int,
+        now: datetime,
+        scheduler: FairShareScheduler,
+    ) -> List[UUID]:
+        """Lock up to ``limit`` claimable task ids, split across lanes by weight."""
+
+        queue_stmt = (
+            select(
+                FulfillmentTask.lane,
+                FulfillmentTask.task_type,
+                func.count(FulfillmentTask.id),
+                func.min(FulfillmentTask.scheduled_at),
+            )
+            .where(claimable)
+            .group_by(FulfillmentTask.lane, FulfillmentTask.task_type)
+        )
+        queue: Dict[str, tuple[int, datetime | None]] = {}
+        for lane, task_type, count, oldest in (await self.db.execute(queue_stmt)).all():
+            key = lane or task_type.value
+            depth, previous = queue.get(key, (0, None))
+            candidates = [value for value in (previous, oldest) if value is not None]
+            queue[key] = (depth + int(count), min(candidates) if candidates else None)
+        scheduler.observe_queue(queue, now)
+
+        allocation = scheduler.allocate({lane: depth for lane, (depth, _) in queue.items()}, limit)
+        ordering = (FulfillmentTask.priority.desc(), FulfillmentTask.scheduled_at)
+        candidate_ids: List[UUID] = []
+        for lane, slots in allocation.items():
+            if slots <= 0:
+                continue
+            lane_stmt = (
+                select(FulfillmentTask.id)
+                .where(claimable, self._lane_clause(lane))
+                .order_by(*ordering)
+                .limit(slots)
+                .with_for_update(skip_locked=True)
+            )
+            candidate_ids.extend((await self.db.execute(lane_stmt)).scalars().all())
+
+        shortfall = min(limit, sum(allocation.values())) - len(candidate_ids)
+        if shortfall > 0:
+            # Rows locked by other replicas left slots unused; fill them from any lane.
+            backfill_stmt = (
+                select(FulfillmentTask.id)
+                .where(claimable, FulfillmentTask.id.notin_(candidate_ids) if candidate_ids else true())
+                .order_by(*ordering)
+                .limit(shortfall)
+                .with_for_update(skip_locked=True)
+            )
+            candidate_ids.extend((await self.db.execute(backfill_stmt)).scalars().all())
+        return candidate_ids
+
+    @staticmethod
+    def _lane_clause(lane: str) -> Any:
+        clause = FulfillmentTask.lane == lane
+        try:
+            task_type = FulfillmentTaskTypeEnum(lane)
+        except ValueError:
+            return clause
+        # Rows written before lanes existed default to their task-type lane.
+        return or_(clause, and_(FulfillmentTask.lane.is_(None), FulfillmentTask.task_type == task_type))
+
+    async def get_task(self, task_id: UUID) -> Optional[FulfillmentTask]:
+        """Load a single task with its order item and order for processing."""
+        stmt = (
+            select(FulfillmentTask)
+            .options(
+                selectinload(FulfillmentTask.order_item).selectinload(OrderItem.order)
+            )
+            .where(FulfillmentTask.id == task_id)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
         
     async def update_task_status(
         self,
@@ -755,8 +1091,11 @@ class FulfillmentService:
             
             if status == FulfillmentTaskStatusEnum.IN_PROGRESS:
                 task.started_at = datetime.utcnow()
-            elif status in [FulfillmentTaskStatusEnum.COMPLETED, FulfillmentTaskStatusEnum.FAILED]:
-                task.completed_at = datetime.utcnow()
+            else:
+                task.lease_owner = None
+                task.lease_expires_at = None
+                if status in [FulfillmentTaskStatusEnum.COMPLETED, FulfillmentTaskStatusEnum.FAILED]:
+                    task.completed_at = datetime.utcnow()
                 
             if result_data:
                 task.result = result_data
@@ -805,6 +1144,8 @@ class FulfillmentService:
         task.result = None
         task.started_at = None
         task.completed_at = None
+        task.lease_owner = None
+        task.lease_expires_at = None
         task.scheduled_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
 
         await self.db.commit()
@@ -830,6 +1171,78 @@ class FulfillmentService:
 
         return task
             
+    async def apply_task_outcomes(self, outcomes: Sequence[FulfillmentTaskOutcome]) -> None:
+        """Persist terminal transitions for claimed tasks in one bulk write.
+
+        All rows go out as a single executemany ``UPDATE ... WHERE id = :id``,
+        affected orders are re-derived once each, and the batch commits once. The
+        task objects (usually detached after claiming) are updated in place without
+        being marked dirty, so callers can keep logging from them.
+        """
+        if not outcomes:
+            return
+
+        now = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        for outcome in outcomes:
+            task = outcome.task
+            retry_count = task.retry_count or 0
+            row: Dict[str, Any] = {
+                "id": task.id,
+                "status": outcome.status,
+                "result": outcome.result if outcome.result else task.result,
+                "error_message": task.error_message,
+                "retry_count": retry_count,
+                "started_at": task.started_at,
+                "completed_at": now,
+                "scheduled_at": task.scheduled_at,
+                "lease_owner": None,
+                "lease_expires_at": None,
+            }
+            if outcome.error_message:
+                row["error_message"] = outcome.error_message
+                if not outcome.deferred:
+                    row["retry_count"] = retry_count + 1
+            if outcome.status == FulfillmentTaskStatusEnum.PENDING:
+                row.update(
+                    result=None,
+                    started_at=None,
+                    completed_at=None,
+                    scheduled_at=now + timedelta(seconds=outcome.retry_delay_seconds),
+                )
+            rows.append(row)
+
+        await self.db.execute(update(FulfillmentTask), rows)
+
+        order_ids: set[UUID] = set()
+        for outcome, row in zip(outcomes, rows):
+            for key, value in row.items():
+                if key != "id":
+                    set_committed_value(outcome.task, key, value)
+            order_item = outcome.task.order_item
+            if order_item is not None:
+                order_ids.add(order_item.order_id)
+
+        for order_id in order_ids:
+            await self._sync_order_status_for_order(order_id)
+
+        await self.db.commit()
+
+        if self.notification_service:
+            for outcome in outcomes:
+                if outcome.status != FulfillmentTaskStatusEnum.PENDING or outcome.deferred:
+                    continue
+                order_item = outcome.task.order_item
+                order = order_item.order if order_item is not None else None
+                if order is not None:
+                    await self.notification_service.send_fulfillment_retry(order, outcome.task)
+
+        logger.info(
+            "Applied fulfillment task outcomes",
+            tasks=len(rows),
+            orders=len(order_ids),
+        )
+
     async def get_order_fulfillment_progress(self, order_id: UUID) -> Optional[Dict[str, Any]]:
         """Get fulfillment progress for an order.
         
@@ -840,21 +1253,14 @@ class FulfillmentService:
             Dictionary with fulfillment progress information
         """
         try:
-            # Get order with items and tasks
-            stmt = (
-                select(Order)
-                .options(
-                    selectinload(Order.items).selectinload(OrderItem.fulfillment_tasks)
-                )
-                .where(Order.id == order_id)
-            )
-            result = await self.db.execute(stmt)
-            order = result.scalar_one_or_none()
-            
+            order = await self.db.get(Order, order_id)
             if not order:
                 return None
 
-            stats = self._calculate_task_stats(order)
+            stats = await self._load_task_stats(order_id)
+            items_count = await self.db.scalar(
+                select(func.count(OrderItem.id)).where(OrderItem.order_id == order_id)
+            )
             total_tasks = stats["total"]
             completed_tasks = stats["completed"]
             failed_tasks = stats["failed"]
@@ -869,7 +1275,7 @@ class FulfillmentService:
                 "failed_tasks": failed_tasks,
                 "in_progress_tasks": in_progress_tasks,
                 "progress_percentage": round(progress_percentage, 2),
-                "items_count": len(order.items)
+                "items_count": int(items_count or 0)
             }
             
         except Exception as e:
@@ -881,13 +1287,15 @@ class FulfillmentService:
             return None
 
     async def _sync_order_status_for_order(self, order_id: UUID) -> None:
-        """Recalculate order status based on fulfillment task state."""
+        """Recalculate order status based on fulfillment task state.
+
+        Task counts come from a single ``GROUP BY status`` aggregate, so the cost
+        of a transition no longer grows with the number of items/tasks on the order.
+        """
         stmt = (
             select(Order)
-            .options(
-                selectinload(Order.items).selectinload(OrderItem.fulfillment_tasks)
-            )
             .where(Order.id == order_id)
+            .execution_options(populate_existing=True)
         )
         result = await self.db.execute(stmt)
         order = result.scalar_one_or_none()
@@ -898,7 +1306,7 @@ class FulfillmentService:
         if order.status == OrderStatusEnum.CANCELED:
             return
 
-        stats = self._calculate_task_stats(order)
+        stats = await self._load_task_stats(order_id)
 
         if stats["total"] == 0:
             return
@@ -925,38 +1333,31 @@ class FulfillmentService:
             if new_status == OrderStatusEnum.COMPLETED:
                 await self.notification_service.send_fulfillment_completion(order)
 
-    @staticmethod
-    def _calculate_task_stats(order: Order) -> Dict[str, int]:
-        """Aggregate fulfillment task statistics for an order."""
-        total_tasks = 0
-        completed_tasks = 0
-        failed_tasks = 0
-        in_progress_tasks = 0
-
-        for item in order.items:
-            for task in item.fulfillment_tasks:
-                total_tasks += 1
-                if task.status == FulfillmentTaskStatusEnum.COMPLETED:
-                    completed_tasks += 1
-                elif task.status == FulfillmentTaskStatusEnum.FAILED:
-                    failed_tasks += 1
-                elif task.status == FulfillmentTaskStatusEnum.IN_PROGRESS:
-                    in_progress_tasks += 1
+    async def _load_task_stats(self, order_id: UUID) -> Dict[str, int]:
+        """Aggregate fulfillment task counts per status for an order."""
+        stmt = (
+            select(FulfillmentTask.status, func.count(FulfillmentTask.id))
+            .join(OrderItem, FulfillmentTask.order_item_id == OrderItem.id)
+            .where(OrderItem.order_id == order_id)
+            .group_by(FulfillmentTask.status)
+        )
+        counts = {status: int(count) for status, count in (await self.db.execute(stmt)).all()}
 
         return {
-            "total": total_tasks,
-            "completed": completed_tasks,
-            "failed": failed_tasks,
-            "in_progress": in_progress_tasks,
+            "total": sum(counts.values()),
+            "completed": counts.get(FulfillmentTaskStatusEnum.COMPLETED, 0),
+            "failed": counts.get(FulfillmentTaskStatusEnum.FAILED, 0),
+            "in_progress": counts.get(FulfillmentTaskStatusEnum.IN_PROGRESS, 0),
         }
-    async def _cache_platform_context(self, provider_id: str, platform_context: Mapping[str, Any] | None) -> None:
+
+    def _cache_platform_context(self, provider_id: str, platform_context: Mapping[str, Any] | None) -> None:
         if not provider_id:
             return
+        self._platform_context_cache.buffer_context(provider_id, platform_context)
+
+    async def _flush_platform_contexts(self) -> None:
+        """Write the contexts buffered while processing an order as one upsert."""
         try:
-            await self._platform_context_cache.record_context(provider_id, platform_context)
+            await self._platform_context_cache.flush_contexts()
         except Exception as error:  # pragma: no cover - defensive logging
-            logger.warning(
-                "Failed to cache provider platform context",
-                provider_id=provider_id,
-                error=str(error),
-            )
+            logger.warning("Failed to cache provider platform contexts", error=str(error))
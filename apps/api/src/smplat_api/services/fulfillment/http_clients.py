@@ -0,0 +1,308 @@
+"""Process-wide pooled HTTP clients for provider and fulfillment executions.
+
+Every outbound provider call (order placement, balance refresh, health probes,
+replays, configured fulfillment executions) goes through a keep-alive
+``httpx.AsyncClient`` keyed by provider id or host, so repeated calls reuse
+TCP/TLS connections instead of paying a fresh handshake per request. Each key
+gets its own connection pool and a concurrency semaphore sized from the
+provider descriptor metadata (``metadata["http"]``) or the global defaults.
+
+The registry is bound to the event loop that created it; the FastAPI lifespan
+closes it on shutdown, and one-off runners (CLI, Celery) transparently get a
+fresh registry for their own loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from itertools import chain
+from typing import Any, AsyncIterator, Dict, Mapping
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from smplat_api.core.settings import settings
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _positive_int(value: Any) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)) and value > 0:
+        return int(value)
+    return None
+
+
+def _positive_float(value: Any) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)) and value > 0:
+        return float(value)
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class HttpClientLimits:
+    """Connection pool, concurrency and timeout settings for one client key."""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_seconds: float = 30.0
+    max_concurrency: int | None = None
+    timeout_seconds: float | None = None
+    connect_timeout_seconds: float | None = None
+
+    @classmethod
+    def defaults(cls) -> "HttpClientLimits":
+        return cls(
+            max_connections=settings.provider_http_max_connections,
+            max_keepalive_connections=settings.provider_http_max_keepalive_connections,
+            keepalive_expiry_seconds=settings.provider_http_keepalive_expiry_seconds,
+        )
+
+    @property
+    def concurrency(self) -> int:
+        return self.max_concurrency or self.max_connections
+
+    def build_timeout(self, total_seconds: float) -> httpx.Timeout:
+        return httpx.Timeout(total_seconds, connect=self.connect_timeout_seconds or total_seconds)
+
+
+def provider_http_limits(metadata: Mapping[str, Any] | None) -> HttpClientLimits:
+    """Resolve per-provider HTTP limits from descriptor/model metadata.
+
+    Providers may declare ``{"http": {"maxConnections", "maxKeepaliveConnections",
+    "maxConcurrency", "timeoutSeconds", "connectTimeoutSeconds"}}``; anything
+    missing falls back to the global ``PROVIDER_HTTP_*`` settings.
+    """
+
+    limits = HttpClientLimits.defaults()
+    if not isinstance(metadata, Mapping):
+        return limits
+    config = metadata.get("http")
+    if not isinstance(config, Mapping):
+        return limits
+
+    max_connections = _positive_int(config.get("maxConnections")) or limits.max_connections
+    max_keepalive = _positive_int(config.get("maxKeepaliveConnections")) or min(
+        limits.max_keepalive_connections, max_connections
+    )
+    return replace(
+        limits,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        max_concurrency=_positive_int(config.get("maxConcurrency")),
+        timeout_seconds=_positive_float(config.get("timeoutSeconds")),
+        connect_timeout_seconds=_positive_float(config.get("connectTimeoutSeconds")),
+    )
+
+
+def host_key(url: str) -> str:
+    """Return the client key for ad-hoc URLs (scheme + host + port)."""
+
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower() if parts.netloc else url
+
+
+@dataclass
+class _PooledClient:
+    client: httpx.AsyncClient
+    limits: HttpClientLimits
+    semaphore: asyncio.Semaphore
+    in_flight: int = 0
+    requests: int = 0
+    # Callers holding or waiting for a slot; a retired pool closes when it drops to zero.
+    refs: int = 0
+    retired: bool = False
+
+
+class HttpClientRegistry:
+    """Keyed pool of long-lived ``httpx.AsyncClient`` instances."""
+
+    def __init__(
+        self,
+        *,
+        default_timeout_seconds: float | None = None,
+        http2: bool | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._default_timeout = default_timeout_seconds or settings.provider_http_timeout_seconds
+        requested_http2 = settings.provider_http2_enabled if http2 is None else http2
+        self._http2 = requested_http2 and _http2_available()
+        self._transport = transport
+        self._clients: Dict[str, _PooledClient] = {}
+        self._retired: list[_PooledClient] = []
+        self._closed = False
+        self.loop = asyncio.get_running_loop()
+
+    @property
+    def http2(self) -> bool:
+        return self._http2
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _build_client(self, limits: HttpClientLimits) -> httpx.AsyncClient:
+        kwargs: Dict[str, Any] = {
+            "timeout": limits.build_timeout(limits.timeout_seconds or self._default_timeout),
+            "limits": httpx.Limits(
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=limits.keepalive_expiry_seconds,
+            ),
+            "http2": self._http2,
+        }
+        if self._transport is not None:
+            kwargs["transport"] = self._transport
+        return httpx.AsyncClient(**kwargs)
+
+    def _entry(self, key: str, limits: HttpClientLimits | None) -> _PooledClient:
+        if self._closed:
+            raise RuntimeError("HTTP client registry is closed")
+        resolved = limits or HttpClientLimits.defaults()
+        entry = self._clients.get(key)
+        if entry is not None and entry.limits == resolved:
+            return entry
+        if entry is not None:
+            # Limits changed (catalog edit); new calls use a fresh pool while
+            # in-flight requests finish on the old one, closed once they drain.
+            entry.retired = True
+            self._retired.append(entry)
+        entry = _PooledClient(
+            client=self._build_client(resolved),
+            limits=resolved,
+            semaphore=asyncio.Semaphore(resolved.concurrency),
+        )
+        self._clients[key] = entry
+        return entry
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        key: str,
+        limits: HttpClientLimits | None = None,
+    ) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the pooled client for ``key`` while holding one concurrency slot."""
+
+        entry = self._entry(key, limits)
+        entry.refs += 1
+        try:
+            await self._close_drained()
+            async with entry.semaphore:
+                entry.in_flight += 1
+                entry.requests += 1
+                try:
+                    yield entry.client
+                finally:
+                    entry.in_flight -= 1
+        finally:
+            entry.refs -= 1
+            if entry.retired and entry.refs == 0:
+                await self._close_drained()
+
+    async def _close_drained(self) -> None:
+        """Close retired pools that no caller holds or waits on any more."""
+
+        drained = [entry for entry in self._retired if entry.refs == 0]
+        if not drained:
+            return
+        self._retired = [entry for entry in self._retired if entry.refs > 0]
+        for entry in drained:
+            await self._close_client(entry.client)
+
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warning("Failed to close pooled HTTP client", error=str(exc))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "http2": self._http2,
+            "clients": {
+                key: {
+                    "maxConnections": entry.limits.max_connections,
+                    "concurrency": entry.limits.concurrency,
+                    "inFlight": entry.in_flight,
+                    "requests": entry.requests,
+                }
+                for key, entry in self._clients.items()
+            },
+        }
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        clients = [entry.client for entry in chain(self._clients.values(), self._retired)]
+        self._clients.clear()
+        self._retired.clear()
+        for client in clients:
+            await self._close_client(client)
+
+
+_REGISTRY: HttpClientRegistry | None = None
+
+
+def get_http_client_registry() -> HttpClientRegistry:
+    """Return the registry for the running event loop, creating it on first use."""
+
+    global _REGISTRY
+    loop = asyncio.get_running_loop()
+    if _REGISTRY is None or _REGISTRY.loop is not loop or _REGISTRY.closed:
+        _REGISTRY = HttpClientRegistry()
+    return _REGISTRY
+
+
+def configure_http_client_registry(registry: HttpClientRegistry | None) -> None:
+    """Install a specific registry (tests, custom transports) or clear it."""
+
+    global _REGISTRY
+    _REGISTRY = registry
+
+
+async def close_http_client_registry() -> None:
+    """Close pooled connections; called from the application lifespan."""
+
+    global _REGISTRY
+    registry = _REGISTRY
+    _REGISTRY = None
+    if registry is not None and registry.loop is asyncio.get_running_loop():
+        await registry.aclose()
+
+
+@asynccontextmanager
+async def provider_client(
+    key: str,
+    *,
+    http_client: httpx.AsyncClient | None = None,
+    limits: HttpClientLimits | None = None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield an injected client as-is, otherwise a pooled client for ``key``."""
+
+    if http_client is not None:
+        yield http_client
+        return
+    async with get_http_client_registry().acquire(key, limits) as client:
+        yield client
+
+
+__all__ = [
+    "HttpClientLimits",
+    "HttpClientRegistry",
+    "close_http_client_registry",
+    "configure_http_client_registry",
+    "get_http_client_registry",
+    "host_key",
+    "provider_client",
+    "provider_http_limits",
+]
@@ -0,0 +1,153 @@
+"""Off-loop execution for CPU-bound metric aggregation.
+
+Metric computers fetch rows asynchronously and then call ``MetricExecutor.run``
+with a kernel from ``metric_kernels``. ``FULFILLMENT_METRICS_EXECUTOR`` selects
+where the kernel runs:
+
+* ``process`` (default) - a lazily started ``ProcessPoolExecutor`` using the
+  ``spawn`` start method, so large forecasts never hold the GIL of the API
+  process;
+* ``thread`` - the loop's default thread pool, for environments that cannot
+  spawn processes;
+* ``inline`` - on the event loop itself (tests, debugging).
+
+If the process pool cannot start or breaks, the executor logs once and
+degrades to ``thread`` for the rest of the process lifetime.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, TypeVar
+
+from loguru import logger
+
+from smplat_api.core.settings import settings
+
+T = TypeVar("T")
+
+EXECUTOR_PROCESS = "process"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_INLINE = "inline"
+_MODES = {EXECUTOR_PROCESS, EXECUTOR_THREAD, EXECUTOR_INLINE}
+
+
+class MetricExecutor:
+    """Runs synchronous metric kernels away from the event loop."""
+
+    def __init__(self, mode: str = EXECUTOR_PROCESS, *, max_workers: int = 2) -> None:
+        mode = (mode or EXECUTOR_PROCESS).strip().lower()
+        if mode not in _MODES:
+            logger.warning("Unknown metrics executor mode; using thread", mode=mode)
+            mode = EXECUTOR_THREAD
+        self.mode = mode
+        self.max_workers = max(1, int(max_workers))
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+        self.runs = 0
+        self.fallbacks = 0
+        self.last_duration_seconds: float | None = None
+        self.last_kernel: str | None = None
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Execute ``fn(*args)`` according to ``mode`` and return its result."""
+
+        started = perf_counter()
+        try:
+            if self.mode == EXECUTOR_INLINE:
+                return fn(*args)
+            loop = asyncio.get_running_loop()
+            if self.mode == EXECUTOR_PROCESS:
+                pool = self._process_pool()
+                if pool is not None:
+                    try:
+                        return await loop.run_in_executor(pool, partial(fn, *args))
+                    except BrokenProcessPool as exc:
+                        self._degrade(str(exc))
+            return await loop.run_in_executor(None, partial(fn, *args))
+        finally:
+            self.runs += 1
+            self.last_kernel = getattr(fn, "__name__", repr(fn))
+            self.last_duration_seconds = perf_counter() - started
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "pool_started": self._pool is not None,
+            "runs": self.runs,
+            "fallbacks": self.fallbacks,
+            "last_kernel": self.last_kernel,
+            "last_duration_seconds": (
+                round(self.last_duration_seconds, 6) if self.last_duration_seconds is not None else None
+            ),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _process_pool(self) -> ProcessPoolExecutor | None:
+        with self._lock:
+            if self._pool is None and self.mode == EXECUTOR_PROCESS:
+                try:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except (OSError, ValueError, NotImplementedError) as exc:
+                    self.mode = EXECUTOR_THREAD
+                    self.fallbacks += 1
+                    logger.warning("Metrics process pool unavailable; using threads", error=str(exc))
+            return self._pool
+
+    def _degrade(self, reason: str) -> None:
+        logger.warning("Metrics process pool broke; falling back to threads", error=reason)
+        self.fallbacks += 1
+        self.mode = EXECUTOR_THREAD
+        self.shutdown()
+
+
+_EXECUTOR: MetricExecutor | None = None
+
+
+def get_metric_executor() -> MetricExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = MetricExecutor(
+            settings.fulfillment_metrics_executor,
+            max_workers=settings.fulfillment_metrics_executor_workers,
+        )
+    return _EXECUTOR
+
+
+def configure_metric_executor(executor: MetricExecutor | None) -> None:
+    """Install ``executor`` as the process-wide instance (``None`` rebuilds from settings)."""
+    global _EXECUTOR
+    if _EXECUTOR is not None and _EXECUTOR is not executor:
+        _EXECUTOR.shutdown()
+    _EXECUTOR = executor
+
+
+def shutdown_metric_executor() -> None:
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown()
+
+
+__all__ = [
+    "EXECUTOR_INLINE",
+    "EXECUTOR_PROCESS",
+    "EXECUTOR_THREAD",
+    "MetricExecutor",
+    "configure_metric_executor",
+    "get_metric_executor",
+    "shutdown_metric_executor",
+]
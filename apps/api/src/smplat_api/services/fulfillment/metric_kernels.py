@@ -0,0 +1,240 @@
+"""Pure aggregation kernels behind the fulfillment trust metrics.
+
+``FulfillmentMetricsService`` fetches rows on the event loop, packs them into
+compact columnar arrays (``array('d')`` timestamps/minutes plus ``array('i')``
+SKU indexes into a shared SKU list) and hands them to these functions through
+``MetricExecutor``. Everything here is module-level, synchronous and picklable
+so it can run in a worker process; keep database and settings imports out.
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+# (sku index, starts_at, ends_at, hourly capacity); datetimes are UTC-aware.
+ShiftRow = tuple[int, datetime, datetime, int]
+
+_FALLBACK_COPY = (
+    ("no_staffing_capacity", "Operators are restaffing pods – backlog forecast temporarily unavailable."),
+    ("limited_history", "Forecast calibrating from recent completions – showing guarantee copy."),
+    ("sla_breach_risk", "Projected clearance exceeds SLA guardrail – reinforcing backlog messaging."),
+    ("sla_watch", "Elevated backlog detected – concierge is monitoring delivery commitments."),
+    ("forecast_unavailable", "No recent completions available – displaying fallback assurance copy."),
+)
+
+
+def normalize_sku(slug: str | None, title: str | None) -> str:
+    if slug and slug.strip():
+        return slug.strip().lower()
+    if title and title.strip():
+        return title.strip().lower().replace(" ", "-")
+    return "unknown-sku"
+
+
+def percentile(values: Sequence[float], pct: float) -> float | None:
+    """Linearly interpolated percentile (``pct`` in 0-100)."""
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (pct / 100) * (len(ordered) - 1)
+    lower_index = int(rank)
+    upper_index = min(lower_index + 1, len(ordered) - 1)
+    lower_value = ordered[lower_index]
+    upper_value = ordered[upper_index]
+    fraction = rank - lower_index
+    return lower_value + (upper_value - lower_value) * fraction
+
+
+def backlog_summary(anchors: array, now_ts: float) -> dict[str, Any]:
+    """Summarise overdue minutes for backlog tasks anchored at epoch seconds ``anchors``."""
+
+    total_minutes = 0.0
+    overdue = 0
+    for anchor in anchors:
+        delta_minutes = (now_ts - anchor) / 60
+        if delta_minutes > 0:
+            total_minutes += delta_minutes
+            overdue += 1
+    return {
+        "overdue_task_count": overdue,
+        "total_backlog_minutes": total_minutes,
+        "average_backlog_minutes": (total_minutes / overdue) if overdue else None,
+    }
+
+
+def delivery_forecast(
+    now: datetime,
+    skus: Sequence[str],
+    backlog_sku: array,
+    duration_sku: array,
+    duration_minutes: array,
+    shifts: Sequence[ShiftRow],
+) -> dict[str, Any]:
+    """Project per-SKU clearance times from backlog counts, history and staffing shifts.
+
+    Returns ``value``, ``sample_size``, ``metadata`` and ``forecast`` for a
+    ``fulfillment_delivery_sla_forecast`` snapshot.
+    """
+
+    backlog_counts = [0] * len(skus)
+    for index in backlog_sku:
+        backlog_counts[index] += 1
+
+    durations_by_sku: list[list[float]] = [[] for _ in skus]
+    for index, minutes in zip(duration_sku, duration_minutes):
+        durations_by_sku[index].append(minutes)
+
+    shifts_by_sku: list[list[tuple[datetime, datetime, int]]] = [[] for _ in skus]
+    for index, starts, ends, hourly_capacity in shifts:
+        shifts_by_sku[index].append((starts, ends, hourly_capacity))
+
+    overall_durations = list(duration_minutes)
+    overall_percentiles = {
+        "p50": percentile(overall_durations, 50),
+        "p90": percentile(overall_durations, 90),
+    }
+
+    max_clear_minutes: float | None = None
+    sku_forecasts: list[dict[str, Any]] = []
+    sku_metadata: dict[str, Any] = {}
+
+    order = sorted(
+        (index for index in range(len(skus)) if backlog_counts[index] or durations_by_sku[index] or shifts_by_sku[index]),
+        key=lambda index: skus[index],
+    )
+    for index in order:
+        sku = skus[index]
+        backlog_count = backlog_counts[index]
+        durations = durations_by_sku[index]
+        average_minutes = sum(durations) / len(durations) if durations else None
+        percentile_bands = {
+            "p50": percentile(durations, 50),
+            "p90": percentile(durations, 90),
+        }
+
+        remaining = backlog_count
+        windows: list[dict[str, Any]] = []
+        clear_time: datetime | None = None
+        total_capacity = 0
+        total_shift_hours = 0.0
+
+        for starts, ends, hourly_capacity in sorted(shifts_by_sku[index]):
+            duration_hours = max((ends - starts).total_seconds() / 3600, 0.0)
+            capacity_tasks = int(round(hourly_capacity * duration_hours)) if hourly_capacity else 0
+            total_capacity += capacity_tasks
+            total_shift_hours += duration_hours
+
+            backlog_before = remaining
+            projected = min(remaining, capacity_tasks) if capacity_tasks > 0 else 0
+            backlog_after = max(0, backlog_before - projected)
+
+            if projected > 0 and clear_time is None and hourly_capacity:
+                if backlog_before == projected:
+                    clear_time = starts + timedelta(hours=backlog_before / hourly_capacity)
+
+            windows.append(
+                {
+                    "start": starts.isoformat(),
+                    "end": ends.isoformat(),
+                    "hourly_capacity": hourly_capacity,
+                    "capacity_tasks": capacity_tasks,
+                    "backlog_at_start": backlog_before,
+                    "projected_tasks_completed": projected,
+                    "backlog_after": backlog_after,
+                }
+            )
+            remaining = backlog_after
+
+        estimated_clear_minutes = None
+        if clear_time is not None:
+            estimated_clear_minutes = max((clear_time - now).total_seconds() / 60, 0)
+        elif backlog_count and total_capacity > 0 and average_minutes is not None:
+            # Approximate by distributing remaining work across aggregate capacity rate.
+            capacity_rate = total_capacity / max(total_shift_hours, 1e-6)
+            if capacity_rate > 0:
+                estimated_clear_minutes = (backlog_count / capacity_rate) * 60
+        elif backlog_count == 0:
+            estimated_clear_minutes = 0
+
+        if estimated_clear_minutes is not None:
+            max_clear_minutes = (
+                estimated_clear_minutes
+                if max_clear_minutes is None
+                else max(max_clear_minutes, estimated_clear_minutes)
+            )
+
+        unsupported_reason = None
+        if backlog_count and total_capacity == 0:
+            unsupported_reason = "no_staffing_capacity"
+        elif backlog_count and average_minutes is None:
+            unsupported_reason = "insufficient_history"
+
+        sku_metadata[sku] = {
+            "backlog_tasks": backlog_count,
+            "average_minutes": average_minutes,
+            "percentile_bands": percentile_bands,
+            "windows": windows,
+            "unsupported_reason": unsupported_reason,
+            "estimated_clear_minutes": estimated_clear_minutes,
+            "sample_size": len(durations),
+        }
+        sku_forecasts.append(
+            {
+                "sku": sku,
+                "backlog_tasks": backlog_count,
+                "completed_sample_size": len(durations),
+                "average_minutes": average_minutes,
+                "percentile_bands": percentile_bands,
+                "windows": windows,
+                "estimated_clear_minutes": estimated_clear_minutes,
+                "unsupported_reason": unsupported_reason,
+            }
+        )
+
+    value = max_clear_minutes
+    overall_alerts: list[str] = []
+    if value is None:
+        overall_alerts.append("forecast_unavailable")
+    elif value >= 240:
+        overall_alerts.append("sla_breach_risk")
+    elif value >= 120:
+        overall_alerts.append("sla_watch")
+
+    if len(overall_durations) < 5:
+        overall_alerts.append("limited_history")
+
+    unsupported_codes = [details.get("unsupported_reason") for details in sku_metadata.values()]
+    if unsupported_codes and all(code == "no_staffing_capacity" for code in unsupported_codes if code):
+        overall_alerts.append("no_staffing_capacity")
+    elif unsupported_codes and any(code for code in unsupported_codes):
+        overall_alerts.append("partial_support")
+
+    normalized_alerts = list(dict.fromkeys(code for code in overall_alerts if code))
+    fallback_copy = next((copy for code, copy in _FALLBACK_COPY if code in normalized_alerts), None)
+
+    return {
+        "value": value,
+        "sample_size": len(overall_durations),
+        "metadata": {
+            "source": "fulfillment",
+            "overall_percentile_bands": overall_percentiles,
+            "sku_breakdown": sku_metadata,
+            "observed_tasks": len(overall_durations),
+            "observed_window_days": 30,
+            "forecast_alerts": normalized_alerts,
+            "fallback_copy": fallback_copy,
+        },
+        "forecast": {
+            "generated_at": now.isoformat(),
+            "horizon_hours": 36,
+            "skus": sku_forecasts,
+        },
+    }
+
+
+__all__ = ["ShiftRow", "backlog_summary", "delivery_forecast", "normalize_sku", "percentile"]
@@ -1,16 +1,27 @@
-"""Fulfillment-derived metric computations for trust surfaces."""
+"""Fulfillment-derived metric computations for trust surfaces.
+
+Snapshots are cached in memory (``_CACHE``) and in ``FulfillmentMetricCache``.
+Recomputes are single-flight per metric id within the process, so concurrent
+requests for an expired metric share one computation and one persistent write.
+Within ``FULFILLMENT_METRIC_STALE_GRACE_MINUTES`` of expiry the old snapshot is
+served (``cache_layer="stale"``) while a background task refreshes it, and a
+snapshot older than ``FULFILLMENT_METRIC_REFRESH_AHEAD_RATIO`` of its TTL is
+refreshed in the background before it expires.
+"""
 
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable, Literal
 
 from loguru import logger
 from sqlalchemy import Select, case, delete, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from smplat_api.core.settings import settings
 
 from smplat_api.models.fulfillment import (
     FulfillmentStaffingShift,
@@ -21,16 +32,32 @@ from smplat_api.models.order import Order, OrderItem
 from smplat_api.models.metric_cache import FulfillmentMetricCache
 from smplat_api.models.product import Product
 
+from . import metric_kernels
+from .metric_executor import MetricExecutor, get_metric_executor
+
 # meta: caching-strategy: timed-memory
 _CACHE_LOCK = asyncio.Lock()
 _CACHE_TTL = timedelta(minutes=15)
 _CACHE: dict[str, "MetricSnapshot"] = {}
+# meta: caching-strategy: single-flight
+_INFLIGHT: dict[str, asyncio.Future] = {}
+_BACKGROUND_REFRESHES: dict[str, asyncio.Task] = {}
+
+Freshness = Literal["fresh", "refresh_ahead", "stale", "expired"]
 
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _epoch(value: datetime) -> float:
+    return _as_utc(value).timestamp()
+
+
 @dataclass(slots=True)
 class MetricSnapshot:
     """Raw metric output computed from fulfillment datasets."""
@@ -112,8 +139,21 @@ class FulfillmentMetricsService:
     # meta: trust-metric-catalog: fulfillment
     _definitions: dict[str, MetricDefinition]
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        executor: MetricExecutor | None = None,
+        session_factory: Callable[[], AsyncSession] | None = None,
+    ) -> None:
         self._session = session
+        # Metrics resolve concurrently, but an AsyncSession only runs one statement at a time.
+        self._session_lock = asyncio.Lock()
+        self._executor = executor or get_metric_executor()
+        # Background refreshes outlive the request session, so they open their own.
+        self._session_factory = session_factory or async_sessionmaker(
+            session.bind, expire_on_commit=False, class_=AsyncSession
+        )
         self._definitions = {
             "fulfillment_sla_on_time_pct": MetricDefinition(
                 metric_id="fulfillment_sla_on_time_pct",
@@ -156,58 +196,51 @@ class FulfillmentMetricsService:
     async def resolve_metrics(self, requests: list[MetricRequest]) -> list[ResolvedMetric]:
         """Resolve metrics with freshness metadata for downstream consumers."""
 
-        resolved: list[ResolvedMetric] = []
-
-        for request in requests:
-            definition = self._definitions.get(request.metric_id)
-            if not definition:
-                logger.warning("Unsupported metric requested", metric_id=request.metric_id)
-                provenance = MetricProvenance(
-                    source=None,
-                    cache_layer="none",
-                    cache_refreshed_at=None,
-                    cache_expires_at=None,
-                    cache_ttl_minutes=None,
-                    notes=["Metric not registered in fulfillment catalog."],
-                    unsupported_reason="metric_not_registered",
-                )
-                resolved.append(
-                    ResolvedMetric(
-                        metric_id=request.metric_id,
-                        value=None,
-                        formatted_value=None,
-                        computed_at=None,
-                        sample_size=0,
-                        freshness_window_minutes=request.freshness_window_minutes,
-                        verification_state="unsupported",
-                        metadata={"source": "unknown"},
-                        provenance=provenance,
-                        forecast=None,
-                    )
-                )
-                continue
-
-            snapshot, cache_metadata = await self._get_snapshot(definition)
-            freshness_window = request.freshness_window_minutes or definition.default_freshness_minutes
-            verification_state = self._derive_verification_state(snapshot, freshness_window)
-            provenance = self._build_provenance(definition, cache_metadata)
-
-            resolved.append(
-                ResolvedMetric(
-                    metric_id=snapshot.metric_id,
-                    value=snapshot.value,
-                    formatted_value=snapshot.formatted_value,
-                    computed_at=snapshot.computed_at,
-                    sample_size=snapshot.sample_size,
-                    freshness_window_minutes=freshness_window,
-                    verification_state=verification_state,
-                    metadata={"source": definition.source, **snapshot.metadata},
-                    provenance=provenance,
-                    forecast=snapshot.forecast,
-                )
+        return list(await asyncio.gather(*(self._resolve_metric(request) for request in requests)))
+
+    async def _resolve_metric(self, request: MetricRequest) -> ResolvedMetric:
+        definition = self._definitions.get(request.metric_id)
+        if not definition:
+            logger.warning("Unsupported metric requested", metric_id=request.metric_id)
+            provenance = MetricProvenance(
+                source=None,
+                cache_layer="none",
+                cache_refreshed_at=None,
+                cache_expires_at=None,
+                cache_ttl_minutes=None,
+                notes=["Metric not registered in fulfillment catalog."],
+                unsupported_reason="metric_not_registered",
+            )
+            return ResolvedMetric(
+                metric_id=request.metric_id,
+                value=None,
+                formatted_value=None,
+                computed_at=None,
+                sample_size=0,
+                freshness_window_minutes=request.freshness_window_minutes,
+                verification_state="unsupported",
+                metadata={"source": "unknown"},
+                provenance=provenance,
+                forecast=None,
             )
 
-        return resolved
+        snapshot, cache_metadata = await self._get_snapshot(definition)
+        freshness_window = request.freshness_window_minutes or definition.default_freshness_minutes
+        verification_state = self._derive_verification_state(snapshot, freshness_window)
+        provenance = self._build_provenance(definition, cache_metadata)
+
+        return ResolvedMetric(
+            metric_id=snapshot.metric_id,
+            value=snapshot.value,
+            formatted_value=snapshot.formatted_value,
+            computed_at=snapshot.computed_at,
+            sample_size=snapshot.sample_size,
+            freshness_window_minutes=freshness_window,
+            verification_state=verification_state,
+            metadata={"source": definition.source, **snapshot.metadata},
+            provenance=provenance,
+            forecast=snapshot.forecast,
+        )
 
     async def _get_snapshot(self, definition: MetricDefinition) -> tuple[MetricSnapshot, dict[str, Any]]:
         now = _utcnow()
@@ -221,31 +254,117 @@ class FulfillmentMetricsService:
                     metric_id=definition.metric_id,
                     cache_layer="memory",
                 )
-                return cached, self._build_cache_metadata("memory", cached, persistent_ttl)
+                return cached, self._serve_cached(definition, "memory", cached, persistent_ttl, now)
 
-        persistent = await self._load_persistent_snapshot(definition.metric_id, now)
+        persistent = await self._load_persistent_snapshot(definition.metric_id, now, persistent_ttl)
         if persistent:
+            async with _CACHE_LOCK:
+                _CACHE[definition.metric_id] = persistent
+            layer = "stale" if self._freshness(persistent, persistent_ttl, now) == "stale" else "persistent"
             logger.debug(
                 "Fulfillment metric hydrated from persistent cache",
                 metric_id=definition.metric_id,
-                cache_layer="persistent",
+                cache_layer=layer,
             )
-            async with _CACHE_LOCK:
-                _CACHE[definition.metric_id] = persistent
-            return persistent, self._build_cache_metadata("persistent", persistent, persistent_ttl)
+            return persistent, self._serve_cached(definition, layer, persistent, persistent_ttl, now)
 
-        snapshot = await definition.computer(self)
-        logger.debug(
-            "Fulfillment metric recomputed",
-            metric_id=definition.metric_id,
-            cache_layer="computed",
-        )
-        await self._store_persistent_snapshot(snapshot, persistent_ttl)
+        snapshot, shared = await self._recompute(definition)
+        cache_metadata = self._build_cache_metadata("computed", snapshot, persistent_ttl)
+        if shared:
+            cache_metadata["notes"] = [*cache_metadata["notes"], "Joined an in-flight recompute."]
+        return snapshot, cache_metadata
 
-        async with _CACHE_LOCK:
-            _CACHE[definition.metric_id] = snapshot
+    def _serve_cached(
+        self,
+        definition: MetricDefinition,
+        layer: str,
+        snapshot: MetricSnapshot,
+        ttl: timedelta,
+        now: datetime,
+    ) -> dict[str, Any]:
+        cache_metadata = self._build_cache_metadata(layer, snapshot, ttl)
+        if self._freshness(snapshot, ttl, now) == "refresh_ahead":
+            if self._schedule_refresh(definition):
+                cache_metadata["notes"] = [*cache_metadata["notes"], "Background refresh scheduled ahead of expiry."]
+        elif layer == "stale":
+            self._schedule_refresh(definition)
+        return cache_metadata
 
-        return snapshot, self._build_cache_metadata("computed", snapshot, persistent_ttl)
+    @staticmethod
+    def _freshness(snapshot: MetricSnapshot, ttl: timedelta, now: datetime) -> Freshness:
+        age = now - snapshot.computed_at
+        if age > ttl + timedelta(minutes=settings.fulfillment_metric_stale_grace_minutes):
+            return "expired"
+        if age > ttl:
+            return "stale"
+        if age > ttl * settings.fulfillment_metric_refresh_ahead_ratio:
+            return "refresh_ahead"
+        return "fresh"
+
+    async def _recompute(self, definition: MetricDefinition) -> tuple[MetricSnapshot, bool]:
+        """Recompute and persist ``definition`` once per process; return (snapshot, joined_existing)."""
+
+        metric_id = definition.metric_id
+        flight = _INFLIGHT.get(metric_id)
+        if flight is not None and not flight.done() and flight.get_loop() is asyncio.get_running_loop():
+            await asyncio.wait({flight})
+            if not flight.cancelled():
+                return flight.result(), True
+            # The leader failed or was cancelled; compute on our own session instead.
+
+        flight = asyncio.get_running_loop().create_future()
+        _INFLIGHT[metric_id] = flight
+        try:
+            snapshot = await definition.computer(self)
+            logger.debug(
+                "Fulfillment metric recomputed",
+                metric_id=metric_id,
+                cache_layer="computed",
+            )
+            await self._store_persistent_snapshot(snapshot, self._persistent_ttl(definition))
+            async with _CACHE_LOCK:
+                _CACHE[metric_id] = snapshot
+        except BaseException:
+            flight.cancel()
+            raise
+        else:
+            flight.set_result(snapshot)
+            return snapshot, False
+        finally:
+            if _INFLIGHT.get(metric_id) is flight:
+                del _INFLIGHT[metric_id]
+
+    def _schedule_refresh(self, definition: MetricDefinition) -> bool:
+        metric_id = definition.metric_id
+        existing = _BACKGROUND_REFRESHES.get(metric_id)
+        if (existing is not None and not existing.done()) or metric_id in _INFLIGHT:
+            return False
+        task = asyncio.create_task(self._background_refresh(definition))
+        _BACKGROUND_REFRESHES[metric_id] = task
+
+        def _forget(done: asyncio.Task) -> None:
+            if _BACKGROUND_REFRESHES.get(metric_id) is done:
+                del _BACKGROUND_REFRESHES[metric_id]
+
+        task.add_done_callback(_forget)
+        return True
+
+    async def _background_refresh(self, definition: MetricDefinition) -> None:
+        try:
+            async with self._session_factory() as session:
+                service = FulfillmentMetricsService(
+                    session,
+                    executor=self._executor,
+                    session_factory=self._session_factory,
+                )
+                await service._recompute(service._definitions[definition.metric_id])
+                await session.commit()
+        except Exception as exc:
+            logger.warning(
+                "Background fulfillment metric refresh failed",
+                metric_id=definition.metric_id,
+                error=str(exc),
+            )
 
     async def purge_cache(self, metric_id: str | None = None) -> list[str]:
         """Invalidate both memory and persistent caches for selected metrics."""
@@ -290,8 +409,11 @@ class FulfillmentMetricsService:
         minimum_minutes = max(minutes, int(_CACHE_TTL.total_seconds() // 60))
         return timedelta(minutes=minimum_minutes)
 
-    async def _load_persistent_snapshot(self, metric_id: str, now: datetime) -> MetricSnapshot | None:
-        record = await self._session.get(FulfillmentMetricCache, metric_id)
+    async def _load_persistent_snapshot(
+        self, metric_id: str, now: datetime, ttl: timedelta | None = None
+    ) -> MetricSnapshot | None:
+        async with self._session_lock:
+            record = await self._session.get(FulfillmentMetricCache, metric_id)
         if not record:
             return None
 
@@ -300,6 +422,9 @@ class FulfillmentMetricsService:
             expires_at = expires_at.replace(tzinfo=timezone.utc)
 
         if expires_at <= now:
+            snapshot = record.to_snapshot()
+            if ttl is not None and self._freshness(snapshot, ttl, now) == "stale":
+                return snapshot
             await self._evict_persistent_metric(metric_id)
             return None
 
@@ -307,26 +432,32 @@ class FulfillmentMetricsService:
 
     async def _store_persistent_snapshot(self, snapshot: MetricSnapshot, ttl: timedelta) -> None:
         expires_at = snapshot.computed_at + ttl
-        record = await self._session.get(FulfillmentMetricCache, snapshot.metric_id)
-
-        if record:
-            record.value = snapshot.value
-            record.formatted_value = snapshot.formatted_value
-            record.sample_size = snapshot.sample_size
-            record.computed_at = snapshot.computed_at
-            record.expires_at = expires_at
-            record.metadata_json = snapshot.metadata
-            record.forecast_json = snapshot.forecast
-        else:
-            self._session.add(FulfillmentMetricCache.from_snapshot(snapshot, expires_at))
+        async with self._session_lock:
+            record = await self._session.get(FulfillmentMetricCache, snapshot.metric_id)
+
+            if record:
+                record.value = snapshot.value
+                record.formatted_value = snapshot.formatted_value
+                record.sample_size = snapshot.sample_size
+                record.computed_at = snapshot.computed_at
+                record.expires_at = expires_at
+                record.metadata_json = snapshot.metadata
+                record.forecast_json = snapshot.forecast
+            else:
+                self._session.add(FulfillmentMetricCache.from_snapshot(snapshot, expires_at))
 
-        await self._session.flush()
+            await self._session.flush()
 
     async def _evict_persistent_metric(self, metric_id: str) -> None:
-        await self._session.execute(
-            delete(FulfillmentMetricCache).where(FulfillmentMetricCache.metric_id == metric_id)
-        )
-        await self._session.flush()
+        async with self._session_lock:
+            await self._session.execute(
+                delete(FulfillmentMetricCache).where(FulfillmentMetricCache.metric_id == metric_id)
+            )
+            await self._session.flush()
+
+    async def _execute(self, stmt: Select) -> Any:
+        async with self._session_lock:
+            return await self._session.execute(stmt)
 
     def _build_cache_metadata(
         self,
@@ -340,6 +471,7 @@ class FulfillmentMetricsService:
             "memory": ["Served from in-memory cache."],
             "persistent": ["Hydrated from persistent cache store."],
             "computed": ["Snapshot recomputed from fulfillment sources."],
+            "stale": ["Served expired snapshot while a background refresh runs."],
         }
         notes = notes_lookup.get(layer, [])
 
@@ -367,27 +499,11 @@ class FulfillmentMetricsService:
 
     @staticmethod
     def _normalize_sku(slug: str | None, title: str | None) -> str:
-        if slug and slug.strip():
-            return slug.strip().lower()
-        if title and title.strip():
-            sanitized = title.strip().lower().replace(" ", "-")
-            return sanitized
-        return "unknown-sku"
+        return metric_kernels.normalize_sku(slug, title)
 
     @staticmethod
     def _percentile(values: list[float], percentile: float) -> float | None:
-        if not values:
-            return None
-        ordered = sorted(values)
-        if len(ordered) == 1:
-            return ordered[0]
-        rank = (percentile / 100) * (len(ordered) - 1)
-        lower_index = int(rank)
-        upper_index = min(lower_index + 1, len(ordered) - 1)
-        lower_value = ordered[lower_index]
-        upper_value = ordered[upper_index]
-        fraction = rank - lower_index
-        return lower_value + (upper_value - lower_value) * fraction
+        return metric_kernels.percentile(values, percentile)
 
     @staticmethod
     def _derive_verification_state(snapshot: MetricSnapshot, freshness_window: int | None) -> str:
@@ -415,7 +531,7 @@ class FulfillmentMetricsService:
             .where(FulfillmentTask.scheduled_at.isnot(None))
         )
 
-        result = await self._session.execute(stmt)
+        result = await self._execute(stmt)
         total, on_time = result.one()
 
         total_int = int(total or 0)
@@ -443,7 +559,7 @@ class FulfillmentMetricsService:
             .where(FulfillmentTask.started_at.isnot(None))
         )
 
-        result = await self._session.execute(stmt)
+        result = await self._execute(stmt)
         rows = result.all()
 
         deltas: list[float] = []
@@ -484,24 +600,20 @@ class FulfillmentMetricsService:
             )
         )
 
-        result = await self._session.execute(stmt)
+        result = await self._execute(stmt)
         rows = result.all()
 
-        backlog_minutes: list[float] = []
+        anchors = array("d")
         for scheduled_at, created_at in rows:
             anchor = scheduled_at or created_at
-            if anchor is None:
-                continue
-            if anchor.tzinfo is None:
-                anchor = anchor.replace(tzinfo=timezone.utc)
-            delta_minutes = (now - anchor).total_seconds() / 60
-            if delta_minutes > 0:
-                backlog_minutes.append(delta_minutes)
+            if anchor is not None:
+                anchors.append(_epoch(anchor))
 
-        overdue_tasks = len(backlog_minutes)
+        summary = await self._executor.run(metric_kernels.backlog_summary, anchors, now.timestamp())
+        overdue_tasks = summary["overdue_task_count"]
         outstanding_tasks = len(rows)
-        total_minutes = sum(backlog_minutes)
-        average_minutes = (total_minutes / overdue_tasks) if overdue_tasks else None
+        total_minutes = summary["total_backlog_minutes"]
+        average_minutes = summary["average_backlog_minutes"]
 
         formatted = None
         value = None
@@ -559,8 +671,8 @@ class FulfillmentMetricsService:
             .where(FulfillmentTask.status == FulfillmentTaskStatusEnum.COMPLETED)
         )
 
-        scheduled_count = int((await self._session.execute(scheduled_stmt)).scalar_one() or 0)
-        completed_count = int((await self._session.execute(completed_stmt)).scalar_one() or 0)
+        scheduled_count = int((await self._execute(scheduled_stmt)).scalar_one() or 0)
+        completed_count = int((await self._execute(completed_stmt)).scalar_one() or 0)
 
         coverage = None
         formatted = None
@@ -596,7 +708,7 @@ class FulfillmentMetricsService:
             .where(FulfillmentTask.completed_at >= cutoff)
         )
 
-        result = await self._session.execute(stmt)
+        result = await self._execute(stmt)
         rows = result.all()
 
         scores: list[float] = []
@@ -647,17 +759,24 @@ class FulfillmentMetricsService:
             )
         )
 
-        backlog_rows = (await self._session.execute(backlog_stmt)).all()
+        backlog_rows = (await self._execute(backlog_stmt)).all()
 
-        backlog_by_sku: dict[str, list[datetime]] = defaultdict(list)
-        for slug, title, scheduled_at, created_at in backlog_rows:
+        # Rows are packed into columnar arrays keyed by an index into ``skus`` so
+        # the aggregation can be shipped to the metrics executor cheaply.
+        sku_index: dict[str, int] = {}
+
+        def _sku(slug: str | None, title: str | None) -> int:
             sku = self._normalize_sku(slug, title)
-            anchor = scheduled_at or created_at
-            if anchor is None:
+            index = sku_index.get(sku)
+            if index is None:
+                index = sku_index[sku] = len(sku_index)
+            return index
+
+        backlog_sku = array("i")
+        for slug, title, scheduled_at, created_at in backlog_rows:
+            if (scheduled_at or created_at) is None:
                 continue
-            if anchor.tzinfo is None:
-                anchor = anchor.replace(tzinfo=timezone.utc)
-            backlog_by_sku[sku].append(anchor)
+            backlog_sku.append(_sku(slug, title))
 
         duration_stmt: Select = (
             select(
@@ -675,27 +794,19 @@ class FulfillmentMetricsService:
             .where(FulfillmentTask.completed_at >= lookback)
         )
 
-        duration_rows = (await self._session.execute(duration_stmt)).all()
+        duration_rows = (await self._execute(duration_stmt)).all()
 
-        durations_by_sku: dict[str, list[float]] = defaultdict(list)
+        duration_sku = array("i")
+        duration_minutes = array("d")
         for slug, title, started_at, completed_at, scheduled_at in duration_rows:
-            if completed_at is None:
-                continue
-            if completed_at.tzinfo is None:
-                completed_at = completed_at.replace(tzinfo=timezone.utc)
-
             start = started_at or scheduled_at
-            if start is None:
+            if completed_at is None or start is None:
                 continue
-            if start.tzinfo is None:
-                start = start.replace(tzinfo=timezone.utc)
-
-            delta_minutes = (completed_at - start).total_seconds() / 60
+            delta_minutes = (_epoch(completed_at) - _epoch(start)) / 60
             if delta_minutes < 0:
                 continue
-
-            sku = self._normalize_sku(slug, title)
-            durations_by_sku[sku].append(delta_minutes)
+            duration_sku.append(_sku(slug, title))
+            duration_minutes.append(delta_minutes)
 
         shift_stmt: Select = (
             select(
@@ -708,125 +819,23 @@ class FulfillmentMetricsService:
             .where(FulfillmentStaffingShift.starts_at <= horizon)
         )
 
-        shift_rows = (await self._session.execute(shift_stmt)).all()
-        shifts_by_sku: dict[str, list[tuple[datetime, datetime, int]]] = defaultdict(list)
-        for sku, starts_at, ends_at, hourly_capacity in shift_rows:
-            normalized_sku = self._normalize_sku(sku, sku)
-            starts = starts_at
-            ends = ends_at
-            if starts.tzinfo is None:
-                starts = starts.replace(tzinfo=timezone.utc)
-            if ends.tzinfo is None:
-                ends = ends.replace(tzinfo=timezone.utc)
-            shifts_by_sku[normalized_sku].append((starts, ends, int(hourly_capacity or 0)))
-
-        all_skus = sorted({*backlog_by_sku.keys(), *durations_by_sku.keys(), *shifts_by_sku.keys()})
-
-        overall_durations = [value for values in durations_by_sku.values() for value in values]
-        overall_percentiles = {
-            "p50": self._percentile(overall_durations, 50),
-            "p90": self._percentile(overall_durations, 90),
-        }
-
-        max_clear_minutes: float | None = None
-        sku_forecasts: list[dict[str, Any]] = []
-        sku_metadata: dict[str, Any] = {}
-
-        for sku in all_skus:
-            backlog_entries = sorted(backlog_by_sku.get(sku, []))
-            backlog_count = len(backlog_entries)
-            durations = durations_by_sku.get(sku, [])
-            average_minutes = sum(durations) / len(durations) if durations else None
-            percentile_bands = {
-                "p50": self._percentile(durations, 50),
-                "p90": self._percentile(durations, 90),
-            }
-
-            sorted_shifts = sorted(shifts_by_sku.get(sku, []))
-            remaining = backlog_count
-            backlog_after = backlog_count
-            windows: list[dict[str, Any]] = []
-            clear_time: datetime | None = None
-            total_capacity = 0
-            total_shift_hours = 0.0
-
-            for starts, ends, hourly_capacity in sorted_shifts:
-                duration_hours = max((ends - starts).total_seconds() / 3600, 0.0)
-                capacity_tasks = int(round(hourly_capacity * duration_hours)) if hourly_capacity else 0
-                total_capacity += capacity_tasks
-                total_shift_hours += duration_hours
-
-                backlog_before = remaining
-                projected = min(remaining, capacity_tasks) if capacity_tasks > 0 else 0
-                backlog_after = max(0, backlog_before - projected)
-
-                if projected > 0 and clear_time is None and hourly_capacity:
-                    if backlog_before == projected:
-                        hours_needed = backlog_before / hourly_capacity
-                        clear_time = starts + timedelta(hours=hours_needed)
-
-                windows.append(
-                    {
-                        "start": starts.isoformat(),
-                        "end": ends.isoformat(),
-                        "hourly_capacity": hourly_capacity,
-                        "capacity_tasks": capacity_tasks,
-                        "backlog_at_start": backlog_before,
-                        "projected_tasks_completed": projected,
-                        "backlog_after": backlog_after,
-                    }
-                )
-
-                remaining = backlog_after
-
-            estimated_clear_minutes = None
-            if clear_time is not None:
-                estimated_clear_minutes = max((clear_time - now).total_seconds() / 60, 0)
-            elif backlog_count and total_capacity > 0 and average_minutes is not None:
-                # Approximate by distributing remaining work across aggregate capacity rate.
-                capacity_rate = total_capacity / max(total_shift_hours, 1e-6)
-                if capacity_rate > 0:
-                    estimated_clear_minutes = (backlog_count / capacity_rate) * 60
-            elif backlog_count == 0:
-                estimated_clear_minutes = 0
-
-            if estimated_clear_minutes is not None:
-                max_clear_minutes = (
-                    estimated_clear_minutes
-                    if max_clear_minutes is None
-                    else max(max_clear_minutes, estimated_clear_minutes)
-                )
+        shift_rows = (await self._execute(shift_stmt)).all()
+        shifts: list[metric_kernels.ShiftRow] = [
+            (_sku(sku, sku), _as_utc(starts_at), _as_utc(ends_at), int(hourly_capacity or 0))
+            for sku, starts_at, ends_at, hourly_capacity in shift_rows
+        ]
 
-            unsupported_reason = None
-            if backlog_count and total_capacity == 0:
-                unsupported_reason = "no_staffing_capacity"
-            elif backlog_count and average_minutes is None:
-                unsupported_reason = "insufficient_history"
-
-            sku_metadata[sku] = {
-                "backlog_tasks": backlog_count,
-                "average_minutes": average_minutes,
-                "percentile_bands": percentile_bands,
-                "windows": windows,
-                "unsupported_reason": unsupported_reason,
-                "estimated_clear_minutes": estimated_clear_minutes,
-                "sample_size": len(durations),
-            }
-
-            sku_forecasts.append(
-                {
-                    "sku": sku,
-                    "backlog_tasks": backlog_count,
-                    "completed_sample_size": len(durations),
-                    "average_minutes": average_minutes,
-                    "percentile_bands": percentile_bands,
-                    "windows": windows,
-                    "estimated_clear_minutes": estimated_clear_minutes,
-                    "unsupported_reason": unsupported_reason,
-                }
-            )
+        result = await self._executor.run(
+            metric_kernels.delivery_forecast,
+            now,
+            list(sku_index),
+            backlog_sku,
+            duration_sku,
+            duration_minutes,
+            shifts,
+        )
 
-        value = max_clear_minutes
+        value = result["value"]
         formatted = None
         if value is not None:
             if value >= 60:
@@ -834,63 +843,14 @@ class FulfillmentMetricsService:
             else:
                 formatted = f"{value:.0f}m"
 
-        overall_alerts: list[str] = []
-
-        if value is None:
-            overall_alerts.append("forecast_unavailable")
-        elif value >= 240:
-            overall_alerts.append("sla_breach_risk")
-        elif value >= 120:
-            overall_alerts.append("sla_watch")
-
-        if len(overall_durations) < 5:
-            overall_alerts.append("limited_history")
-
-        unsupported_codes = [
-            details.get("unsupported_reason")
-            for details in sku_metadata.values()
-            if isinstance(details, dict)
-        ]
-
-        if unsupported_codes and all(code == "no_staffing_capacity" for code in unsupported_codes if code):
-            overall_alerts.append("no_staffing_capacity")
-        elif unsupported_codes and any(code for code in unsupported_codes):
-            overall_alerts.append("partial_support")
-
-        normalized_alerts = list(dict.fromkeys(code for code in overall_alerts if code))
-
-        fallback_copy = None
-        if "no_staffing_capacity" in normalized_alerts:
-            fallback_copy = "Operators are restaffing pods – backlog forecast temporarily unavailable."
-        elif "limited_history" in normalized_alerts:
-            fallback_copy = "Forecast calibrating from recent completions – showing guarantee copy."
-        elif "sla_breach_risk" in normalized_alerts:
-            fallback_copy = "Projected clearance exceeds SLA guardrail – reinforcing backlog messaging."
-        elif "sla_watch" in normalized_alerts:
-            fallback_copy = "Elevated backlog detected – concierge is monitoring delivery commitments."
-        elif "forecast_unavailable" in normalized_alerts:
-            fallback_copy = "No recent completions available – displaying fallback assurance copy."
-
         snapshot = MetricSnapshot(
             metric_id="fulfillment_delivery_sla_forecast",
             value=value,
             formatted_value=formatted,
             computed_at=now,
-            sample_size=len(overall_durations),
-            metadata={
-                "source": "fulfillment",
-                "overall_percentile_bands": overall_percentiles,
-                "sku_breakdown": sku_metadata,
-                "observed_tasks": len(overall_durations),
-                "observed_window_days": 30,
-                "forecast_alerts": normalized_alerts,
-                "fallback_copy": fallback_copy,
-            },
-            forecast={
-                "generated_at": now.isoformat(),
-                "horizon_hours": 36,
-                "skus": sku_forecasts,
-            },
+            sample_size=result["sample_size"],
+            metadata=result["metadata"],
+            forecast=result["forecast"],
         )
 
         return snapshot
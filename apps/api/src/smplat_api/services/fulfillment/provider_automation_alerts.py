@@ -154,9 +154,18 @@ class ProviderAutomationAlertEvaluator:
         self._guardrail_warn_threshold = max(guardrail_warn_threshold, 1)
         self._replay_failure_threshold = max(replay_failure_threshold, 1)
 
-    def evaluate(self, snapshot: ProviderAutomationSnapshotResponse) -> list[ProviderAutomationAlert]:
+    def evaluate(
+        self,
+        snapshot: ProviderAutomationSnapshotResponse,
+        *,
+        provider_ids: Iterable[str] | None = None,
+    ) -> list[ProviderAutomationAlert]:
+        """Return alerts for breaching providers, limited to ``provider_ids`` when given."""
+        only = set(provider_ids) if provider_ids is not None else None
         alerts: list[ProviderAutomationAlert] = []
         for entry in snapshot.providers:
+            if only is not None and entry.id not in only:
+                continue
             telemetry = entry.telemetry
             guardrail_summary = telemetry.guardrails
             replays = telemetry.replays
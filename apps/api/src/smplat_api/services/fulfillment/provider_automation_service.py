@@ -1,26 +1,38 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any, Mapping, MutableMapping, Sequence
 from uuid import UUID, uuid4
 
 import httpx
-from sqlalchemy import select, cast, String, func
+from sqlalchemy import and_, or_, select, cast, String, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from loguru import logger
 
-from smplat_api.models.fulfillment import FulfillmentProviderOrder
+from smplat_api.core.settings import settings
+from smplat_api.models.fulfillment import FulfillmentProviderOrder, order_lookup_key
 from smplat_api.services.fulfillment.provider_catalog_service import ProviderCatalogService
 from smplat_api.services.fulfillment.provider_endpoints import (
+    EndpointInvocationResult,
     ProviderEndpointError,
     append_refill_entry,
     build_metadata_context,
+    endpoint_template_key,
     extract_balance_from_payload,
     extract_endpoint,
     invoke_provider_endpoint,
 )
+from smplat_api.services.fulfillment.http_clients import provider_http_limits
+from smplat_api.services.fulfillment.provider_limits import get_provider_guard
+from smplat_api.services.fulfillment.replay_schedule import replay_backlog
+from smplat_api.services.fulfillment.provider_snapshot_cache import (
+    get_cached_snapshot,
+    snapshot_version,
+    store_snapshot,
+)
 from smplat_api.schemas.fulfillment_provider import (
     ProviderAutomationSnapshotProviderEntry,
     ProviderAutomationSnapshotResponse,
@@ -28,6 +40,37 @@ from smplat_api.schemas.fulfillment_provider import (
 )
 
 
+@dataclass(frozen=True, slots=True)
+class _SnapshotOrderRow:
+    """Provider order columns and payload fields the automation telemetry reads."""
+
+    provider_id: str
+    service_id: str | None
+    amount: Decimal | None
+    payload: dict[str, Any]
+    id: UUID | None = None
+    created_at: datetime | None = None
+
+
+# Changes are re-read this far behind the watermark: ``updated_at`` is stamped at
+# statement time, so a transaction can commit after a later-stamped one was read.
+_TELEMETRY_WATERMARK_OVERLAP = timedelta(seconds=60)
+# Full rebuilds pick up deleted orders and anything older than the overlap.
+_TELEMETRY_FULL_REBUILD_INTERVAL = timedelta(hours=6)
+
+
+@dataclass
+class ProviderAutomationTelemetryState:
+    """Per-provider order windows carried between ``build_incremental_snapshot`` calls."""
+
+    limit_per_provider: int = 0
+    watermark: datetime | None = None
+    rebuilt_at: datetime | None = None
+    provider_names: dict[str, str] = field(default_factory=dict)
+    windows: dict[str, dict[Any, _SnapshotOrderRow]] = field(default_factory=dict)
+    telemetry: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
 class ProviderAutomationService:
     """Operational helpers for wallet snapshots and provider order actions."""
 
@@ -55,6 +98,9 @@ class ProviderAutomationService:
             context=context,
             http_client=self._http_client,
             default_timeout=endpoint.get("timeoutSeconds") or 8.0,
+            client_key=provider.id,
+            limits=provider_http_limits(provider.metadata_json),
+            template_key=endpoint_template_key(provider.id, "balance", provider.updated_at),
         )
         amount, currency = extract_balance_from_payload(invocation.payload, endpoint)
         await self._catalog.record_balance_snapshot(
@@ -85,7 +131,7 @@ class ProviderAutomationService:
             return []
         stmt = (
             select(FulfillmentProviderOrder)
-            .where(self._normalized_uuid_column(FulfillmentProviderOrder.order_id) == normalized_id)
+            .where(self._order_lookup_clause([normalized_id]))
             .order_by(FulfillmentProviderOrder.created_at.desc())
             .limit(limit)
         )
@@ -105,9 +151,7 @@ class ProviderAutomationService:
             return {}
         stmt = (
             select(FulfillmentProviderOrder)
-            .where(
-                self._normalized_uuid_column(FulfillmentProviderOrder.order_id).in_(normalized_pairs.keys())
-            )
+            .where(self._order_lookup_clause(list(normalized_pairs)))
             .order_by(FulfillmentProviderOrder.created_at.desc())
         )
         result = await self._session.execute(stmt)
@@ -180,11 +224,12 @@ class ProviderAutomationService:
             if isinstance(value, (str, int, float)):
                 context.setdefault(key, value)
 
-        invocation = await invoke_provider_endpoint(
+        invocation = await self._invoke_guarded(
+            provider,
             endpoint,
+            kind="refill",
             context=context,
-            http_client=self._http_client,
-            default_timeout=endpoint.get("timeoutSeconds") or 10.0,
+            service_id=provider_order.service_id,
         )
 
         entry = {
@@ -251,11 +296,12 @@ class ProviderAutomationService:
             if isinstance(value, (str, int, float)):
                 context.setdefault(key, value)
 
-        invocation = await invoke_provider_endpoint(
+        invocation = await self._invoke_guarded(
+            provider,
             endpoint,
+            kind="order",
             context=context,
-            http_client=self._http_client,
-            default_timeout=endpoint.get("timeoutSeconds") or 10.0,
+            service_id=provider_order.service_id,
         )
 
         rule_ids, rule_metadata = self._extract_rule_context(payload)
@@ -298,6 +344,38 @@ class ProviderAutomationService:
 
         return entry
 
+    async def _invoke_guarded(
+        self,
+        provider: Any,
+        endpoint: Mapping[str, Any],
+        *,
+        kind: str,
+        context: Mapping[str, Any],
+        service_id: str | None = None,
+    ) -> EndpointInvocationResult:
+        """Invoke a provider endpoint behind the provider/service rate limit and circuit breaker.
+
+        Raises ``ProviderThrottledError`` without calling the provider when the
+        call is held back.
+        """
+
+        health_status = getattr(provider.health_status, "value", provider.health_status)
+        async with get_provider_guard().guard(
+            provider.id,
+            service_id,
+            provider_rate_limit=provider.rate_limit_per_minute,
+            health_status=health_status,
+        ):
+            return await invoke_provider_endpoint(
+                endpoint,
+                context=context,
+                http_client=self._http_client,
+                default_timeout=endpoint.get("timeoutSeconds") or 10.0,
+                client_key=provider.id,
+                limits=provider_http_limits(provider.metadata_json),
+                template_key=endpoint_template_key(provider.id, kind, getattr(provider, "updated_at", None)),
+            )
+
     async def schedule_provider_order_replay(
         self,
         provider_order: FulfillmentProviderOrder,
@@ -335,12 +413,23 @@ class ProviderAutomationService:
         return entry
 
     async def build_snapshot(self, *, limit_per_provider: int = 25) -> ProviderAutomationSnapshotResponse:
+        """Summarize the latest ``limit_per_provider`` orders of every provider.
+
+        One windowed query serves all providers; the result is cached until a
+        provider or provider order write is committed (see ``provider_snapshot_cache``).
+        """
         providers = await self._catalog.list_providers()
+        cache_key = (limit_per_provider, tuple((provider.id, provider.name) for provider in providers))
+        cached = get_cached_snapshot(cache_key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        version = snapshot_version()
+        rows_by_provider = await self._load_snapshot_rows([provider.id for provider in providers], limit_per_provider)
         aggregated = self._create_empty_telemetry()
         provider_entries: list[ProviderAutomationSnapshotProviderEntry] = []
         for provider in providers:
-            orders = await self.list_provider_orders(provider.id, limit_per_provider)
-            telemetry_dict = self._summarize_orders(orders)
+            telemetry_dict = self._summarize_orders(rows_by_provider.get(provider.id, []))
             telemetry = ProviderAutomationTelemetry.model_validate(telemetry_dict)
             provider_entries.append(
                 ProviderAutomationSnapshotProviderEntry(
@@ -351,30 +440,175 @@ class ProviderAutomationService:
             )
             self._merge_telemetry(aggregated, telemetry_dict)
         aggregated_model = ProviderAutomationTelemetry.model_validate(aggregated)
-        return ProviderAutomationSnapshotResponse(aggregated=aggregated_model, providers=provider_entries)
+        snapshot = ProviderAutomationSnapshotResponse(aggregated=aggregated_model, providers=provider_entries)
+        store_snapshot(cache_key, version, snapshot.model_copy(deep=True))
+        return snapshot
 
-    async def calculate_replay_backlog_metrics(self) -> dict[str, Any]:
-        stmt = select(FulfillmentProviderOrder.payload).where(FulfillmentProviderOrder.payload.isnot(None))
+    async def _load_snapshot_rows(
+        self,
+        provider_ids: Sequence[str],
+        limit_per_provider: int,
+    ) -> dict[str, list[_SnapshotOrderRow]]:
+        if not provider_ids or limit_per_provider <= 0:
+            return {}
+        ranked = (
+            select(
+                *self._snapshot_columns(),
+                func.row_number()
+                .over(
+                    partition_by=FulfillmentProviderOrder.provider_id,
+                    order_by=FulfillmentProviderOrder.created_at.desc(),
+                )
+                .label("position"),
+            )
+            .where(FulfillmentProviderOrder.provider_id.in_(list(provider_ids)))
+            .subquery()
+        )
+        stmt = (
+            select(ranked)
+            .where(ranked.c.position <= limit_per_provider)
+            .order_by(ranked.c.provider_id, ranked.c.position)
+        )
         result = await self._session.execute(stmt)
-        total = 0
-        next_eta: datetime | None = None
-        for payload in result.scalars():
-            if not isinstance(payload, dict):
-                continue
-            schedule = payload.get("scheduledReplays")
-            if not isinstance(schedule, list):
-                continue
-            for entry in schedule:
-                if not isinstance(entry, dict):
-                    continue
-                if entry.get("status", "scheduled") != "scheduled":
-                    continue
-                total += 1
-                candidate = self._parse_iso_timestamp(entry.get("scheduledFor"))
-                if candidate is None:
-                    continue
-                if next_eta is None or candidate < next_eta:
-                    next_eta = candidate
+        grouped: dict[str, list[_SnapshotOrderRow]] = {}
+        for row in result:
+            grouped.setdefault(row.provider_id, []).append(self._snapshot_row(row))
+        return grouped
+
+    @staticmethod
+    def _snapshot_columns() -> tuple[Any, ...]:
+        payload = FulfillmentProviderOrder.payload
+        return (
+            FulfillmentProviderOrder.id,
+            FulfillmentProviderOrder.created_at,
+            FulfillmentProviderOrder.provider_id,
+            FulfillmentProviderOrder.service_id,
+            FulfillmentProviderOrder.amount,
+            payload["replays"].label("replays"),
+            payload["scheduledReplays"].label("scheduled_replays"),
+            payload["guardrails"].label("guardrails"),
+            payload[("service", "metadata", "guardrails")].label("service_guardrails"),
+            payload["providerCostAmount"].label("provider_cost_amount"),
+            payload["serviceRules"].label("service_rules"),
+        )
+
+    @staticmethod
+    def _snapshot_row(row: Any) -> _SnapshotOrderRow:
+        snapshot_payload: dict[str, Any] = {
+            "replays": row.replays,
+            "scheduledReplays": row.scheduled_replays,
+            "guardrails": row.guardrails,
+            "providerCostAmount": row.provider_cost_amount,
+            "serviceRules": row.service_rules,
+        }
+        if row.service_guardrails is not None:
+            snapshot_payload["service"] = {"metadata": {"guardrails": row.service_guardrails}}
+        return _SnapshotOrderRow(
+            provider_id=row.provider_id,
+            service_id=row.service_id,
+            amount=row.amount,
+            payload=snapshot_payload,
+            id=row.id,
+            created_at=row.created_at,
+        )
+
+    async def build_incremental_snapshot(
+        self,
+        state: ProviderAutomationTelemetryState,
+        *,
+        limit_per_provider: int = 25,
+    ) -> tuple[ProviderAutomationSnapshotResponse, set[str]]:
+        """Bring ``state`` up to date and return the snapshot plus the providers whose telemetry moved.
+
+        Only provider orders updated since the previous call are read; they replace or
+        join the per-provider window of the latest ``limit_per_provider`` orders. The
+        state is rebuilt from scratch on the first call, when the provider list or limit
+        changes, and every few hours.
+        """
+        providers = await self._catalog.list_providers()
+        provider_names = {provider.id: provider.name for provider in providers}
+        now = datetime.now(timezone.utc)
+        changed: set[str] = set()
+        if (
+            state.watermark is None
+            or state.rebuilt_at is None
+            or state.limit_per_provider != limit_per_provider
+            or set(provider_names) != set(state.provider_names)
+            or now - state.rebuilt_at >= _TELEMETRY_FULL_REBUILD_INTERVAL
+        ):
+            rows_by_provider = await self._load_snapshot_rows(list(provider_names), limit_per_provider)
+            state.windows = {
+                provider_id: {row.id: row for row in rows_by_provider.get(provider_id, [])}
+                for provider_id in provider_names
+            }
+            state.limit_per_provider = limit_per_provider
+            state.rebuilt_at = now
+            state.telemetry = {}
+            changed = set(provider_names)
+        else:
+            stmt = select(*self._snapshot_columns()).where(
+                FulfillmentProviderOrder.updated_at > state.watermark - _TELEMETRY_WATERMARK_OVERLAP,
+                FulfillmentProviderOrder.provider_id.in_(list(provider_names)),
+            )
+            for raw in await self._session.execute(stmt):
+                row = self._snapshot_row(raw)
+                if self._apply_to_window(state.windows.setdefault(row.provider_id, {}), row, limit_per_provider):
+                    changed.add(row.provider_id)
+            changed.update(
+                provider_id
+                for provider_id, name in provider_names.items()
+                if state.provider_names.get(provider_id) != name
+            )
+        state.watermark = now
+        state.provider_names = provider_names
+
+        for provider_id in changed:
+            window = sorted(
+                state.windows.get(provider_id, {}).values(),
+                key=lambda row: row.created_at or datetime.min,
+                reverse=True,
+            )
+            state.telemetry[provider_id] = self._summarize_orders(window)
+
+        aggregated = self._create_empty_telemetry()
+        provider_entries: list[ProviderAutomationSnapshotProviderEntry] = []
+        for provider in providers:
+            telemetry_dict = state.telemetry.get(provider.id) or self._create_empty_telemetry()
+            provider_entries.append(
+                ProviderAutomationSnapshotProviderEntry(
+                    id=provider.id,
+                    name=provider.name,
+                    telemetry=ProviderAutomationTelemetry.model_validate(telemetry_dict),
+                )
+            )
+            self._merge_telemetry(aggregated, telemetry_dict)
+        snapshot = ProviderAutomationSnapshotResponse(
+            aggregated=ProviderAutomationTelemetry.model_validate(aggregated),
+            providers=provider_entries,
+        )
+        return snapshot, changed
+
+    @staticmethod
+    def _apply_to_window(window: dict[Any, _SnapshotOrderRow], row: _SnapshotOrderRow, limit: int) -> bool:
+        """Merge ``row`` into a provider's latest-orders window; return True when it changed."""
+        existing = window.get(row.id)
+        if existing is not None:
+            if existing == row:
+                return False
+            window[row.id] = row
+            return True
+        if limit <= 0:
+            return False
+        if len(window) >= limit:
+            oldest = min(window.values(), key=lambda item: item.created_at or datetime.min)
+            if (row.created_at or datetime.min) <= (oldest.created_at or datetime.min):
+                return False
+            del window[oldest.id]
+        window[row.id] = row
+        return True
+
+    async def calculate_replay_backlog_metrics(self) -> dict[str, Any]:
+        total, next_eta = await replay_backlog(self._session)
         return {
             "scheduledBacklog": total,
             "nextScheduledAt": next_eta.isoformat() if next_eta else None,
@@ -519,7 +753,7 @@ class ProviderAutomationService:
             "ruleOverridesByService": {},
         }
 
-    def _summarize_orders(self, orders: Sequence[FulfillmentProviderOrder]) -> dict[str, Any]:
+    def _summarize_orders(self, orders: Sequence[FulfillmentProviderOrder | _SnapshotOrderRow]) -> dict[str, Any]:
         summary = self._create_empty_telemetry()
         summary["totalOrders"] = len(orders)
         for order in orders:
@@ -714,35 +948,33 @@ class ProviderAutomationService:
         if status in ("pass", "warn", "fail"):
             summary[status] += 1
 
-    @staticmethod
-    def _parse_iso_timestamp(value: Any) -> datetime | None:
-        if not isinstance(value, str):
-            return None
-        text = value.strip()
-        if not text:
-            return None
-        normalized = text.replace("Z", "+00:00")
-        try:
-            return datetime.fromisoformat(normalized)
-        except ValueError:
-            return None
-
     @staticmethod
     def _normalize_uuid_value(value: Any) -> str | None:
-        if value is None:
-            return None
-        if isinstance(value, UUID):
-            return value.hex
-        if isinstance(value, str):
-            text = value.strip()
-            if not text:
-                return None
-            return text.replace("-", "").lower()
-        return str(value).replace("-", "").lower()
+        return order_lookup_key(value)
 
     @staticmethod
     def _normalized_uuid_column(column: Any) -> Any:
         return func.replace(func.lower(cast(column, String)), "-", "")
 
+    @classmethod
+    def _order_lookup_clause(cls, normalized_ids: Sequence[str]) -> Any:
+        """Match provider orders by the indexed ``order_lookup_key``.
+
+        While ``provider_order_lookup_dual_read`` is on, rows the backfill has not
+        reached yet (NULL key) are still matched on the normalized ``order_id``.
+        """
+        key_column = FulfillmentProviderOrder.order_lookup_key
+        if len(normalized_ids) == 1:
+            clause = key_column == normalized_ids[0]
+        else:
+            clause = key_column.in_(normalized_ids)
+        if not settings.provider_order_lookup_dual_read:
+            return clause
+        legacy = and_(
+            key_column.is_(None),
+            cls._normalized_uuid_column(FulfillmentProviderOrder.order_id).in_(normalized_ids),
+        )
+        return or_(clause, legacy)
+
 
-__all__ = ["ProviderAutomationService"]
+__all__ = ["ProviderAutomationService", "ProviderAutomationTelemetryState"]
@@ -0,0 +1,464 @@
+"""Push-based provider order status updates.
+
+Providers configured with ``metadata["automation"]["callbacks"]`` and a
+``credentials["callbackSecret"]`` POST status callbacks to
+``/fulfillment/providers/{provider_id}/callbacks``. The endpoint only verifies the
+HMAC signature and appends the events to ``fulfillment_provider_callbacks`` with
+one multi-row insert; redeliveries collapse on ``(provider_id, event_id)``.
+
+``ProviderCallbackWorker`` leases pending rows oldest first and hands them to
+``apply_callbacks``, which loads every referenced provider order with one query,
+folds the callbacks into the order payloads, writes one timeline event per order
+whose status moved and commits the whole batch at once.
+
+Callback config keys (all optional): ``eventsPath`` (list of events in the body;
+defaults to ``events``, a top-level list or the body itself), ``eventIdPath``,
+``orderIdPath`` and ``statusPath``. Events without an id are deduplicated on a
+hash of their content.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Mapping, Sequence
+from uuid import uuid4
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import flag_modified
+
+from smplat_api.core.work_signals import PROVIDER_CALLBACKS, notify_work
+from smplat_api.models.fulfillment import FulfillmentProviderCallback, FulfillmentProviderOrder
+from smplat_api.services.orders.state_machine import (
+    OrderEventDraft,
+    OrderStateActorTypeEnum,
+    OrderStateEventTypeEnum,
+    OrderStateMachine,
+)
+
+from .provider_endpoints import extract_path
+
+SIGNATURE_HEADER = "X-Provider-Signature"
+CALLBACK_OUTCOME_APPLIED = "applied"
+CALLBACK_OUTCOME_UNMATCHED = "unmatched"
+
+_DEFAULT_EVENT_ID_KEYS = ("eventId", "event_id", "id")
+_DEFAULT_ORDER_ID_KEYS = ("providerOrderId", "orderId", "order_id", "order")
+_DEFAULT_STATUS_KEYS = ("status", "state")
+_CALLBACK_HISTORY_LIMIT = 20
+
+
+@dataclass(slots=True)
+class ProviderCallbackEvent:
+    """Normalized callback ready to be appended to the ingest table."""
+
+    event_id: str
+    provider_reference: str
+    status: str | None
+    payload: Mapping[str, Any]
+
+
+@dataclass(slots=True)
+class ProviderCallbackBatchResult:
+    """Outcome of ``apply_callbacks`` for one claimed batch."""
+
+    applied: int = 0
+    unmatched: int = 0
+    deferred: int = 0
+    orders_updated: int = 0
+    timeline: list[OrderEventDraft] = field(default_factory=list)
+
+    def as_summary(self) -> dict[str, int]:
+        return {
+            "applied": self.applied,
+            "unmatched": self.unmatched,
+            "deferred": self.deferred,
+            "ordersUpdated": self.orders_updated,
+            "timelineEvents": len(self.timeline),
+        }
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return _as_utc(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def callback_config(metadata: Mapping[str, Any] | None) -> Mapping[str, Any] | None:
+    """Return the provider's callback configuration, or ``None`` when push is not enabled."""
+
+    if not isinstance(metadata, Mapping):
+        return None
+    automation = metadata.get("automation")
+    if not isinstance(automation, Mapping):
+        return None
+    config = automation.get("callbacks")
+    if not isinstance(config, Mapping) or config.get("enabled") is False:
+        return None
+    return config
+
+
+def callback_secret(credentials: Mapping[str, Any] | None) -> str | None:
+    if not isinstance(credentials, Mapping):
+        return None
+    secret = credentials.get("callbackSecret")
+    return secret if isinstance(secret, str) and secret else None
+
+
+def verify_callback_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Check a hex HMAC-SHA256 of the raw body, optionally prefixed with ``sha256=``."""
+
+    if not signature:
+        return False
+    candidate = signature.strip()
+    if candidate.lower().startswith("sha256="):
+        candidate = candidate[len("sha256="):]
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, candidate.lower())
+
+
+def _lookup(event: Mapping[str, Any], config: Mapping[str, Any], path_key: str, defaults: Sequence[str]) -> Any:
+    path = config.get(path_key)
+    if isinstance(path, str) and path:
+        return extract_path(event, path)
+    for key in defaults:
+        value = event.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _scalar(value: Any) -> str | None:
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def parse_callback_events(body: Any, config: Mapping[str, Any]) -> list[ProviderCallbackEvent]:
+    """Normalize a callback body into events; entries without an order reference are dropped."""
+
+    events_path = config.get("eventsPath")
+    if isinstance(events_path, str) and events_path and isinstance(body, Mapping):
+        raw_events = extract_path(body, events_path)
+    elif isinstance(body, list):
+        raw_events = body
+    elif isinstance(body, Mapping) and isinstance(body.get("events"), list):
+        raw_events = body["events"]
+    else:
+        raw_events = [body]
+    if not isinstance(raw_events, list):
+        return []
+
+    events: dict[str, ProviderCallbackEvent] = {}
+    for raw in raw_events:
+        if not isinstance(raw, Mapping):
+            continue
+        reference = _scalar(_lookup(raw, config, "orderIdPath", _DEFAULT_ORDER_ID_KEYS))
+        if reference is None:
+            continue
+        event_id = _scalar(_lookup(raw, config, "eventIdPath", _DEFAULT_EVENT_ID_KEYS))
+        if event_id is None or event_id == reference:
+            digest = hashlib.sha256(json.dumps(raw, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            event_id = f"sha256:{digest}"
+        events[event_id[:128]] = ProviderCallbackEvent(
+            event_id=event_id[:128],
+            provider_reference=reference[:128],
+            status=_scalar(_lookup(raw, config, "statusPath", _DEFAULT_STATUS_KEYS)),
+            payload=dict(raw),
+        )
+    return list(events.values())
+
+
+async def ingest_callbacks(
+    session: AsyncSession,
+    provider_id: str,
+    events: Sequence[ProviderCallbackEvent],
+    *,
+    received_at: datetime,
+) -> int:
+    """Append ``events`` in one statement, skip already-seen ids and commit.
+
+    Returns the number of new rows; the callback worker is woken when there are any.
+    """
+
+    if not events:
+        return 0
+    stmt = insert(FulfillmentProviderCallback).values(
+        [
+            {
+                "id": uuid4(),
+                "provider_id": provider_id,
+                "event_id": event.event_id,
+                "provider_reference": event.provider_reference,
+                "status": event.status[:64] if event.status else None,
+                "payload": dict(event.payload),
+                "received_at": received_at,
+                "attempts": 0,
+            }
+            for event in events
+        ]
+    )
+    stmt = stmt.on_conflict_do_nothing(
+        index_elements=[FulfillmentProviderCallback.provider_id, FulfillmentProviderCallback.event_id]
+    )
+    result = await session.execute(stmt)
+    await session.commit()
+    inserted = max(result.rowcount or 0, 0)
+    if inserted:
+        notify_work(PROVIDER_CALLBACKS)
+    return inserted
+
+
+async def claim_pending_callbacks(
+    session: AsyncSession,
+    worker_id: str,
+    *,
+    now: datetime,
+    limit: int,
+    lease_seconds: int,
+) -> list[FulfillmentProviderCallback]:
+    """Lease up to ``limit`` pending callbacks to ``worker_id`` and commit the claim.
+
+    Same contract as ``claim_due_replays``: expired leases are claimable again and
+    claimed rows come back in arrival order.
+    """
+
+    now = _as_utc(now) or datetime.now(timezone.utc)
+    claimable = and_(
+        FulfillmentProviderCallback.applied_at.is_(None),
+        or_(
+            FulfillmentProviderCallback.lease_expires_at.is_(None),
+            FulfillmentProviderCallback.lease_expires_at <= now,
+        ),
+    )
+    candidate_stmt = (
+        select(FulfillmentProviderCallback.id)
+        .where(claimable)
+        .order_by(FulfillmentProviderCallback.received_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    candidate_ids = list((await session.execute(candidate_stmt)).scalars().all())
+    if not candidate_ids:
+        await session.commit()
+        return []
+
+    await session.execute(
+        update(FulfillmentProviderCallback)
+        .where(FulfillmentProviderCallback.id.in_(candidate_ids), claimable)
+        .values(
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=FulfillmentProviderCallback.attempts + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    claimed_stmt = (
+        select(FulfillmentProviderCallback)
+        .where(
+            FulfillmentProviderCallback.id.in_(candidate_ids),
+            FulfillmentProviderCallback.lease_owner == worker_id,
+            FulfillmentProviderCallback.applied_at.is_(None),
+        )
+        .order_by(FulfillmentProviderCallback.received_at, FulfillmentProviderCallback.id)
+        .execution_options(populate_existing=True)
+    )
+    claimed = list((await session.execute(claimed_stmt)).scalars().all())
+    await session.commit()
+    return claimed
+
+
+async def _load_referenced_orders(
+    session: AsyncSession,
+    callbacks: Iterable[FulfillmentProviderCallback],
+) -> dict[tuple[str, str], list[FulfillmentProviderOrder]]:
+    provider_ids = {callback.provider_id for callback in callbacks}
+    references = {callback.provider_reference for callback in callbacks}
+    if not references:
+        return {}
+    # The payloads are rewritten whole, so lock the rows (in id order, to avoid
+    # deadlocks) until the batch commits.
+    stmt = (
+        select(FulfillmentProviderOrder)
+        .where(
+            FulfillmentProviderOrder.provider_id.in_(provider_ids),
+            FulfillmentProviderOrder.provider_reference.in_(references),
+        )
+        .order_by(FulfillmentProviderOrder.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    orders: dict[tuple[str, str], list[FulfillmentProviderOrder]] = {}
+    for order in (await session.execute(stmt)).scalars():
+        orders.setdefault((order.provider_id, order.provider_reference), []).append(order)
+    return orders
+
+
+def _fold_callback(payload: dict[str, Any], callback: FulfillmentProviderCallback) -> None:
+    received_at = _as_utc(callback.received_at)
+    received_iso = received_at.isoformat() if received_at else None
+    updated_at = _parse_timestamp(payload.get("providerStatusUpdatedAt"))
+    # A callback retried after a newer one was applied only joins the history.
+    if received_at is None or updated_at is None or received_at >= updated_at:
+        if callback.status:
+            payload["providerStatus"] = callback.status
+        payload["providerStatusUpdatedAt"] = received_iso
+        payload["providerCallback"] = callback.payload
+    history = payload.get("providerCallbacks")
+    history = list(history) if isinstance(history, list) else []
+    history.append({"eventId": callback.event_id, "status": callback.status, "receivedAt": received_iso})
+    payload["providerCallbacks"] = history[-_CALLBACK_HISTORY_LIMIT:]
+
+
+async def apply_callbacks(
+    session: AsyncSession,
+    callbacks: Sequence[FulfillmentProviderCallback],
+    *,
+    now: datetime,
+    unmatched_retry_seconds: int,
+    unmatched_grace_seconds: int,
+) -> ProviderCallbackBatchResult:
+    """Fold a claimed batch into provider orders and commit it as one transaction.
+
+    Callbacks are applied in arrival order, so the newest status wins; one older
+    than the status already stored is only recorded in the callback history.
+    Callbacks whose provider order is not visible yet keep their lease for
+    ``unmatched_retry_seconds`` and are retried until ``unmatched_grace_seconds``
+    after arrival, then settle as ``unmatched``.
+    """
+
+    now = _as_utc(now) or datetime.now(timezone.utc)
+    result = ProviderCallbackBatchResult()
+    if not callbacks:
+        return result
+
+    orders_by_reference = await _load_referenced_orders(session, callbacks)
+    applied_ids: list[Any] = []
+    unmatched_ids: list[Any] = []
+    deferred_ids: list[Any] = []
+    touched: dict[Any, tuple[FulfillmentProviderOrder, dict[str, Any], str | None, list[str]]] = {}
+    grace = timedelta(seconds=unmatched_grace_seconds)
+
+    for callback in callbacks:
+        orders = orders_by_reference.get((callback.provider_id, callback.provider_reference))
+        if not orders:
+            received_at = _as_utc(callback.received_at) or now
+            if now - received_at >= grace:
+                unmatched_ids.append(callback.id)
+            else:
+                deferred_ids.append(callback.id)
+            continue
+        applied_ids.append(callback.id)
+        for order in orders:
+            entry = touched.get(order.id)
+            if entry is None:
+                payload = dict(order.payload) if isinstance(order.payload, Mapping) else {}
+                entry = (order, payload, payload.get("providerStatus"), [])
+                touched[order.id] = entry
+            _fold_callback(entry[1], callback)
+            entry[3].append(callback.event_id)
+
+    for order, payload, previous_status, event_ids in touched.values():
+        order.payload = payload
+        flag_modified(order, "payload")
+        status = payload.get("providerStatus")
+        if status != previous_status and order.order_id:
+            result.timeline.append(
+                OrderEventDraft(
+                    order_id=order.order_id,
+                    event_type=OrderStateEventTypeEnum.NOTE,
+                    actor_type=OrderStateActorTypeEnum.PROVIDER,
+                    actor_id=order.provider_id,
+                    actor_label=order.provider_name,
+                    notes=f"Provider reported status {status}",
+                    metadata={
+                        "source": "provider_callback",
+                        "providerOrderId": str(order.id),
+                        "providerReference": order.provider_reference,
+                        "previousStatus": previous_status,
+                        "status": status,
+                        "eventIds": event_ids,
+                    },
+                )
+            )
+
+    if applied_ids:
+        await session.execute(
+            update(FulfillmentProviderCallback)
+            .where(FulfillmentProviderCallback.id.in_(applied_ids))
+            .values(outcome=CALLBACK_OUTCOME_APPLIED, applied_at=now, lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+    if unmatched_ids:
+        await session.execute(
+            update(FulfillmentProviderCallback)
+            .where(FulfillmentProviderCallback.id.in_(unmatched_ids))
+            .values(outcome=CALLBACK_OUTCOME_UNMATCHED, applied_at=now, lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+    if deferred_ids:
+        await session.execute(
+            update(FulfillmentProviderCallback)
+            .where(FulfillmentProviderCallback.id.in_(deferred_ids))
+            .values(lease_expires_at=now + timedelta(seconds=unmatched_retry_seconds))
+            .execution_options(synchronize_session=False)
+        )
+
+    if result.timeline:
+        # record_events commits the order updates, callback settlement and timeline together.
+        await OrderStateMachine(session).record_events(result.timeline)
+    else:
+        await session.commit()
+
+    result.applied = len(applied_ids)
+    result.unmatched = len(unmatched_ids)
+    result.deferred = len(deferred_ids)
+    result.orders_updated = len(touched)
+    return result
+
+
+async def prune_callbacks(session: AsyncSession, *, older_than: datetime) -> int:
+    """Delete settled callbacks older than ``older_than``; their ids stop deduplicating."""
+
+    result = await session.execute(
+        delete(FulfillmentProviderCallback).where(
+            FulfillmentProviderCallback.applied_at.isnot(None),
+            FulfillmentProviderCallback.applied_at < older_than,
+        )
+    )
+    await session.commit()
+    return max(result.rowcount or 0, 0)
+
+
+__all__ = [
+    "CALLBACK_OUTCOME_APPLIED",
+    "CALLBACK_OUTCOME_UNMATCHED",
+    "ProviderCallbackBatchResult",
+    "ProviderCallbackEvent",
+    "SIGNATURE_HEADER",
+    "apply_callbacks",
+    "callback_config",
+    "callback_secret",
+    "claim_pending_callbacks",
+    "ingest_callbacks",
+    "parse_callback_events",
+    "prune_callbacks",
+    "verify_callback_signature",
+]
@@ -79,7 +79,7 @@ class ProviderCatalogService:
         )
         self._session.add(provider)
         await self._session.commit()
-        await provider_registry.refresh_catalog(self._session, force=True)
+        await provider_registry.refresh_catalog(self._session)
         return provider
 
     async def update_provider(
@@ -123,13 +123,13 @@ class ProviderCatalogService:
 
         await self._session.commit()
         await self._session.refresh(provider)
-        await provider_registry.refresh_catalog(self._session, force=True)
+        await provider_registry.refresh_catalog(self._session)
         return provider
 
     async def delete_provider(self, provider: FulfillmentProvider) -> None:
         await self._session.delete(provider)
         await self._session.commit()
-        await provider_registry.refresh_catalog(self._session, force=True)
+        await provider_registry.refresh_catalog(self._session)
 
     async def create_service(
         self,
@@ -161,7 +161,7 @@ class ProviderCatalogService:
         )
         self._session.add(service)
         await self._session.commit()
-        await provider_registry.refresh_catalog(self._session, force=True)
+        await provider_registry.refresh_catalog(self._session)
         return service
 
     async def record_health_snapshot(
@@ -173,6 +173,38 @@ class ProviderCatalogService:
         service_statuses: Mapping[str, tuple[FulfillmentProviderHealthStatusEnum, Mapping[str, Any]]] | None,
         checked_at: datetime,
         refresh_registry: bool = True,
+    ) -> None:
+        self._apply_health_snapshot(provider, provider_status, provider_payload, service_statuses, checked_at)
+        await self._session.commit()
+        if refresh_registry:
+            await provider_registry.refresh_catalog(self._session)
+
+    async def record_health_snapshots(
+        self,
+        snapshots: Sequence[
+            tuple[
+                FulfillmentProvider,
+                FulfillmentProviderHealthStatusEnum,
+                Mapping[str, Any],
+                Mapping[str, tuple[FulfillmentProviderHealthStatusEnum, Mapping[str, Any]]] | None,
+            ]
+        ],
+        *,
+        checked_at: datetime,
+    ) -> None:
+        """Persist a sweep of ``(provider, status, payload, service_statuses)`` in one commit."""
+
+        for provider, provider_status, provider_payload, service_statuses in snapshots:
+            self._apply_health_snapshot(provider, provider_status, provider_payload, service_statuses, checked_at)
+        await self._session.commit()
+
+    @staticmethod
+    def _apply_health_snapshot(
+        provider: FulfillmentProvider,
+        provider_status: FulfillmentProviderHealthStatusEnum,
+        provider_payload: Mapping[str, Any],
+        service_statuses: Mapping[str, tuple[FulfillmentProviderHealthStatusEnum, Mapping[str, Any]]] | None,
+        checked_at: datetime,
     ) -> None:
         provider.health_status = provider_status
         provider.last_health_check_at = checked_at
@@ -196,10 +228,6 @@ class ProviderCatalogService:
             service.last_health_check_at = checked_at
             service.health_payload = dict(payload)
 
-        await self._session.commit()
-        if refresh_registry:
-            await provider_registry.refresh_catalog(self._session, force=True)
-
     async def record_balance_snapshot(
         self,
         provider: FulfillmentProvider,
@@ -208,6 +236,30 @@ class ProviderCatalogService:
         currency: str | None,
         payload: Mapping[str, Any] | None,
         retrieved_at: datetime,
+    ) -> None:
+        self._apply_balance_snapshot(provider, amount, currency, payload, retrieved_at)
+        await self._session.commit()
+        await self._session.refresh(provider)
+
+    async def record_balance_snapshots(
+        self,
+        snapshots: Sequence[tuple[FulfillmentProvider, float | None, str | None, Mapping[str, Any] | None]],
+        *,
+        retrieved_at: datetime,
+    ) -> None:
+        """Persist a sweep of ``(provider, amount, currency, payload)`` balances in one commit."""
+
+        for provider, amount, currency, payload in snapshots:
+            self._apply_balance_snapshot(provider, amount, currency, payload, retrieved_at)
+        await self._session.commit()
+
+    def _apply_balance_snapshot(
+        self,
+        provider: FulfillmentProvider,
+        amount: float | None,
+        currency: str | None,
+        payload: Mapping[str, Any] | None,
+        retrieved_at: datetime,
     ) -> None:
         snapshot = provider.balance_snapshot
         if snapshot is None:
@@ -222,9 +274,6 @@ class ProviderCatalogService:
         snapshot.payload = dict(payload) if payload else None
         snapshot.retrieved_at = retrieved_at
 
-        await self._session.commit()
-        await self._session.refresh(provider)
-
     async def update_service(
         self,
         service: FulfillmentService,
@@ -269,10 +318,10 @@ class ProviderCatalogService:
 
         await self._session.commit()
         await self._session.refresh(service)
-        await provider_registry.refresh_catalog(self._session, force=True)
+        await provider_registry.refresh_catalog(self._session)
         return service
 
     async def delete_service(self, service: FulfillmentService) -> None:
         await self._session.delete(service)
         await self._session.commit()
-        await provider_registry.refresh_catalog(self._session, force=True)
+        await provider_registry.refresh_catalog(self._session)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Any, Dict, Mapping, MutableMapping
 
 import httpx
 
+from .http_clients import HttpClientLimits, host_key, provider_client
+from .templating import compile_template
+
 
 class ProviderEndpointError(RuntimeError):
     """Raised when a provider endpoint cannot be invoked successfully."""
@@ -42,31 +46,23 @@ def build_metadata_context(metadata: Mapping[str, Any] | None) -> Dict[str, Any]
     return context
 
 
-def _render_template_value(template: str, context: Mapping[str, Any]) -> Any:
-    stripped = template.strip()
-    if stripped.startswith("{{") and stripped.endswith("}}"):
-        key = stripped[2:-2].strip()
-        if key in context:
-            value = context[key]
-            if isinstance(value, (dict, list)):
-                return value
-            return "" if value is None else str(value)
-    rendered = template
-    for key, value in context.items():
-        placeholder = f"{{{{{key}}}}}"
-        if placeholder in rendered:
-            rendered = rendered.replace(placeholder, "" if value is None else str(value))
-    return rendered
-
-
-def render_object(obj: Any, context: Mapping[str, Any]) -> Any:
-    if isinstance(obj, str):
-        return _render_template_value(obj, context)
-    if isinstance(obj, list):
-        return [render_object(item, context) for item in obj]
-    if isinstance(obj, Mapping):
-        return {key: render_object(value, context) for key, value in obj.items()}
-    return obj
+def render_object(obj: Any, context: Mapping[str, Any], *, cache_key: str | None = None) -> Any:
+    """Render ``{{ placeholder }}`` values in an endpoint template using the cached plan."""
+
+    return compile_template(obj, strict=False, cache_key=cache_key).render(context)
+
+
+def endpoint_template_key(provider_id: str, kind: str, version: Any) -> str | None:
+    """Return the plan cache key for a provider endpoint at a given config version.
+
+    ``version`` is anything that changes with the provider's metadata (the row's
+    ``updated_at``, the catalog version); without one, templates are fingerprinted.
+    """
+
+    if version is None:
+        return None
+    stamp = version.isoformat() if isinstance(version, datetime) else str(version)
+    return f"provider:{provider_id}:{kind}:{stamp}"
 
 
 def extract_path(payload: Mapping[str, Any], path: str) -> Any:
@@ -135,8 +131,17 @@ async def invoke_provider_endpoint(
     context: Mapping[str, Any] | None = None,
     http_client: httpx.AsyncClient | None = None,
     default_timeout: float = 10.0,
+    client_key: str | None = None,
+    limits: HttpClientLimits | None = None,
+    template_key: str | None = None,
 ) -> EndpointInvocationResult:
-    """Execute the configured endpoint and return the parsed payload."""
+    """Execute the configured endpoint and return the parsed payload.
+
+    Without an injected ``http_client`` the request runs on the pooled client for
+    ``client_key`` (usually the provider id; the URL host otherwise), honouring the
+    provider's connection/concurrency ``limits``. ``template_key`` (see
+    ``endpoint_template_key``) keys the cached render plans of the endpoint.
+    """
 
     method = str(endpoint.get("method") or "POST").upper()
     url_template = endpoint.get("url")
@@ -144,32 +149,54 @@ async def invoke_provider_endpoint(
         raise ProviderEndpointError("Endpoint URL is not configured")
 
     timeout_seconds = endpoint.get("timeoutSeconds")
-    timeout = timeout_seconds if isinstance(timeout_seconds, (int, float)) and timeout_seconds > 0 else default_timeout
+    if isinstance(timeout_seconds, (int, float)) and timeout_seconds > 0:
+        timeout: float = timeout_seconds
+    elif limits is not None and limits.timeout_seconds:
+        timeout = limits.timeout_seconds
+    else:
+        timeout = default_timeout
 
     render_context = dict(context or {})
     headers_template = endpoint.get("headers")
     body_template = endpoint.get("payload")
 
-    url = _render_template_value(url_template, render_context)
-    headers = render_object(headers_template, render_context) if isinstance(headers_template, Mapping) else {}
-    body = render_object(body_template, render_context) if isinstance(body_template, Mapping) else None
-
-    client = http_client or httpx.AsyncClient(timeout=timeout)
-    owns_client = http_client is None
+    def plan_key(part: str) -> str | None:
+        return f"{template_key}:{part}" if template_key else None
+
+    url = render_object(url_template, render_context, cache_key=plan_key("url"))
+    headers = (
+        render_object(headers_template, render_context, cache_key=plan_key("headers"))
+        if isinstance(headers_template, Mapping)
+        else {}
+    )
+    body = (
+        render_object(body_template, render_context, cache_key=plan_key("payload"))
+        if isinstance(body_template, Mapping)
+        else None
+    )
+
+    request_timeout = limits.build_timeout(timeout) if limits is not None else httpx.Timeout(timeout)
+    request_kwargs: Dict[str, Any] = {
+        "method": method,
+        "url": url,
+        "headers": headers,
+        "timeout": request_timeout,
+    }
+    if body is not None:
+        request_kwargs["json"] = body
 
     try:
-        request_kwargs: Dict[str, Any] = {"method": method, "url": url, "headers": headers}
-        if body is not None:
-            request_kwargs["json"] = body
-        response = await client.request(**request_kwargs)
+        async with provider_client(
+            client_key or host_key(str(url)),
+            http_client=http_client,
+            limits=limits,
+        ) as client:
+            response = await client.request(**request_kwargs)
         response.raise_for_status()
         payload = _parse_response_body(response)
         return EndpointInvocationResult(payload=payload, url=url)
     except httpx.HTTPError as exc:
         raise ProviderEndpointError(str(exc), url=url) from exc
-    finally:
-        if owns_client:
-            await client.aclose()
 
 
 def append_refill_entry(target: MutableMapping[str, Any], entry: Mapping[str, Any]) -> None:
@@ -187,6 +214,7 @@ __all__ = [
     "ProviderEndpointError",
     "append_refill_entry",
     "build_metadata_context",
+    "endpoint_template_key",
     "extract_balance_from_payload",
     "extract_endpoint",
     "extract_path",
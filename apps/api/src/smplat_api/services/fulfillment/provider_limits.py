@@ -0,0 +1,429 @@
+"""Per-provider rate limiting and circuit breaking for outbound provider calls.
+
+Provider and service descriptors carry ``rate_limit_per_minute`` and
+``health_status``; ``ProviderCallGuard`` enforces them before a request leaves
+the process:
+
+* a token bucket per provider/service (capacity = the per-minute limit, refilled
+  continuously), kept in Redis when ``PROVIDER_RATE_LIMIT_REDIS_ENABLED`` is set
+  so every worker shares one budget, and in-process otherwise or while Redis is
+  unreachable;
+* a circuit breaker per provider/service that opens after
+  ``PROVIDER_CIRCUIT_FAILURE_THRESHOLD`` consecutive failures, rejects calls for
+  ``PROVIDER_CIRCUIT_RESET_SECONDS`` and then lets a single probe through.
+
+Rejected calls raise ``ProviderThrottledError`` carrying ``retry_after_seconds``
+so callers can defer the work instead of treating it as a provider failure.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from time import monotonic
+from typing import Any, AsyncIterator, Callable, Dict
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from smplat_api.core.settings import settings
+from smplat_api.domain.fulfillment import provider_registry
+from smplat_api.models.fulfillment import FulfillmentProviderHealthStatusEnum
+
+from .provider_endpoints import ProviderEndpointError
+
+Clock = Callable[[], float]
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Seconds to stay on the in-process limiter after a Redis error before retrying Redis.
+_REDIS_RETRY_SECONDS = 30.0
+
+# KEYS[1] = bucket key; ARGV = capacity, tokens per second.
+# Returns milliseconds until a token is available (0 when one was taken).
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait_ms = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait_ms = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return wait_ms
+"""
+
+
+class ProviderThrottledError(ProviderEndpointError):
+    """Raised when a provider call is held back by its rate limit or circuit breaker."""
+
+    def __init__(self, message: str, *, scope: str, reason: str, retry_after_seconds: float) -> None:
+        super().__init__(message)
+        self.scope = scope
+        self.reason = reason
+        self.retry_after_seconds = max(float(retry_after_seconds), 0.0)
+
+    @property
+    def retry_after(self) -> int:
+        """Whole seconds to wait, suitable for ``Retry-After`` and task scheduling."""
+        return max(1, math.ceil(self.retry_after_seconds))
+
+
+@dataclass
+class TokenBucket:
+    """Continuously refilled bucket holding at most ``capacity`` tokens."""
+
+    capacity: float
+    refill_per_second: float
+    tokens: float
+    updated_at: float
+
+    @classmethod
+    def per_minute(cls, limit: int, now: float) -> "TokenBucket":
+        return cls(capacity=float(limit), refill_per_second=limit / 60.0, tokens=float(limit), updated_at=now)
+
+    def take(self, now: float) -> float:
+        """Take a token; return 0 on success or the seconds until one is available."""
+        elapsed = max(now - self.updated_at, 0.0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.refill_per_second
+
+
+@dataclass
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe."""
+
+    failure_threshold: int
+    reset_seconds: float
+    state: str = CIRCUIT_CLOSED
+    consecutive_failures: int = 0
+    opened_at: float | None = None
+    probe_in_flight: bool = False
+    total_failures: int = 0
+    total_rejections: int = 0
+
+    def before_call(self, now: float) -> float:
+        """Return 0 when a call may proceed, otherwise the seconds until the next probe."""
+        if self.state == CIRCUIT_OPEN:
+            remaining = (self.opened_at or now) + self.reset_seconds - now
+            if remaining > 0:
+                self.total_rejections += 1
+                return remaining
+            self.state = CIRCUIT_HALF_OPEN
+            self.probe_in_flight = False
+        if self.state == CIRCUIT_HALF_OPEN:
+            if self.probe_in_flight:
+                self.total_rejections += 1
+                return self.reset_seconds
+            self.probe_in_flight = True
+        return 0.0
+
+    def record_success(self) -> None:
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+
+    def record_failure(self, now: float) -> None:
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+        if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = CIRCUIT_OPEN
+            self.opened_at = now
+
+    def snapshot(self, now: float) -> dict[str, Any]:
+        retry_after = None
+        if self.state == CIRCUIT_OPEN and self.opened_at is not None:
+            retry_after = round(max(self.opened_at + self.reset_seconds - now, 0.0), 3)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "total_rejections": self.total_rejections,
+            "retry_after_seconds": retry_after,
+        }
+
+
+@dataclass
+class _LimitStats:
+    limit_per_minute: int
+    allowed: int = 0
+    throttled: int = 0
+    backend: str = "local"
+
+
+@dataclass
+class ProviderCallGuard:
+    """Shared rate limiter and circuit breakers keyed by provider/service."""
+
+    redis_client: Redis | None = None
+    use_redis: bool = field(default_factory=lambda: settings.provider_rate_limit_redis_enabled)
+    key_prefix: str = field(default_factory=lambda: settings.provider_rate_limit_key_prefix)
+    failure_threshold: int = field(default_factory=lambda: settings.provider_circuit_failure_threshold)
+    reset_seconds: float = field(default_factory=lambda: settings.provider_circuit_reset_seconds)
+    clock: Clock = monotonic
+    _buckets: Dict[str, TokenBucket] = field(default_factory=dict)
+    _breakers: Dict[str, CircuitBreaker] = field(default_factory=dict)
+    _stats: Dict[str, _LimitStats] = field(default_factory=dict)
+    _lock: Lock = field(default_factory=Lock)
+    _redis_unavailable_until: float = 0.0
+
+    async def acquire(
+        self,
+        provider_id: str,
+        service_id: str | None = None,
+        *,
+        provider_rate_limit: int | None = None,
+        service_rate_limit: int | None = None,
+        health_status: str | None = None,
+    ) -> None:
+        """Admit one call or raise ``ProviderThrottledError``.
+
+        Limits and health default to the cached provider registry descriptors.
+        """
+        provider = provider_registry.get_provider(provider_id)
+        service = provider_registry.get_service(service_id) if service_id else None
+        if provider_rate_limit is None and provider is not None:
+            provider_rate_limit = provider.rate_limit_per_minute
+        if service_rate_limit is None and service is not None:
+            service_rate_limit = service.rate_limit_per_minute
+        if health_status is None and provider is not None:
+            health_status = provider.health_status
+
+        provider_scope = _scope("provider", provider_id)
+        if health_status == FulfillmentProviderHealthStatusEnum.OFFLINE.value:
+            raise ProviderThrottledError(
+                f"Provider {provider_id} is marked offline",
+                scope=provider_scope,
+                reason="provider_offline",
+                retry_after_seconds=self.reset_seconds,
+            )
+
+        scopes = [(provider_scope, provider_rate_limit)]
+        if service_id:
+            scopes.append((_scope("service", service_id), service_rate_limit))
+
+        now = self.clock()
+        with self._lock:
+            admitted: list[CircuitBreaker] = []
+            for scope, _ in scopes:
+                breaker = self._breaker(scope)
+                wait = breaker.before_call(now)
+                if wait <= 0:
+                    admitted.append(breaker)
+                else:
+                    for previous in admitted:
+                        previous.probe_in_flight = False
+                    raise ProviderThrottledError(
+                        f"Circuit open for {scope}",
+                        scope=scope,
+                        reason="circuit_open",
+                        retry_after_seconds=wait,
+                    )
+
+        for scope, limit in scopes:
+            if not limit or limit <= 0:
+                continue
+            wait = await self._take_token(scope, int(limit))
+            if wait > 0:
+                self._release_probes(scopes)
+                raise ProviderThrottledError(
+                    f"Rate limit of {limit}/min reached for {scope}",
+                    scope=scope,
+                    reason="rate_limited",
+                    retry_after_seconds=wait,
+                )
+
+    def record_success(self, provider_id: str, service_id: str | None = None) -> None:
+        with self._lock:
+            for scope in _scopes(provider_id, service_id):
+                self._breaker(scope).record_success()
+
+    def record_failure(self, provider_id: str, service_id: str | None = None) -> None:
+        now = self.clock()
+        with self._lock:
+            for scope in _scopes(provider_id, service_id):
+                breaker = self._breaker(scope)
+                previous = breaker.state
+                breaker.record_failure(now)
+                if breaker.state == CIRCUIT_OPEN and previous != CIRCUIT_OPEN:
+                    logger.warning(
+                        "Provider circuit opened",
+                        scope=scope,
+                        consecutive_failures=breaker.consecutive_failures,
+                        reset_seconds=self.reset_seconds,
+                    )
+
+    @asynccontextmanager
+    async def guard(self, provider_id: str, service_id: str | None = None, **limits: Any) -> AsyncIterator[None]:
+        """Admit a call, then feed its outcome into the circuit breakers."""
+        await self.acquire(provider_id, service_id, **limits)
+        try:
+            yield
+        except asyncio.CancelledError:
+            self._release_probes([(scope, None) for scope in _scopes(provider_id, service_id)])
+            raise
+        except Exception:
+            self.record_failure(provider_id, service_id)
+            raise
+        self.record_success(provider_id, service_id)
+
+    def snapshot(self) -> dict[str, Any]:
+        now = self.clock()
+        with self._lock:
+            rate_limits = {
+                scope: {
+                    "limit_per_minute": stats.limit_per_minute,
+                    "allowed": stats.allowed,
+                    "throttled": stats.throttled,
+                    "backend": stats.backend,
+                    "local_tokens": round(self._buckets[scope].tokens, 3) if scope in self._buckets else None,
+                }
+                for scope, stats in self._stats.items()
+            }
+            circuits = {scope: breaker.snapshot(now) for scope, breaker in self._breakers.items()}
+        return {
+            "backend": "redis" if self.use_redis else "local",
+            "redis_degraded": self._redis_unavailable_until > now,
+            "failure_threshold": self.failure_threshold,
+            "reset_seconds": self.reset_seconds,
+            "rate_limits": rate_limits,
+            "circuits": circuits,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._breakers.clear()
+            self._stats.clear()
+            self._redis_unavailable_until = 0.0
+
+    def _breaker(self, scope: str) -> CircuitBreaker:
+        breaker = self._breakers.get(scope)
+        if breaker is None:
+            breaker = CircuitBreaker(failure_threshold=max(1, self.failure_threshold), reset_seconds=self.reset_seconds)
+            self._breakers[scope] = breaker
+        return breaker
+
+    def _release_probes(self, scopes: list[tuple[str, int | None]]) -> None:
+        with self._lock:
+            for scope, _ in scopes:
+                breaker = self._breakers.get(scope)
+                if breaker is not None:
+                    breaker.probe_in_flight = False
+
+    async def _take_token(self, scope: str, limit: int) -> float:
+        backend = "local"
+        wait: float | None = None
+        if self.use_redis and self.clock() >= self._redis_unavailable_until:
+            wait = await self._take_redis_token(scope, limit)
+            if wait is not None:
+                backend = "redis"
+        if wait is None:
+            wait = self._take_local_token(scope, limit)
+
+        with self._lock:
+            stats = self._stats.get(scope)
+            if stats is None:
+                stats = _LimitStats(limit_per_minute=limit)
+                self._stats[scope] = stats
+            stats.limit_per_minute = limit
+            stats.backend = backend
+            if wait > 0:
+                stats.throttled += 1
+            else:
+                stats.allowed += 1
+        return wait
+
+    def _take_local_token(self, scope: str, limit: int) -> float:
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(scope)
+            if bucket is None or bucket.capacity != limit:
+                bucket = TokenBucket.per_minute(limit, now)
+                self._buckets[scope] = bucket
+            return bucket.take(now)
+
+    async def _take_redis_token(self, scope: str, limit: int) -> float | None:
+        if self.redis_client is None:
+            self.redis_client = Redis.from_url(
+                settings.redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+        try:
+            wait_ms = await self.redis_client.eval(
+                _TOKEN_BUCKET_SCRIPT,
+                1,
+                f"{self.key_prefix}{scope}",
+                limit,
+                limit / 60.0,
+            )
+        except Exception as exc:
+            self._redis_unavailable_until = self.clock() + _REDIS_RETRY_SECONDS
+            logger.warning(
+                "Provider rate limiter falling back to in-process buckets",
+                scope=scope,
+                error=str(exc),
+            )
+            return None
+        return max(float(wait_ms or 0), 0.0) / 1000.0
+
+
+def _scope(kind: str, identifier: str) -> str:
+    return f"{kind}:{identifier}"
+
+
+def _scopes(provider_id: str, service_id: str | None) -> list[str]:
+    scopes = [_scope("provider", provider_id)]
+    if service_id:
+        scopes.append(_scope("service", service_id))
+    return scopes
+
+
+_GUARD: ProviderCallGuard | None = None
+
+
+def get_provider_guard() -> ProviderCallGuard:
+    global _GUARD
+    if _GUARD is None:
+        _GUARD = ProviderCallGuard()
+    return _GUARD
+
+
+def configure_provider_guard(guard: ProviderCallGuard | None) -> None:
+    """Install ``guard`` as the process-wide instance (``None`` rebuilds from settings)."""
+    global _GUARD
+    _GUARD = guard
+
+
+__all__ = [
+    "CircuitBreaker",
+    "ProviderCallGuard",
+    "ProviderThrottledError",
+    "TokenBucket",
+    "configure_provider_guard",
+    "get_provider_guard",
+]
@@ -0,0 +1,186 @@
+"""Adaptive scheduling of active provider health probes.
+
+The health job runs on a short cron and asks ``ProviderProbeScheduler`` which
+providers are due instead of probing the whole catalog every time. The interval
+is derived from the cached registry descriptor:
+
+* providers without an active service are never probed;
+* degraded, offline or unknown providers, and providers whose real calls failed
+  since their last probe, are due every ``PROVIDER_PROBE_MIN_INTERVAL_SECONDS``;
+* healthy providers start at ``PROVIDER_PROBE_BASE_INTERVAL_SECONDS`` and double
+  the interval with every consecutive healthy probe up to
+  ``PROVIDER_PROBE_MAX_INTERVAL_SECONDS``.
+
+Successful fulfillment calls (reported by ``TaskProcessor``) count as passive
+health checks and push the next active probe of a healthy provider back.
+State is in-process, like ``ProviderCallGuard``; a restart only resets the
+backoff.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, Dict, Iterable, Mapping
+
+from smplat_api.core.settings import settings
+from smplat_api.domain.fulfillment.provider_registry import (
+    FulfillmentProviderDescriptor,
+    FulfillmentServiceDescriptor,
+)
+from smplat_api.models.fulfillment import FulfillmentProviderHealthStatusEnum, FulfillmentServiceStatusEnum
+
+Clock = Callable[[], datetime]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass
+class _ProviderProbeState:
+    healthy_streak: int = 0
+    last_call_success_at: datetime | None = None
+    last_call_failure_at: datetime | None = None
+
+
+@dataclass
+class ProviderProbeScheduler:
+    """Decides which providers need an active health probe."""
+
+    min_interval_seconds: float = field(default_factory=lambda: settings.provider_probe_min_interval_seconds)
+    base_interval_seconds: float = field(default_factory=lambda: settings.provider_probe_base_interval_seconds)
+    max_interval_seconds: float = field(default_factory=lambda: settings.provider_probe_max_interval_seconds)
+    clock: Clock = _utcnow
+    _states: Dict[str, _ProviderProbeState] = field(default_factory=dict)
+    _lock: Lock = field(default_factory=Lock)
+
+    def record_call_outcome(self, provider_id: str, *, success: bool) -> None:
+        """Feed the outcome of a real provider call in as passive health."""
+        now = self.clock()
+        with self._lock:
+            state = self._state(provider_id)
+            if success:
+                state.last_call_success_at = now
+            else:
+                state.last_call_failure_at = now
+
+    def record_probe(self, provider_id: str, status: FulfillmentProviderHealthStatusEnum | str) -> None:
+        """Update the backoff after an active probe classified the provider."""
+        value = status.value if isinstance(status, FulfillmentProviderHealthStatusEnum) else str(status)
+        with self._lock:
+            state = self._state(provider_id)
+            if value == FulfillmentProviderHealthStatusEnum.HEALTHY.value:
+                state.healthy_streak += 1
+            else:
+                state.healthy_streak = 0
+
+    def interval_for(self, provider: FulfillmentProviderDescriptor) -> timedelta:
+        with self._lock:
+            state = self._states.get(provider.id) or _ProviderProbeState()
+        last_probe = _as_utc(provider.last_health_check_at)
+        failed_since_probe = state.last_call_failure_at is not None and (
+            last_probe is None or state.last_call_failure_at > last_probe
+        )
+        if provider.health_status != FulfillmentProviderHealthStatusEnum.HEALTHY.value or failed_since_probe:
+            return timedelta(seconds=self.min_interval_seconds)
+        seconds = self.base_interval_seconds * (2 ** max(state.healthy_streak - 1, 0))
+        return timedelta(seconds=min(max(seconds, self.min_interval_seconds), self.max_interval_seconds))
+
+    def next_probe_at(self, provider: FulfillmentProviderDescriptor) -> datetime | None:
+        """Return when ``provider`` is next due, or ``None`` when it is due now."""
+        last_probe = _as_utc(provider.last_health_check_at)
+        if last_probe is None:
+            return None
+        last_checked = last_probe
+        with self._lock:
+            state = self._states.get(provider.id)
+        if (
+            state is not None
+            and state.last_call_success_at is not None
+            and provider.health_status == FulfillmentProviderHealthStatusEnum.HEALTHY.value
+            and (state.last_call_failure_at is None or state.last_call_success_at > state.last_call_failure_at)
+        ):
+            last_checked = max(last_checked, state.last_call_success_at)
+        return last_checked + self.interval_for(provider)
+
+    def due_providers(
+        self,
+        providers: Iterable[FulfillmentProviderDescriptor],
+        services: Iterable[FulfillmentServiceDescriptor],
+    ) -> list[str]:
+        """Return the ids of providers with an active service whose probe is due."""
+        active = active_provider_ids(services)
+        now = self.clock()
+        due: list[str] = []
+        for provider in providers:
+            if provider.id not in active:
+                continue
+            next_at = self.next_probe_at(provider)
+            if next_at is None or next_at <= now:
+                due.append(provider.id)
+        return due
+
+    def snapshot(self) -> Mapping[str, dict[str, object]]:
+        with self._lock:
+            return {
+                provider_id: {
+                    "healthy_streak": state.healthy_streak,
+                    "last_call_success_at": state.last_call_success_at,
+                    "last_call_failure_at": state.last_call_failure_at,
+                }
+                for provider_id, state in self._states.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+    def _state(self, provider_id: str) -> _ProviderProbeState:
+        state = self._states.get(provider_id)
+        if state is None:
+            state = _ProviderProbeState()
+            self._states[provider_id] = state
+        return state
+
+
+def active_provider_ids(services: Iterable[FulfillmentServiceDescriptor]) -> set[str]:
+    """Return the providers that own at least one active service."""
+    return {
+        service.provider_id
+        for service in services
+        if service.status == FulfillmentServiceStatusEnum.ACTIVE.value
+    }
+
+
+_SCHEDULER: ProviderProbeScheduler | None = None
+
+
+def get_probe_scheduler() -> ProviderProbeScheduler:
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = ProviderProbeScheduler()
+    return _SCHEDULER
+
+
+def configure_probe_scheduler(scheduler: ProviderProbeScheduler | None) -> None:
+    """Install ``scheduler`` as the process-wide instance (``None`` rebuilds from settings)."""
+    global _SCHEDULER
+    _SCHEDULER = scheduler
+
+
+__all__ = [
+    "ProviderProbeScheduler",
+    "active_provider_ids",
+    "configure_probe_scheduler",
+    "get_probe_scheduler",
+]
@@ -0,0 +1,89 @@
+"""Versioned in-process cache for provider automation snapshots.
+
+``ProviderAutomationService.build_snapshot`` is polled by the admin automation
+endpoint. Its result is cached under the current snapshot
+version, which is bumped after any session commits a write to
+``FulfillmentProviderOrder`` or ``FulfillmentProvider``. Only the committing
+process sees the bump, so entries also expire after
+``PROVIDER_AUTOMATION_SNAPSHOT_TTL_SECONDS`` to bound staleness across replicas.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from smplat_api.core.settings import settings
+from smplat_api.models.fulfillment import FulfillmentProvider, FulfillmentProviderOrder
+
+_DIRTY_KEY = "provider_snapshot_dirty"
+
+_lock = Lock()
+_version = 0
+_entries: dict[Hashable, tuple[int, float, Any]] = {}
+
+
+def snapshot_version() -> int:
+    return _version
+
+
+def invalidate_provider_snapshots() -> None:
+    """Bump the snapshot version so the next ``build_snapshot`` recomputes."""
+    global _version
+    with _lock:
+        _version += 1
+        _entries.clear()
+
+
+def get_cached_snapshot(key: Hashable) -> Any | None:
+    ttl = settings.provider_automation_snapshot_ttl_seconds
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        version, stored_at, value = entry
+        if version != _version or ttl <= 0 or monotonic() - stored_at > ttl:
+            _entries.pop(key, None)
+            return None
+        return value
+
+
+def store_snapshot(key: Hashable, version: int, value: Any) -> None:
+    """Cache ``value`` if no write was committed since ``version`` was read."""
+    with _lock:
+        if version == _version:
+            _entries[key] = (version, monotonic(), value)
+
+
+def _mark_dirty(mapper, connection, target) -> None:  # type: ignore[no-untyped-def]
+    session = object_session(target)
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        invalidate_provider_snapshots()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_on_rollback(session: Session, previous_transaction) -> None:  # type: ignore[no-untyped-def]
+    session.info.pop(_DIRTY_KEY, None)
+
+
+for _model in (FulfillmentProvider, FulfillmentProviderOrder):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_dirty)
+
+
+__all__ = [
+    "get_cached_snapshot",
+    "invalidate_provider_snapshots",
+    "snapshot_version",
+    "store_snapshot",
+]
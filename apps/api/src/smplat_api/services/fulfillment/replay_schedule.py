@@ -0,0 +1,255 @@
+"""Scheduled provider order replays backed by ``fulfillment_provider_replay_schedules``.
+
+``FulfillmentProviderOrder.payload["scheduledReplays"]`` stays the view the admin UI
+reads and the place callers append new entries. Before every flush the entries of
+new or modified provider orders are mirrored into schedule rows, so the replay
+worker can claim due entries and the backlog metrics can aggregate over the
+``(status, scheduled_for)`` index instead of scanning JSON payloads.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Mapping
+
+from sqlalchemy import and_, event, func, inspect, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from smplat_api.models.fulfillment import (
+    FulfillmentProviderOrder,
+    FulfillmentProviderReplaySchedule,
+    FulfillmentProviderReplayStatusEnum,
+)
+
+_PENDING_STATUSES = (
+    FulfillmentProviderReplayStatusEnum.SCHEDULED,
+    FulfillmentProviderReplayStatusEnum.IN_PROGRESS,
+)
+_TERMINAL_STATUSES = {
+    FulfillmentProviderReplayStatusEnum.EXECUTED.value: FulfillmentProviderReplayStatusEnum.EXECUTED,
+    FulfillmentProviderReplayStatusEnum.FAILED.value: FulfillmentProviderReplayStatusEnum.FAILED,
+}
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return _as_utc(datetime.fromisoformat(value.strip().replace("Z", "+00:00")))
+    except ValueError:
+        return None
+
+
+def _parse_amount(value: Any) -> Decimal | None:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _schedule_entries(payload: Any) -> list[Mapping[str, Any]]:
+    if not isinstance(payload, Mapping):
+        return []
+    schedule = payload.get("scheduledReplays")
+    if not isinstance(schedule, list):
+        return []
+    # A repeated id mirrors to a single row, so the last entry for it wins.
+    entries: dict[str, Mapping[str, Any]] = {}
+    for entry in schedule:
+        if isinstance(entry, Mapping) and entry.get("id"):
+            entries[str(entry["id"])] = entry
+    return list(entries.values())
+
+
+def _sync_order(
+    session: Session,
+    order: FulfillmentProviderOrder,
+    existing: Mapping[str, FulfillmentProviderReplaySchedule],
+) -> None:
+    now = datetime.now(timezone.utc)
+    for entry in _schedule_entries(order.payload):
+        entry_id = str(entry["id"])
+        status = entry.get("status") or FulfillmentProviderReplayStatusEnum.SCHEDULED.value
+        # Entries without a parseable time were always treated as due.
+        scheduled_for = _parse_timestamp(entry.get("scheduledFor")) or now
+        row = existing.get(entry_id)
+        if row is None:
+            if status != FulfillmentProviderReplayStatusEnum.SCHEDULED.value:
+                continue
+            session.add(
+                FulfillmentProviderReplaySchedule(
+                    provider_order=order,
+                    entry_id=entry_id,
+                    provider_id=order.provider_id,
+                    status=FulfillmentProviderReplayStatusEnum.SCHEDULED,
+                    scheduled_for=scheduled_for,
+                    requested_amount=_parse_amount(entry.get("requestedAmount")),
+                )
+            )
+            continue
+        terminal = _TERMINAL_STATUSES.get(status)
+        if terminal is not None and row.status != terminal:
+            row.status = terminal
+            row.performed_at = _parse_timestamp(entry.get("performedAt")) or now
+            row.lease_owner = None
+            row.lease_expires_at = None
+        elif (
+            status == FulfillmentProviderReplayStatusEnum.SCHEDULED.value
+            and row.status == FulfillmentProviderReplayStatusEnum.SCHEDULED
+            and _as_utc(row.scheduled_for) != scheduled_for
+        ):
+            row.scheduled_for = scheduled_for
+        # IN_PROGRESS rows belong to the worker holding the lease; it settles them.
+
+
+@event.listens_for(Session, "before_flush")
+def _mirror_scheduled_replays(session: Session, flush_context, instances) -> None:  # type: ignore[no-untyped-def]
+    orders: list[FulfillmentProviderOrder] = []
+    for obj in session.new:
+        if isinstance(obj, FulfillmentProviderOrder) and _schedule_entries(obj.payload):
+            orders.append(obj)
+    dirty_ids = []
+    for obj in session.dirty:
+        if isinstance(obj, FulfillmentProviderOrder) and inspect(obj).attrs.payload.history.has_changes():
+            if _schedule_entries(obj.payload):
+                orders.append(obj)
+                dirty_ids.append(obj.id)
+    if not orders:
+        return
+
+    existing: dict[Any, dict[str, FulfillmentProviderReplaySchedule]] = {}
+    if dirty_ids:
+        with session.no_autoflush:
+            rows = session.execute(
+                select(FulfillmentProviderReplaySchedule).where(
+                    FulfillmentProviderReplaySchedule.provider_order_id.in_(dirty_ids)
+                )
+            ).scalars()
+            for row in rows:
+                existing.setdefault(row.provider_order_id, {})[row.entry_id] = row
+    for order in orders:
+        _sync_order(session, order, existing.get(order.id, {}))
+
+
+async def claim_due_replays(
+    session: AsyncSession,
+    worker_id: str,
+    *,
+    now: datetime,
+    limit: int,
+    lease_seconds: int,
+) -> list[FulfillmentProviderReplaySchedule]:
+    """Lease up to ``limit`` due schedule rows to ``worker_id`` and commit the claim.
+
+    Rows whose lease expired while IN_PROGRESS are claimable again. Postgres skips
+    rows locked by other replicas; SQLite relies on the guarded UPDATE. Claimed rows
+    come back oldest-due first with their provider order loaded.
+    """
+    now = _as_utc(now) or datetime.now(timezone.utc)
+    claimable = or_(
+        and_(
+            FulfillmentProviderReplaySchedule.status == FulfillmentProviderReplayStatusEnum.SCHEDULED,
+            FulfillmentProviderReplaySchedule.scheduled_for <= now,
+        ),
+        and_(
+            FulfillmentProviderReplaySchedule.status == FulfillmentProviderReplayStatusEnum.IN_PROGRESS,
+            FulfillmentProviderReplaySchedule.lease_expires_at.isnot(None),
+            FulfillmentProviderReplaySchedule.lease_expires_at <= now,
+        ),
+    )
+    candidate_stmt = (
+        select(FulfillmentProviderReplaySchedule.id)
+        .where(claimable)
+        .order_by(FulfillmentProviderReplaySchedule.scheduled_for)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    candidate_ids = list((await session.execute(candidate_stmt)).scalars().all())
+    if not candidate_ids:
+        await session.commit()
+        return []
+
+    await session.execute(
+        update(FulfillmentProviderReplaySchedule)
+        .where(FulfillmentProviderReplaySchedule.id.in_(candidate_ids), claimable)
+        .values(
+            status=FulfillmentProviderReplayStatusEnum.IN_PROGRESS,
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    claimed_stmt = (
+        select(FulfillmentProviderReplaySchedule)
+        .options(selectinload(FulfillmentProviderReplaySchedule.provider_order))
+        .where(
+            FulfillmentProviderReplaySchedule.id.in_(candidate_ids),
+            FulfillmentProviderReplaySchedule.lease_owner == worker_id,
+            FulfillmentProviderReplaySchedule.status == FulfillmentProviderReplayStatusEnum.IN_PROGRESS,
+        )
+        .order_by(FulfillmentProviderReplaySchedule.scheduled_for)
+        .execution_options(populate_existing=True)
+    )
+    claimed = list((await session.execute(claimed_stmt)).scalars().all())
+    await session.commit()
+    return claimed
+
+
+def settle_replay(
+    schedule: FulfillmentProviderReplaySchedule,
+    status: FulfillmentProviderReplayStatusEnum,
+    *,
+    performed_at: datetime,
+) -> None:
+    """Record the outcome of a claimed replay and release its lease."""
+    schedule.status = status
+    schedule.performed_at = performed_at
+    schedule.lease_owner = None
+    schedule.lease_expires_at = None
+
+
+def defer_replay(schedule: FulfillmentProviderReplaySchedule, *, run_at: datetime) -> None:
+    """Put a claimed replay back in the queue for ``run_at``."""
+    schedule.status = FulfillmentProviderReplayStatusEnum.SCHEDULED
+    schedule.scheduled_for = run_at
+    schedule.lease_owner = None
+    schedule.lease_expires_at = None
+
+
+async def replay_backlog(session: AsyncSession) -> tuple[int, datetime | None]:
+    """Return the number of pending replays and the earliest due time."""
+    stmt = select(
+        func.count(FulfillmentProviderReplaySchedule.id),
+        func.min(FulfillmentProviderReplaySchedule.scheduled_for),
+    ).where(FulfillmentProviderReplaySchedule.status.in_(_PENDING_STATUSES))
+    total, next_eta = (await session.execute(stmt)).one()
+    return int(total or 0), _as_utc(next_eta)
+
+
+def find_schedule_entry(payload: Any, entry_id: str) -> Mapping[str, Any] | None:
+    """Return the ``scheduledReplays`` entry with ``entry_id`` from a provider order payload."""
+    for entry in _schedule_entries(payload):
+        if str(entry.get("id")) == entry_id:
+            return entry
+    return None
+
+
+__all__ = [
+    "claim_due_replays",
+    "defer_replay",
+    "find_schedule_entry",
+    "replay_backlog",
+    "settle_replay",
+]
@@ -0,0 +1,172 @@
+"""Weighted fair-share batch selection for the fulfillment queue.
+
+Due tasks are grouped into lanes: the task type, suffixed with ``@provider-id``
+when a configured execution targets a provider. ``FairShareScheduler`` splits
+each claim batch across the lanes that have work using deficit round robin, so
+a lane's share follows its weight (``FULFILLMENT_LANE_WEIGHTS``) and small lanes
+still get slots when there are more lanes than batch slots. Within a lane,
+tasks are claimed by ``priority`` (highest first) and then ``scheduled_at``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Iterable, Mapping
+
+from smplat_api.models.fulfillment import FulfillmentTaskTypeEnum
+
+# Exponential moving average factor for per-lane claim wait times.
+_WAIT_SMOOTHING = 0.2
+
+
+def task_lane(task_type: FulfillmentTaskTypeEnum | str, execution: Mapping[str, Any] | None = None) -> str:
+    """Return the scheduling lane for a task type and optional execution config."""
+
+    lane = getattr(task_type, "value", task_type)
+    provider_id = execution.get("provider_id") if isinstance(execution, Mapping) else None
+    if isinstance(provider_id, str) and provider_id.strip() and "{{" not in provider_id:
+        lane = f"{lane}@{provider_id.strip()}"
+    return str(lane)[:128]
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass
+class LaneStats:
+    """Queue depth and wait-time observations for one lane."""
+
+    depth: int = 0
+    oldest_due_at: datetime | None = None
+    claimed_total: int = 0
+    last_claimed: int = 0
+    last_wait_seconds: float | None = None
+    avg_wait_seconds: float | None = None
+    deficit: float = 0.0
+
+
+class FairShareScheduler:
+    """Deficit-round-robin allocation of claim slots across lanes."""
+
+    def __init__(self, weights: Mapping[str, float] | None = None, *, default_weight: float = 1.0) -> None:
+        self._weights = {str(key): float(value) for key, value in (weights or {}).items() if float(value) > 0}
+        self._default_weight = default_weight
+        self._lanes: Dict[str, LaneStats] = {}
+        self._observed_at: datetime | None = None
+        self._lock = Lock()
+
+    def weight_for(self, lane: str) -> float:
+        if lane in self._weights:
+            return self._weights[lane]
+        task_type = lane.split("@", 1)[0]
+        return self._weights.get(task_type, self._default_weight)
+
+    def allocate(self, depths: Mapping[str, int], limit: int) -> Dict[str, int]:
+        """Split ``limit`` claim slots across lanes with pending work."""
+
+        allocation = {lane: 0 for lane, depth in depths.items() if depth > 0}
+        if limit <= 0 or not allocation:
+            return allocation
+
+        with self._lock:
+            stats = {lane: self._lane(lane) for lane in allocation}
+            remaining = min(limit, sum(depths[lane] for lane in allocation))
+            active = sorted(allocation)
+            while remaining > 0 and active:
+                total_weight = sum(self.weight_for(lane) for lane in active)
+                for lane in active:
+                    stats[lane].deficit += remaining * self.weight_for(lane) / total_weight
+                granted = 0
+                for lane in sorted(active, key=lambda name: -stats[name].deficit):
+                    take = min(int(stats[lane].deficit), depths[lane] - allocation[lane], remaining - granted)
+                    if take > 0:
+                        allocation[lane] += take
+                        stats[lane].deficit -= take
+                        granted += take
+                if granted == 0:
+                    # Only fractional credit left: the most-owed lane takes the next slot.
+                    lane = max(active, key=lambda name: stats[name].deficit)
+                    allocation[lane] += 1
+                    stats[lane].deficit -= 1
+                    granted = 1
+                remaining -= granted
+                active = [lane for lane in active if allocation[lane] < depths[lane]]
+
+            for lane, lane_stats in stats.items():
+                if allocation[lane] >= depths[lane]:
+                    # Lanes drained this round do not bank credit (standard DRR reset).
+                    lane_stats.deficit = 0.0
+                else:
+                    lane_stats.deficit = min(lane_stats.deficit, float(limit))
+        return allocation
+
+    def observe_queue(self, queue: Mapping[str, tuple[int, datetime | None]], now: datetime) -> None:
+        """Record per-lane depth and oldest due time from the latest claim scan."""
+
+        with self._lock:
+            self._observed_at = _naive_utc(now)
+            for lane, stats in self._lanes.items():
+                if lane not in queue:
+                    stats.depth = 0
+                    stats.oldest_due_at = None
+                    stats.last_claimed = 0
+            for lane, (depth, oldest) in queue.items():
+                stats = self._lane(lane)
+                stats.depth = depth
+                stats.oldest_due_at = _naive_utc(oldest) if oldest is not None else None
+                stats.last_claimed = 0
+
+    def record_claimed(self, lanes_and_due: Iterable[tuple[str, datetime | None]], now: datetime) -> None:
+        """Record how long claimed tasks waited past their ``scheduled_at``."""
+
+        now = _naive_utc(now)
+        with self._lock:
+            for lane, due_at in lanes_and_due:
+                stats = self._lane(lane)
+                stats.claimed_total += 1
+                stats.last_claimed += 1
+                if due_at is None:
+                    continue
+                wait = max((now - _naive_utc(due_at)).total_seconds(), 0.0)
+                stats.last_wait_seconds = wait
+                if stats.avg_wait_seconds is None:
+                    stats.avg_wait_seconds = wait
+                else:
+                    stats.avg_wait_seconds += _WAIT_SMOOTHING * (wait - stats.avg_wait_seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            observed_at = self._observed_at
+            lanes = {}
+            for lane, stats in sorted(self._lanes.items()):
+                oldest_wait = None
+                if observed_at is not None and stats.oldest_due_at is not None:
+                    oldest_wait = round(max((observed_at - stats.oldest_due_at).total_seconds(), 0.0), 3)
+                lanes[lane] = {
+                    "weight": self.weight_for(lane),
+                    "queue_depth": stats.depth,
+                    "oldest_wait_seconds": oldest_wait,
+                    "claimed_total": stats.claimed_total,
+                    "last_claimed": stats.last_claimed,
+                    "last_wait_seconds": round(stats.last_wait_seconds, 3) if stats.last_wait_seconds is not None else None,
+                    "avg_wait_seconds": round(stats.avg_wait_seconds, 3) if stats.avg_wait_seconds is not None else None,
+                }
+        return {
+            "observed_at": observed_at.isoformat() if observed_at else None,
+            "lanes": lanes,
+        }
+
+    def _lane(self, lane: str) -> LaneStats:
+        stats = self._lanes.get(lane)
+        if stats is None:
+            stats = LaneStats()
+            self._lanes[lane] = stats
+        return stats
+
+
+__all__ = ["FairShareScheduler", "LaneStats", "task_lane"]
@@ -3,13 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import os
-import re
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from time import monotonic
-from typing import Any, Awaitable, Callable
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping
 from uuid import UUID
 
 from copy import deepcopy
@@ -17,6 +16,8 @@ import httpx
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from smplat_api.core.work_signals import FULFILLMENT_TASKS, AdaptivePollBackoff, get_work_signal
+from smplat_api.core.worker_identity import default_worker_id
 from smplat_api.models.fulfillment import (
     FulfillmentTask,
     FulfillmentTaskStatusEnum,
@@ -26,7 +27,13 @@ from smplat_api.models.order import OrderItem
 from smplat_api.models.order import Order
 from smplat_api.models.product import Product
 from smplat_api.observability.fulfillment import get_fulfillment_store
-from .fulfillment_service import FulfillmentService
+from .fulfillment_service import FulfillmentService, FulfillmentTaskOutcome
+from smplat_api.domain.fulfillment import provider_registry
+from .http_clients import HttpClientLimits, host_key, provider_client, provider_http_limits
+from .provider_limits import ProviderThrottledError, get_provider_guard
+from .provider_probe_schedule import get_probe_scheduler
+from .scheduling import FairShareScheduler
+from .templating import compile_template
 
 
 SessionFactory = Callable[[], Awaitable[AsyncSession]] | Callable[[], AsyncSession]
@@ -40,10 +47,6 @@ def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-_TEMPLATE_PATTERN = re.compile(r"\{\{\s*([^}]+?)\s*\}\}")
-_SINGLE_TEMPLATE_PATTERN = re.compile(r"^\s*\{\{\s*([^}]+?)\s*\}\}\s*$")
-
-
 @dataclass
 class TaskProcessorMetrics:
     """Simple in-memory metrics for monitoring task processing."""
@@ -52,6 +55,7 @@ class TaskProcessorMetrics:
     tasks_failed: int = 0
     tasks_retried: int = 0
     tasks_dead_lettered: int = 0
+    tasks_deferred: int = 0
     loop_errors: int = 0
     last_run_started_at: datetime | None = None
     last_run_finished_at: datetime | None = None
@@ -65,6 +69,7 @@ class TaskProcessorMetrics:
             "tasks_failed": self.tasks_failed,
             "tasks_retried": self.tasks_retried,
             "tasks_dead_lettered": self.tasks_dead_lettered,
+            "tasks_deferred": self.tasks_deferred,
             "loop_errors": self.loop_errors,
             "last_run_started_at": self.last_run_started_at.isoformat() if self.last_run_started_at else None,
             "last_run_finished_at": self.last_run_finished_at.isoformat() if self.last_run_finished_at else None,
@@ -82,10 +87,22 @@ class TaskProcessor:
         session_factory: SessionFactory,
         poll_interval_seconds: int = 30,
         batch_size: int = 25,
+        concurrency: int = 4,
+        lease_seconds: int = 300,
+        worker_id: str | None = None,
+        batch_writes: bool = False,
+        lane_weights: Mapping[str, float] | None = None,
     ) -> None:
         self._session_factory = session_factory
         self._poll_interval = poll_interval_seconds
         self._batch_size = batch_size
+        self._concurrency = max(1, concurrency)
+        self._lease_seconds = lease_seconds
+        self._worker_id = worker_id or default_worker_id()
+        self._batch_writes = batch_writes
+        self._scheduler = FairShareScheduler(lane_weights)
+        self._backoff = AdaptivePollBackoff.for_interval(poll_interval_seconds)
+        self._wakeup = get_work_signal(FULFILLMENT_TASKS)
         self._running = False
         self._metrics = TaskProcessorMetrics()
         self._observability = get_fulfillment_store()
@@ -110,6 +127,18 @@ class TaskProcessor:
     def batch_size(self) -> int:
         return self._batch_size
 
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @property
+    def worker_id(self) -> str:
+        return self._worker_id
+
+    @property
+    def batch_writes(self) -> bool:
+        return self._batch_writes
+
     async def start(self) -> None:
         """Start the processor loop until `stop` is called."""
         if self._running:
@@ -120,8 +149,9 @@ class TaskProcessor:
 
         try:
             while self._running:
+                claimed = 0
                 try:
-                    await self.run_once()
+                    claimed = await self.run_once()
                 except asyncio.CancelledError:
                     raise
                 except Exception as exc:  # pragma: no cover - defensive logging
@@ -137,7 +167,9 @@ class TaskProcessor:
                 if not self._running:
                     break
 
-                await asyncio.sleep(self._poll_interval)
+                delay = self._backoff.next_delay(claimed, self._batch_size)
+                if delay > 0:
+                    await self._wakeup.wait(delay)
         finally:
             self._running = False
             logger.info("Fulfillment task processor stopped")
@@ -145,38 +177,220 @@ class TaskProcessor:
     def stop(self) -> None:
         """Signal the processor loop to stop after the current iteration."""
         self._running = False
+        self._wakeup.wake()
+
+    async def run_once(self) -> int:
+        """Claim a batch of due tasks and process it on the bounded worker pool.
 
-    async def run_once(self) -> None:
-        """Process a single batch of pending tasks."""
+        Returns the number of claimed tasks so the loop can drain full batches
+        without waiting.
+        """
         start_time = _utcnow()
         self._metrics.last_run_started_at = start_time
-        session = await self._acquire_session()
         try:
-            service = FulfillmentService(session)
-            tasks = await service.get_pending_tasks(limit=self._batch_size)
+            tasks = await self._claim_batch()
 
             if not tasks:
                 logger.debug("No pending fulfillment tasks found")
-                return
+                return 0
+
+            logger.info(
+                "Processing fulfillment tasks",
+                count=len(tasks),
+                concurrency=self._concurrency,
+                worker_id=self._worker_id,
+                batch_writes=self._batch_writes,
+            )
 
-            logger.info("Processing fulfillment tasks", count=len(tasks))
+            if self._batch_writes:
+                await self._run_batch(tasks)
+                return len(tasks)
 
-            for task in tasks:
-                await self._process_single_task(service, task)
+            semaphore = asyncio.Semaphore(self._concurrency)
+            outcomes = await asyncio.gather(
+                *(self._run_claimed_task(task, semaphore) for task in tasks),
+                return_exceptions=True,
+            )
+            errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+            if errors:
+                raise errors[0]
+            return len(tasks)
         except Exception as exc:
             self._metrics.last_error = str(exc)
             self._metrics.last_error_at = _utcnow()
             raise
         finally:
-            await session.close()
             finished = _utcnow()
             self._metrics.last_run_finished_at = finished
             self._metrics.last_run_duration_seconds = (finished - start_time).total_seconds()
 
-    async def _process_single_task(self, service: FulfillmentService, task: FulfillmentTask) -> None:
-        """Process an individual fulfillment task."""
-        await service.update_task_status(task.id, FulfillmentTaskStatusEnum.IN_PROGRESS)
+    async def _claim_batch(self) -> list[FulfillmentTask]:
+        """Lease the next batch of due tasks to this worker."""
+        session = await self._acquire_session()
+        try:
+            service = FulfillmentService(session)
+            return await service.claim_pending_tasks(
+                self._worker_id,
+                limit=self._batch_size,
+                lease_seconds=self._lease_seconds,
+                scheduler=self._scheduler,
+            )
+        finally:
+            await session.close()
+
+    async def _run_claimed_task(self, task: FulfillmentTask, semaphore: asyncio.Semaphore) -> None:
+        """Process a claimed task on its own session once a worker slot frees up."""
+        async with semaphore:
+            session = await self._acquire_session()
+            try:
+                service = FulfillmentService(session)
+                claimed = await service.get_task(task.id)
+                if claimed is None:
+                    logger.warning("Claimed fulfillment task disappeared", task_id=str(task.id))
+                    return
+                await self._process_single_task(service, claimed)
+            finally:
+                await session.close()
+
+    async def _run_batch(self, tasks: list[FulfillmentTask]) -> None:
+        """Execute a claimed batch and write its state transitions in bulk.
+
+        Tasks with a configured execution (external HTTP side effects) persist
+        their outcome as soon as they finish so a crash cannot replay the call;
+        all other outcomes are buffered and written with one bulk UPDATE and a
+        single commit at the end of the batch.
+        """
+        semaphore = asyncio.Semaphore(self._concurrency)
+        results = await asyncio.gather(
+            *(self._run_batched_task(task, semaphore) for task in tasks),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        buffered = [
+            outcome
+            for outcome in results
+            if isinstance(outcome, FulfillmentTaskOutcome) and not self._has_external_side_effects(outcome.task)
+        ]
+
+        if buffered:
+            session = await self._acquire_session()
+            try:
+                await FulfillmentService(session).apply_task_outcomes(buffered)
+            finally:
+                await session.close()
+            for outcome in buffered:
+                self._record_outcome(outcome)
+
+        if errors:
+            raise errors[0]
+
+    async def _run_batched_task(
+        self,
+        task: FulfillmentTask,
+        semaphore: asyncio.Semaphore,
+    ) -> FulfillmentTaskOutcome:
+        """Execute a claimed task and return its outcome instead of writing it."""
+        async with semaphore:
+            session = await self._acquire_session()
+            try:
+                service = FulfillmentService(session)
+                try:
+                    result = await self._execute_task(service, task)
+                    outcome = FulfillmentTaskOutcome(
+                        task=task,
+                        status=FulfillmentTaskStatusEnum.COMPLETED,
+                        result=result,
+                    )
+                except Exception as exc:
+                    outcome = self._failure_outcome(task, exc)
+                    if not outcome.deferred:
+                        self._record_failure(task, exc)
+
+                if self._has_external_side_effects(task):
+                    await service.apply_task_outcomes([outcome])
+                    self._record_outcome(outcome)
+                return outcome
+            finally:
+                await session.close()
 
+    @staticmethod
+    def _has_external_side_effects(task: FulfillmentTask) -> bool:
+        return bool((task.payload or {}).get("execution"))
+
+    def _failure_outcome(self, task: FulfillmentTask, exc: Exception) -> FulfillmentTaskOutcome:
+        """Decide between deferral, retry and dead letter for a failed task."""
+        if isinstance(exc, ProviderThrottledError):
+            return FulfillmentTaskOutcome(
+                task=task,
+                status=FulfillmentTaskStatusEnum.PENDING,
+                error_message=str(exc),
+                retry_delay_seconds=exc.retry_after,
+                deferred=True,
+            )
+        current_retries = task.retry_count or 0
+        max_retries = task.max_retries or 0
+        if current_retries >= max_retries:
+            return FulfillmentTaskOutcome(
+                task=task,
+                status=FulfillmentTaskStatusEnum.FAILED,
+                error_message=str(exc),
+                result={
+                    "dead_letter": True,
+                    "retry_count": current_retries,
+                    "max_retries": max_retries,
+                },
+            )
+        return FulfillmentTaskOutcome(
+            task=task,
+            status=FulfillmentTaskStatusEnum.PENDING,
+            error_message=str(exc),
+            retry_delay_seconds=self._compute_retry_delay(current_retries),
+        )
+
+    def _record_outcome(self, outcome: FulfillmentTaskOutcome) -> None:
+        """Update metrics/observability once an outcome has been persisted."""
+        task = outcome.task
+        if outcome.status == FulfillmentTaskStatusEnum.COMPLETED:
+            self._record_success(task)
+        elif outcome.deferred:
+            self._record_deferral(task, outcome)
+        else:
+            self._record_failure_resolution(
+                task,
+                outcome.status == FulfillmentTaskStatusEnum.PENDING,
+                outcome.retry_delay_seconds,
+                outcome.error_message or "",
+            )
+
+    def _record_success(self, task: FulfillmentTask) -> None:
+        self._metrics.tasks_processed += 1
+        self._observability.record_processed(task.task_type.value)
+
+        logger.info(
+            "Fulfillment task completed",
+            task_id=str(task.id),
+            task_type=task.task_type.value,
+        )
+
+    def _record_deferral(self, task: FulfillmentTask, outcome: FulfillmentTaskOutcome) -> None:
+        self._metrics.tasks_deferred += 1
+        self._observability.record_deferred(task.task_type.value, outcome.error_message or "")
+        logger.info(
+            "Fulfillment task deferred by provider limits",
+            task_id=str(task.id),
+            task_type=task.task_type.value,
+            reason=outcome.error_message,
+            next_run_at=task.scheduled_at.isoformat() if task.scheduled_at else None,
+        )
+
+    def _record_failure(self, task: FulfillmentTask, exc: Exception) -> None:
+        self._metrics.tasks_failed += 1
+        self._metrics.last_error = str(exc)
+        self._metrics.last_error_at = _utcnow()
+        self._observability.record_failure(task.task_type.value, str(exc))
+
+    async def _process_single_task(self, service: FulfillmentService, task: FulfillmentTask) -> None:
+        """Process an individual fulfillment task already claimed as IN_PROGRESS."""
         try:
             result = await self._execute_task(service, task)
             await service.update_task_status(
@@ -184,46 +398,50 @@ class TaskProcessor:
                 FulfillmentTaskStatusEnum.COMPLETED,
                 result_data=result,
             )
-            self._metrics.tasks_processed += 1
-            self._observability.record_processed(task.task_type.value)
+            self._record_success(task)
+        except ProviderThrottledError as exc:
+            outcome = self._failure_outcome(task, exc)
+            await service.apply_task_outcomes([outcome])
+            self._record_outcome(outcome)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            self._record_failure(task, exc)
+            should_retry, retry_delay = await self._handle_task_failure(service, task, exc)
+            self._record_failure_resolution(task, should_retry, retry_delay, str(exc))
 
-            logger.info(
-                "Fulfillment task completed",
+    def _record_failure_resolution(
+        self,
+        task: FulfillmentTask,
+        should_retry: bool,
+        retry_delay: int,
+        error: str,
+    ) -> None:
+        """Track whether a failed task was rescheduled or dead-lettered."""
+        if should_retry:
+            self._metrics.tasks_retried += 1
+            self._observability.record_retry(
+                task.task_type.value,
+                task.scheduled_at,
+                retry_delay,
+            )
+            logger.warning(
+                "Fulfillment task failure scheduled for retry",
                 task_id=str(task.id),
                 task_type=task.task_type.value,
+                retry_count=task.retry_count,
+                max_retries=task.max_retries,
+                next_run_at=task.scheduled_at.isoformat() if task.scheduled_at else None,
+            )
+        else:
+            self._metrics.tasks_dead_lettered += 1
+            self._observability.record_dead_letter(task.task_type.value)
+            logger.error(
+                "Fulfillment task failed after exhausting retries",
+                task_id=str(task.id),
+                task_type=task.task_type.value,
+                retry_count=task.retry_count,
+                max_retries=task.max_retries,
+                error=error,
             )
-        except Exception as exc:  # pragma: no cover - defensive logging
-            self._metrics.tasks_failed += 1
-            self._metrics.last_error = str(exc)
-            self._metrics.last_error_at = _utcnow()
-            self._observability.record_failure(task.task_type.value, str(exc))
-            should_retry, retry_delay = await self._handle_task_failure(service, task, exc)
-            if should_retry:
-                self._metrics.tasks_retried += 1
-                self._observability.record_retry(
-                    task.task_type.value,
-                    task.scheduled_at,
-                    retry_delay,
-                )
-                logger.warning(
-                    "Fulfillment task failure scheduled for retry",
-                    task_id=str(task.id),
-                    task_type=task.task_type.value,
-                    retry_count=task.retry_count,
-                    max_retries=task.max_retries,
-                    next_run_at=task.scheduled_at.isoformat() if task.scheduled_at else None,
-                )
-            else:
-                self._metrics.tasks_dead_lettered += 1
-                self._observability.record_dead_letter(task.task_type.value)
-                logger.error(
-                    "Fulfillment task failed after exhausting retries",
-                    task_id=str(task.id),
-                    task_type=task.task_type.value,
-                    retry_count=task.retry_count,
-                    max_retries=task.max_retries,
-                    error=str(exc),
-                )
 
     async def _execute_task(self, service: FulfillmentService, task: FulfillmentTask) -> dict[str, Any]:
         """Execute business logic for a task type."""
@@ -273,11 +491,18 @@ class TaskProcessor:
         context_snapshot = payload.get("context")
         context = await self._build_execution_context(service, task, context_snapshot, environment_keys)
 
+        template_key = payload.get("template_key")
         try:
-            rendered_execution = self._render_template_structure(execution_config, context)
+            rendered_execution = compile_template(
+                execution_config,
+                cache_key=f"{template_key}:execution" if template_key else None,
+            ).render(context)
             rendered_payload = None
             if payload.get("raw_payload") is not None:
-                rendered_payload = self._render_template_structure(payload["raw_payload"], context)
+                rendered_payload = compile_template(
+                    payload["raw_payload"],
+                    cache_key=f"{template_key}:payload" if template_key else None,
+                ).render(context)
         except Exception as exc:
             logger.exception(
                 "Failed to render fulfillment task template",
@@ -289,7 +514,8 @@ class TaskProcessor:
         execution_kind = str(rendered_execution.get("kind") or "http").lower()
 
         if execution_kind == "http":
-            result = await self._perform_http_execution(rendered_execution)
+            async with self._provider_guard(rendered_execution):
+                result = await self._perform_http_execution(rendered_execution)
             if rendered_payload is not None:
                 result["payload_snapshot"] = rendered_payload
             result["execution_kind"] = "http"
@@ -297,6 +523,26 @@ class TaskProcessor:
 
         raise RuntimeError(f"Unsupported execution kind '{execution_kind}' for fulfillment task")
 
+    @staticmethod
+    @asynccontextmanager
+    async def _provider_guard(execution: dict[str, Any]) -> AsyncIterator[None]:
+        """Rate limit/circuit-break executions that name a ``provider_id``.
+
+        Outcomes also feed the probe scheduler as passive provider health.
+        """
+        provider_id = execution.get("provider_id")
+        if not provider_id:
+            yield
+            return
+        service_id = execution.get("service_id")
+        async with get_provider_guard().guard(str(provider_id), str(service_id) if service_id else None):
+            try:
+                yield
+            except Exception:
+                get_probe_scheduler().record_call_outcome(str(provider_id), success=False)
+                raise
+        get_probe_scheduler().record_call_outcome(str(provider_id), success=True)
+
     async def _build_execution_context(
         self,
         service: FulfillmentService,
@@ -336,101 +582,6 @@ class TaskProcessor:
 
         return context
 
-    def _render_template_structure(self, structure: Any, context: dict[str, Any]) -> Any:
-        """Render templated values within a nested structure."""
-        if isinstance(structure, dict):
-            return {key: self._render_template_structure(value, context) for key, value in structure.items()}
-        if isinstance(structure, list):
-            return [self._render_template_structure(value, context) for value in structure]
-        if isinstance(structure, str):
-            if "{{" not in structure:
-                return structure
-
-            single_match = _SINGLE_TEMPLATE_PATTERN.match(structure)
-            if single_match:
-                expression = single_match.group(1).strip()
-                value = self._resolve_context_path(context, expression)
-                return value
-
-            rendered = self._render_template_string(structure, context)
-            return self._coerce_scalar(rendered, structure)
-        return structure
-
-    def _render_template_string(self, template: str, context: dict[str, Any]) -> str:
-        """Render interpolations for inline template strings."""
-
-        def replacer(match: re.Match[str]) -> str:
-            expression = match.group(1).strip()
-            value = self._resolve_context_path(context, expression)
-            if value is None:
-                return ""
-            if isinstance(value, (dict, list)):
-                return json.dumps(value)
-            return str(value)
-
-        return _TEMPLATE_PATTERN.sub(replacer, template)
-
-    def _resolve_context_path(self, context: dict[str, Any], expression: str) -> Any:
-        """Resolve dotted template expressions into context values."""
-        if not expression:
-            raise KeyError("Empty template expression")
-
-        if "|" in expression:
-            raise KeyError(f"Unsupported template filter syntax in '{expression}'")
-
-        current: Any = context
-        for part in expression.split("."):
-            key = part.strip()
-            if key == "":
-                raise KeyError(f"Invalid empty segment in template expression '{expression}'")
-
-            if isinstance(current, dict):
-                if key not in current:
-                    raise KeyError(f"Missing key '{key}' in template context")
-                current = current[key]
-            elif isinstance(current, (list, tuple)):
-                if not key.isdigit():
-                    raise KeyError(f"List index '{key}' must be numeric in template expression '{expression}'")
-                index = int(key)
-                if index >= len(current):
-                    raise KeyError(f"Index {index} out of range for template expression '{expression}'")
-                current = current[index]
-            else:
-                if not hasattr(current, key):
-                    raise KeyError(f"Attribute '{key}' missing on template context object")
-                current = getattr(current, key)
-
-        return current
-
-    @staticmethod
-    def _coerce_scalar(rendered: str, original: str) -> Any:
-        """Attempt to coerce rendered scalar values into native Python types."""
-        if not isinstance(rendered, str):
-            return rendered
-
-        trimmed = rendered.strip()
-        if not trimmed:
-            return ""
-
-        if trimmed.lower() in {"null", "none"}:
-            return None
-        if trimmed.lower() == "true":
-            return True
-        if trimmed.lower() == "false":
-            return False
-
-        # Only attempt numeric parsing if the original value was a pure template
-        if original.strip().startswith("{{") and original.strip().endswith("}}"):
-            try:
-                return int(trimmed)
-            except ValueError:
-                try:
-                    return float(trimmed)
-                except ValueError:
-                    pass
-
-        return rendered
-
     async def _perform_http_execution(self, execution: dict[str, Any]) -> dict[str, Any]:
         """Execute an HTTP request based on execution configuration."""
         method = str(execution.get("method") or "POST").upper()
@@ -462,14 +613,16 @@ class TaskProcessor:
         elif body is not None:
             data = body
 
+        client_key, limits = self._execution_client(execution, str(url))
+        default_timeout = limits.timeout_seconds or 30.0
         timeout_value = execution.get("timeout_seconds")
         try:
-            timeout_seconds = float(timeout_value) if timeout_value is not None else 30.0
+            timeout_seconds = float(timeout_value) if timeout_value is not None else default_timeout
         except (TypeError, ValueError):
-            timeout_seconds = 30.0
+            timeout_seconds = default_timeout
 
         start = monotonic()
-        async with httpx.AsyncClient(timeout=timeout_seconds) as client:
+        async with provider_client(client_key, limits=limits) as client:
             response = await client.request(
                 method,
                 str(url),
@@ -478,6 +631,7 @@ class TaskProcessor:
                 json=json_payload,
                 content=content,
                 data=data,
+                timeout=limits.build_timeout(timeout_seconds),
             )
         duration_ms = int((monotonic() - start) * 1000)
 
@@ -500,6 +654,19 @@ class TaskProcessor:
             "response": response_data,
         }
 
+    @staticmethod
+    def _execution_client(execution: dict[str, Any], url: str) -> tuple[str, HttpClientLimits]:
+        """Return the pooled client key and HTTP limits for an execution.
+
+        Executions naming a ``provider_id`` share that provider's pool, sized by its
+        descriptor ``metadata["http"]``; others are keyed by URL host.
+        """
+        provider_id = execution.get("provider_id")
+        if provider_id:
+            provider = provider_registry.get_provider(str(provider_id))
+            return str(provider_id), provider_http_limits(provider.metadata if provider else None)
+        return host_key(url), HttpClientLimits.defaults()
+
     @staticmethod
     def _environment_context(keys: list[str] | None) -> dict[str, Any]:
         if not keys:
@@ -552,29 +719,23 @@ class TaskProcessor:
         exc: Exception,
     ) -> tuple[bool, int]:
         """Handle task failure by scheduling retries or marking the task as failed."""
-        current_retries = task.retry_count or 0
-        max_retries = task.max_retries or 0
+        outcome = self._failure_outcome(task, exc)
 
-        if current_retries >= max_retries:
+        if outcome.status == FulfillmentTaskStatusEnum.FAILED:
             await service.update_task_status(
                 task.id,
                 FulfillmentTaskStatusEnum.FAILED,
-                error_message=str(exc),
-                result_data={
-                    "dead_letter": True,
-                    "retry_count": current_retries,
-                    "max_retries": max_retries,
-                },
+                error_message=outcome.error_message,
+                result_data=outcome.result,
             )
             return False, 0
 
-        delay_seconds = self._compute_retry_delay(current_retries)
         await service.schedule_retry(
             task=task,
-            delay_seconds=delay_seconds,
-            error_message=str(exc),
+            delay_seconds=outcome.retry_delay_seconds,
+            error_message=outcome.error_message or str(exc),
         )
-        return True, delay_seconds
+        return True, outcome.retry_delay_seconds
 
     async def _acquire_session(self) -> AsyncSession:
         """Create or await an async session from the configured factory."""
@@ -589,5 +750,11 @@ class TaskProcessor:
             "running": self.is_running,
             "poll_interval_seconds": self._poll_interval,
             "batch_size": self._batch_size,
+            "concurrency": self._concurrency,
+            "lease_seconds": self._lease_seconds,
+            "worker_id": self._worker_id,
+            "batch_writes": self._batch_writes,
+            "next_poll_delay_seconds": self._backoff.current_seconds,
+            "queue": self._scheduler.snapshot(),
             "metrics": self._metrics.snapshot(),
         }
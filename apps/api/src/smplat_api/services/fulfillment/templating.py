@@ -0,0 +1,271 @@
+"""Compiled ``{{ path.to.value }}`` templates for fulfillment and provider payloads.
+
+Execution configs (``TaskProcessor``) and provider endpoint definitions
+(``provider_endpoints``) are static per product/provider, while the context
+changes per task. ``compile_template`` parses a nested structure once into a
+render plan of closures, so each render is a straight evaluation against the
+context instead of a regex walk. Plans are cached under a caller key (the task's
+product config hash, the provider endpoint's config version) and fall back to a
+fingerprint of the config.
+
+Two resolution modes share the same plan format:
+
+* ``strict=True`` (fulfillment executions): dotted paths walk dicts, list
+  indices and attributes; missing values raise ``KeyError``. A string that is a
+  single placeholder returns the raw value, while inline interpolations are
+  stringified (JSON for containers) and coerced back to ``bool``/``None``/numbers.
+* ``strict=False`` (provider endpoints): placeholders are looked up as flat
+  context keys first, then as dotted paths; unknown placeholders are left in
+  place and scalar values are rendered as strings.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Mapping
+
+_TEMPLATE_PATTERN = re.compile(r"\{\{\s*([^}]+?)\s*\}\}")
+_PLAN_CACHE_SIZE = 512
+_MISSING = object()
+
+RenderFn = Callable[[Mapping[str, Any]], Any]
+
+
+class TemplatePlan:
+    """Pre-parsed render plan for one template structure."""
+
+    __slots__ = ("fingerprint", "strict", "_render")
+
+    def __init__(self, fingerprint: str, strict: bool, render: RenderFn) -> None:
+        self.fingerprint = fingerprint
+        self.strict = strict
+        self._render = render
+
+    def render(self, context: Mapping[str, Any]) -> Any:
+        return self._render(context)
+
+
+def config_fingerprint(structure: Any) -> str:
+    """Stable hash of a JSON-like template structure."""
+
+    encoded = json.dumps(structure, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+_PLAN_CACHE: "OrderedDict[tuple[bool, str], TemplatePlan]" = OrderedDict()
+
+
+def compile_template(structure: Any, *, strict: bool = True, cache_key: str | None = None) -> TemplatePlan:
+    """Return the cached render plan for ``structure``, compiling it on first use.
+
+    ``cache_key`` lets callers supply their own config hash; by default the
+    structure is fingerprinted.
+    """
+
+    fingerprint = cache_key or config_fingerprint(structure)
+    key = (strict, fingerprint)
+    plan = _PLAN_CACHE.get(key)
+    if plan is not None:
+        _PLAN_CACHE.move_to_end(key)
+        return plan
+    plan = TemplatePlan(fingerprint, strict, _compile_node(structure, strict))
+    _PLAN_CACHE[key] = plan
+    if len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+        _PLAN_CACHE.popitem(last=False)
+    return plan
+
+
+def render_template(structure: Any, context: Mapping[str, Any], *, strict: bool = True) -> Any:
+    """Compile (or reuse) the plan for ``structure`` and render it against ``context``."""
+
+    return compile_template(structure, strict=strict).render(context)
+
+
+def clear_template_cache() -> None:
+    _PLAN_CACHE.clear()
+
+
+def _compile_node(node: Any, strict: bool) -> RenderFn:
+    if isinstance(node, Mapping):
+        items = [(key, _compile_node(value, strict)) for key, value in node.items()]
+        return lambda context: {key: render(context) for key, render in items}
+    if isinstance(node, (list, tuple)):
+        renderers = [_compile_node(value, strict) for value in node]
+        return lambda context: [render(context) for render in renderers]
+    if isinstance(node, str) and "{{" in node:
+        return _compile_string(node, strict)
+    return lambda context: node
+
+
+def _compile_string(template: str, strict: bool) -> RenderFn:
+    matches = list(_TEMPLATE_PATTERN.finditer(template))
+    if not matches:
+        return lambda context: template
+
+    resolve = _compile_strict_path if strict else _compile_lenient_path
+    if len(matches) == 1 and matches[0].group(0) == template.strip():
+        lookup = resolve(matches[0].group(1).strip())
+        if strict:
+            return lookup
+        return _lenient_single(lookup, template)
+
+    parts: list[str | tuple[RenderFn, str]] = []
+    cursor = 0
+    for match in matches:
+        if match.start() > cursor:
+            parts.append(template[cursor : match.start()])
+        parts.append((resolve(match.group(1).strip()), match.group(0)))
+        cursor = match.end()
+    if cursor < len(template):
+        parts.append(template[cursor:])
+
+    if strict:
+        numeric = template.strip().startswith("{{") and template.strip().endswith("}}")
+
+        def render_strict(context: Mapping[str, Any]) -> Any:
+            rendered = "".join(
+                part if isinstance(part, str) else _stringify_strict(part[0](context)) for part in parts
+            )
+            return coerce_scalar(rendered, numeric=numeric)
+
+        return render_strict
+
+    def render_lenient(context: Mapping[str, Any]) -> str:
+        chunks: list[str] = []
+        for part in parts:
+            if isinstance(part, str):
+                chunks.append(part)
+                continue
+            value = part[0](context)
+            if value is _MISSING:
+                chunks.append(part[1])
+            else:
+                chunks.append("" if value is None else str(value))
+        return "".join(chunks)
+
+    return render_lenient
+
+
+def _lenient_single(lookup: RenderFn, template: str) -> RenderFn:
+    def render(context: Mapping[str, Any]) -> Any:
+        value = lookup(context)
+        if value is _MISSING:
+            return template
+        if isinstance(value, (dict, list)):
+            return value
+        return "" if value is None else str(value)
+
+    return render
+
+
+def _stringify_strict(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _fail(message: str) -> RenderFn:
+    def render(context: Mapping[str, Any]) -> Any:
+        raise KeyError(message)
+
+    return render
+
+
+def _compile_strict_path(expression: str) -> RenderFn:
+    if not expression:
+        return _fail("Empty template expression")
+    if "|" in expression:
+        return _fail(f"Unsupported template filter syntax in '{expression}'")
+
+    segments: list[tuple[str, int | None]] = []
+    for part in expression.split("."):
+        key = part.strip()
+        if key == "":
+            return _fail(f"Invalid empty segment in template expression '{expression}'")
+        segments.append((key, int(key) if key.isdigit() else None))
+
+    def resolve(context: Mapping[str, Any]) -> Any:
+        current: Any = context
+        for key, index in segments:
+            if isinstance(current, dict):
+                if key not in current:
+                    raise KeyError(f"Missing key '{key}' in template context")
+                current = current[key]
+            elif isinstance(current, (list, tuple)):
+                if index is None:
+                    raise KeyError(f"List index '{key}' must be numeric in template expression '{expression}'")
+                if index >= len(current):
+                    raise KeyError(f"Index {index} out of range for template expression '{expression}'")
+                current = current[index]
+            else:
+                if not hasattr(current, key):
+                    raise KeyError(f"Attribute '{key}' missing on template context object")
+                current = getattr(current, key)
+        return current
+
+    return resolve
+
+
+def _compile_lenient_path(expression: str) -> RenderFn:
+    segments = [(part.strip(), int(part) if part.strip().isdigit() else None) for part in expression.split(".")]
+
+    def resolve(context: Mapping[str, Any]) -> Any:
+        if expression in context:
+            return context[expression]
+        if len(segments) == 1:
+            return _MISSING
+        current: Any = context
+        for key, index in segments:
+            if isinstance(current, Mapping):
+                current = current.get(key, _MISSING)
+            elif isinstance(current, (list, tuple)) and index is not None and index < len(current):
+                current = current[index]
+            else:
+                return _MISSING
+            if current is _MISSING:
+                return _MISSING
+        return current
+
+    return resolve
+
+
+def coerce_scalar(rendered: str, *, numeric: bool = False) -> Any:
+    """Coerce an interpolated string back into ``None``/``bool`` (and numbers when ``numeric``)."""
+
+    trimmed = rendered.strip()
+    if not trimmed:
+        return ""
+
+    lowered = trimmed.lower()
+    if lowered in {"null", "none"}:
+        return None
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+
+    if numeric:
+        try:
+            return int(trimmed)
+        except ValueError:
+            try:
+                return float(trimmed)
+            except ValueError:
+                pass
+
+    return rendered
+
+
+__all__ = [
+    "TemplatePlan",
+    "clear_template_cache",
+    "coerce_scalar",
+    "compile_template",
+    "config_fingerprint",
+    "render_template",
+]
@@ -12,6 +12,7 @@ from sqlalchemy.orm import selectinload
 
 from smplat_api.celery_app import celery_app
 from smplat_api.core.settings import settings
+from smplat_api.core.work_signals import JOURNEY_RUNS, notify_work
 from smplat_api.models import JourneyComponent, Product, ProductJourneyComponent
 from smplat_api.models.journey_runtime import JourneyComponentRun, JourneyComponentRunStatusEnum
 from smplat_api.schemas.product import JourneyComponentRunCreate
@@ -293,6 +294,7 @@ class JourneyRuntimeService:
                 run_id=str(run.id),
                 token=run.run_token,
             )
+            notify_work(JOURNEY_RUNS)
             return
         try:
             celery_app.send_task(
@@ -6,6 +6,11 @@ from .analytics import (  # noqa: F401
     LoyaltySegmentSummary,
     LoyaltyVelocityMetrics,
 )
+from .catalog_cache import (  # noqa: F401
+    LoyaltyRewardDescriptor,
+    LoyaltyTierDescriptor,
+    invalidate_loyalty_catalog,
+)
 from .loyalty_service import (  # noqa: F401
     LoyaltyGuardrailOverrideRecord,
     LoyaltyGuardrailSnapshot,
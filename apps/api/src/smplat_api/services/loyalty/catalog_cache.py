@@ -0,0 +1,251 @@
+"""Process-wide cache of active loyalty tiers, rewards and nudge campaigns.
+
+Ledger posting, member snapshots and nudge orchestration all read the same small
+catalog. ``load_loyalty_catalog`` serves it from memory and reloads it with three
+queries when:
+
+* a commit wrote a ``LoyaltyTier``, ``LoyaltyReward`` or ``LoyaltyNudgeCampaign``
+  (the ``after_commit`` hook calls ``invalidate_loyalty_catalog``, which raises the
+  ``LOYALTY_CATALOG`` work signal; the Redis wake-up bridge relays it to other
+  replicas);
+* the snapshot is older than ``LOYALTY_CATALOG_CACHE_TTL_SECONDS``, which bounds
+  staleness for writes that bypass the ORM.
+
+Tiers are frozen descriptors sorted by threshold, so tier selection is a bisect
+over ``thresholds``.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from itertools import chain
+from typing import Any, Mapping, Optional, Tuple
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from smplat_api.core.settings import settings
+from smplat_api.core.work_signals import LOYALTY_CATALOG, get_work_signal, notify_work
+from smplat_api.models.loyalty import (
+    LoyaltyNudgeCampaign,
+    LoyaltyNudgeChannel,
+    LoyaltyReward,
+    LoyaltyTier,
+)
+
+_CHANGED_KEY = "loyalty_catalog_changed"
+
+
+@dataclass
+class NudgeCampaignConfig:
+    """Resolved campaign configuration for nudge orchestration."""
+
+    slug: str
+    ttl: timedelta
+    frequency_cap: timedelta
+    default_priority: int
+    channels: list[LoyaltyNudgeChannel]
+
+
+@dataclass(frozen=True, slots=True)
+class LoyaltyTierDescriptor:
+    """Immutable view of an active loyalty tier."""
+
+    id: UUID
+    slug: str
+    name: str
+    description: str | None
+    point_threshold: Decimal
+    benefits: Tuple[Any, ...] = ()
+    is_active: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class LoyaltyRewardDescriptor:
+    """Immutable view of an active loyalty reward."""
+
+    id: UUID
+    slug: str
+    name: str
+    description: str | None
+    cost_points: Decimal
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+    is_active: bool = True
+
+
+@dataclass(frozen=True)
+class LoyaltyCatalogSnapshot:
+    """One consistent load of the loyalty catalog."""
+
+    version: int
+    loaded_at: datetime
+    tiers: Tuple[LoyaltyTierDescriptor, ...]
+    rewards: Tuple[LoyaltyRewardDescriptor, ...]
+    campaigns: Mapping[str, NudgeCampaignConfig]
+    thresholds: Tuple[Decimal, ...] = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "thresholds", tuple(tier.point_threshold for tier in self.tiers))
+
+    def tier_for_points(self, points: Decimal | None) -> Optional[LoyaltyTierDescriptor]:
+        """Return the highest tier whose threshold is at most ``points``."""
+
+        index = bisect_right(self.thresholds, Decimal(points or 0)) - 1
+        return self.tiers[index] if index >= 0 else None
+
+    def next_tier_above(self, threshold: Decimal | None) -> Optional[LoyaltyTierDescriptor]:
+        """Return the first tier with a threshold strictly above ``threshold``."""
+
+        index = bisect_right(self.thresholds, Decimal(threshold or 0))
+        return self.tiers[index] if index < len(self.tiers) else None
+
+    def get_tier(self, tier_id: UUID | None) -> Optional[LoyaltyTierDescriptor]:
+        if tier_id is None:
+            return None
+        return next((tier for tier in self.tiers if tier.id == tier_id), None)
+
+
+_SNAPSHOT: LoyaltyCatalogSnapshot | None = None
+_VERSION = 0
+
+
+def _tier_descriptor(tier: LoyaltyTier) -> LoyaltyTierDescriptor:
+    benefits = tier.benefits if isinstance(tier.benefits, (list, tuple)) else []
+    return LoyaltyTierDescriptor(
+        id=tier.id,
+        slug=tier.slug,
+        name=tier.name,
+        description=tier.description,
+        point_threshold=Decimal(tier.point_threshold or 0),
+        benefits=tuple(benefits),
+        is_active=bool(tier.is_active),
+    )
+
+
+def _reward_descriptor(reward: LoyaltyReward) -> LoyaltyRewardDescriptor:
+    metadata = reward.metadata_json if isinstance(reward.metadata_json, Mapping) else {}
+    return LoyaltyRewardDescriptor(
+        id=reward.id,
+        slug=reward.slug,
+        name=reward.name,
+        description=reward.description,
+        cost_points=Decimal(reward.cost_points or 0),
+        metadata=dict(metadata),
+        is_active=bool(reward.is_active),
+    )
+
+
+def _campaign_config(record: LoyaltyNudgeCampaign) -> NudgeCampaignConfig:
+    channels = list(record.channel_preferences or [])
+    if not channels:
+        channels = [LoyaltyNudgeChannel.EMAIL]
+    return NudgeCampaignConfig(
+        slug=record.slug,
+        ttl=timedelta(seconds=int(record.ttl_seconds or 0) or 86_400),
+        frequency_cap=timedelta(hours=int(record.frequency_cap_hours or 0) or 12),
+        default_priority=int(record.default_priority or 0),
+        channels=channels,
+    )
+
+
+async def load_loyalty_catalog(session: AsyncSession, *, force: bool = False) -> LoyaltyCatalogSnapshot:
+    """Return the cached catalog, reloading it when invalidated, expired or forced."""
+
+    global _SNAPSHOT, _VERSION
+    now = datetime.now(timezone.utc)
+    signalled = await get_work_signal(LOYALTY_CATALOG).wait(0)
+    if (
+        not force
+        and not signalled
+        and _SNAPSHOT is not None
+        and now - _SNAPSHOT.loaded_at < timedelta(seconds=settings.loyalty_catalog_cache_ttl_seconds)
+    ):
+        return _SNAPSHOT
+
+    tiers = (
+        await session.execute(
+            select(LoyaltyTier)
+            .where(LoyaltyTier.is_active.is_(True))
+            .order_by(LoyaltyTier.point_threshold.asc(), LoyaltyTier.slug.asc())
+        )
+    ).scalars().all()
+    rewards = (
+        await session.execute(
+            select(LoyaltyReward)
+            .where(LoyaltyReward.is_active.is_(True))
+            .order_by(LoyaltyReward.cost_points.asc())
+        )
+    ).scalars().all()
+    campaigns = (await session.execute(select(LoyaltyNudgeCampaign))).scalars().all()
+
+    _VERSION += 1
+    snapshot = LoyaltyCatalogSnapshot(
+        version=_VERSION,
+        loaded_at=now,
+        tiers=tuple(_tier_descriptor(tier) for tier in tiers),
+        rewards=tuple(_reward_descriptor(reward) for reward in rewards),
+        campaigns={record.slug: _campaign_config(record) for record in campaigns},
+    )
+    _SNAPSHOT = snapshot
+    logger.debug(
+        "Loyalty catalog loaded",
+        version=snapshot.version,
+        tiers=len(snapshot.tiers),
+        rewards=len(snapshot.rewards),
+        campaigns=len(snapshot.campaigns),
+    )
+    return snapshot
+
+
+def invalidate_loyalty_catalog() -> None:
+    """Make every process reload the catalog on its next read."""
+
+    notify_work(LOYALTY_CATALOG)
+
+
+def clear_cache() -> None:
+    """Drop the cached catalog of this process."""
+
+    global _SNAPSHOT
+    _SNAPSHOT = None
+
+
+@event.listens_for(Session, "after_flush")
+def _track_catalog_writes(session: Session, flush_context) -> None:  # type: ignore[no-untyped-def]
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, (LoyaltyTier, LoyaltyReward, LoyaltyNudgeCampaign)):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        session.info[_CHANGED_KEY] = True
+        return
+
+
+@event.listens_for(Session, "after_commit")
+def _announce_catalog_writes(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        invalidate_loyalty_catalog()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_catalog_writes(session: Session, previous_transaction) -> None:  # type: ignore[no-untyped-def]
+    if session.info.pop(_CHANGED_KEY, False):
+        # A load between the flush and the rollback may have cached the discarded rows.
+        get_work_signal(LOYALTY_CATALOG).wake()
+
+
+__all__ = [
+    "LoyaltyCatalogSnapshot",
+    "LoyaltyRewardDescriptor",
+    "LoyaltyTierDescriptor",
+    "NudgeCampaignConfig",
+    "clear_cache",
+    "invalidate_loyalty_catalog",
+    "load_loyalty_catalog",
+]
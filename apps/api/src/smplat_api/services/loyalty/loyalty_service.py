@@ -10,10 +10,12 @@ from typing import Any, Literal, Optional, Sequence, Tuple
 from uuid import UUID, uuid4
 
 from loguru import logger
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, case, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from smplat_api.models.loyalty import (
     LoyaltyGuardrailAuditAction,
@@ -26,7 +28,6 @@ from smplat_api.models.loyalty import (
     LoyaltyLedgerEntry,
     LoyaltyLedgerEntryType,
     LoyaltyNudge,
-    LoyaltyNudgeCampaign,
     LoyaltyNudgeChannel,
     LoyaltyNudgeDispatchEvent,
     LoyaltyNudgeStatus,
@@ -37,7 +38,6 @@ from smplat_api.models.loyalty import (
     LoyaltyRedemption,
     LoyaltyRedemptionStatus,
     LoyaltyReward,
-    LoyaltyTier,
     ReferralInvite,
     ReferralStatus,
 )
@@ -46,11 +46,21 @@ from smplat_api.services.notifications import NotificationService
 from smplat_api.core.settings import settings
 from smplat_api.observability.loyalty import get_loyalty_store
 
+from .catalog_cache import (
+    LoyaltyCatalogSnapshot,
+    LoyaltyRewardDescriptor,
+    LoyaltyTierDescriptor,
+    NudgeCampaignConfig,
+    load_loyalty_catalog,
+)
+
 
 CHECKOUT_INTENT_DEFAULT_TTL = timedelta(days=14)
 NUDGE_REFRESH_WINDOW = timedelta(hours=6)
 NUDGE_EXPIRING_POINTS_WINDOW = timedelta(days=7)
 NUDGE_REDEMPTION_STALLED_WINDOW = timedelta(days=3)
+NUDGE_AGGREGATION_PAGE_SIZE = 200
+EXPIRATION_CONSUMPTION_PAGE_SIZE = 20
 
 
 @dataclass
@@ -74,17 +84,6 @@ class LoyaltyNudgeCard:
     dismissed_at: Optional[datetime]
 
 
-@dataclass
-class NudgeCampaignConfig:
-    """Resolved campaign configuration for nudge orchestration."""
-
-    slug: str
-    ttl: timedelta
-    frequency_cap: timedelta
-    default_priority: int
-    channels: list[LoyaltyNudgeChannel]
-
-
 @dataclass
 class _NudgeSignal:
     """Internal representation of a nudge-worthy signal."""
@@ -98,6 +97,20 @@ class _NudgeSignal:
     channels: Optional[list[LoyaltyNudgeChannel]] = None
 
 
+def _nudge_card_sort_key(card: LoyaltyNudgeCard) -> tuple[int, datetime, str]:
+    return (
+        -(card.priority or 0),
+        card.expires_at or datetime.max.replace(tzinfo=timezone.utc),
+        str(card.id),
+    )
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
 @dataclass
 class LoyaltyNudgeDispatchCandidate:
     """Pending dispatch enriched with delivery channels."""
@@ -134,6 +147,15 @@ class PointsExpirationWindow:
     status: LoyaltyPointExpirationStatus
 
 
+@dataclass
+class PointExpirationSweep:
+    """Totals of one point-expiration sweep."""
+
+    expirations: int = 0
+    members: int = 0
+    points_expired: Decimal = Decimal("0")
+
+
 @dataclass
 class LoyaltyGuardrailOverrideRecord:
     """Serializable guardrail override for operator tooling."""
@@ -175,32 +197,17 @@ class LoyaltyService:
     ) -> None:
         self._db = db_session
         self._notifications = notification_service or NotificationService(db_session)
-        self._campaign_cache: dict[str, NudgeCampaignConfig] | None = None
         self._observability = get_loyalty_store()
 
-    async def _get_campaigns(self) -> dict[str, NudgeCampaignConfig]:
-        """Load loyalty nudge campaigns from persistence."""
+    async def _catalog(self) -> LoyaltyCatalogSnapshot:
+        """Return the process-wide tier/reward/campaign catalog (see ``catalog_cache``)."""
 
-        if self._campaign_cache is not None:
-            return self._campaign_cache
+        return await load_loyalty_catalog(self._db)
 
-        stmt = select(LoyaltyNudgeCampaign)
-        result = await self._db.execute(stmt)
-        campaigns: dict[str, NudgeCampaignConfig] = {}
-        for record in result.scalars().all():
-            channels = list(record.channel_preferences or [])
-            if not channels:
-                channels = [LoyaltyNudgeChannel.EMAIL]
-            campaigns[record.slug] = NudgeCampaignConfig(
-                slug=record.slug,
-                ttl=timedelta(seconds=int(record.ttl_seconds or 0) or 86_400),
-                frequency_cap=timedelta(hours=int(record.frequency_cap_hours or 0) or 12),
-                default_priority=int(record.default_priority or 0),
-                channels=channels,
-            )
+    async def _get_campaigns(self) -> dict[str, NudgeCampaignConfig]:
+        """Return loyalty nudge campaigns keyed by slug."""
 
-        self._campaign_cache = campaigns
-        return campaigns
+        return dict((await self._catalog()).campaigns)
 
     @staticmethod
     def _normalize_channels(
@@ -302,31 +309,15 @@ class LoyaltyService:
             channels=[LoyaltyNudgeChannel.EMAIL],
         )
 
-    async def list_active_tiers(self) -> list[LoyaltyTier]:
+    async def list_active_tiers(self) -> list[LoyaltyTierDescriptor]:
         """Return active tiers ordered by threshold."""
 
-        stmt = (
-            select(LoyaltyTier)
-            .where(LoyaltyTier.is_active.is_(True))
-            .order_by(LoyaltyTier.point_threshold.asc())
-        )
-        result = await self._db.execute(stmt)
-        tiers = list(result.scalars().all())
-        logger.debug("Fetched loyalty tiers", count=len(tiers))
-        return tiers
+        return list((await self._catalog()).tiers)
 
-    async def list_active_rewards(self) -> list[LoyaltyReward]:
+    async def list_active_rewards(self) -> list[LoyaltyRewardDescriptor]:
         """Return active loyalty rewards ordered by cost."""
 
-        stmt = (
-            select(LoyaltyReward)
-            .where(LoyaltyReward.is_active.is_(True))
-            .order_by(LoyaltyReward.cost_points.asc())
-        )
-        result = await self._db.execute(stmt)
-        rewards = list(result.scalars().all())
-        logger.debug("Fetched loyalty rewards", count=len(rewards))
-        return rewards
+        return list((await self._catalog()).rewards)
 
     async def get_reward(self, slug: str) -> LoyaltyReward | None:
         """Lookup a reward by slug."""
@@ -662,13 +653,7 @@ class LoyaltyService:
         for nudge in nudges:
             cards.append(self._to_nudge_card(nudge))
 
-        cards.sort(
-            key=lambda card: (
-                -(card.priority or 0),
-                card.expires_at or datetime.max.replace(tzinfo=timezone.utc),
-                str(card.id),
-            )
-        )
+        cards.sort(key=_nudge_card_sort_key)
         return cards
 
     def _to_nudge_card(self, nudge: LoyaltyNudge) -> LoyaltyNudgeCard:
@@ -757,6 +742,7 @@ class LoyaltyService:
         self,
         *,
         limit: int = 250,
+        page_size: int = NUDGE_AGGREGATION_PAGE_SIZE,
         now: datetime | None = None,
     ) -> dict[UUID, list[LoyaltyNudgeCard]]:
         """Aggregate nudges for members with actionable signals."""
@@ -800,16 +786,28 @@ class LoyaltyService:
         if not candidate_member_ids:
             return {}
 
-        stmt = select(LoyaltyMember).where(LoyaltyMember.id.in_(list(candidate_member_ids)))
-        result = await self._db.execute(stmt)
-        members = list(result.scalars().all())
-
+        # Each page costs a fixed number of set-based queries, whatever its size.
+        member_ids = sorted(candidate_member_ids, key=str)
+        page_size = max(1, page_size)
         aggregated: dict[UUID, list[LoyaltyNudgeCard]] = {}
-        for member_row in members:
-            cards = await self.list_member_nudges(member_row, now=now)
-            if cards:
-                aggregated[member_row.id] = cards
+        for start in range(0, len(member_ids), page_size):
+            page = member_ids[start : start + page_size]
+            await self._sync_nudges_bulk(page, now=now)
+            stmt = (
+                select(LoyaltyNudge)
+                .where(
+                    LoyaltyNudge.member_id.in_(page),
+                    LoyaltyNudge.status == LoyaltyNudgeStatus.ACTIVE,
+                )
+                .order_by(LoyaltyNudge.priority.desc(), LoyaltyNudge.created_at.asc())
+                .execution_options(populate_existing=True)
+            )
+            result = await self._db.execute(stmt)
+            for nudge in result.scalars().all():
+                aggregated.setdefault(nudge.member_id, []).append(self._to_nudge_card(nudge))
 
+        for cards in aggregated.values():
+            cards.sort(key=_nudge_card_sort_key)
         return aggregated
 
     async def collect_nudge_dispatch_batch(
@@ -817,39 +815,72 @@ class LoyaltyService:
         *,
         limit: int = 100,
         now: datetime | None = None,
+        worker_id: str | None = None,
+        lease_seconds: int | None = None,
     ) -> list[LoyaltyNudgeDispatchCandidate]:
-        """Return nudges ready for outbound notifications."""
+        """Lease nudges ready for outbound notifications and commit the claim.
+
+        Status, expiry, frequency cap (``next_dispatch_at``) and lease checks run
+        in SQL against ``ix_loyalty_nudges_dispatch``, so a batch is never
+        under-filled by rows discarded afterwards. Claimed rows are leased to
+        ``worker_id``; concurrent dispatchers receive disjoint batches and a
+        crashed dispatcher's nudges become claimable once the lease expires.
+        """
 
         now = now or datetime.now(timezone.utc)
-        campaigns = await self._get_campaigns()
-        stmt = (
+        worker_id = worker_id or uuid4().hex
+        lease = timedelta(seconds=lease_seconds or settings.loyalty_nudge_dispatch_lease_seconds)
+        dispatchable = and_(
+            LoyaltyNudge.status == LoyaltyNudgeStatus.ACTIVE,
+            or_(LoyaltyNudge.next_dispatch_at.is_(None), LoyaltyNudge.next_dispatch_at <= now),
+            or_(LoyaltyNudge.expires_at.is_(None), LoyaltyNudge.expires_at > now),
+            or_(LoyaltyNudge.lease_expires_at.is_(None), LoyaltyNudge.lease_expires_at <= now),
+        )
+        candidate_stmt = (
+            select(LoyaltyNudge.id)
+            .where(dispatchable)
+            .order_by(LoyaltyNudge.priority.desc(), LoyaltyNudge.updated_at.desc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        candidate_ids = list((await self._db.execute(candidate_stmt)).scalars().all())
+        if not candidate_ids:
+            return []
+
+        await self._db.execute(
+            update(LoyaltyNudge)
+            .where(LoyaltyNudge.id.in_(candidate_ids), dispatchable)
+            # Leasing is bookkeeping, not an edit: keep updated_at (dispatch order) as is.
+            .values(
+                lease_owner=worker_id,
+                lease_expires_at=now + lease,
+                updated_at=LoyaltyNudge.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        claimed_stmt = (
             select(LoyaltyNudge)
             .options(
                 selectinload(LoyaltyNudge.member),
                 selectinload(LoyaltyNudge.dispatch_events),
             )
-            .where(
-                LoyaltyNudge.status == LoyaltyNudgeStatus.ACTIVE,
-                or_(LoyaltyNudge.expires_at.is_(None), LoyaltyNudge.expires_at > now),
-            )
+            .where(LoyaltyNudge.id.in_(candidate_ids), LoyaltyNudge.lease_owner == worker_id)
             .order_by(LoyaltyNudge.priority.desc(), LoyaltyNudge.updated_at.desc())
-            .limit(limit * 3)
+            .execution_options(populate_existing=True)
         )
-        result = await self._db.execute(stmt)
+        claimed = list((await self._db.execute(claimed_stmt)).scalars().all())
+        await self._db.commit()
+
+        campaigns = await self._get_campaigns()
         candidates: list[LoyaltyNudgeDispatchCandidate] = []
-        for nudge in result.scalars().all():
+        for nudge in claimed:
             campaign = self._resolve_campaign(
                 nudge.campaign_slug, campaigns, fallback_priority=nudge.priority or 0
             )
-            cutoff = now - campaign.frequency_cap
-            if nudge.last_triggered_at and nudge.last_triggered_at > cutoff:
-                continue
             channels = self._plan_dispatch_channels(nudge, campaign, now=now)
             candidates.append(
                 LoyaltyNudgeDispatchCandidate(nudge=nudge, channels=channels)
             )
-            if len(candidates) >= limit:
-                break
 
         return candidates
 
@@ -859,21 +890,41 @@ class LoyaltyService:
         *,
         now: datetime | None = None,
     ) -> None:
-        """Record the latest trigger time for dispatched nudges."""
+        """Record the latest trigger time for dispatched nudges and release their leases."""
 
         timestamp = now or datetime.now(timezone.utc)
+        campaigns = await self._get_campaigns()
         for candidate in nudges:
-            candidate.nudge.last_triggered_at = timestamp
+            nudge = candidate.nudge
+            campaign = self._resolve_campaign(
+                nudge.campaign_slug, campaigns, fallback_priority=nudge.priority or 0
+            )
+            nudge.last_triggered_at = timestamp
+            nudge.next_dispatch_at = timestamp + campaign.frequency_cap
+            nudge.lease_owner = None
+            nudge.lease_expires_at = None
             for channel in candidate.channels:
                 event = LoyaltyNudgeDispatchEvent(
-                    nudge_id=candidate.nudge.id,
+                    nudge_id=nudge.id,
                     channel=channel,
                     sent_at=timestamp,
-                    metadata_json={"campaign": candidate.nudge.campaign_slug},
+                    metadata_json={"campaign": nudge.campaign_slug},
                 )
                 self._db.add(event)
         await self._db.flush()
 
+    async def release_nudge_dispatch_claims(self, nudges: Sequence[LoyaltyNudge]) -> None:
+        """Return undelivered nudges to the dispatch pool before their lease expires."""
+
+        if not nudges:
+            return
+        await self._db.execute(
+            update(LoyaltyNudge)
+            .where(LoyaltyNudge.id.in_([nudge.id for nudge in nudges]))
+            .values(lease_owner=None, lease_expires_at=None, updated_at=LoyaltyNudge.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
     async def _sync_member_nudges(
         self,
         member: LoyaltyMember,
@@ -898,18 +949,9 @@ class LoyaltyService:
             key = (signal.nudge_type, signal.source_id)
             seen_keys.add(key)
             payload = signal.payload
-            campaign = campaigns.get(signal.campaign_slug or "")
-            if campaign is None:
-                campaign = NudgeCampaignConfig(
-                    slug=signal.campaign_slug or "default",
-                    ttl=timedelta(days=1),
-                    frequency_cap=timedelta(hours=12),
-                    default_priority=signal.priority,
-                    channels=[LoyaltyNudgeChannel.EMAIL],
-                )
-            channels = signal.channels or campaign.channels
-            priority = signal.priority if signal.priority else campaign.default_priority
-            expires_at = signal.expires_at or current_time + campaign.ttl
+            campaign, channels, priority, expires_at = self._resolve_nudge_values(
+                signal, campaigns, now=current_time
+            )
 
             nudge = existing_by_key.get(key)
             if nudge is None:
@@ -945,6 +987,143 @@ class LoyaltyService:
 
         await self._db.flush()
 
+    async def _sync_nudges_bulk(
+        self,
+        member_ids: Sequence[UUID],
+        *,
+        now: datetime,
+    ) -> None:
+        """Apply ``_sync_member_nudges`` to a page of members with set-based statements.
+
+        New, reactivated and changed nudges go out in one upsert that never
+        touches dismissed rows; nudges whose signal disappeared are expired in
+        one UPDATE. Unchanged active nudges are not written, so ``updated_at``
+        and ``last_triggered_at`` (which drive dispatch order and frequency
+        caps) keep their meaning.
+        """
+
+        if not member_ids:
+            return
+        campaigns = await self._get_campaigns()
+        signals = await self._build_nudge_signals_bulk(member_ids, campaigns, now=now)
+
+        stmt = (
+            select(LoyaltyNudge)
+            .where(LoyaltyNudge.member_id.in_(list(member_ids)))
+            .execution_options(populate_existing=True)
+        )
+        result = await self._db.execute(stmt)
+        existing = {
+            (nudge.member_id, nudge.nudge_type, nudge.source_id): nudge
+            for nudge in result.scalars().all()
+        }
+
+        desired: dict[tuple[UUID, LoyaltyNudgeType, str], dict[str, Any]] = {}
+        for member_id, member_signals in signals.items():
+            for signal in member_signals:
+                campaign, channels, priority, expires_at = self._resolve_nudge_values(
+                    signal, campaigns, now=now
+                )
+                desired[(member_id, signal.nudge_type, signal.source_id)] = {
+                    "payload": signal.payload,
+                    "priority": priority,
+                    "expires_at": expires_at,
+                    "campaign_slug": campaign.slug,
+                    "channel_preferences": list(channels),
+                }
+
+        rows: list[dict[str, Any]] = []
+        for key, fields in desired.items():
+            nudge = existing.get(key)
+            if nudge is not None and (
+                nudge.status == LoyaltyNudgeStatus.DISMISSED
+                or (nudge.status == LoyaltyNudgeStatus.ACTIVE and self._nudge_matches(nudge, fields))
+            ):
+                continue
+            member_id, nudge_type, source_id = key
+            rows.append(
+                {
+                    "id": uuid4(),
+                    "member_id": member_id,
+                    "nudge_type": nudge_type,
+                    "source_id": source_id,
+                    "status": LoyaltyNudgeStatus.ACTIVE,
+                    **fields,
+                }
+            )
+
+        if rows:
+            upsert = insert(LoyaltyNudge.__table__).values(rows)
+            upsert = upsert.on_conflict_do_update(
+                index_elements=[
+                    LoyaltyNudge.member_id,
+                    LoyaltyNudge.nudge_type,
+                    LoyaltyNudge.source_id,
+                ],
+                set_={
+                    "status": upsert.excluded.status,
+                    "payload": upsert.excluded.payload,
+                    "priority": upsert.excluded.priority,
+                    "expires_at": upsert.excluded.expires_at,
+                    "campaign_slug": upsert.excluded.campaign_slug,
+                    "channel_preferences": upsert.excluded.channel_preferences,
+                    "updated_at": func.now(),
+                },
+                where=LoyaltyNudge.__table__.c.status != LoyaltyNudgeStatus.DISMISSED,
+            )
+            await self._db.execute(upsert)
+
+        stale_ids = [
+            nudge.id
+            for key, nudge in existing.items()
+            if key not in desired
+            and nudge.status not in {LoyaltyNudgeStatus.DISMISSED, LoyaltyNudgeStatus.EXPIRED}
+        ]
+        if stale_ids:
+            await self._db.execute(
+                update(LoyaltyNudge)
+                .where(LoyaltyNudge.id.in_(stale_ids))
+                .values(
+                    status=LoyaltyNudgeStatus.EXPIRED,
+                    expires_at=func.coalesce(LoyaltyNudge.expires_at, now),
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def _resolve_nudge_values(
+        signal: _NudgeSignal,
+        campaigns: dict[str, NudgeCampaignConfig],
+        *,
+        now: datetime,
+    ) -> tuple[NudgeCampaignConfig, list[LoyaltyNudgeChannel], int, datetime]:
+        """Resolve the campaign, channels, priority and expiry a signal persists with."""
+
+        campaign = campaigns.get(signal.campaign_slug or "")
+        if campaign is None:
+            campaign = NudgeCampaignConfig(
+                slug=signal.campaign_slug or "default",
+                ttl=timedelta(days=1),
+                frequency_cap=timedelta(hours=12),
+                default_priority=signal.priority,
+                channels=[LoyaltyNudgeChannel.EMAIL],
+            )
+        channels = signal.channels or campaign.channels
+        priority = signal.priority if signal.priority else campaign.default_priority
+        expires_at = signal.expires_at or now + campaign.ttl
+        return campaign, channels, priority, expires_at
+
+    def _nudge_matches(self, nudge: LoyaltyNudge, fields: dict[str, Any]) -> bool:
+        return (
+            (nudge.payload_json or {}) == fields["payload"]
+            and (nudge.priority or 0) == fields["priority"]
+            and _as_utc(nudge.expires_at) == _as_utc(fields["expires_at"])
+            and nudge.campaign_slug == fields["campaign_slug"]
+            and self._normalize_channels(nudge.channel_preferences)
+            == self._normalize_channels(fields["channel_preferences"])
+        )
+
     async def _build_nudge_signals(
         self,
         member: LoyaltyMember,
@@ -954,12 +1133,27 @@ class LoyaltyService:
     ) -> list[_NudgeSignal]:
         """Inspect loyalty signals and produce nudge candidates."""
 
-        signals: list[_NudgeSignal] = []
+        signals = await self._build_nudge_signals_bulk([member.id], campaigns, now=now)
+        return signals[member.id]
+
+    async def _build_nudge_signals_bulk(
+        self,
+        member_ids: Sequence[UUID],
+        campaigns: dict[str, NudgeCampaignConfig],
+        *,
+        now: datetime,
+    ) -> dict[UUID, list[_NudgeSignal]]:
+        """Produce nudge candidates for many members, one query per signal source."""
+
+        signals: dict[UUID, list[_NudgeSignal]] = {member_id: [] for member_id in member_ids}
+        if not signals:
+            return signals
+        member_id_list = list(signals)
 
         exp_stmt = (
             select(LoyaltyPointExpiration)
             .where(
-                LoyaltyPointExpiration.member_id == member.id,
+                LoyaltyPointExpiration.member_id.in_(member_id_list),
                 LoyaltyPointExpiration.status == LoyaltyPointExpirationStatus.SCHEDULED,
                 LoyaltyPointExpiration.expires_at >= now,
                 LoyaltyPointExpiration.expires_at <= now + NUDGE_EXPIRING_POINTS_WINDOW,
@@ -990,7 +1184,7 @@ class LoyaltyService:
                     "expiresAt": expiration.expires_at.isoformat(),
                 },
             }
-            signals.append(
+            signals[expiration.member_id].append(
                 _NudgeSignal(
                     nudge_type=LoyaltyNudgeType.EXPIRING_POINTS,
                     source_id=str(expiration.id),
@@ -1005,7 +1199,7 @@ class LoyaltyService:
         intent_stmt = (
             select(LoyaltyCheckoutIntent)
             .where(
-                LoyaltyCheckoutIntent.member_id == member.id,
+                LoyaltyCheckoutIntent.member_id.in_(member_id_list),
                 LoyaltyCheckoutIntent.status == LoyaltyCheckoutIntentStatus.PENDING,
                 or_(
                     LoyaltyCheckoutIntent.expires_at.is_(None),
@@ -1037,7 +1231,7 @@ class LoyaltyService:
                     "expiresAt": intent.expires_at.isoformat() if intent.expires_at else None,
                 },
             }
-            signals.append(
+            signals[intent.member_id].append(
                 _NudgeSignal(
                     nudge_type=LoyaltyNudgeType.CHECKOUT_REMINDER,
                     source_id=str(intent.id),
@@ -1053,7 +1247,7 @@ class LoyaltyService:
             select(LoyaltyRedemption)
             .options(selectinload(LoyaltyRedemption.reward))
             .where(
-                LoyaltyRedemption.member_id == member.id,
+                LoyaltyRedemption.member_id.in_(member_id_list),
                 LoyaltyRedemption.status == LoyaltyRedemptionStatus.REQUESTED,
                 LoyaltyRedemption.requested_at <= now - NUDGE_REDEMPTION_STALLED_WINDOW,
             )
@@ -1087,7 +1281,7 @@ class LoyaltyService:
                     "requestedAt": redemption.requested_at.isoformat(),
                 },
             }
-            signals.append(
+            signals[redemption.member_id].append(
                 _NudgeSignal(
                     nudge_type=LoyaltyNudgeType.REDEMPTION_FOLLOW_UP,
                     source_id=str(redemption.id),
@@ -1993,75 +2187,317 @@ class LoyaltyService:
         self,
         *,
         reference_time: datetime | None = None,
+        chunk_size: int | None = None,
     ) -> list[LoyaltyPointExpiration]:
-        """Expire scheduled balances up to the provided timestamp."""
+        """Expire scheduled balances up to the provided timestamp and return the expired rows.
+
+        Runs the same chunked sweep as ``sweep_point_expirations`` inside the
+        caller's transaction; prefer that method when only totals are needed.
+        """
+
+        horizon = reference_time or datetime.now(timezone.utc)
+        size = max(1, chunk_size or settings.loyalty_expiration_sweep_chunk_size)
+        sweep = PointExpirationSweep()
+        expired_records: list[LoyaltyPointExpiration] = []
+        while True:
+            records = await self._expire_point_chunk(horizon, size, sweep)
+            expired_records.extend(records)
+            if len({record.member_id for record in records}) < size:
+                break
+        await self._db.flush()
+        return expired_records
+
+    async def sweep_point_expirations(
+        self,
+        *,
+        reference_time: datetime | None = None,
+        chunk_size: int | None = None,
+    ) -> PointExpirationSweep:
+        """Expire every scheduled balance due by ``reference_time``, committing per chunk of members."""
 
         horizon = reference_time or datetime.now(timezone.utc)
+        size = max(1, chunk_size or settings.loyalty_expiration_sweep_chunk_size)
+        sweep = PointExpirationSweep()
+        while True:
+            records = await self._expire_point_chunk(horizon, size, sweep)
+            await self._db.commit()
+            if len({record.member_id for record in records}) < size:
+                break
+        return sweep
+
+    async def _expire_point_chunk(
+        self,
+        horizon: datetime,
+        chunk_size: int,
+        sweep: PointExpirationSweep,
+    ) -> list[LoyaltyPointExpiration]:
+        """Expire the due rows of the next ``chunk_size`` members with set-based writes.
+
+        Chunks are cut on member boundaries: each member's due rows are drained
+        together, FIFO up to the member's balance, so a member gets one
+        aggregated ledger entry per sweep. All balance deltas go out in a single
+        ``UPDATE ... FROM (VALUES ...)``.
+        """
+
+        due = and_(
+            LoyaltyPointExpiration.status == LoyaltyPointExpirationStatus.SCHEDULED,
+            LoyaltyPointExpiration.expires_at <= horizon,
+        )
+        has_due = (
+            select(LoyaltyPointExpiration.id)
+            .where(LoyaltyPointExpiration.member_id == LoyaltyMember.id, due)
+            .exists()
+        )
+        member_stmt = (
+            select(LoyaltyMember)
+            .where(has_due)
+            .order_by(LoyaltyMember.id)
+            .limit(chunk_size)
+            .with_for_update(skip_locked=True)
+            .execution_options(populate_existing=True)
+        )
+        members = {
+            member.id: member for member in (await self._db.execute(member_stmt)).scalars().all()
+        }
+        if not members:
+            return []
+
         stmt = (
             select(LoyaltyPointExpiration)
-            .options(selectinload(LoyaltyPointExpiration.member))
+            .where(LoyaltyPointExpiration.member_id.in_(list(members)), due)
+            .order_by(LoyaltyPointExpiration.expires_at.asc(), LoyaltyPointExpiration.id.asc())
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        records = list((await self._db.execute(stmt)).scalars().all())
+        by_member: dict[UUID, list[LoyaltyPointExpiration]] = {}
+        for record in records:
+            by_member.setdefault(record.member_id, []).append(record)
+
+        ledger_rows: list[dict[str, Any]] = []
+        deltas: list[tuple[UUID, Decimal]] = []
+        for member_id, member_records in by_member.items():
+            member = members[member_id]
+            remaining_total = sum(
+                (
+                    max(Decimal(record.points or 0) - Decimal(record.consumed_points or 0), Decimal("0"))
+                    for record in member_records
+                ),
+                Decimal("0"),
+            )
+            balance_before = Decimal(member.points_balance or 0)
+            expire_amount = min(remaining_total, balance_before)
+            if remaining_total > expire_amount:
+                logger.warning(
+                    "Expiration left unadjusted balance",
+                    member_id=str(member_id),
+                    remaining=str(remaining_total - expire_amount),
+                )
+
+            budget = expire_amount
+            for record in member_records:
+                remaining = max(Decimal(record.points or 0) - Decimal(record.consumed_points or 0), Decimal("0"))
+                take = min(remaining, budget)
+                budget -= take
+                if remaining > Decimal("0"):
+                    record.consumed_points = Decimal(record.consumed_points or 0) + take
+                record.status = LoyaltyPointExpirationStatus.EXPIRED
+
+            sweep.expirations += len(member_records)
+            if expire_amount <= Decimal("0"):
+                continue
+            sweep.members += 1
+            sweep.points_expired += expire_amount
+            balance_after = balance_before - expire_amount
+            deltas.append((member_id, expire_amount))
+            ledger_rows.append(
+                {
+                    "member_id": member_id,
+                    "entry_type": LoyaltyLedgerEntryType.ADJUSTMENT,
+                    "amount": expire_amount * Decimal("-1"),
+                    "description": "Loyalty points expiration",
+                    "metadata_json": {
+                        "expiration_ids": [str(record.id) for record in member_records],
+                        "balance_before": str(balance_before),
+                        "balance_after": str(balance_after),
+                        "balance_delta": str(expire_amount * Decimal("-1")),
+                    },
+                }
+            )
+
+        if ledger_rows:
+            await self._db.execute(insert(LoyaltyLedgerEntry), ledger_rows)
+        if deltas:
+            # A VALUES CTE rather than an aliased derived table: SQLite cannot name VALUES columns inline.
+            expired_points = values(
+                column("member_id", LoyaltyMember.id.type),
+                column("delta", LoyaltyMember.points_balance.type),
+                name="expired_points",
+            ).data(deltas).cte("expired_points")
+            await self._db.execute(
+                update(LoyaltyMember)
+                .where(LoyaltyMember.id == expired_points.c.member_id)
+                .values(points_balance=LoyaltyMember.points_balance - expired_points.c.delta)
+                .execution_options(synchronize_session=False)
+            )
+            for member_id, amount in deltas:
+                member = members[member_id]
+                set_committed_value(
+                    member, "points_balance", Decimal(member.points_balance or 0) - amount
+                )
+        await self._refresh_expiration_pointers(list(by_member))
+        logger.info(
+            "Expired loyalty point chunk",
+            expirations=len(records),
+            members=len(deltas),
+            points=str(sum((amount for _, amount in deltas), Decimal("0"))),
+        )
+        return records
+
+    async def grant_bonus_batch(
+        self,
+        *,
+        window_start: datetime,
+        amount: Decimal,
+        expires_at: datetime | None = None,
+        after_member_id: UUID | None = None,
+        limit: int = 1000,
+        description: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> list[UUID]:
+        """Grant a ``TIER_BONUS`` to the next page of members due one and return their ids.
+
+        Eligible members were active since ``window_start`` and have no
+        ``TIER_BONUS`` entry since then, found with one anti-join and paged by
+        id after ``after_member_id``. The page is posted with bulk inserts and a
+        single balance ``UPDATE``; tiers are re-evaluated only for members whose
+        lifetime points crossed a tier threshold.
+        """
+
+        if amount <= Decimal("0"):
+            raise ValueError("Bonus amount must be positive")
+
+        recent_bonus = (
+            select(LoyaltyLedgerEntry.id)
             .where(
-                LoyaltyPointExpiration.status == LoyaltyPointExpirationStatus.SCHEDULED,
-                LoyaltyPointExpiration.expires_at <= horizon,
+                LoyaltyLedgerEntry.member_id == LoyaltyMember.id,
+                LoyaltyLedgerEntry.entry_type == LoyaltyLedgerEntryType.TIER_BONUS,
+                LoyaltyLedgerEntry.created_at >= window_start,
             )
-            .order_by(LoyaltyPointExpiration.expires_at.asc())
+            .exists()
         )
-        result = await self._db.execute(stmt)
-        expired_records: list[LoyaltyPointExpiration] = []
-        for record in result.scalars().all():
-            member = record.member
-            if member is None:
-                logger.warning("Expiration missing member", expiration_id=str(record.id))
-                continue
+        stmt = (
+            select(
+                LoyaltyMember.id,
+                LoyaltyMember.points_balance,
+                LoyaltyMember.lifetime_points,
+                LoyaltyMember.current_tier_id,
+            )
+            .where(LoyaltyMember.updated_at >= window_start, ~recent_bonus)
+            .order_by(LoyaltyMember.id.asc())
+            .limit(limit)
+            .with_for_update(of=LoyaltyMember)
+        )
+        if after_member_id is not None:
+            stmt = stmt.where(LoyaltyMember.id > after_member_id)
+        rows = (await self._db.execute(stmt)).all()
+        if not rows:
+            return []
 
-            remaining = max(Decimal(record.points or 0) - Decimal(record.consumed_points or 0), Decimal("0"))
-            if remaining > Decimal("0"):
-                expire_amount = min(remaining, Decimal(member.points_balance or 0))
-                if expire_amount > Decimal("0"):
-                    metadata = {"expiration_id": str(record.id)}
-                    try:
-                        await self.record_ledger_entry(
-                            member,
-                            entry_type=LoyaltyLedgerEntryType.ADJUSTMENT,
-                            amount=expire_amount * Decimal("-1"),
-                            description="Loyalty points expiration",
-                            metadata=metadata,
-                        )
-                    except ValueError as exc:
-                        logger.warning(
-                            "Unable to record expiration adjustment",
-                            expiration_id=str(record.id),
-                            error=str(exc),
-                        )
-                leftover = remaining - expire_amount
-                if leftover > Decimal("0"):
-                    logger.warning(
-                        "Expiration left unadjusted balance",
-                        expiration_id=str(record.id),
-                        remaining=str(leftover),
-                    )
-                record.consumed_points = min(record.points, record.consumed_points + expire_amount)
+        member_ids = [row.id for row in rows]
+        ledger_rows: list[dict[str, Any]] = []
+        for row in rows:
+            balance_before = Decimal(row.points_balance or 0)
+            ledger_rows.append(
+                {
+                    "member_id": row.id,
+                    "entry_type": LoyaltyLedgerEntryType.TIER_BONUS,
+                    "amount": amount,
+                    "description": description,
+                    "metadata_json": {
+                        **(metadata or {}),
+                        "balance_before": str(balance_before),
+                        "balance_after": str(balance_before + amount),
+                        "balance_delta": str(amount),
+                    },
+                }
+            )
+        await self._db.execute(insert(LoyaltyLedgerEntry), ledger_rows)
 
-            record.status = LoyaltyPointExpirationStatus.EXPIRED
-            expired_records.append(record)
+        balance_values: dict[str, Any] = {
+            "points_balance": LoyaltyMember.points_balance + amount,
+            "lifetime_points": LoyaltyMember.lifetime_points + amount,
+        }
+        if expires_at is not None:
+            await self._db.execute(
+                insert(LoyaltyPointExpiration),
+                [
+                    {
+                        "member_id": member_id,
+                        "points": amount,
+                        "expires_at": expires_at,
+                        "metadata_json": metadata or {},
+                    }
+                    for member_id in member_ids
+                ],
+            )
+            balance_values["next_expiration_at"] = case(
+                (
+                    or_(
+                        LoyaltyMember.next_expiration_at.is_(None),
+                        LoyaltyMember.next_expiration_at > expires_at,
+                    ),
+                    expires_at,
+                ),
+                else_=LoyaltyMember.next_expiration_at,
+            )
+        await self._db.execute(
+            update(LoyaltyMember)
+            .where(LoyaltyMember.id.in_(member_ids))
+            .values(**balance_values)
+            .execution_options(synchronize_session=False)
+        )
 
-        await self._db.flush()
-        return expired_records
+        catalog = await self._catalog()
+        crossed = [
+            row.id
+            for row in rows
+            if (target := catalog.tier_for_points(Decimal(row.lifetime_points or 0) + amount)) is not None
+            and target.id != row.current_tier_id
+            and target != catalog.tier_for_points(row.lifetime_points)
+        ]
+        if crossed:
+            members = (
+                await self._db.execute(
+                    select(LoyaltyMember)
+                    .where(LoyaltyMember.id.in_(crossed))
+                    .execution_options(populate_existing=True)
+                )
+            ).scalars().all()
+            for member in members:
+                await self._maybe_upgrade_tier(member)
+            await self._db.flush()
+
+        logger.info(
+            "Granted loyalty bonus batch",
+            members=len(member_ids),
+            tier_changes=len(crossed),
+            amount=str(amount),
+        )
+        return member_ids
 
     async def snapshot_member(self, member: LoyaltyMember) -> LoyaltySnapshot:
         """Return a serializable snapshot of a loyalty member."""
 
-        tiers = await self.list_active_tiers()
+        catalog = await self._catalog()
+        tiers = catalog.tiers
         current_tier = member.current_tier
         if current_tier is None and tiers:
-            current_tier = next((tier for tier in tiers if tier.id == member.current_tier_id), None)
+            current_tier = catalog.get_tier(member.current_tier_id)
 
         next_tier = None
         if current_tier:
-            for tier in tiers:
-                if tier.point_threshold > current_tier.point_threshold:
-                    next_tier = tier
-                    break
+            next_tier = catalog.next_tier_above(current_tier.point_threshold)
         elif tiers:
             next_tier = tiers[0]
 
@@ -2096,7 +2532,7 @@ class LoyaltyService:
         )
 
     async def _assign_initial_tier(self, member: LoyaltyMember) -> None:
-        tiers = await self.list_active_tiers()
+        tiers = (await self._catalog()).tiers
         if not tiers:
             return
         lowest = tiers[0]
@@ -2104,15 +2540,9 @@ class LoyaltyService:
         member.last_tier_upgrade_at = datetime.now(timezone.utc)
 
     async def _maybe_upgrade_tier(self, member: LoyaltyMember) -> None:
-        tiers = await self.list_active_tiers()
-        if not tiers:
-            return
-        eligible = [
-            tier for tier in tiers if tier.point_threshold <= (member.lifetime_points or Decimal("0"))
-        ]
-        if not eligible:
+        target = (await self._catalog()).tier_for_points(member.lifetime_points)
+        if target is None:
             return
-        target = eligible[-1]
         if member.current_tier_id == target.id:
             return
         member.current_tier_id = target.id
@@ -2156,29 +2586,82 @@ class LoyaltyService:
         member.points_on_hold = max(current_hold - amount, Decimal("0"))
 
     async def _consume_expiring_points(self, member: LoyaltyMember, amount: Decimal) -> None:
+        """Consume open expirations FIFO, reading only from the member's next-expiry pointer on."""
+
         remaining = Decimal(amount)
         if remaining <= Decimal("0"):
             return
 
-        stmt = (
-            select(LoyaltyPointExpiration)
-            .where(LoyaltyPointExpiration.member_id == member.id)
-            .order_by(LoyaltyPointExpiration.expires_at.asc())
+        pointer = (
+            select(LoyaltyMember.next_expiration_at)
+            .where(LoyaltyMember.id == member.id)
+            .scalar_subquery()
         )
-        result = await self._db.execute(stmt)
-        for record in result.scalars().all():
-            available = Decimal(record.points or 0) - Decimal(record.consumed_points or 0)
-            if available <= Decimal("0"):
-                if record.status == LoyaltyPointExpirationStatus.SCHEDULED:
+        cursor: tuple[datetime, UUID] | None = None
+        done = False
+        while not done:
+            stmt = (
+                select(LoyaltyPointExpiration)
+                .where(
+                    LoyaltyPointExpiration.member_id == member.id,
+                    LoyaltyPointExpiration.status == LoyaltyPointExpirationStatus.SCHEDULED,
+                    LoyaltyPointExpiration.expires_at >= pointer,
+                )
+                .order_by(LoyaltyPointExpiration.expires_at.asc(), LoyaltyPointExpiration.id.asc())
+                .limit(EXPIRATION_CONSUMPTION_PAGE_SIZE)
+            )
+            if cursor is not None:
+                stmt = stmt.where(
+                    or_(
+                        LoyaltyPointExpiration.expires_at > cursor[0],
+                        and_(
+                            LoyaltyPointExpiration.expires_at == cursor[0],
+                            LoyaltyPointExpiration.id > cursor[1],
+                        ),
+                    )
+                )
+            records = list((await self._db.execute(stmt)).scalars().all())
+            for record in records:
+                available = Decimal(record.points or 0) - Decimal(record.consumed_points or 0)
+                if available <= Decimal("0"):
                     record.status = LoyaltyPointExpirationStatus.CONSUMED
-                continue
-            consume = min(available, remaining)
-            record.consumed_points = Decimal(record.consumed_points or 0) + consume
-            if record.consumed_points >= record.points:
-                record.status = LoyaltyPointExpirationStatus.CONSUMED
-            remaining -= consume
-            if remaining <= Decimal("0"):
-                break
+                    continue
+                consume = min(available, remaining)
+                record.consumed_points = Decimal(record.consumed_points or 0) + consume
+                if record.consumed_points >= record.points:
+                    record.status = LoyaltyPointExpirationStatus.CONSUMED
+                remaining -= consume
+                if remaining <= Decimal("0"):
+                    done = True
+                    break
+            if len(records) < EXPIRATION_CONSUMPTION_PAGE_SIZE:
+                done = True
+            elif records:
+                cursor = (records[-1].expires_at, records[-1].id)
+
+        await self._refresh_expiration_pointers([member.id])
+
+    async def _refresh_expiration_pointers(self, member_ids: Sequence[UUID]) -> None:
+        """Recompute ``next_expiration_at`` for members whose open expirations changed."""
+
+        if not member_ids:
+            return
+        next_open = (
+            select(func.min(LoyaltyPointExpiration.expires_at))
+            .where(
+                LoyaltyPointExpiration.member_id == LoyaltyMember.id,
+                LoyaltyPointExpiration.status == LoyaltyPointExpirationStatus.SCHEDULED,
+                LoyaltyPointExpiration.consumed_points < LoyaltyPointExpiration.points,
+            )
+            .scalar_subquery()
+        )
+        # Pointer maintenance is bookkeeping: keep updated_at, which progression reads as activity.
+        await self._db.execute(
+            update(LoyaltyMember)
+            .where(LoyaltyMember.id.in_(list(member_ids)))
+            .values(next_expiration_at=next_open, updated_at=LoyaltyMember.updated_at)
+            .execution_options(synchronize_session=False)
+        )
 
     async def _create_point_expiration(
         self,
@@ -2196,6 +2679,19 @@ class LoyaltyService:
         )
         self._db.add(record)
         await self._db.flush()
+        # Atomic "min": only ever move the pointer earlier.
+        await self._db.execute(
+            update(LoyaltyMember)
+            .where(
+                LoyaltyMember.id == member.id,
+                or_(
+                    LoyaltyMember.next_expiration_at.is_(None),
+                    LoyaltyMember.next_expiration_at > expires_at,
+                ),
+            )
+            .values(next_expiration_at=expires_at, updated_at=LoyaltyMember.updated_at)
+            .execution_options(synchronize_session=False)
+        )
         logger.debug(
             "Scheduled loyalty expiration",
             member_id=str(member.id),
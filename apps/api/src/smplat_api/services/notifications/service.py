@@ -19,7 +19,6 @@ from smplat_api.models.loyalty import (
     LoyaltyNudge,
     LoyaltyNudgeChannel,
     LoyaltyNudgeStatus,
-    LoyaltyTier,
 )
 from smplat_api.models.order import Order, OrderItem, OrderStatusEnum
 from smplat_api.models.payment import Payment
@@ -48,6 +47,7 @@ from .backend import (
     InMemoryPushBackend,
 )
 from .templates import (
+    LoyaltyTierView,
     RenderedTemplate,
     build_pricing_experiment_html,
     build_pricing_experiment_text,
@@ -702,7 +702,7 @@ class NotificationService:
     async def send_loyalty_tier_upgrade(
         self,
         member: LoyaltyMember,
-        tier: LoyaltyTier,
+        tier: LoyaltyTierView,
     ) -> None:
         """Send milestone notification when a member reaches a tier."""
 
@@ -6,11 +6,12 @@ import html
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
-from typing import Any, Iterable, Mapping, Optional, Sequence
+from typing import Any, Iterable, Mapping, Optional, Protocol, Sequence
+from uuid import UUID
 
 from smplat_api.models.fulfillment import FulfillmentTask
 from smplat_api.models.invoice import Invoice
-from smplat_api.models.loyalty import LoyaltyMember, LoyaltyTier
+from smplat_api.models.loyalty import LoyaltyMember
 from smplat_api.models.order import Order, OrderItem
 from smplat_api.models.payment import Payment
 from smplat_api.models.user import User
@@ -29,6 +30,22 @@ from smplat_api.services.provider_telemetry import (
 )
 
 
+class LoyaltyTierView(Protocol):
+    """Tier fields read by loyalty notifications (ORM rows or cached catalog descriptors)."""
+
+    @property
+    def id(self) -> UUID: ...
+
+    @property
+    def slug(self) -> str: ...
+
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def benefits(self) -> Any: ...
+
+
 @dataclass
 class RenderedTemplate:
     subject: str
@@ -1346,7 +1363,7 @@ def render_invoice_overdue(
 
 def render_loyalty_tier_upgrade(
     member: LoyaltyMember,
-    tier: LoyaltyTier,
+    tier: LoyaltyTierView,
     *,
     contact_name: str | None,
 ) -> RenderedTemplate:
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+from dataclasses import dataclass, field
+from typing import Any, Iterable
 from uuid import UUID
 
 from loguru import logger
@@ -44,6 +44,19 @@ class OrderEventDescriptor:
     order: Order
 
 
+@dataclass(slots=True)
+class OrderEventDraft:
+    """Audit entry buffered for ``OrderStateMachine.record_events``."""
+
+    order_id: UUID
+    event_type: OrderStateEventTypeEnum
+    actor_type: OrderStateActorTypeEnum | None = None
+    actor_id: str | None = None
+    actor_label: str | None = None
+    notes: str | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
 class OrderStateMachine:
     """Encapsulates order state transitions, audit logging, and delivery proof notes."""
 
@@ -158,6 +171,32 @@ class OrderStateMachine:
         )
         return OrderEventDescriptor(event=event, order=order)
 
+    async def record_events(self, drafts: Iterable[OrderEventDraft]) -> list[OrderStateEvent]:
+        """Insert several audit entries with a single commit.
+
+        Unlike ``record_event`` the orders are not re-read; callers pass ids of
+        orders they just loaded.
+        """
+
+        events = [
+            OrderStateEvent(
+                order_id=draft.order_id,
+                event_type=draft.event_type,
+                actor_type=draft.actor_type,
+                actor_id=draft.actor_id,
+                actor_label=draft.actor_label,
+                notes=draft.notes,
+                metadata_json=draft.metadata,
+            )
+            for draft in drafts
+        ]
+        if not events:
+            return []
+        self._session.add_all(events)
+        await self._session.commit()
+        logger.info("Order timeline events recorded", count=len(events))
+        return events
+
     async def list_events(self, order_id: UUID) -> list[OrderStateEvent]:
         """Return chronological order state events."""
 
@@ -1,3 +1,11 @@
+"""Recently observed platform contexts per fulfillment provider.
+
+Writers buffer contexts with ``buffer_context``; repeated observations of the same
+``(provider_id, platform_id)`` collapse to the latest one, and ``flush_contexts``
+writes the buffer as one multi-row upsert inside the caller's unit of work. Reads
+rank rows per provider by ``last_seen_at`` in SQL and return only the top N.
+"""
+
 from __future__ import annotations
 
 from dataclasses import dataclass
@@ -26,38 +34,48 @@ class ProviderPlatformContextCacheService:
 
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
+        self._pending: dict[tuple[str, str], dict[str, Any]] = {}
 
-    async def record_context(self, provider_id: str, platform_context: Mapping[str, Any] | None) -> None:
+    def buffer_context(self, provider_id: str, platform_context: Mapping[str, Any] | None) -> None:
+        """Queue a context for the next ``flush_contexts``; the latest write per platform wins."""
         if not provider_id or not platform_context:
             return
         platform_id = _string_field(platform_context.get("id"))
         label = _string_field(platform_context.get("label"))
         if not platform_id or not label:
             return
-        handle = _string_field(platform_context.get("handle"))
-        platform_type = _string_field(platform_context.get("platformType"))
-        stmt = (
-            insert(ProviderPlatformContextCache)
-            .values(
-                provider_id=provider_id,
-                platform_id=platform_id,
-                label=label,
-                handle=handle,
-                platform_type=platform_type,
-                context=dict(platform_context),
-            )
-            .on_conflict_do_update(
-                index_elements=[ProviderPlatformContextCache.provider_id, ProviderPlatformContextCache.platform_id],
-                set_={
-                    "label": label,
-                    "handle": handle,
-                    "platform_type": platform_type,
-                    "context": dict(platform_context),
-                    "last_seen_at": func.now(),
-                },
-            )
+        self._pending[(provider_id, platform_id)] = {
+            "provider_id": provider_id,
+            "platform_id": platform_id,
+            "label": label,
+            "handle": _string_field(platform_context.get("handle")),
+            "platform_type": _string_field(platform_context.get("platformType")),
+            "context": dict(platform_context),
+        }
+
+    async def flush_contexts(self) -> int:
+        """Upsert every buffered context in one statement; return the number of rows written."""
+        if not self._pending:
+            return 0
+        rows = list(self._pending.values())
+        self._pending.clear()
+        stmt = insert(ProviderPlatformContextCache).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProviderPlatformContextCache.provider_id, ProviderPlatformContextCache.platform_id],
+            set_={
+                "label": stmt.excluded.label,
+                "handle": stmt.excluded.handle,
+                "platform_type": stmt.excluded.platform_type,
+                "context": stmt.excluded.context,
+                "last_seen_at": func.now(),
+            },
         )
         await self._session.execute(stmt)
+        return len(rows)
+
+    async def record_context(self, provider_id: str, platform_context: Mapping[str, Any] | None) -> None:
+        self.buffer_context(provider_id, platform_context)
+        await self.flush_contexts()
 
     async def fetch_contexts_for_providers(
         self,
@@ -65,24 +83,35 @@ class ProviderPlatformContextCacheService:
         *,
         limit_per_provider: int = 3,
     ) -> dict[str, list[ProviderPlatformContextRecord]]:
-        if not provider_ids:
+        if not provider_ids or limit_per_provider <= 0:
             return {}
-        stmt = (
-            select(ProviderPlatformContextCache)
-            .where(ProviderPlatformContextCache.provider_id.in_(provider_ids))
-            .order_by(
-                ProviderPlatformContextCache.provider_id.asc(),
-                ProviderPlatformContextCache.last_seen_at.desc(),
+        ranked = (
+            select(
+                ProviderPlatformContextCache.provider_id,
+                ProviderPlatformContextCache.platform_id,
+                ProviderPlatformContextCache.label,
+                ProviderPlatformContextCache.handle,
+                ProviderPlatformContextCache.platform_type,
+                ProviderPlatformContextCache.context,
+                func.row_number()
+                .over(
+                    partition_by=ProviderPlatformContextCache.provider_id,
+                    order_by=ProviderPlatformContextCache.last_seen_at.desc(),
+                )
+                .label("position"),
             )
+            .where(ProviderPlatformContextCache.provider_id.in_(list(provider_ids)))
+            .subquery()
+        )
+        stmt = (
+            select(ranked)
+            .where(ranked.c.position <= limit_per_provider)
+            .order_by(ranked.c.provider_id, ranked.c.position)
         )
         result = await self._session.execute(stmt)
-        rows = result.scalars().all()
         normalized: dict[str, list[ProviderPlatformContextRecord]] = {}
-        for row in rows:
-            bucket = normalized.setdefault(row.provider_id, [])
-            if len(bucket) >= limit_per_provider:
-                continue
-            bucket.append(
+        for row in result:
+            normalized.setdefault(row.provider_id, []).append(
                 ProviderPlatformContextRecord(
                     provider_id=row.provider_id,
                     platform_id=row.platform_id,
@@ -49,6 +49,9 @@ async def run_scheduled_replays(
         automation_factory=automation_factory,
         interval_seconds=settings.provider_replay_worker_interval_seconds,
         limit=settings.provider_replay_worker_limit,
+        lease_seconds=settings.provider_replay_worker_lease_seconds,
+        concurrency=settings.provider_replay_worker_concurrency,
+        per_provider_concurrency=settings.provider_replay_worker_per_provider_concurrency,
     )
     summary = await worker.process_scheduled(limit=limit)
     logger.info("Scheduled provider replays processed", summary=summary)
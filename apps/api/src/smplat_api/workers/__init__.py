@@ -6,6 +6,7 @@ from .hosted_session_recovery import HostedSessionRecoveryWorker
 from .journey_runtime import JourneyRuntimeWorker
 from .provider_automation import ProviderOrderReplayWorker
 from .provider_automation_alerts import ProviderAutomationAlertWorker
+from .provider_callbacks import ProviderCallbackWorker
 from .receipt_storage_probe import ReceiptStorageProbeWorker
 
 __all__ = [
@@ -15,5 +16,6 @@ __all__ = [
     "JourneyRuntimeWorker",
     "ProviderOrderReplayWorker",
     "ProviderAutomationAlertWorker",
+    "ProviderCallbackWorker",
     "ReceiptStorageProbeWorker",
 ]
@@ -10,6 +10,7 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from smplat_api.core.settings import settings
+from smplat_api.core.work_signals import JOURNEY_RUNS, AdaptivePollBackoff, get_work_signal
 from smplat_api.models.journey_runtime import JourneyComponentRunStatusEnum
 from smplat_api.services.journey_runtime import JourneyRuntimeService
 from smplat_api.tasks.journey_runtime import process_journey_run
@@ -31,6 +32,8 @@ class JourneyRuntimeWorker:
         self.interval_seconds = interval_seconds or settings.journey_runtime_poll_interval_seconds
         self._batch_size = batch_size or settings.journey_runtime_batch_size
         self._stop_event = asyncio.Event()
+        self._backoff = AdaptivePollBackoff.for_interval(self.interval_seconds)
+        self._wakeup = get_work_signal(JOURNEY_RUNS)
         self._task: asyncio.Task | None = None
         self.is_running: bool = False
 
@@ -50,6 +53,7 @@ class JourneyRuntimeWorker:
         if not self._task:
             return
         self._stop_event.set()
+        self._wakeup.wake()
         await self._task
         self._task = None
         self.is_running = False
@@ -79,16 +83,19 @@ class JourneyRuntimeWorker:
 
     async def _run_loop(self) -> None:
         while not self._stop_event.is_set():
+            processed = 0
             try:
                 summary = await self.run_once()
-                if summary["processed"]:
+                processed = summary["processed"]
+                if processed:
                     logger.info("Journey runtime worker iteration", summary=summary)
             except Exception as exc:  # pragma: no cover - defensive logging
                 logger.exception("Journey runtime worker iteration failed", error=str(exc))
-            try:
-                await asyncio.wait_for(self._stop_event.wait(), timeout=self.interval_seconds)
-            except asyncio.TimeoutError:
-                continue
+            if self._stop_event.is_set():
+                break
+            delay = self._backoff.next_delay(processed, self._batch_size)
+            if delay > 0:
+                await self._wakeup.wait(delay)
 
     async def _collect_run_ids(self) -> list[UUID]:
         session = await self._ensure_session()
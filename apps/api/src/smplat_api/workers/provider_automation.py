@@ -3,18 +3,33 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Literal, Mapping
 from uuid import uuid4
 
 from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.attributes import flag_modified
 
-from smplat_api.models.fulfillment import FulfillmentProviderOrder
+from smplat_api.core.worker_identity import default_worker_id
+from smplat_api.models.fulfillment import (
+    FulfillmentProviderOrder,
+    FulfillmentProviderReplaySchedule,
+    FulfillmentProviderReplayStatusEnum,
+)
 from smplat_api.services.fulfillment import ProviderAutomationService
+from smplat_api.services.fulfillment.provider_limits import ProviderThrottledError
+from smplat_api.services.fulfillment.replay_schedule import (
+    claim_due_replays,
+    defer_replay,
+    find_schedule_entry,
+    settle_replay,
+)
 from smplat_api.services.orders.state_machine import (
+    OrderEventDraft,
     OrderStateActorTypeEnum,
     OrderStateEventTypeEnum,
     OrderStateMachine,
@@ -25,6 +40,14 @@ AutomationFactory = Callable[[AsyncSession], ProviderAutomationService]
 Clock = Callable[[], datetime]
 
 
+@dataclass(slots=True)
+class _ReplayOutcome:
+    """Result of one scheduled replay, merged into the sweep summary."""
+
+    result: Literal["succeeded", "failed", "deferred"]
+    timeline: OrderEventDraft | None = None
+
+
 class ProviderOrderReplayWorker:
     """Executes scheduled provider order replays."""
 
@@ -36,142 +59,259 @@ class ProviderOrderReplayWorker:
         clock: Clock | None = None,
         interval_seconds: int | None = None,
         limit: int | None = None,
+        lease_seconds: int = 300,
+        worker_id: str | None = None,
+        concurrency: int = 8,
+        per_provider_concurrency: int = 2,
     ) -> None:
         self._session_factory = session_factory
         self._automation_factory = automation_factory or (lambda session: ProviderAutomationService(session))
         self._clock = clock or (lambda: datetime.now(timezone.utc))
         self.interval_seconds = interval_seconds or 300
         self._limit = limit or 25
+        self._lease_seconds = lease_seconds
+        self._worker_id = worker_id or default_worker_id()
+        self._concurrency = max(1, concurrency)
+        self._per_provider_concurrency = max(1, per_provider_concurrency)
         self._stop_event = asyncio.Event()
         self._task: asyncio.Task | None = None
         self.is_running: bool = False
 
     async def process_scheduled(self, *, limit: int | None = None) -> dict[str, int]:
-        """Trigger due scheduled replays and persist execution metadata."""
+        """Trigger due scheduled replays and persist execution metadata.
+
+        Claimed replays run concurrently, each on its own session, bounded by
+        ``concurrency`` overall and ``per_provider_concurrency`` per provider so a
+        slow provider only holds its own slots. Replays of the same provider order
+        run one after another because each rewrites the order's payload. Timeline
+        events are written in one batch once the sweep settles.
+        """
 
         effective_limit = limit or self._limit
         if effective_limit <= 0:
-            return {"processed": 0, "succeeded": 0, "failed": 0}
+            return {"processed": 0, "succeeded": 0, "failed": 0, "deferred": 0}
 
-        session = await self._ensure_session()
-        summary = {"processed": 0, "succeeded": 0, "failed": 0}
+        summary = {"processed": 0, "succeeded": 0, "failed": 0, "deferred": 0}
 
+        session = await self._ensure_session()
         async with session as db:
-            automation = self._automation_factory(db)
-            machine = OrderStateMachine(db)
-            stmt = (
-                select(FulfillmentProviderOrder)
-                .where(FulfillmentProviderOrder.payload.isnot(None))
-                .order_by(FulfillmentProviderOrder.updated_at.asc())
-                .limit(max(effective_limit * 4, 50))
+            claimed = await claim_due_replays(
+                db,
+                self._worker_id,
+                now=self._clock(),
+                limit=effective_limit,
+                lease_seconds=self._lease_seconds,
             )
-            result = await db.execute(stmt)
-            orders = result.scalars().all()
-
-            for order in orders:
-                due_entries = self._collect_due_entries(order)
-                for entry in due_entries:
-                    if summary["processed"] >= effective_limit:
-                        break
-                    summary["processed"] += 1
-                    requested_amount = self._safe_float(entry.get("requestedAmount"))
-                    entry_id = entry.get("id")
-                    try:
-                        replay_entry = await automation.replay_provider_order(order, amount=requested_amount)
-                        self._mark_schedule_entry(
-                            order,
-                            entry_id,
-                            status="executed",
-                            performed_at=self._clock().isoformat(),
-                            response=replay_entry,
-                        )
-                        summary["succeeded"] += 1
-                        rule_ids = replay_entry.get("ruleIds")
-                        rule_labels = ProviderAutomationService._summarize_rule_labels(
-                            rule_ids,
-                            replay_entry.get("ruleMetadata"),
-                        )
-                        logger.info(
-                            "Provider scheduled replay executed",
-                            provider_order_id=str(order.id),
-                            schedule_id=entry_id,
-                            rule_ids=rule_ids,
-                            rule_labels=rule_labels,
-                        )
-                        await self._record_timeline_event(
-                            machine,
-                            order,
-                            event_type=OrderStateEventTypeEnum.REPLAY_EXECUTED,
-                            actor_type=OrderStateActorTypeEnum.AUTOMATION,
-                            metadata=ProviderAutomationService.build_timeline_metadata(
-                                order,
-                                entry=replay_entry,
-                                extra={
-                                    "scheduleId": entry_id,
-                                    "trigger": "scheduled_replay",
-                                },
-                            ),
-                            notes="Automation replay executed from schedule",
-                        )
-                    except Exception as exc:
-                        failure_entry = self._record_failed_replay(
-                            order,
-                            requested_amount=requested_amount,
-                            error=str(exc),
-                        )
-                        self._mark_schedule_entry(
-                            order,
-                            entry_id,
-                            status="failed",
-                            performed_at=self._clock().isoformat(),
-                            response={"error": str(exc)},
-                        )
-                        summary["failed"] += 1
-                        schedule_rule_ids = entry.get("ruleIds")
-                        schedule_rule_labels = ProviderAutomationService._summarize_rule_labels(
-                            schedule_rule_ids,
-                            entry.get("ruleMetadata"),
-                        )
-                        logger.warning(
-                            "Provider scheduled replay failed",
-                            provider_order_id=str(order.id),
-                            schedule_id=entry_id,
-                            error=str(exc),
-                            rule_ids=schedule_rule_ids,
-                            rule_labels=schedule_rule_labels,
-                        )
-                        await self._record_timeline_event(
-                            machine,
-                            order,
-                            event_type=OrderStateEventTypeEnum.REPLAY_EXECUTED,
-                            actor_type=OrderStateActorTypeEnum.AUTOMATION,
-                            metadata=ProviderAutomationService.build_timeline_metadata(
-                                order,
-                                entry=failure_entry,
-                                extra={
-                                    "scheduleId": entry_id,
-                                    "trigger": "scheduled_replay",
-                                    "error": str(exc),
-                                },
-                            ),
-                            notes="Automation replay attempt failed",
-                        )
-
-                if summary["processed"] >= effective_limit:
-                    break
-
-            if summary["processed"]:
-                await db.commit()
-            else:
-                await db.rollback()
 
-        backlog_metrics = await automation.calculate_replay_backlog_metrics()
+        if claimed:
+            semaphore = asyncio.Semaphore(self._concurrency)
+            provider_semaphores: dict[str, asyncio.Semaphore] = {}
+            groups: dict[Any, list[FulfillmentProviderReplaySchedule]] = {}
+            for schedule in claimed:
+                groups.setdefault(schedule.provider_order_id, []).append(schedule)
+            grouped_outcomes = await asyncio.gather(
+                *(self._run_replay_group(group, semaphore, provider_semaphores) for group in groups.values())
+            )
+            ordered = [schedule for group in groups.values() for schedule in group]
+            outcomes = [outcome for group_outcomes in grouped_outcomes for outcome in group_outcomes]
+            timeline: list[OrderEventDraft] = []
+            for schedule, outcome in zip(ordered, outcomes):
+                if isinstance(outcome, BaseException):
+                    # The row keeps its lease and is retried once the lease expires.
+                    logger.opt(exception=outcome).error(
+                        "Provider scheduled replay crashed",
+                        provider_order_id=str(schedule.provider_order_id),
+                        schedule_id=schedule.entry_id,
+                    )
+                    continue
+                if outcome is None:
+                    continue
+                summary["processed"] += 1
+                summary[outcome.result] += 1
+                if outcome.timeline is not None:
+                    timeline.append(outcome.timeline)
+            await self._record_timeline_events(timeline)
+
+        session = await self._ensure_session()
+        async with session as db:
+            backlog_metrics = await self._automation_factory(db).calculate_replay_backlog_metrics()
         summary["scheduledBacklog"] = backlog_metrics.get("scheduledBacklog", 0)
         next_eta = backlog_metrics.get("nextScheduledAt")
         if next_eta:
             summary["nextScheduledAt"] = next_eta
         return summary
 
+    async def _run_replay_group(
+        self,
+        group: list[FulfillmentProviderReplaySchedule],
+        semaphore: asyncio.Semaphore,
+        provider_semaphores: dict[str, asyncio.Semaphore],
+    ) -> list[_ReplayOutcome | Exception | None]:
+        """Run the claimed replays of one provider order in sequence."""
+
+        outcomes: list[_ReplayOutcome | Exception | None] = []
+        for schedule in group:
+            try:
+                outcomes.append(await self._run_claimed_replay(schedule, semaphore, provider_semaphores))
+            except Exception as exc:
+                outcomes.append(exc)
+        return outcomes
+
+    async def _run_claimed_replay(
+        self,
+        claimed: FulfillmentProviderReplaySchedule,
+        semaphore: asyncio.Semaphore,
+        provider_semaphores: dict[str, asyncio.Semaphore],
+    ) -> _ReplayOutcome | None:
+        """Execute one claimed replay on its own session once its slots free up."""
+
+        provider_semaphore = provider_semaphores.setdefault(
+            claimed.provider_id,
+            asyncio.Semaphore(self._per_provider_concurrency),
+        )
+        # Take the provider slot first so replays queued behind a slow provider
+        # do not hold global slots other providers could use.
+        async with provider_semaphore, semaphore:
+            session = await self._ensure_session()
+            async with session as db:
+                stmt = (
+                    select(FulfillmentProviderReplaySchedule)
+                    .options(selectinload(FulfillmentProviderReplaySchedule.provider_order))
+                    .where(
+                        FulfillmentProviderReplaySchedule.id == claimed.id,
+                        FulfillmentProviderReplaySchedule.lease_owner == self._worker_id,
+                    )
+                )
+                schedule = (await db.execute(stmt)).scalar_one_or_none()
+                if schedule is None:
+                    logger.warning(
+                        "Provider scheduled replay lease lost",
+                        provider_order_id=str(claimed.provider_order_id),
+                        schedule_id=claimed.entry_id,
+                    )
+                    return None
+                # Lock the order so other writers of its payload (callbacks, other
+                # replicas) wait for this replay instead of overwriting it.
+                await db.execute(
+                    select(FulfillmentProviderOrder)
+                    .where(FulfillmentProviderOrder.id == schedule.provider_order_id)
+                    .with_for_update()
+                    .execution_options(populate_existing=True)
+                )
+                outcome = await self._execute_replay(self._automation_factory(db), schedule)
+                await db.commit()
+                return outcome
+
+    async def _execute_replay(
+        self,
+        automation: ProviderAutomationService,
+        schedule: FulfillmentProviderReplaySchedule,
+    ) -> _ReplayOutcome:
+        order = schedule.provider_order
+        entry = find_schedule_entry(order.payload, schedule.entry_id) or {
+            "id": schedule.entry_id,
+            "requestedAmount": schedule.requested_amount,
+        }
+        requested_amount = self._safe_float(entry.get("requestedAmount"))
+        entry_id = entry.get("id")
+        try:
+            replay_entry = await automation.replay_provider_order(order, amount=requested_amount)
+        except ProviderThrottledError as exc:
+            # Throttled/open providers were never called; keep the entry scheduled.
+            run_at = self._clock() + timedelta(seconds=exc.retry_after)
+            self._defer_schedule_entry(order, entry_id, exc, run_at=run_at)
+            defer_replay(schedule, run_at=run_at)
+            logger.info(
+                "Provider scheduled replay deferred",
+                provider_order_id=str(order.id),
+                schedule_id=entry_id,
+                scope=exc.scope,
+                reason=exc.reason,
+                retry_after_seconds=exc.retry_after,
+            )
+            return _ReplayOutcome("deferred")
+        except Exception as exc:
+            failure_entry = self._record_failed_replay(
+                order,
+                requested_amount=requested_amount,
+                error=str(exc),
+            )
+            performed_at = self._clock()
+            self._mark_schedule_entry(
+                order,
+                entry_id,
+                status="failed",
+                performed_at=performed_at.isoformat(),
+                response={"error": str(exc)},
+            )
+            settle_replay(schedule, FulfillmentProviderReplayStatusEnum.FAILED, performed_at=performed_at)
+            schedule_rule_ids = entry.get("ruleIds")
+            schedule_rule_labels = ProviderAutomationService._summarize_rule_labels(
+                schedule_rule_ids,
+                entry.get("ruleMetadata"),
+            )
+            logger.warning(
+                "Provider scheduled replay failed",
+                provider_order_id=str(order.id),
+                schedule_id=entry_id,
+                error=str(exc),
+                rule_ids=schedule_rule_ids,
+                rule_labels=schedule_rule_labels,
+            )
+            return _ReplayOutcome(
+                "failed",
+                self._timeline_draft(
+                    order,
+                    metadata=ProviderAutomationService.build_timeline_metadata(
+                        order,
+                        entry=failure_entry,
+                        extra={
+                            "scheduleId": entry_id,
+                            "trigger": "scheduled_replay",
+                            "error": str(exc),
+                        },
+                    ),
+                    notes="Automation replay attempt failed",
+                ),
+            )
+
+        performed_at = self._clock()
+        self._mark_schedule_entry(
+            order,
+            entry_id,
+            status="executed",
+            performed_at=performed_at.isoformat(),
+            response=replay_entry,
+        )
+        settle_replay(schedule, FulfillmentProviderReplayStatusEnum.EXECUTED, performed_at=performed_at)
+        rule_ids = replay_entry.get("ruleIds")
+        rule_labels = ProviderAutomationService._summarize_rule_labels(
+            rule_ids,
+            replay_entry.get("ruleMetadata"),
+        )
+        logger.info(
+            "Provider scheduled replay executed",
+            provider_order_id=str(order.id),
+            schedule_id=entry_id,
+            rule_ids=rule_ids,
+            rule_labels=rule_labels,
+        )
+        return _ReplayOutcome(
+            "succeeded",
+            self._timeline_draft(
+                order,
+                metadata=ProviderAutomationService.build_timeline_metadata(
+                    order,
+                    entry=replay_entry,
+                    extra={
+                        "scheduleId": entry_id,
+                        "trigger": "scheduled_replay",
+                    },
+                ),
+                notes="Automation replay executed from schedule",
+            ),
+        )
+
     async def run_once(self, *, limit: int | None = None) -> dict[str, int]:
         """Run a single iteration respecting the configured limit."""
 
@@ -198,27 +338,6 @@ class ProviderOrderReplayWorker:
         self.is_running = False
         logger.info("Provider order replay worker stopped")
 
-    def _collect_due_entries(self, order: FulfillmentProviderOrder) -> list[dict[str, Any]]:
-        payload = self._safe_payload(order.payload)
-        schedule = payload.get("scheduledReplays")
-        if not isinstance(schedule, list):
-            return []
-
-        due: list[dict[str, Any]] = []
-        now = self._clock()
-        for entry in schedule:
-            if not isinstance(entry, dict):
-                continue
-            if entry.get("status", "scheduled") != "scheduled":
-                continue
-            entry_id = entry.get("id")
-            if not entry_id:
-                continue
-            scheduled_for = self._parse_datetime(entry.get("scheduledFor"))
-            if scheduled_for is None or scheduled_for <= now:
-                due.append(entry)
-        return due
-
     def _mark_schedule_entry(
         self,
         order: FulfillmentProviderOrder,
@@ -253,6 +372,30 @@ class ProviderOrderReplayWorker:
             break
         self._apply_payload(order, payload)
 
+    def _defer_schedule_entry(
+        self,
+        order: FulfillmentProviderOrder,
+        entry_id: str | None,
+        exc: ProviderThrottledError,
+        *,
+        run_at: datetime,
+    ) -> None:
+        if not entry_id:
+            return
+
+        payload = self._safe_payload(order.payload)
+        schedule = payload.get("scheduledReplays")
+        if not isinstance(schedule, list):
+            return
+        for entry in schedule:
+            if not isinstance(entry, dict) or entry.get("id") != entry_id:
+                continue
+            entry["scheduledFor"] = run_at.isoformat()
+            entry["deferrals"] = int(entry.get("deferrals") or 0) + 1
+            entry["deferredReason"] = exc.reason
+            break
+        self._apply_payload(order, payload)
+
     def _record_failed_replay(
         self,
         order: FulfillmentProviderOrder,
@@ -297,22 +440,6 @@ class ProviderOrderReplayWorker:
         except (TypeError, ValueError):
             return None
 
-    @staticmethod
-    def _parse_datetime(value: Any) -> datetime | None:
-        if not isinstance(value, str):
-            return None
-        text = value.strip()
-        if not text:
-            return None
-        cleaned = text.replace("Z", "+00:00")
-        try:
-            parsed = datetime.fromisoformat(cleaned)
-        except ValueError:
-            return None
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        return parsed
-
     async def _ensure_session(self) -> AsyncSession:
         maybe_session = self._session_factory()
         if isinstance(maybe_session, AsyncSession):
@@ -324,34 +451,36 @@ class ProviderOrderReplayWorker:
         order.payload = payload
         flag_modified(order, "payload")
 
-    async def _record_timeline_event(
-        self,
-        machine: OrderStateMachine,
+    @staticmethod
+    def _timeline_draft(
         provider_order: FulfillmentProviderOrder,
         *,
-        event_type: OrderStateEventTypeEnum,
-        actor_type: OrderStateActorTypeEnum,
         metadata: Mapping[str, Any],
-        notes: str | None = None,
-    ) -> None:
+        notes: str,
+    ) -> OrderEventDraft | None:
         if not provider_order.order_id:
+            return None
+        return OrderEventDraft(
+            order_id=provider_order.order_id,
+            event_type=OrderStateEventTypeEnum.REPLAY_EXECUTED,
+            actor_type=OrderStateActorTypeEnum.AUTOMATION,
+            actor_id=str(provider_order.id),
+            notes=notes,
+            metadata=dict(metadata),
+        )
+
+    async def _record_timeline_events(self, drafts: list[OrderEventDraft]) -> None:
+        if not drafts:
             return
-        try:
-            await machine.record_event(
-                order_id=provider_order.order_id,
-                event_type=event_type,
-                actor_type=actor_type,
-                actor_id=str(provider_order.id),
-                actor_label=None,
-                notes=notes,
-                metadata=dict(metadata),
-            )
-        except Exception:
-            logger.exception(
-                "Failed to record automation replay timeline event",
-                order_id=str(provider_order.order_id),
-                event_type=event_type.value,
-            )
+        session = await self._ensure_session()
+        async with session as db:
+            try:
+                await OrderStateMachine(db).record_events(drafts)
+            except Exception:
+                logger.exception(
+                    "Failed to record automation replay timeline events",
+                    count=len(drafts),
+                )
 
     async def _run_loop(self) -> None:
         while not self._stop_event.is_set():
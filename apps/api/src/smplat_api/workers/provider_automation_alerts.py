@@ -1,8 +1,15 @@
-"""Worker that inspects provider automation telemetry and emits alerts."""
+"""Worker that inspects provider automation telemetry and emits alerts.
+
+Telemetry is kept between runs in a ``ProviderAutomationTelemetryState``: each run
+reads only the provider orders updated since the previous one, and thresholds are
+re-evaluated only for providers whose counters moved. Load alerts are recomputed
+when orders changed or the previous result is older than ``_LOAD_ALERT_MAX_AGE``.
+"""
 
 from __future__ import annotations
 
 import asyncio
+from datetime import datetime, timedelta, timezone
 from typing import Any, Awaitable, Callable, Mapping, Sequence
 from urllib.parse import quote_plus, urlencode, urljoin
 
@@ -15,6 +22,7 @@ from smplat_api.core.settings import settings
 from smplat_api.models.provider_guardrail_status import ProviderGuardrailStatus
 from smplat_api.schemas.fulfillment_provider import ProviderAutomationSnapshotResponse
 from smplat_api.services.fulfillment import ProviderAutomationService
+from smplat_api.services.fulfillment.provider_automation_service import ProviderAutomationTelemetryState
 from smplat_api.services.fulfillment.provider_automation_alerts import (
     ProviderAutomationAlert,
     ProviderAutomationAlertEvaluator,
@@ -29,6 +37,8 @@ SessionFactory = Callable[[], AsyncSession] | Callable[[], Awaitable[AsyncSessio
 AutomationFactory = Callable[[AsyncSession], ProviderAutomationService]
 MetricsFactory = Callable[[AsyncSession], BlueprintMetricsService]
 
+_LOAD_ALERT_MAX_AGE = timedelta(minutes=60)
+
 
 class ProviderAutomationAlertWorker:
     """Periodically evaluates provider automation telemetry and notifies operators."""
@@ -71,6 +81,10 @@ class ProviderAutomationAlertWorker:
         self._load_alert_limit = settings.provider_load_alert_max_results
         self._frontend_url = settings.frontend_url
         self._workflow_summary_url = settings.guardrail_workflow_telemetry_summary_url
+        self._telemetry_state = ProviderAutomationTelemetryState()
+        self._alerts_by_provider: dict[str, ProviderAutomationAlert] = {}
+        self._load_alerts: list[ProviderLoadAlert] = []
+        self._load_alerts_at: datetime | None = None
         self._stop_event = asyncio.Event()
         self._task: asyncio.Task | None = None
         self.is_running: bool = False
@@ -90,9 +104,12 @@ class ProviderAutomationAlertWorker:
         alerts: Sequence[ProviderAutomationAlert] = []
         async with session as db:
             automation = self._automation_factory(db)
-            snapshot = await automation.build_snapshot(limit_per_provider=self._snapshot_limit)
-            load_alerts = await self._collect_load_alerts(db)
-            alerts = self._evaluator.evaluate(snapshot)
+            snapshot, changed = await automation.build_incremental_snapshot(
+                self._telemetry_state,
+                limit_per_provider=self._snapshot_limit,
+            )
+            alerts = self._update_alerts(snapshot, changed)
+            load_alerts = await self._refresh_load_alerts(db, orders_changed=bool(changed))
             auto_summary = await self._sync_guardrail_status(db, alerts)
         workflow_summary = await self._fetch_workflow_summary()
         await self._dispatch(alerts, load_alerts, auto_summary, workflow_summary)
@@ -145,6 +162,27 @@ class ProviderAutomationAlertWorker:
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.exception("Provider automation alert dispatch failed", error=str(exc))
 
+    def _update_alerts(
+        self,
+        snapshot: ProviderAutomationSnapshotResponse,
+        changed: set[str],
+    ) -> list[ProviderAutomationAlert]:
+        """Re-evaluate providers in ``changed`` and keep the previous verdict for the rest."""
+        current_ids = {entry.id for entry in snapshot.providers}
+        for provider_id in list(self._alerts_by_provider):
+            if provider_id in changed or provider_id not in current_ids:
+                del self._alerts_by_provider[provider_id]
+        for alert in self._evaluator.evaluate(snapshot, provider_ids=changed):
+            self._alerts_by_provider[alert.provider_id] = alert
+        return [self._alerts_by_provider[entry.id] for entry in snapshot.providers if entry.id in self._alerts_by_provider]
+
+    async def _refresh_load_alerts(self, session: AsyncSession, *, orders_changed: bool) -> list[ProviderLoadAlert]:
+        now = datetime.now(timezone.utc)
+        if orders_changed or self._load_alerts_at is None or now - self._load_alerts_at >= _LOAD_ALERT_MAX_AGE:
+            self._load_alerts = await self._collect_load_alerts(session)
+            self._load_alerts_at = now
+        return list(self._load_alerts)
+
     async def _collect_load_alerts(self, session: AsyncSession) -> list[ProviderLoadAlert]:
         if not self._load_alert_enabled:
             return []
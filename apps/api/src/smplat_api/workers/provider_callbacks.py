@@ -0,0 +1,131 @@
+"""In-process worker that applies ingested provider status callbacks in batches."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from smplat_api.core.settings import settings
+from smplat_api.core.work_signals import PROVIDER_CALLBACKS, AdaptivePollBackoff, get_work_signal
+from smplat_api.core.worker_identity import default_worker_id
+from smplat_api.services.fulfillment.provider_callbacks import (
+    apply_callbacks,
+    claim_pending_callbacks,
+    prune_callbacks,
+)
+
+SessionFactory = Callable[[], AsyncSession] | Callable[[], Awaitable[AsyncSession]]
+Clock = Callable[[], datetime]
+
+_PRUNE_INTERVAL = timedelta(hours=1)
+
+
+class ProviderCallbackWorker:
+    """Drains ``fulfillment_provider_callbacks`` into provider orders.
+
+    Wakes on the ``PROVIDER_CALLBACKS`` signal raised by the ingest endpoint and
+    keeps draining while batches come back full.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        *,
+        clock: Clock | None = None,
+        interval_seconds: int | None = None,
+        batch_size: int | None = None,
+        lease_seconds: int | None = None,
+        worker_id: str | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self.interval_seconds = interval_seconds or settings.provider_callback_worker_interval_seconds
+        self._batch_size = batch_size or settings.provider_callback_batch_size
+        self._lease_seconds = lease_seconds or settings.provider_callback_lease_seconds
+        self._worker_id = worker_id or default_worker_id()
+        self._stop_event = asyncio.Event()
+        self._backoff = AdaptivePollBackoff.for_interval(self.interval_seconds)
+        self._wakeup = get_work_signal(PROVIDER_CALLBACKS)
+        self._last_prune: datetime | None = None
+        self._task: asyncio.Task | None = None
+        self.is_running: bool = False
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run_loop())
+        self.is_running = True
+        logger.info(
+            "Provider callback worker started",
+            interval_seconds=self.interval_seconds,
+            batch_size=self._batch_size,
+        )
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._stop_event.set()
+        self._wakeup.wake()
+        await self._task
+        self._task = None
+        self.is_running = False
+        logger.info("Provider callback worker stopped")
+
+    async def run_once(self) -> dict[str, int]:
+        """Claim and apply one batch of pending callbacks."""
+
+        now = self._clock()
+        session = await self._ensure_session()
+        async with session as db:
+            claimed = await claim_pending_callbacks(
+                db,
+                self._worker_id,
+                now=now,
+                limit=self._batch_size,
+                lease_seconds=self._lease_seconds,
+            )
+            summary = {"claimed": len(claimed)}
+            if claimed:
+                result = await apply_callbacks(
+                    db,
+                    claimed,
+                    now=now,
+                    unmatched_retry_seconds=settings.provider_callback_unmatched_retry_seconds,
+                    unmatched_grace_seconds=settings.provider_callback_unmatched_grace_seconds,
+                )
+                summary.update(result.as_summary())
+            if self._last_prune is None or now - self._last_prune >= _PRUNE_INTERVAL:
+                self._last_prune = now
+                cutoff = now - timedelta(hours=settings.provider_callback_retention_hours)
+                summary["pruned"] = await prune_callbacks(db, older_than=cutoff)
+        return summary
+
+    async def _run_loop(self) -> None:
+        while not self._stop_event.is_set():
+            claimed = 0
+            try:
+                summary = await self.run_once()
+                claimed = summary["claimed"]
+                if claimed:
+                    logger.info("Provider callback worker iteration", summary=summary)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.exception("Provider callback worker iteration failed", error=str(exc))
+            if self._stop_event.is_set():
+                break
+            delay = self._backoff.next_delay(claimed, self._batch_size)
+            if delay > 0:
+                await self._wakeup.wait(delay)
+
+    async def _ensure_session(self) -> AsyncSession:
+        maybe_session = self._session_factory()
+        if isinstance(maybe_session, AsyncSession):
+            return maybe_session
+        return await maybe_session
+
+
+__all__ = ["ProviderCallbackWorker"]
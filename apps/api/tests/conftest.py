@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from smplat_api.app import create_app
 from smplat_api.db.base import Base
 from smplat_api.db.session import get_session
+from smplat_api.domain.fulfillment import provider_registry
+from smplat_api.services.loyalty import catalog_cache as loyalty_catalog_cache
 
 
 def _configure_path() -> None:
@@ -25,6 +27,9 @@ async def session_factory():
         await conn.run_sync(Base.metadata.create_all)
 
     factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    # The registry caches are process-wide; a fresh database starts a fresh catalog.
+    provider_registry.clear_cache()
+    loyalty_catalog_cache.clear_cache()
 
     try:
         yield factory
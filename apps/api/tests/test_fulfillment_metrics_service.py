@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
@@ -21,6 +22,8 @@ from smplat_api.models.product import Product, ProductStatusEnum
 from smplat_api.services.fulfillment.metrics import (
     FulfillmentMetricsService,
     MetricRequest,
+    MetricSnapshot,
+    _BACKGROUND_REFRESHES,
     _CACHE,
     _utcnow,
 )
@@ -692,3 +695,101 @@ async def test_trust_endpoint_surfaces_alerts_and_guardrail(app_with_db):
         assert metric["fallback_copy"]
     finally:
         settings.checkout_api_key = previous_key
+
+
+async def _seed_cached_on_time_metric(session, age: timedelta, expires_in: timedelta) -> MetricSnapshot:
+    computed_at = _utcnow() - age
+    snapshot = MetricSnapshot(
+        metric_id="fulfillment_sla_on_time_pct",
+        value=0.25,
+        formatted_value="25%",
+        computed_at=computed_at,
+        sample_size=4,
+        metadata={"on_time_tasks": 1},
+    )
+    session.add(FulfillmentMetricCache.from_snapshot(snapshot, _utcnow() + expires_in))
+    await session.commit()
+    return snapshot
+
+
+async def _wait_for_background_refresh(metric_id: str) -> None:
+    task = _BACKGROUND_REFRESHES.get(metric_id)
+    if task is not None:
+        await task
+
+
+@pytest.mark.asyncio
+async def test_concurrent_recomputes_are_single_flight(session_factory, monkeypatch: pytest.MonkeyPatch):
+    calls = 0
+    release = asyncio.Event()
+    original = FulfillmentMetricsService._compute_on_time_percentage
+
+    async def slow_compute(self):  # type: ignore[no-untyped-def]
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return await original(self)
+
+    monkeypatch.setattr(FulfillmentMetricsService, "_compute_on_time_percentage", slow_compute)
+
+    async with session_factory() as first_session, session_factory() as second_session:
+        first = FulfillmentMetricsService(first_session, session_factory=session_factory)
+        second = FulfillmentMetricsService(second_session, session_factory=session_factory)
+        request = [MetricRequest(metric_id="fulfillment_sla_on_time_pct")]
+
+        leader = asyncio.create_task(first.resolve_metrics(request))
+        follower = asyncio.create_task(second.resolve_metrics(request))
+        await asyncio.sleep(0.05)
+        release.set()
+        [led], [followed] = await asyncio.gather(leader, follower)
+
+    assert calls == 1
+    assert led.computed_at == followed.computed_at
+    assert "Joined an in-flight recompute." in followed.provenance.notes
+
+
+@pytest.mark.asyncio
+async def test_expired_snapshot_is_served_stale_and_refreshed_in_background(session_factory):
+    async with session_factory() as session:
+        stale = await _seed_cached_on_time_metric(
+            session, age=timedelta(days=1, minutes=5), expires_in=timedelta(minutes=-5)
+        )
+        service = FulfillmentMetricsService(session, session_factory=session_factory)
+
+        [resolved] = await service.resolve_metrics([MetricRequest(metric_id="fulfillment_sla_on_time_pct")])
+
+        assert resolved.provenance.cache_layer == "stale"
+        assert resolved.value == pytest.approx(0.25)
+        assert resolved.verification_state == "stale"
+
+        await _wait_for_background_refresh("fulfillment_sla_on_time_pct")
+
+    refreshed = _CACHE["fulfillment_sla_on_time_pct"]
+    assert refreshed.computed_at > stale.computed_at
+    assert refreshed.value is None
+    async with session_factory() as session:
+        record = await session.get(FulfillmentMetricCache, "fulfillment_sla_on_time_pct")
+        assert record is not None
+        assert record.sample_size == 0
+
+
+@pytest.mark.asyncio
+async def test_snapshot_near_expiry_is_refreshed_ahead(session_factory):
+    async with session_factory() as session:
+        await _seed_cached_on_time_metric(session, age=timedelta(hours=22), expires_in=timedelta(hours=2))
+        service = FulfillmentMetricsService(session, session_factory=session_factory)
+
+        [resolved, unknown] = await service.resolve_metrics(
+            [
+                MetricRequest(metric_id="fulfillment_sla_on_time_pct"),
+                MetricRequest(metric_id="unknown_metric"),
+            ]
+        )
+
+        assert resolved.provenance.cache_layer == "persistent"
+        assert "Background refresh scheduled ahead of expiry." in resolved.provenance.notes
+        assert unknown.verification_state == "unsupported"
+
+        await _wait_for_background_refresh("fulfillment_sla_on_time_pct")
+
+    assert _CACHE["fulfillment_sla_on_time_pct"].sample_size == 0
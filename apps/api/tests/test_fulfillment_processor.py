@@ -18,6 +18,7 @@ from smplat_api.models.fulfillment import FulfillmentTask
 from smplat_api.models.order import Order, OrderItem, OrderSourceEnum, OrderStatusEnum
 from smplat_api.models.product import Product, ProductStatusEnum
 from smplat_api.services.fulfillment.fulfillment_service import FulfillmentService
+from smplat_api.services.fulfillment.provider_limits import ProviderCallGuard, configure_provider_guard
 from smplat_api.services.fulfillment.task_processor import TaskProcessor
 from smplat_api.services.fulfillment.task_processor import (
     FulfillmentTaskStatusEnum,
@@ -43,14 +44,44 @@ class FakeInstagramService:
 
 class FakeFulfillmentService:
     instances: list["FakeFulfillmentService"] = []
+    # Claims and task execution run on separate sessions/services, so the
+    # bookkeeping is shared across instances.
+    claimed: dict[UUID, Any] = {}
+    status_updates: list[tuple[UUID, FulfillmentTaskStatusEnum]] = []
+    scheduled_retries: list[tuple[UUID, int]] = []
+    applied_batches: list[list[Any]] = []
 
     def __init__(self, session: DummySession) -> None:
         self.session = session
         self.instagram_service = FakeInstagramService()
-        self.status_updates: list[tuple[UUID, FulfillmentTaskStatusEnum]] = []
-        self.scheduled_retries: list[tuple[UUID, int]] = []
         FakeFulfillmentService.instances.append(self)
 
+    @classmethod
+    def reset(cls) -> None:
+        cls.instances.clear()
+        cls.claimed.clear()
+        cls.status_updates.clear()
+        cls.scheduled_retries.clear()
+        cls.applied_batches.clear()
+
+    async def claim_pending_tasks(
+        self,
+        worker_id: str,
+        *,
+        limit: int,
+        lease_seconds: int,
+        scheduler: Any = None,
+    ) -> list[Any]:
+        tasks = await self.get_pending_tasks(limit)
+        for task in tasks:
+            task.lease_owner = worker_id
+            self.claimed[task.id] = task
+            self.status_updates.append((task.id, FulfillmentTaskStatusEnum.IN_PROGRESS))
+        return tasks
+
+    async def get_task(self, task_id: UUID) -> Any | None:
+        return self.claimed.get(task_id)
+
     async def get_pending_tasks(self, limit: int) -> list[Any]:
         account_id = uuid4()
         task = SimpleNamespace(
@@ -84,10 +115,20 @@ class FakeFulfillmentService:
         task.scheduled_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
         self.scheduled_retries.append((task.id, delay_seconds))
 
+    async def apply_task_outcomes(self, outcomes: list[Any]) -> None:
+        self.applied_batches.append(list(outcomes))
+        for outcome in outcomes:
+            self.status_updates.append((outcome.task.id, outcome.status))
+            if outcome.status == FulfillmentTaskStatusEnum.PENDING:
+                if not outcome.deferred:
+                    outcome.task.retry_count += 1
+                outcome.task.scheduled_at = datetime.utcnow() + timedelta(seconds=outcome.retry_delay_seconds)
+                self.scheduled_retries.append((outcome.task.id, outcome.retry_delay_seconds))
+
 
 @pytest.mark.asyncio
 async def test_task_processor_run_once(monkeypatch: pytest.MonkeyPatch) -> None:
-    FakeFulfillmentService.instances.clear()
+    FakeFulfillmentService.reset()
     get_fulfillment_store().reset()
     monkeypatch.setattr(
         "smplat_api.services.fulfillment.task_processor.FulfillmentService",
@@ -111,7 +152,7 @@ async def test_task_processor_run_once(monkeypatch: pytest.MonkeyPatch) -> None:
 
 @pytest.mark.asyncio
 async def test_task_processor_failure_dead_letters_when_retries_exhausted(monkeypatch: pytest.MonkeyPatch) -> None:
-    FakeFulfillmentService.instances.clear()
+    FakeFulfillmentService.reset()
     get_fulfillment_store().reset()
 
     class FailingService(FakeFulfillmentService):
@@ -152,7 +193,7 @@ async def test_task_processor_failure_dead_letters_when_retries_exhausted(monkey
 
 @pytest.mark.asyncio
 async def test_task_processor_schedules_retry_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
-    FakeFulfillmentService.instances.clear()
+    FakeFulfillmentService.reset()
     get_fulfillment_store().reset()
 
     class RetryingService(FakeFulfillmentService):
@@ -191,6 +232,176 @@ async def test_task_processor_schedules_retry_on_failure(monkeypatch: pytest.Mon
     assert len(service.scheduled_retries) == 1
 
 
+@pytest.mark.asyncio
+async def test_task_processor_runs_claimed_tasks_with_bounded_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    FakeFulfillmentService.reset()
+    get_fulfillment_store().reset()
+
+    class BatchService(FakeFulfillmentService):
+        async def get_pending_tasks(self, limit: int) -> list[Any]:
+            return [
+                SimpleNamespace(
+                    id=uuid4(),
+                    task_type=FulfillmentTaskTypeEnum.CONTENT_PROMOTION,
+                    payload={},
+                    retry_count=0,
+                    max_retries=1,
+                    scheduled_at=datetime.utcnow() - timedelta(seconds=5),
+                )
+                for _ in range(limit)
+            ]
+
+    in_flight = 0
+    peak = 0
+
+    async def slow_execute(self, service, task):  # type: ignore[no-untyped-def]
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"status": "ok"}
+
+    monkeypatch.setattr(
+        "smplat_api.services.fulfillment.task_processor.FulfillmentService",
+        BatchService,
+    )
+    monkeypatch.setattr(TaskProcessor, "_execute_task", slow_execute, raising=False)
+
+    processor = TaskProcessor(lambda: DummySession(), batch_size=6, concurrency=2, worker_id="worker-a")
+    await processor.run_once()
+
+    assert processor.metrics.tasks_processed == 6
+    assert peak == 2
+    assert all(task.lease_owner == "worker-a" for task in BatchService.claimed.values())
+    completed = [status for _, status in BatchService.status_updates if status == FulfillmentTaskStatusEnum.COMPLETED]
+    assert len(completed) == 6
+    assert processor.health_snapshot()["concurrency"] == 2
+
+
+@pytest.mark.asyncio
+async def test_task_processor_batch_mode_writes_outcomes_in_bulk(monkeypatch: pytest.MonkeyPatch) -> None:
+    FakeFulfillmentService.reset()
+    get_fulfillment_store().reset()
+
+    class MixedBatchService(FakeFulfillmentService):
+        async def get_pending_tasks(self, limit: int) -> list[Any]:
+            return [
+                SimpleNamespace(
+                    id=uuid4(),
+                    task_type=FulfillmentTaskTypeEnum.ANALYTICS_COLLECTION,
+                    payload={"instagram_account_id": str(uuid4())},
+                    retry_count=0,
+                    max_retries=3,
+                    scheduled_at=datetime.utcnow(),
+                ),
+                SimpleNamespace(
+                    id=uuid4(),
+                    task_type=FulfillmentTaskTypeEnum.FOLLOWER_GROWTH,
+                    payload={"execution": {"kind": "http", "url": "https://ops.example"}},
+                    retry_count=0,
+                    max_retries=3,
+                    scheduled_at=datetime.utcnow(),
+                ),
+                SimpleNamespace(
+                    id=uuid4(),
+                    task_type=FulfillmentTaskTypeEnum.CONTENT_PROMOTION,
+                    payload={"fail": True},
+                    retry_count=1,
+                    max_retries=3,
+                    scheduled_at=datetime.utcnow(),
+                ),
+            ]
+
+    async def fake_execute(self, service, task):  # type: ignore[no-untyped-def]
+        if task.payload.get("fail"):
+            raise RuntimeError("transient")
+        return {"status": "ok"}
+
+    monkeypatch.setattr(
+        "smplat_api.services.fulfillment.task_processor.FulfillmentService",
+        MixedBatchService,
+    )
+    monkeypatch.setattr(TaskProcessor, "_execute_task", fake_execute)
+
+    processor = TaskProcessor(lambda: DummySession(), batch_writes=True)
+    await processor.run_once()
+
+    batches = FakeFulfillmentService.applied_batches
+    # The HTTP-backed task is persisted on its own; the rest share one bulk write.
+    assert sorted(len(batch) for batch in batches) == [1, 2]
+    solo = next(batch for batch in batches if len(batch) == 1)
+    assert solo[0].task.payload.get("execution")
+
+    statuses = {outcome.status for batch in batches for outcome in batch}
+    assert statuses == {FulfillmentTaskStatusEnum.COMPLETED, FulfillmentTaskStatusEnum.PENDING}
+    assert len(FakeFulfillmentService.scheduled_retries) == 1
+    assert processor.metrics.tasks_processed == 2
+    assert processor.metrics.tasks_failed == 1
+    assert processor.metrics.tasks_retried == 1
+    assert processor.health_snapshot()["batch_writes"] is True
+
+
+@pytest.mark.asyncio
+async def test_task_processor_defers_tasks_for_open_provider_circuit(monkeypatch: pytest.MonkeyPatch) -> None:
+    FakeFulfillmentService.reset()
+    get_fulfillment_store().reset()
+    guard = ProviderCallGuard(use_redis=False, failure_threshold=1, reset_seconds=45)
+    guard.record_failure("prov-open")
+    configure_provider_guard(guard)
+
+    class ProviderTaskService(FakeFulfillmentService):
+        async def get_pending_tasks(self, limit: int) -> list[Any]:
+            task = SimpleNamespace(
+                id=uuid4(),
+                task_type=FulfillmentTaskTypeEnum.FOLLOWER_GROWTH,
+                payload={
+                    "execution": {
+                        "kind": "http",
+                        "url": "https://provider.example/orders",
+                        "provider_id": "prov-open",
+                    }
+                },
+                retry_count=1,
+                max_retries=1,
+                scheduled_at=datetime.utcnow() - timedelta(seconds=5),
+            )
+            return [task]
+
+    async def fail_if_called(self, execution):  # type: ignore[no-untyped-def]
+        raise AssertionError("provider should not be called while the circuit is open")
+
+    async def empty_context(self, service, task, snapshot, environment_keys):  # type: ignore[no-untyped-def]
+        return {}
+
+    monkeypatch.setattr(
+        "smplat_api.services.fulfillment.task_processor.FulfillmentService",
+        ProviderTaskService,
+    )
+    monkeypatch.setattr(TaskProcessor, "_perform_http_execution", fail_if_called)
+    monkeypatch.setattr(TaskProcessor, "_build_execution_context", empty_context)
+
+    try:
+        processor = TaskProcessor(lambda: DummySession())
+        await processor.run_once()
+    finally:
+        configure_provider_guard(None)
+
+    assert processor.metrics.tasks_deferred == 1
+    assert processor.metrics.tasks_failed == 0
+    assert processor.metrics.tasks_dead_lettered == 0
+
+    [[outcome]] = ProviderTaskService.applied_batches
+    assert outcome.deferred is True
+    assert outcome.status == FulfillmentTaskStatusEnum.PENDING
+    assert outcome.retry_delay_seconds == 45
+    assert outcome.task.retry_count == 1
+
+    snapshot = get_fulfillment_store().snapshot().as_dict()
+    assert snapshot["totals"]["deferred"] == 1
+    assert "circuit_open" not in (snapshot["events"]["last_failure_message"] or "")
+
+
 @pytest.mark.asyncio
 async def test_task_processor_loop_handles_exception(monkeypatch: pytest.MonkeyPatch) -> None:
     processor = TaskProcessor(lambda: DummySession(), poll_interval_seconds=0)
@@ -306,6 +517,7 @@ async def test_execute_configured_http_task(session_factory, monkeypatch: pytest
             json: Any | None = None,
             content: Any | None = None,
             data: Any | None = None,
+            timeout: Any | None = None,
         ) -> FakeResponse:
             captured["method"] = method
             captured["url"] = url
@@ -314,11 +526,20 @@ async def test_execute_configured_http_task(session_factory, monkeypatch: pytest
             captured["params"] = params
             captured["content"] = content
             captured["data"] = data
+            captured["timeout"] = timeout
             return FakeResponse()
 
+        assert task.payload["template_key"].startswith(f"product:{product.id}:task:0:")
+
+        def fail_fingerprint(structure: Any) -> str:
+            raise AssertionError("keyed executions should not fingerprint their templates")
+
         monkeypatch.setenv("FULFILLMENT_BASE_URL", "https://ops.example")
         monkeypatch.setenv("FULFILLMENT_ANALYTICS_TOKEN", "token-321")
         monkeypatch.setattr(AsyncClient, "request", fake_request, raising=False)
+        monkeypatch.setattr(
+            "smplat_api.services.fulfillment.templating.config_fingerprint", fail_fingerprint
+        )
 
         processor = TaskProcessor(lambda: session)
         result = await processor._execute_task(service, task)
@@ -340,7 +561,7 @@ async def test_execute_configured_http_task(session_factory, monkeypatch: pytest
 
 @pytest.mark.asyncio
 async def test_task_processor_health_snapshot(monkeypatch: pytest.MonkeyPatch) -> None:
-    FakeFulfillmentService.instances.clear()
+    FakeFulfillmentService.reset()
     get_fulfillment_store().reset()
     monkeypatch.setattr(
         "smplat_api.services.fulfillment.task_processor.FulfillmentService",
@@ -354,6 +575,7 @@ async def test_task_processor_health_snapshot(monkeypatch: pytest.MonkeyPatch) -
     assert snapshot["running"] is False
     assert snapshot["poll_interval_seconds"] == processor.poll_interval
     assert snapshot["metrics"]["last_run_finished_at"] is not None
+    assert snapshot["queue"]["lanes"] == {}
 
 
 @pytest.mark.asyncio
@@ -398,7 +620,7 @@ async def test_fulfillment_health_endpoint() -> None:
     assert "metrics" in body
 @pytest.mark.asyncio
 async def test_fulfillment_observability_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
-    FakeFulfillmentService.instances.clear()
+    FakeFulfillmentService.reset()
     store = get_fulfillment_store()
     store.reset()
 
@@ -433,3 +655,6 @@ async def test_fulfillment_observability_endpoint(monkeypatch: pytest.MonkeyPatc
     assert body["totals"]["processed"] >= 1
     assert "processed" in body["per_task_type"]
     assert body["per_task_type"]["processed"]
+    assert "circuits" in body["provider_limits"]
+    assert "max_lag_seconds" in body["event_loop"]
+    assert body["metrics_executor"]["mode"] in {"process", "thread", "inline"}
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from smplat_api.models.fulfillment import FulfillmentTaskTypeEnum
+from smplat_api.services.fulfillment.scheduling import FairShareScheduler, task_lane
+
+
+def test_task_lane_splits_provider_executions():
+    assert task_lane(FulfillmentTaskTypeEnum.FOLLOWER_GROWTH) == "follower_growth"
+    assert task_lane(FulfillmentTaskTypeEnum.FOLLOWER_GROWTH, {"provider_id": "prov-a"}) == "follower_growth@prov-a"
+    assert task_lane("follower_growth", {"provider_id": "{{ env.PROVIDER }}"}) == "follower_growth"
+
+
+def test_allocate_follows_weights_and_redistributes_unused_share():
+    scheduler = FairShareScheduler({"analytics_collection": 3, "follower_growth@prov-a": 2})
+
+    assert scheduler.weight_for("analytics_collection@prov-b") == 3
+    assert scheduler.allocate({"analytics_collection": 100, "follower_growth": 100}, 8) == {
+        "analytics_collection": 6,
+        "follower_growth": 2,
+    }
+    # A short lane's unused share flows to the others.
+    assert scheduler.allocate({"analytics_collection": 1, "follower_growth@prov-a": 50, "follower_growth": 50}, 10) == {
+        "analytics_collection": 1,
+        "follower_growth@prov-a": 6,
+        "follower_growth": 3,
+    }
+
+
+def test_allocate_rotates_slots_when_lanes_outnumber_batch():
+    scheduler = FairShareScheduler()
+    depths = {"a": 10, "b": 10, "c": 10}
+
+    granted = {lane: 0 for lane in depths}
+    for _ in range(3):
+        for lane, slots in scheduler.allocate(depths, 1).items():
+            granted[lane] += slots
+
+    assert granted == {"a": 1, "b": 1, "c": 1}
+
+
+def test_snapshot_reports_depth_and_wait_times():
+    scheduler = FairShareScheduler()
+    now = datetime(2026, 1, 1, 12, 0, 0)
+
+    scheduler.observe_queue({"follower_growth": (40, now - timedelta(minutes=10))}, now)
+    scheduler.record_claimed([("follower_growth", now - timedelta(seconds=30))], now)
+    scheduler.record_claimed([("follower_growth", now - timedelta(seconds=80))], now)
+
+    lane = scheduler.snapshot()["lanes"]["follower_growth"]
+    assert lane["queue_depth"] == 40
+    assert lane["oldest_wait_seconds"] == 600
+    assert lane["claimed_total"] == 2
+    assert lane["last_wait_seconds"] == 80
+    assert lane["avg_wait_seconds"] == 40
+
+    scheduler.observe_queue({}, now)
+    assert scheduler.snapshot()["lanes"]["follower_growth"]["queue_depth"] == 0
@@ -26,7 +26,8 @@ from smplat_api.models.fulfillment import (
 from smplat_api.models.order import Order, OrderItem, OrderSourceEnum, OrderStatusEnum
 from smplat_api.models.notification import NotificationPreference
 from smplat_api.models.product import Product, ProductStatusEnum
-from smplat_api.services.fulfillment.fulfillment_service import FulfillmentService
+from smplat_api.services.fulfillment.scheduling import FairShareScheduler
+from smplat_api.services.fulfillment.fulfillment_service import FulfillmentService, FulfillmentTaskOutcome
 from smplat_api.models.user import User, UserRoleEnum, UserStatusEnum
 from smplat_api.services.notifications import NotificationService
 from smplat_api.domain.fulfillment import provider_registry
@@ -101,6 +102,7 @@ async def test_process_order_fulfillment_respects_product_configuration(session_
                     "type": FulfillmentTaskTypeEnum.ANALYTICS_COLLECTION.value,
                     "title": "Baseline snapshot",
                     "schedule_offset_minutes": 0,
+                    "priority": 5,
                     "execution": {
                         "kind": "http",
                         "method": "POST",
@@ -122,7 +124,8 @@ async def test_process_order_fulfillment_respects_product_configuration(session_
                         "body": {"order": "{{ order }}", "product": "{{ product }}"},
                     },
                 },
-            ]
+            ],
+            "priority": 1,
         }
 
         product = Product(
@@ -183,11 +186,14 @@ async def test_process_order_fulfillment_respects_product_configuration(session_
         assert first_task.payload["context"]["item"]["quantity"] == 2
         assert first_task.payload["execution"]["environment_keys"] == ["FULFILLMENT_BASE_URL"]
         assert first_task.payload["raw_payload"]["playbook"] == "baseline"
+        assert first_task.priority == 5
+        assert first_task.lane == FulfillmentTaskTypeEnum.ANALYTICS_COLLECTION.value
 
         second_task = tasks[1]
         assert second_task.task_type == FulfillmentTaskTypeEnum.CONTENT_PROMOTION
         assert second_task.payload["context"]["product"]["slug"] == product.slug
         assert second_task.payload["execution"]["body"]["order"] == "{{ order }}"
+        assert second_task.priority == 1
 
 
 @pytest.mark.asyncio
@@ -523,6 +529,7 @@ async def test_process_order_fulfillment_calls_provider_endpoint(session_factory
         assert len(provider_orders) == 1
         record = provider_orders[0]
         assert record.payload.get("providerOrderId") == "remote-001"
+        assert record.provider_reference == "remote-001"
         assert record.payload.get("providerResponse", {}).get("data", {}).get("order_id") == "remote-001"
         assert responses
         assert float(responses[0]["payload"]["amount"]) == 150
@@ -683,6 +690,333 @@ async def test_get_pending_tasks_filters_by_schedule(session_factory):
         assert pending[0].title == "Due task"
 
 
+@pytest.mark.asyncio
+async def test_claim_pending_tasks_leases_disjoint_batches(session_factory):
+    async with session_factory() as session:
+        order = Order(
+            order_number="SM100011",
+            subtotal=Decimal("30.00"),
+            tax=Decimal("0"),
+            total=Decimal("30.00"),
+            currency=CurrencyEnum.EUR,
+            status=OrderStatusEnum.PROCESSING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        order_item = OrderItem(
+            order=order,
+            product_title="Claimable",
+            quantity=1,
+            unit_price=Decimal("30.00"),
+            total_price=Decimal("30.00"),
+        )
+        tasks = [
+            FulfillmentTask(
+                order_item=order_item,
+                task_type=FulfillmentTaskTypeEnum.CONTENT_PROMOTION,
+                title=f"Due task {index}",
+                status=FulfillmentTaskStatusEnum.PENDING,
+                scheduled_at=datetime.utcnow() - timedelta(minutes=10 - index),
+            )
+            for index in range(3)
+        ]
+        future_task = FulfillmentTask(
+            order_item=order_item,
+            task_type=FulfillmentTaskTypeEnum.ENGAGEMENT_BOOST,
+            title="Future task",
+            status=FulfillmentTaskStatusEnum.PENDING,
+            scheduled_at=datetime.utcnow() + timedelta(minutes=5),
+        )
+        session.add_all([order, order_item, *tasks, future_task])
+        await session.commit()
+
+    async with session_factory() as first_session, session_factory() as second_session:
+        first = await FulfillmentService(first_session).claim_pending_tasks("worker-a", limit=2)
+        second = await FulfillmentService(second_session).claim_pending_tasks("worker-b", limit=5)
+
+    assert [task.title for task in first] == ["Due task 0", "Due task 1"]
+    assert [task.title for task in second] == ["Due task 2"]
+    assert all(task.status == FulfillmentTaskStatusEnum.IN_PROGRESS for task in first + second)
+    assert all(task.lease_owner == "worker-a" for task in first)
+    assert all(task.lease_expires_at is not None for task in first + second)
+
+    async with session_factory() as session:
+        stored_order = await session.get(Order, order.id)
+        assert stored_order.status == OrderStatusEnum.ACTIVE
+        assert await FulfillmentService(session).claim_pending_tasks("worker-c") == []
+
+
+@pytest.mark.asyncio
+async def test_claim_pending_tasks_shares_batches_across_lanes(session_factory):
+    async with session_factory() as session:
+        order = Order(
+            order_number="SM100019",
+            subtotal=Decimal("30.00"),
+            tax=Decimal("0"),
+            total=Decimal("30.00"),
+            currency=CurrencyEnum.EUR,
+            status=OrderStatusEnum.PROCESSING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        order_item = OrderItem(
+            order=order,
+            product_title="Mixed workload",
+            quantity=1,
+            unit_price=Decimal("30.00"),
+            total_price=Decimal("30.00"),
+        )
+        growth = [
+            FulfillmentTask(
+                order_item=order_item,
+                task_type=FulfillmentTaskTypeEnum.FOLLOWER_GROWTH,
+                title=f"Growth {index}",
+                status=FulfillmentTaskStatusEnum.PENDING,
+                scheduled_at=datetime.utcnow() - timedelta(hours=1, minutes=index),
+            )
+            for index in range(12)
+        ]
+        analytics = [
+            FulfillmentTask(
+                order_item=order_item,
+                task_type=FulfillmentTaskTypeEnum.ANALYTICS_COLLECTION,
+                title=f"Analytics {index}",
+                status=FulfillmentTaskStatusEnum.PENDING,
+                scheduled_at=datetime.utcnow() - timedelta(minutes=1),
+                priority=index,
+            )
+            for index in range(3)
+        ]
+        session.add_all([order, order_item, *growth, *analytics])
+        await session.commit()
+
+    scheduler = FairShareScheduler({"analytics_collection": 3})
+    async with session_factory() as session:
+        claimed = await FulfillmentService(session).claim_pending_tasks("worker-a", limit=4, scheduler=scheduler)
+
+    # Weight 3:1 gives analytics three of four slots despite the older growth backlog.
+    assert [task.title for task in claimed] == ["Analytics 2", "Analytics 1", "Growth 11", "Analytics 0"]
+
+    lanes = scheduler.snapshot()["lanes"]
+    assert lanes["follower_growth"]["queue_depth"] == 12
+    assert lanes["follower_growth"]["oldest_wait_seconds"] >= 3600
+    assert lanes["analytics_collection"]["claimed_total"] == 3
+    assert lanes["analytics_collection"]["avg_wait_seconds"] >= 60
+
+    async with session_factory() as session:
+        claimed = await FulfillmentService(session).claim_pending_tasks("worker-a", limit=4, scheduler=scheduler)
+    assert [task.title for task in claimed] == ["Growth 10", "Growth 9", "Growth 8", "Growth 7"]
+    assert scheduler.snapshot()["lanes"]["analytics_collection"]["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_claim_pending_tasks_reclaims_expired_leases(session_factory):
+    async with session_factory() as session:
+        order = Order(
+            order_number="SM100012",
+            subtotal=Decimal("30.00"),
+            tax=Decimal("0"),
+            total=Decimal("30.00"),
+            currency=CurrencyEnum.EUR,
+            status=OrderStatusEnum.ACTIVE,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        order_item = OrderItem(
+            order=order,
+            product_title="Stalled",
+            quantity=1,
+            unit_price=Decimal("30.00"),
+            total_price=Decimal("30.00"),
+        )
+        stalled = FulfillmentTask(
+            order_item=order_item,
+            task_type=FulfillmentTaskTypeEnum.CONTENT_PROMOTION,
+            title="Stalled task",
+            status=FulfillmentTaskStatusEnum.IN_PROGRESS,
+            scheduled_at=datetime.utcnow() - timedelta(hours=1),
+            lease_owner="crashed-worker",
+            lease_expires_at=datetime.utcnow() - timedelta(minutes=1),
+        )
+        leased = FulfillmentTask(
+            order_item=order_item,
+            task_type=FulfillmentTaskTypeEnum.ENGAGEMENT_BOOST,
+            title="Leased task",
+            status=FulfillmentTaskStatusEnum.IN_PROGRESS,
+            scheduled_at=datetime.utcnow() - timedelta(hours=1),
+            lease_owner="live-worker",
+            lease_expires_at=datetime.utcnow() + timedelta(minutes=5),
+        )
+        session.add_all([order, order_item, stalled, leased])
+        await session.commit()
+
+        service = FulfillmentService(session)
+        claimed = await service.claim_pending_tasks("worker-a")
+        assert [task.title for task in claimed] == ["Stalled task"]
+        assert claimed[0].lease_owner == "worker-a"
+        assert claimed[0].retry_count == 1
+
+        await service.update_task_status(claimed[0].id, FulfillmentTaskStatusEnum.COMPLETED)
+        completed = await session.get(FulfillmentTask, claimed[0].id)
+        assert completed.lease_owner is None
+        assert completed.lease_expires_at is None
+
+
+@pytest.mark.asyncio
+async def test_claim_pending_tasks_fails_expired_leases_without_retries_left(session_factory):
+    async with session_factory() as session:
+        order = Order(
+            order_number="SM100013",
+            subtotal=Decimal("30.00"),
+            tax=Decimal("0"),
+            total=Decimal("30.00"),
+            currency=CurrencyEnum.EUR,
+            status=OrderStatusEnum.PROCESSING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        order_item = OrderItem(
+            order=order,
+            product_title="Poison",
+            quantity=1,
+            unit_price=Decimal("30.00"),
+            total_price=Decimal("30.00"),
+        )
+        poison = FulfillmentTask(
+            order_item=order_item,
+            task_type=FulfillmentTaskTypeEnum.CONTENT_PROMOTION,
+            title="Poison task",
+            status=FulfillmentTaskStatusEnum.IN_PROGRESS,
+            scheduled_at=datetime.utcnow() - timedelta(hours=1),
+            retry_count=2,
+            max_retries=2,
+            lease_owner="crashed-worker",
+            lease_expires_at=datetime.utcnow() - timedelta(minutes=1),
+        )
+        session.add_all([order, order_item, poison])
+        await session.commit()
+
+        service = FulfillmentService(session)
+        assert await service.claim_pending_tasks("worker-a") == []
+
+        failed = (
+            await session.execute(
+                select(FulfillmentTask)
+                .where(FulfillmentTask.id == poison.id)
+                .execution_options(populate_existing=True)
+            )
+        ).scalar_one()
+        assert failed.status == FulfillmentTaskStatusEnum.FAILED
+        assert failed.retry_count == 2
+        assert failed.lease_owner is None
+        assert failed.lease_expires_at is None
+        assert failed.completed_at is not None
+        assert "lease expired" in failed.error_message.lower()
+
+        assert await service.claim_pending_tasks("worker-b") == []
+
+
+@pytest.mark.asyncio
+async def test_apply_task_outcomes_bulk_writes_claimed_batch(session_factory):
+    async with session_factory() as session:
+        order = Order(
+            order_number="SM100018",
+            subtotal=Decimal("30.00"),
+            tax=Decimal("0"),
+            total=Decimal("30.00"),
+            currency=CurrencyEnum.EUR,
+            status=OrderStatusEnum.PROCESSING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        order_item = OrderItem(
+            order=order,
+            product_title="Batch",
+            quantity=1,
+            unit_price=Decimal("30.00"),
+            total_price=Decimal("30.00"),
+        )
+        tasks = [
+            FulfillmentTask(
+                order_item=order_item,
+                task_type=FulfillmentTaskTypeEnum.CONTENT_PROMOTION,
+                title=f"Batch task {index}",
+                status=FulfillmentTaskStatusEnum.PENDING,
+                max_retries=1,
+                scheduled_at=datetime.utcnow() - timedelta(minutes=1),
+            )
+            for index in range(4)
+        ]
+        session.add_all([order, order_item, *tasks])
+        await session.commit()
+
+    async with session_factory() as session:
+        claimed = await FulfillmentService(session).claim_pending_tasks("worker-a", limit=10)
+    assert len(claimed) == 4
+    by_title = {task.title: task for task in claimed}
+
+    async with session_factory() as session:
+        service = FulfillmentService(session)
+        await service.apply_task_outcomes(
+            [
+                FulfillmentTaskOutcome(
+                    task=by_title["Batch task 0"],
+                    status=FulfillmentTaskStatusEnum.COMPLETED,
+                    result={"status": "ok"},
+                ),
+                FulfillmentTaskOutcome(
+                    task=by_title["Batch task 1"],
+                    status=FulfillmentTaskStatusEnum.PENDING,
+                    error_message="transient",
+                    retry_delay_seconds=60,
+                ),
+                FulfillmentTaskOutcome(
+                    task=by_title["Batch task 2"],
+                    status=FulfillmentTaskStatusEnum.FAILED,
+                    error_message="fatal",
+                    result={"dead_letter": True},
+                ),
+                FulfillmentTaskOutcome(
+                    task=by_title["Batch task 3"],
+                    status=FulfillmentTaskStatusEnum.PENDING,
+                    error_message="Circuit open for provider:prov-x",
+                    retry_delay_seconds=30,
+                    deferred=True,
+                ),
+            ]
+        )
+
+    assert by_title["Batch task 1"].retry_count == 1
+    assert by_title["Batch task 1"].scheduled_at > datetime.utcnow()
+
+    async with session_factory() as session:
+        rows = {
+            task.title: task
+            for task in (await session.execute(select(FulfillmentTask))).scalars().all()
+        }
+        completed = rows["Batch task 0"]
+        assert completed.status == FulfillmentTaskStatusEnum.COMPLETED
+        assert completed.result == {"status": "ok"}
+        assert completed.completed_at is not None
+        assert completed.lease_owner is None
+
+        retried = rows["Batch task 1"]
+        assert retried.status == FulfillmentTaskStatusEnum.PENDING
+        assert retried.retry_count == 1
+        assert retried.error_message == "transient"
+        assert retried.started_at is None
+        assert retried.lease_expires_at is None
+
+        failed = rows["Batch task 2"]
+        assert failed.status == FulfillmentTaskStatusEnum.FAILED
+        assert failed.error_message == "fatal"
+        assert failed.result == {"dead_letter": True}
+
+        deferred = rows["Batch task 3"]
+        assert deferred.status == FulfillmentTaskStatusEnum.PENDING
+        assert deferred.retry_count == 0
+        assert deferred.error_message == "Circuit open for provider:prov-x"
+        assert deferred.scheduled_at > datetime.utcnow()
+
+        refreshed_order = await session.get(Order, order.id)
+        assert refreshed_order.status == OrderStatusEnum.ON_HOLD
+
+
 @pytest.mark.asyncio
 async def test_schedule_retry_updates_task(session_factory):
     async with session_factory() as session:
@@ -834,6 +1168,7 @@ async def test_get_order_fulfillment_progress(session_factory):
         assert progress["failed_tasks"] == 1
         assert progress["in_progress_tasks"] == 1
         assert progress["progress_percentage"] == round(1 / 3 * 100, 2)
+        assert progress["items_count"] == 1
 
 
 @pytest.mark.asyncio
@@ -883,6 +1218,81 @@ async def test_update_task_status_marks_order_completed(session_factory):
         assert final_status.status == OrderStatusEnum.COMPLETED
 
 
+@pytest.mark.asyncio
+async def test_update_task_status_aggregates_across_order_items(session_factory):
+    async with session_factory() as session:
+        order = Order(
+            order_number="SM100016",
+            subtotal=Decimal("120.00"),
+            tax=Decimal("0"),
+            total=Decimal("120.00"),
+            currency=CurrencyEnum.EUR,
+            status=OrderStatusEnum.PROCESSING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        items = [
+            OrderItem(
+                order=order,
+                product_title=f"Bundle part {index}",
+                quantity=1,
+                unit_price=Decimal("40.00"),
+                total_price=Decimal("40.00"),
+            )
+            for index in range(3)
+        ]
+        tasks = [
+            FulfillmentTask(
+                order_item=item,
+                task_type=FulfillmentTaskTypeEnum.CONTENT_PROMOTION,
+                title=f"Task {index}",
+                status=FulfillmentTaskStatusEnum.PENDING,
+            )
+            for index, item in enumerate(items)
+        ]
+        other_order = Order(
+            order_number="SM100017",
+            subtotal=Decimal("10.00"),
+            tax=Decimal("0"),
+            total=Decimal("10.00"),
+            currency=CurrencyEnum.EUR,
+            status=OrderStatusEnum.PROCESSING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        other_item = OrderItem(
+            order=other_order,
+            product_title="Unrelated",
+            quantity=1,
+            unit_price=Decimal("10.00"),
+            total_price=Decimal("10.00"),
+        )
+        other_task = FulfillmentTask(
+            order_item=other_item,
+            task_type=FulfillmentTaskTypeEnum.CONTENT_PROMOTION,
+            title="Unrelated task",
+            status=FulfillmentTaskStatusEnum.FAILED,
+        )
+
+        session.add_all([order, *items, *tasks, other_order, other_item, other_task])
+        await session.commit()
+
+        service = FulfillmentService(session)
+        await service.update_task_status(tasks[0].id, FulfillmentTaskStatusEnum.IN_PROGRESS)
+        assert (await session.get(Order, order.id)).status == OrderStatusEnum.ACTIVE
+
+        await service.update_task_status(tasks[0].id, FulfillmentTaskStatusEnum.COMPLETED)
+        await service.update_task_status(tasks[1].id, FulfillmentTaskStatusEnum.COMPLETED)
+        assert (await session.get(Order, order.id)).status == OrderStatusEnum.ACTIVE
+
+        await service.update_task_status(tasks[2].id, FulfillmentTaskStatusEnum.FAILED, error_message="boom")
+        assert (await session.get(Order, order.id)).status == OrderStatusEnum.ON_HOLD
+
+        progress = await service.get_order_fulfillment_progress(order.id)
+        assert progress["total_tasks"] == 3
+        assert progress["completed_tasks"] == 2
+        assert progress["failed_tasks"] == 1
+        assert progress["items_count"] == 3
+
+
 @pytest.mark.asyncio
 async def test_fulfillment_completion_triggers_notifications(session_factory):
     async with session_factory() as session:
@@ -974,3 +1384,39 @@ async def test_fulfillment_completion_triggers_notifications(session_factory):
         assert "QA escort" in text_body.get_content()
         status_events = [event for event in notification_service.sent_events if event.event_type == "order_status_update"]
         assert any(event.metadata.get("current_status") == OrderStatusEnum.COMPLETED.value for event in status_events)
+
+
+@pytest.mark.asyncio
+async def test_refresh_catalog_reloads_only_changed_entries(session_factory):
+    async with session_factory() as session:
+        session.add_all(
+            [
+                FulfillmentProvider(id="prov-stable", name="Stable", status=FulfillmentProviderStatusEnum.ACTIVE),
+                FulfillmentProvider(id="prov-edited", name="Edited", status=FulfillmentProviderStatusEnum.ACTIVE),
+                FulfillmentServiceModel(
+                    id="svc-removed",
+                    provider_id="prov-edited",
+                    name="Removed Service",
+                    action="followers",
+                ),
+            ]
+        )
+        await session.commit()
+        snapshot = await provider_registry.refresh_catalog(session, force=True)
+        stable = provider_registry.get_provider("prov-stable")
+        assert provider_registry.get_service("svc-removed") is not None
+
+    async with session_factory() as session:
+        edited = await session.get(FulfillmentProvider, "prov-edited")
+        edited.name = "Edited Again"
+        await session.delete(await session.get(FulfillmentServiceModel, "svc-removed"))
+        await session.commit()
+
+    async with session_factory() as session:
+        refreshed = await provider_registry.refresh_catalog(session)
+
+    assert refreshed.version > snapshot.version
+    assert refreshed.loaded_at == snapshot.loaded_at
+    assert provider_registry.get_provider("prov-stable") is stable
+    assert provider_registry.get_provider("prov-edited").name == "Edited Again"
+    assert provider_registry.get_service("svc-removed") is None
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from smplat_api.services.fulfillment import templating
+from smplat_api.services.fulfillment.provider_endpoints import endpoint_template_key, render_object
+from smplat_api.services.fulfillment.templating import (
+    clear_template_cache,
+    compile_template,
+    render_template,
+)
+
+
+CONTEXT = {
+    "order": {"id": "ord-1", "number": "SM-100", "tags": ["vip", "rush"]},
+    "item": {"quantity": 5, "price": 12.5, "active": True, "notes": None},
+    "product": {"meta": {"flags": [{"name": "beta"}]}},
+}
+
+
+def test_strict_render_resolves_paths_and_coerces_types():
+    template = {
+        "url": "https://ops.example/orders/{{ order.id }}",
+        "body": {
+            "quantity": "{{ item.quantity }}",
+            "price": "{{item.price}}",
+            "summary": "{{ order.number }} x{{ item.quantity }}",
+            "pair": "{{ item.quantity }}{{ item.quantity }}",
+            "flag": "{{ product.meta.flags.0.name }}",
+            "tags": "{{ order.tags }}",
+            "inline_tags": "tags={{ order.tags }}",
+            "active": "is {{ item.active }}",
+            "notes": "{{ item.notes }}",
+            "static": ["plain", 3],
+        },
+    }
+
+    rendered = render_template(template, CONTEXT)
+
+    assert rendered["url"] == "https://ops.example/orders/ord-1"
+    body = rendered["body"]
+    assert body["quantity"] == 5
+    assert body["price"] == 12.5
+    assert body["summary"] == "SM-100 x5"
+    assert body["pair"] == 55
+    assert body["flag"] == "beta"
+    assert body["tags"] == ["vip", "rush"]
+    assert body["inline_tags"] == 'tags=["vip", "rush"]'
+    assert body["active"] == "is True"
+    assert body["notes"] is None
+    assert body["static"] == ["plain", 3]
+
+
+def test_strict_render_raises_for_missing_values():
+    with pytest.raises(KeyError):
+        render_template({"value": "{{ order.missing }}"}, CONTEXT)
+    with pytest.raises(KeyError):
+        render_template("{{ order.tags.x }}", CONTEXT)
+    with pytest.raises(KeyError):
+        render_template("{{ order.id | upper }}", CONTEXT)
+
+
+def test_compiled_plan_is_cached_and_isolated_between_renders():
+    clear_template_cache()
+    template = {"headers": {"X-Order": "{{ order.id }}"}, "static": {"k": "v"}}
+
+    plan = compile_template(template)
+    assert compile_template({"static": {"k": "v"}, "headers": {"X-Order": "{{ order.id }}"}}) is plan
+    assert compile_template(template, strict=False) is not plan
+
+    first = plan.render(CONTEXT)
+    first["static"]["k"] = "mutated"
+    second = plan.render({"order": {"id": "ord-2"}})
+
+    assert second == {"headers": {"X-Order": "ord-2"}, "static": {"k": "v"}}
+
+
+def test_render_object_keeps_lenient_provider_semantics():
+    context = {"providerOrderId": "po-9", "quantity": 10, "order": {"id": "ord-1"}, "meta": {"a": 1}}
+    template = {
+        "id": "{{providerOrderId}}",
+        "qty": "{{ quantity }}",
+        "path": "/orders/{{providerOrderId}}/{{ order.id }}",
+        "unknown": "{{missing}}",
+        "partial": "x-{{missing}}-{{quantity}}",
+        "meta": "{{meta}}",
+    }
+
+    rendered = render_object(template, context)
+
+    assert rendered == {
+        "id": "po-9",
+        "qty": "10",
+        "path": "/orders/po-9/ord-1",
+        "unknown": "{{missing}}",
+        "partial": "x-{{missing}}-10",
+        "meta": {"a": 1},
+    }
+
+
+def test_keyed_endpoint_plans_skip_fingerprinting(monkeypatch: pytest.MonkeyPatch):
+    clear_template_cache()
+    updated_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    key = endpoint_template_key("prov-a", "order", updated_at)
+    assert key == "provider:prov-a:order:2026-01-01T00:00:00+00:00"
+    assert endpoint_template_key("prov-a", "order", None) is None
+
+    template = {"path": "/orders/{{providerOrderId}}"}
+    assert render_object(template, {"providerOrderId": "po-1"}, cache_key=f"{key}:url") == {"path": "/orders/po-1"}
+
+    def fail_fingerprint(structure):  # type: ignore[no-untyped-def]
+        raise AssertionError("keyed renders should not fingerprint")
+
+    monkeypatch.setattr(templating, "config_fingerprint", fail_fingerprint)
+    assert render_object(template, {"providerOrderId": "po-2"}, cache_key=f"{key}:url") == {"path": "/orders/po-2"}
@@ -5,11 +5,15 @@ from decimal import Decimal
 
 import pytest
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from smplat_api.jobs.loyalty.nudge_dispatcher import dispatch_loyalty_nudges
 from smplat_api.jobs.loyalty.nudges import aggregate_loyalty_nudges
+from smplat_api.jobs.loyalty.progression import run_loyalty_progression
 from smplat_api.models.loyalty import (
+    LoyaltyJobCheckpoint,
+    LoyaltyLedgerEntry,
+    LoyaltyLedgerEntryType,
     LoyaltyMember,
     LoyaltyNudge,
     LoyaltyNudgeDispatchEvent,
@@ -136,3 +140,117 @@ async def test_loyalty_nudge_dispatcher_fallback(session_factory, monkeypatch) -
         ).scalars().all()
         assert events
         assert any(event.channel == LoyaltyNudgeChannel.SMS for event in events)
+
+
+async def _seed_streak_members(session_factory) -> dict[str, object]:
+    async with session_factory() as session:
+        service = LoyaltyService(session)
+        bronze = LoyaltyTier(slug="bronze", name="Bronze", point_threshold=Decimal("0"), benefits=[])
+        silver = LoyaltyTier(slug="silver", name="Silver", point_threshold=Decimal("15"), benefits=[])
+        session.add_all([bronze, silver])
+        await session.flush()
+        members: dict[str, object] = {"silver_tier_id": silver.id}
+        for label in ("climber", "steady", "rewarded", "dormant"):
+            user = User(email=f"streak-{label}@example.com")
+            session.add(user)
+            await session.flush()
+            member = await service.ensure_member(user.id)
+            members[label] = member.id
+        climber = await session.get(LoyaltyMember, members["climber"])
+        await service.record_ledger_entry(climber, entry_type=LoyaltyLedgerEntryType.EARN, amount=Decimal("10"))
+        rewarded = await session.get(LoyaltyMember, members["rewarded"])
+        await service.record_ledger_entry(
+            rewarded, entry_type=LoyaltyLedgerEntryType.TIER_BONUS, amount=Decimal("10")
+        )
+        await session.execute(
+            update(LoyaltyMember)
+            .where(LoyaltyMember.id == members["dormant"])
+            .values(updated_at=dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=30))
+        )
+        await session.commit()
+    return members
+
+
+@pytest.mark.asyncio
+async def test_loyalty_progression_grants_streak_bonuses_in_batches(session_factory) -> None:
+    members = await _seed_streak_members(session_factory)
+
+    summary = await run_loyalty_progression(session_factory=session_factory, batch_size=1)
+
+    assert summary["bonuses_granted"] == 2
+    assert summary["events_emitted"] == 2
+    assert summary["expired_points"] == 0
+
+    async with session_factory() as session:
+        bonuses = (
+            await session.execute(
+                select(LoyaltyLedgerEntry).where(LoyaltyLedgerEntry.entry_type == LoyaltyLedgerEntryType.TIER_BONUS)
+            )
+        ).scalars().all()
+        granted = sorted(str(entry.member_id) for entry in bonuses if entry.metadata_json.get("kind") == "streak_bonus")
+        assert granted == sorted([str(members["climber"]), str(members["steady"])])
+
+        climber = await session.get(LoyaltyMember, members["climber"])
+        steady = await session.get(LoyaltyMember, members["steady"])
+        assert Decimal(climber.points_balance) == Decimal("20")
+        assert Decimal(climber.lifetime_points) == Decimal("20")
+        assert climber.current_tier_id == members["silver_tier_id"]
+        assert steady.current_tier_id != members["silver_tier_id"]
+        assert steady.next_expiration_at is not None
+
+        expirations = (
+            await session.execute(
+                select(LoyaltyPointExpiration).where(LoyaltyPointExpiration.member_id == members["steady"])
+            )
+        ).scalars().all()
+        assert [Decimal(record.points) for record in expirations] == [Decimal("10")]
+
+        checkpoint = (await session.execute(select(LoyaltyJobCheckpoint))).scalar_one()
+        assert checkpoint.completed_at is not None
+        assert checkpoint.processed_count == 2
+
+    rerun = await run_loyalty_progression(session_factory=session_factory, batch_size=1)
+    assert rerun["bonuses_granted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_loyalty_progression_resumes_from_checkpoint(session_factory, monkeypatch) -> None:
+    members = await _seed_streak_members(session_factory)
+    original = LoyaltyService.grant_bonus_batch
+    calls = 0
+
+    async def _fail_second_page(self, **kwargs):  # type: ignore[no-untyped-def]
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("worker lost")
+        return await original(self, **kwargs)
+
+    monkeypatch.setattr(LoyaltyService, "grant_bonus_batch", _fail_second_page)
+    with pytest.raises(RuntimeError):
+        await run_loyalty_progression(session_factory=session_factory, batch_size=1)
+
+    async with session_factory() as session:
+        checkpoint = (await session.execute(select(LoyaltyJobCheckpoint))).scalar_one()
+        assert checkpoint.completed_at is None
+        assert checkpoint.processed_count == 1
+        first_run_at = checkpoint.run_started_at
+
+    monkeypatch.setattr(LoyaltyService, "grant_bonus_batch", original)
+    summary = await run_loyalty_progression(session_factory=session_factory, batch_size=1)
+    assert summary["bonuses_granted"] == 1
+
+    async with session_factory() as session:
+        checkpoint = (await session.execute(select(LoyaltyJobCheckpoint))).scalar_one()
+        assert checkpoint.completed_at is not None
+        assert checkpoint.processed_count == 2
+        assert checkpoint.run_started_at == first_run_at
+        bonus_members = (
+            await session.execute(
+                select(LoyaltyLedgerEntry.member_id).where(
+                    LoyaltyLedgerEntry.entry_type == LoyaltyLedgerEntryType.TIER_BONUS,
+                    LoyaltyLedgerEntry.member_id != members["rewarded"],
+                )
+            )
+        ).scalars().all()
+        assert sorted(map(str, bonus_members)) == sorted([str(members["climber"]), str(members["steady"])])
@@ -3,7 +3,7 @@ from decimal import Decimal
 
 import pytest
 
-from sqlalchemy import select
+from sqlalchemy import event, select
 
 from smplat_api.models.loyalty import (
     LoyaltyCheckoutIntent,
@@ -101,6 +101,105 @@ async def test_expiration_job(session_factory) -> None:
         assert Decimal(member.points_balance or 0) == Decimal("30")
 
 
+@pytest.mark.asyncio
+async def test_expiration_sweep_aggregates_per_member_and_tracks_next_expiry(session_factory) -> None:
+    async with session_factory() as session:
+        service = LoyaltyService(session)
+        session.add(LoyaltyTier(slug="sweep", name="Sweep", point_threshold=Decimal("0"), benefits=[]))
+        spender_user = User(email="spender@example.com")
+        short_user = User(email="short@example.com")
+        session.add_all([spender_user, short_user])
+        await session.flush()
+
+        now = dt.datetime.now(dt.timezone.utc)
+        spender = await service.ensure_member(spender_user.id)
+        short = await service.ensure_member(short_user.id)
+        await service.record_ledger_entry(spender, entry_type=LoyaltyLedgerEntryType.EARN, amount=Decimal("100"))
+        await service.record_ledger_entry(short, entry_type=LoyaltyLedgerEntryType.EARN, amount=Decimal("10"))
+        for points, days in (("40", 10), ("30", 1), ("20", 2)):
+            await service.schedule_point_expiration(
+                spender, points=Decimal(points), expires_at=now + dt.timedelta(days=days)
+            )
+        await service.schedule_point_expiration(short, points=Decimal("25"), expires_at=now + dt.timedelta(days=1))
+        await session.refresh(spender)
+        assert spender.next_expiration_at.replace(tzinfo=None) == (now + dt.timedelta(days=1)).replace(tzinfo=None)
+
+        # Spending 35 drains the earliest expiration and part of the next one, FIFO.
+        session.add(LoyaltyReward(slug="mug", name="Mug", cost_points=Decimal("35")))
+        await session.flush()
+        redemption = await service.create_redemption(spender, reward_slug="mug")
+        await service.fulfill_redemption(redemption, description="Mug")
+        await session.commit()
+        await session.refresh(spender)
+        assert spender.next_expiration_at.replace(tzinfo=None) == (now + dt.timedelta(days=2)).replace(tzinfo=None)
+
+        statements: list[str] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+            statements.append(statement)
+
+        engine = session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            sweep = await service.sweep_point_expirations(reference_time=now + dt.timedelta(days=5), chunk_size=2)
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        assert (sweep.expirations, sweep.members, sweep.points_expired) == (2, 2, Decimal("25"))
+        assert len([sql for sql in statements if "UPDATE loyalty_members SET points_balance" in sql]) == 1
+
+        await session.refresh(spender)
+        await session.refresh(short)
+        assert Decimal(spender.points_balance) == Decimal("50")
+        assert Decimal(short.points_balance) == Decimal("0")
+        assert spender.next_expiration_at.replace(tzinfo=None) == (now + dt.timedelta(days=10)).replace(tzinfo=None)
+        assert short.next_expiration_at is None
+
+        adjustments = (
+            await session.execute(
+                select(LoyaltyLedgerEntry).where(LoyaltyLedgerEntry.entry_type == LoyaltyLedgerEntryType.ADJUSTMENT)
+            )
+        ).scalars().all()
+        assert sorted(Decimal(entry.amount) for entry in adjustments) == [Decimal("-15"), Decimal("-10")]
+        assert all(len(entry.metadata_json["expiration_ids"]) == 1 for entry in adjustments)
+
+
+@pytest.mark.asyncio
+async def test_expiration_sweep_drains_each_member_within_one_chunk(session_factory) -> None:
+    async with session_factory() as session:
+        service = LoyaltyService(session)
+        session.add(LoyaltyTier(slug="chunked", name="Chunked", point_threshold=Decimal("0"), benefits=[]))
+        users = [User(email="chunk-a@example.com"), User(email="chunk-b@example.com")]
+        session.add_all(users)
+        await session.flush()
+
+        now = dt.datetime.now(dt.timezone.utc)
+        members = [await service.ensure_member(user.id) for user in users]
+        for member in members:
+            await service.record_ledger_entry(member, entry_type=LoyaltyLedgerEntryType.EARN, amount=Decimal("100"))
+        for days in (1, 2, 3):
+            await service.schedule_point_expiration(
+                members[0], points=Decimal("10"), expires_at=now + dt.timedelta(days=days)
+            )
+        await service.schedule_point_expiration(members[1], points=Decimal("5"), expires_at=now + dt.timedelta(days=1))
+        await session.commit()
+
+        # One member per chunk: the first member's three due rows still land in one entry.
+        sweep = await service.sweep_point_expirations(reference_time=now + dt.timedelta(days=5), chunk_size=1)
+        assert (sweep.expirations, sweep.members, sweep.points_expired) == (4, 2, Decimal("35"))
+
+        adjustments = (
+            await session.execute(
+                select(LoyaltyLedgerEntry).where(LoyaltyLedgerEntry.entry_type == LoyaltyLedgerEntryType.ADJUSTMENT)
+            )
+        ).scalars().all()
+        by_member = {entry.member_id: entry for entry in adjustments}
+        assert len(adjustments) == 2
+        assert Decimal(by_member[members[0].id].amount) == Decimal("-30")
+        assert len(by_member[members[0].id].metadata_json["expiration_ids"]) == 3
+        assert Decimal(by_member[members[1].id].amount) == Decimal("-5")
+
+
 @pytest.mark.asyncio
 async def test_member_nudges_from_signals(session_factory) -> None:
     async with session_factory() as session:
@@ -227,9 +326,314 @@ async def test_collect_nudge_dispatch_batch_respects_frequency(session_factory)
         assert candidate.nudge.id == nudge.id
         assert {channel.value for channel in candidate.channels} == {"email", "sms"}
 
-        # Update the nudge as if just dispatched; batch should now filter it out until cooldown passes.
-        nudge.last_triggered_at = now - dt.timedelta(hours=1)
+        # Record the dispatch (which releases the lease); the batch should now filter it out until cooldown passes.
+        await service.mark_nudges_triggered(candidates, now=now - dt.timedelta(hours=1))
         await session.flush()
+        assert nudge.lease_owner is None
 
         filtered = await service.collect_nudge_dispatch_batch(now=now)
         assert filtered == []
+
+        after_cooldown = await service.collect_nudge_dispatch_batch(now=now + dt.timedelta(hours=11, minutes=1))
+        assert [candidate.nudge.id for candidate in after_cooldown] == [nudge.id]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatchers_claim_disjoint_nudge_batches(session_factory) -> None:
+    async with session_factory() as session:
+        tier = LoyaltyTier(slug="lease", name="Lease", point_threshold=Decimal("0"), benefits=[])
+        user = User(email="lease@example.com")
+        session.add_all([tier, user])
+        await session.flush()
+        member = await LoyaltyService(session).ensure_member(user.id)
+        now = dt.datetime.now(dt.timezone.utc)
+        session.add_all(
+            [
+                LoyaltyNudge(
+                    member_id=member.id,
+                    nudge_type=LoyaltyNudgeType.CHECKOUT_REMINDER,
+                    source_id=f"intent-{index}",
+                    status=LoyaltyNudgeStatus.ACTIVE,
+                    payload_json={"headline": f"Nudge {index}"},
+                    priority=index,
+                    expires_at=now + dt.timedelta(days=1),
+                )
+                for index in range(5)
+            ]
+            + [
+                LoyaltyNudge(
+                    member_id=member.id,
+                    nudge_type=LoyaltyNudgeType.CHECKOUT_REMINDER,
+                    source_id="cooling-down",
+                    status=LoyaltyNudgeStatus.ACTIVE,
+                    payload_json={"headline": "Cooling down"},
+                    priority=99,
+                    next_dispatch_at=now + dt.timedelta(hours=1),
+                ),
+                LoyaltyNudge(
+                    member_id=member.id,
+                    nudge_type=LoyaltyNudgeType.CHECKOUT_REMINDER,
+                    source_id="expired",
+                    status=LoyaltyNudgeStatus.ACTIVE,
+                    payload_json={"headline": "Expired"},
+                    priority=98,
+                    expires_at=now - dt.timedelta(minutes=1),
+                ),
+            ]
+        )
+        await session.commit()
+
+    async with session_factory() as first_session, session_factory() as second_session:
+        first = await LoyaltyService(first_session).collect_nudge_dispatch_batch(
+            limit=3, now=now, worker_id="dispatcher-a", lease_seconds=60
+        )
+        second = await LoyaltyService(second_session).collect_nudge_dispatch_batch(
+            limit=3, now=now, worker_id="dispatcher-b", lease_seconds=60
+        )
+
+    first_sources = [candidate.nudge.source_id for candidate in first]
+    second_sources = [candidate.nudge.source_id for candidate in second]
+    # Highest priority first, no overlap, and cooling-down or expired nudges are never claimed.
+    assert first_sources == ["intent-4", "intent-3", "intent-2"]
+    assert second_sources == ["intent-1", "intent-0"]
+
+    async with session_factory() as session:
+        service = LoyaltyService(session)
+        assert await service.collect_nudge_dispatch_batch(now=now, worker_id="dispatcher-c") == []
+        # A crashed dispatcher's claims become available again once the lease runs out.
+        reclaimed = await service.collect_nudge_dispatch_batch(
+            now=now + dt.timedelta(seconds=61), worker_id="dispatcher-c"
+        )
+        assert len(reclaimed) == 5
+        assert {candidate.nudge.lease_owner for candidate in reclaimed} == {"dispatcher-c"}
+
+
+@pytest.mark.asyncio
+async def test_tier_catalog_is_cached_until_tiers_change(session_factory) -> None:
+    async with session_factory() as session:
+        bronze = LoyaltyTier(slug="bronze", name="Bronze", point_threshold=Decimal("0"), benefits=[])
+        silver = LoyaltyTier(slug="silver", name="Silver", point_threshold=Decimal("100"), benefits=[])
+        gold = LoyaltyTier(slug="gold", name="Gold", point_threshold=Decimal("500"), benefits=["concierge"])
+        user = User(email="catalog@example.com")
+        session.add_all([bronze, silver, gold, user])
+        await session.commit()
+
+        service = LoyaltyService(session)
+        member = await service.ensure_member(user.id)
+
+        tier_queries: list[str] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+            if "FROM loyalty_tiers" in statement:
+                tier_queries.append(statement)
+
+        engine = session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            for _ in range(3):
+                await service.record_ledger_entry(
+                    member,
+                    entry_type=LoyaltyLedgerEntryType.EARN,
+                    amount=Decimal("60"),
+                    description="Progress",
+                )
+            snapshot = await service.snapshot_member(member)
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        assert tier_queries == []
+        assert member.current_tier_id == silver.id
+        assert snapshot.next_tier == "gold"
+
+        gold.point_threshold = Decimal("150")
+        await session.commit()
+
+        await service.record_ledger_entry(
+            member,
+            entry_type=LoyaltyLedgerEntryType.EARN,
+            amount=Decimal("1"),
+            description="Re-evaluate",
+        )
+        assert member.current_tier_id == gold.id
+        assert [tier.slug for tier in await service.list_active_tiers()] == ["bronze", "silver", "gold"]
+
+
+async def _seed_nudge_twin(session, service, *, label: str, now: dt.datetime) -> dict:
+    """Seed one member with every nudge signal and a few pre-existing nudge states."""
+
+    user = User(email=f"{label}@example.com")
+    session.add(user)
+    await session.flush()
+    member = await service.ensure_member(user.id)
+
+    expiring = LoyaltyPointExpiration(
+        member_id=member.id,
+        points=Decimal("80"),
+        consumed_points=Decimal("30"),
+        expires_at=now + dt.timedelta(days=2),
+        status=LoyaltyPointExpirationStatus.SCHEDULED,
+    )
+    dismissed_source = LoyaltyPointExpiration(
+        member_id=member.id,
+        points=Decimal("40"),
+        consumed_points=Decimal("0"),
+        expires_at=now + dt.timedelta(days=5),
+        status=LoyaltyPointExpirationStatus.SCHEDULED,
+    )
+    open_intent = LoyaltyCheckoutIntent(
+        member_id=member.id,
+        external_id=f"{label}-open",
+        kind=LoyaltyCheckoutIntentKind.REDEMPTION,
+        status=LoyaltyCheckoutIntentStatus.PENDING,
+        created_at=now - dt.timedelta(hours=3),
+        expires_at=None,
+        metadata_json={"rewardName": "Tote"},
+    )
+    acknowledged_intent = LoyaltyCheckoutIntent(
+        member_id=member.id,
+        external_id=f"{label}-ack",
+        kind=LoyaltyCheckoutIntentKind.REDEMPTION,
+        status=LoyaltyCheckoutIntentStatus.PENDING,
+        created_at=now - dt.timedelta(hours=1),
+        expires_at=now + dt.timedelta(days=1),
+    )
+    stalled = LoyaltyRedemption(
+        member_id=member.id,
+        status=LoyaltyRedemptionStatus.REQUESTED,
+        points_cost=Decimal("100"),
+        quantity=1,
+        requested_at=now - dt.timedelta(days=5),
+    )
+    session.add_all([expiring, dismissed_source, open_intent, acknowledged_intent, stalled])
+    await session.flush()
+
+    session.add_all(
+        [
+            LoyaltyNudge(
+                member_id=member.id,
+                nudge_type=LoyaltyNudgeType.EXPIRING_POINTS,
+                source_id=str(dismissed_source.id),
+                status=LoyaltyNudgeStatus.DISMISSED,
+                payload_json={"headline": "Dismissed"},
+                dismissed_at=now - dt.timedelta(days=1),
+            ),
+            LoyaltyNudge(
+                member_id=member.id,
+                nudge_type=LoyaltyNudgeType.CHECKOUT_REMINDER,
+                source_id=str(acknowledged_intent.id),
+                status=LoyaltyNudgeStatus.ACKNOWLEDGED,
+                payload_json={"headline": "Acknowledged"},
+                acknowledged_at=now - dt.timedelta(hours=2),
+            ),
+            LoyaltyNudge(
+                member_id=member.id,
+                nudge_type=LoyaltyNudgeType.CHECKOUT_REMINDER,
+                source_id="completed-intent",
+                status=LoyaltyNudgeStatus.ACTIVE,
+                payload_json={"headline": "Stale"},
+            ),
+        ]
+    )
+    await session.flush()
+    return {"member": member, "expiring": expiring}
+
+
+async def _nudge_state(session, member_id) -> list[tuple]:
+    nudges = (
+        await session.execute(
+            select(LoyaltyNudge)
+            .where(LoyaltyNudge.member_id == member_id)
+            .execution_options(populate_existing=True)
+        )
+    ).scalars().all()
+    return sorted(
+        (
+            nudge.nudge_type.value,
+            nudge.status.value,
+            nudge.priority,
+            nudge.expires_at,
+            nudge.campaign_slug,
+            tuple(channel.value for channel in nudge.channel_preferences),
+            (nudge.payload_json or {}).get("headline"),
+            (nudge.payload_json or {}).get("body"),
+            nudge.last_triggered_at,
+        )
+        for nudge in nudges
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_nudge_aggregation_matches_per_member_sync(session_factory) -> None:
+    async with session_factory() as session:
+        service = LoyaltyService(session)
+        now = dt.datetime.now(dt.timezone.utc)
+        session.add_all(
+            [
+                LoyaltyTier(slug="base", name="Base", point_threshold=Decimal("0"), benefits=[]),
+                LoyaltyNudgeCampaign(
+                    slug="expiring_points",
+                    name="Expiring points",
+                    ttl_seconds=3_600,
+                    frequency_cap_hours=6,
+                    default_priority=40,
+                    channel_preferences=[LoyaltyNudgeChannel.SMS],
+                ),
+                LoyaltyNudgeCampaign(
+                    slug="checkout_recovery",
+                    name="Checkout recovery",
+                    ttl_seconds=7_200,
+                    frequency_cap_hours=2,
+                    default_priority=15,
+                    channel_preferences=[LoyaltyNudgeChannel.EMAIL, LoyaltyNudgeChannel.PUSH],
+                ),
+            ]
+        )
+        await session.flush()
+
+        reference = [await _seed_nudge_twin(session, service, label=f"ref-{i}", now=now) for i in range(3)]
+        bulk = [await _seed_nudge_twin(session, service, label=f"bulk-{i}", now=now) for i in range(3)]
+        await session.commit()
+
+        for twin in reference:
+            await service.list_member_nudges(twin["member"], now=now)
+        await session.flush()
+        expected = [await _nudge_state(session, twin["member"].id) for twin in reference]
+
+        statements: list[str] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+            statements.append(statement)
+
+        engine = session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            aggregated = await service.aggregate_nudge_candidates(now=now, page_size=2)
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        # Re-running the reference members through the bulk path is a no-op.
+        assert [await _nudge_state(session, twin["member"].id) for twin in reference] == expected
+        assert [await _nudge_state(session, twin["member"].id) for twin in bulk] == expected
+        assert all(len(aggregated[twin["member"].id]) == 4 for twin in bulk)
+        # Six members in pages of two: one signal query per source per page, not per member.
+        assert len([sql for sql in statements if "FROM loyalty_point_expirations" in sql]) == 1 + 3
+
+        # Frequency-cap bookkeeping survives a refresh, and changed signals are rewritten.
+        for twin in reference + bulk:
+            await session.execute(
+                LoyaltyNudge.__table__.update()
+                .where(LoyaltyNudge.__table__.c.member_id == twin["member"].id)
+                .values(last_triggered_at=now - dt.timedelta(hours=1))
+            )
+            twin["expiring"].consumed_points = Decimal("70")
+        await session.commit()
+
+        for twin in reference:
+            await service.list_member_nudges(twin["member"], now=now)
+        await session.flush()
+        expected = [await _nudge_state(session, twin["member"].id) for twin in reference]
+        await service.aggregate_nudge_candidates(now=now, page_size=2)
+
+        assert [await _nudge_state(session, twin["member"].id) for twin in bulk] == expected
+        assert any("10 points will expire" in (row[7] or "") for row in expected[0])
+        assert all(row[8] is not None for row in expected[0])
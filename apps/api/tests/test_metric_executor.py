@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from smplat_api.core.loop_monitor import EventLoopLagMonitor
+from smplat_api.services.fulfillment import metric_kernels
+from smplat_api.services.fulfillment.metric_executor import MetricExecutor
+
+
+def _forecast_inputs(now: datetime, tasks: int = 2000):  # type: ignore[no-untyped-def]
+    skus = ["growth-kit", "trust-suite"]
+    backlog_sku = array("i", [index % 2 for index in range(tasks)])
+    duration_sku = array("i", [index % 2 for index in range(tasks)])
+    duration_minutes = array("d", [float(30 + index % 90) for index in range(tasks)])
+    shifts = [
+        (0, now, now + timedelta(hours=8), 400),
+        (1, now + timedelta(hours=1), now + timedelta(hours=5), 100),
+    ]
+    return now, skus, backlog_sku, duration_sku, duration_minutes, shifts
+
+
+def _blocking_kernel(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def test_backlog_summary_counts_only_overdue_anchors():
+    now_ts = 10_000.0
+    summary = metric_kernels.backlog_summary(array("d", [now_ts - 600, now_ts - 1200, now_ts + 300]), now_ts)
+
+    assert summary["overdue_task_count"] == 2
+    assert summary["total_backlog_minutes"] == pytest.approx(30.0)
+    assert summary["average_backlog_minutes"] == pytest.approx(15.0)
+
+
+def test_delivery_forecast_projects_windows_per_sku():
+    now = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    result = metric_kernels.delivery_forecast(*_forecast_inputs(now, tasks=10))
+
+    skus = {entry["sku"]: entry for entry in result["forecast"]["skus"]}
+    assert list(skus) == ["growth-kit", "trust-suite"]
+    assert skus["growth-kit"]["backlog_tasks"] == 5
+    assert skus["growth-kit"]["estimated_clear_minutes"] == pytest.approx(0.75)
+    assert skus["trust-suite"]["windows"][0]["start"] == (now + timedelta(hours=1)).isoformat()
+    assert result["sample_size"] == 10
+    assert result["value"] == pytest.approx(63.0)
+
+
+@pytest.mark.asyncio
+async def test_process_executor_matches_inline_results():
+    now = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    inputs = _forecast_inputs(now)
+    executor = MetricExecutor("process", max_workers=1)
+    try:
+        pooled = await executor.run(metric_kernels.delivery_forecast, *inputs)
+    finally:
+        executor.shutdown()
+
+    assert pooled == metric_kernels.delivery_forecast(*inputs)
+    assert executor.snapshot()["runs"] == 1
+    assert executor.snapshot()["last_kernel"] == "delivery_forecast"
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_while_kernel_runs_off_loop():
+    async def measure(mode: str) -> float:
+        monitor = EventLoopLagMonitor(interval_seconds=0.01)
+        monitor.start()
+        await asyncio.sleep(0.03)
+        await MetricExecutor(mode).run(_blocking_kernel, 0.3)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+        return monitor.max_lag_seconds
+
+    assert await measure("thread") < 0.15
+    assert await measure("inline") >= 0.25
@@ -137,6 +137,7 @@ async def test_prometheus_metrics_output() -> None:
         body = response.text
         assert "smplat_catalog_search_total" in body
         assert "instagram" in body
+        assert "smplat_event_loop_lag_seconds" in body
     finally:
         settings.checkout_api_key = previous_key
 
@@ -217,12 +217,12 @@ async def test_alert_worker_runs_with_stubs(session_factory):
             self._snapshot = snap
             self.received_limit: int | None = None
 
-        async def build_snapshot(self, limit_per_provider: int = 25) -> ProviderAutomationSnapshotResponse:
+        async def build_incremental_snapshot(self, state, *, limit_per_provider: int = 25):
             self.received_limit = limit_per_provider
-            return self._snapshot
+            return self._snapshot, {entry.id for entry in self._snapshot.providers}
 
     class StubEvaluator:
-        def evaluate(self, snap: ProviderAutomationSnapshotResponse):
+        def evaluate(self, snap: ProviderAutomationSnapshotResponse, *, provider_ids=None):
             assert snap.providers[0].id == "prov-a"
             return [alert]
 
@@ -261,7 +261,7 @@ async def test_alert_worker_runs_with_stubs(session_factory):
 
 @pytest.mark.asyncio
 async def test_alert_history_includes_workflow_telemetry(monkeypatch, session_factory):
-    snapshot = _build_snapshot(fails=1, warns=0, replay_failed=0, replay_total=1)
+    snapshot = _build_snapshot(provider_id="prov-meta", fails=1, warns=0, replay_failed=0, replay_total=1)
     alert = ProviderAutomationAlert(
         provider_id="prov-meta",
         provider_name="Meta Provider",
@@ -277,11 +277,11 @@ async def test_alert_history_includes_workflow_telemetry(monkeypatch, session_fa
         def __init__(self, snap: ProviderAutomationSnapshotResponse) -> None:
             self._snapshot = snap
 
-        async def build_snapshot(self, limit_per_provider: int = 25) -> ProviderAutomationSnapshotResponse:
-            return self._snapshot
+        async def build_incremental_snapshot(self, state, *, limit_per_provider: int = 25):
+            return self._snapshot, {entry.id for entry in self._snapshot.providers}
 
     class StubEvaluator:
-        def evaluate(self, snap: ProviderAutomationSnapshotResponse):
+        def evaluate(self, snap: ProviderAutomationSnapshotResponse, *, provider_ids=None):
             return [alert]
 
     class StubNotifier:
@@ -328,7 +328,7 @@ async def test_alert_history_includes_workflow_telemetry(monkeypatch, session_fa
 
 @pytest.mark.asyncio
 async def test_alert_worker_auto_pause_and_resume(session_factory):
-    snapshot = _build_snapshot(fails=2, warns=0, replay_failed=0, replay_total=0)
+    snapshot = _build_snapshot(provider_id="prov-auto", fails=2, warns=0, replay_failed=0, replay_total=0)
     alert = ProviderAutomationAlert(
         provider_id="prov-auto",
         provider_name="Automation Provider",
@@ -344,8 +344,8 @@ async def test_alert_worker_auto_pause_and_resume(session_factory):
         def __init__(self, snap: ProviderAutomationSnapshotResponse) -> None:
             self._snapshot = snap
 
-        async def build_snapshot(self, limit_per_provider: int = 25) -> ProviderAutomationSnapshotResponse:
-            return self._snapshot
+        async def build_incremental_snapshot(self, state, *, limit_per_provider: int = 25):
+            return self._snapshot, {entry.id for entry in self._snapshot.providers}
 
     class MutableEvaluator:
         def __init__(self, current_alerts: list[ProviderAutomationAlert]) -> None:
@@ -354,7 +354,7 @@ async def test_alert_worker_auto_pause_and_resume(session_factory):
         def set_alerts(self, alerts: list[ProviderAutomationAlert]) -> None:
             self._alerts = alerts
 
-        def evaluate(self, snapshot: ProviderAutomationSnapshotResponse):
+        def evaluate(self, snapshot: ProviderAutomationSnapshotResponse, *, provider_ids=None):
             return list(self._alerts)
 
     class StubNotifier:
@@ -432,3 +432,53 @@ async def test_alert_worker_auto_pause_and_resume(session_factory):
     assert len(stub_notifier.calls) == 2
     assert len(stub_notifier.calls[1]["alerts"]) == 0
     assert stub_notifier.calls[1]["auto_summary"]["autoResumed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_alert_worker_reevaluates_only_changed_providers(session_factory):
+    runs = [
+        (_build_snapshot(fails=3, replay_total=1), {"prov-a"}),
+        # Unchanged provider: the previous verdict is kept without re-evaluation.
+        (_build_snapshot(fails=3, replay_total=1), set()),
+        (_build_snapshot(fails=0, replay_total=1), {"prov-a"}),
+    ]
+
+    class IncrementalAutomation:
+        def __init__(self) -> None:
+            self.states: list[object] = []
+
+        async def build_incremental_snapshot(self, state, *, limit_per_provider: int = 25):
+            self.states.append(state)
+            return runs[len(self.states) - 1]
+
+    class CountingEvaluator(ProviderAutomationAlertEvaluator):
+        def __init__(self) -> None:
+            super().__init__(guardrail_fail_threshold=3, guardrail_warn_threshold=5, replay_failure_threshold=3)
+            self.evaluated: list[set[str] | None] = []
+
+        def evaluate(self, snapshot, *, provider_ids=None):
+            self.evaluated.append(set(provider_ids) if provider_ids is not None else None)
+            return super().evaluate(snapshot, provider_ids=provider_ids)
+
+    class SilentNotifier:
+        async def notify(self, alerts, load_alerts=None, auto_summary=None, workflow_summary=None):
+            return None
+
+    automation = IncrementalAutomation()
+    evaluator = CountingEvaluator()
+    worker = ProviderAutomationAlertWorker(
+        session_factory,
+        automation_factory=lambda session: automation,
+        evaluator=evaluator,
+        notifier=SilentNotifier(),
+        interval_seconds=1,
+    )
+    worker._load_alert_enabled = False  # type: ignore[attr-defined]
+
+    first = await worker.run_once()
+    second = await worker.run_once()
+    third = await worker.run_once()
+
+    assert [first["alerts"], second["alerts"], third["alerts"]] == [1, 1, 0]
+    assert evaluator.evaluated == [{"prov-a"}, set(), {"prov-a"}]
+    assert automation.states[0] is automation.states[1] is automation.states[2]
@@ -5,8 +5,10 @@ from decimal import Decimal
 import httpx
 import json
 import pytest
+from sqlalchemy import event, update
 from uuid import uuid4
 
+from smplat_api.core.settings import settings
 from smplat_api.models.customer_profile import CurrencyEnum
 from smplat_api.models.fulfillment import (
     FulfillmentProvider,
@@ -19,6 +21,7 @@ from smplat_api.services.fulfillment import (
     ProviderAutomationService,
     ProviderAutomationRunTypeEnum,
 )
+from smplat_api.services.fulfillment.provider_automation_service import ProviderAutomationTelemetryState
 from smplat_api.api.v1.endpoints import fulfillment_providers as fp
 from smplat_api.workers.provider_automation import ProviderOrderReplayWorker
 
@@ -391,6 +394,59 @@ async def test_list_orders_for_order_filters_by_order_id(session_factory):
 
         assert len(results) == 1
         assert results[0].order_id == order.id
+        assert results[0].order_lookup_key == order.id.hex
+
+
+@pytest.mark.asyncio
+async def test_list_orders_for_orders_dual_reads_rows_without_lookup_key(session_factory, monkeypatch):
+    async with session_factory() as session:
+        order = Order(
+            id=uuid4(),
+            order_number="SM-LOOKUP-1",
+            subtotal=Decimal("50.00"),
+            tax=Decimal("0"),
+            total=Decimal("50.00"),
+            currency=CurrencyEnum.USD,
+            status=OrderStatusEnum.PENDING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        order_item = OrderItem(
+            id=uuid4(),
+            order=order,
+            product_id=uuid4(),
+            product_title="Lookup Product",
+            quantity=1,
+            unit_price=Decimal("50.00"),
+            total_price=Decimal("50.00"),
+        )
+        order.items.append(order_item)
+        keyed, legacy = (
+            FulfillmentProviderOrder(
+                provider_id="prov-lookup",
+                service_id=service_id,
+                order_id=order.id,
+                order_item_id=order_item.id,
+                payload={},
+            )
+            for service_id in ("svc-keyed", "svc-legacy")
+        )
+        session.add_all([order, keyed, legacy])
+        await session.commit()
+        # Simulate a row written by a replica running the pre-backfill code.
+        await session.execute(
+            update(FulfillmentProviderOrder)
+            .where(FulfillmentProviderOrder.id == legacy.id)
+            .values(order_lookup_key=None)
+        )
+        await session.commit()
+
+        automation = ProviderAutomationService(session)
+        grouped = await automation.list_orders_for_orders([order.id])
+        assert {entry.service_id for entry in grouped[order.id]} == {"svc-keyed", "svc-legacy"}
+
+        monkeypatch.setattr(settings, "provider_order_lookup_dual_read", False)
+        grouped = await automation.list_orders_for_orders([order.id])
+        assert [entry.service_id for entry in grouped[order.id]] == ["svc-keyed"]
 
 
 @pytest.mark.asyncio
@@ -416,6 +472,105 @@ async def test_build_snapshot_summarizes_orders(session_factory):
         assert overrides[provider_order.service_id].rules["rule-drip"].label == "Drip failover"
 
 
+@pytest.mark.asyncio
+async def test_build_snapshot_uses_one_windowed_query_and_caches_until_write(session_factory):
+    async with session_factory() as session:
+        providers = [
+            FulfillmentProvider(
+                id=f"prov-window-{index}",
+                name=f"Window {index}",
+                status=FulfillmentProviderStatusEnum.ACTIVE,
+                health_status=FulfillmentProviderHealthStatusEnum.HEALTHY,
+                metadata_json={},
+            )
+            for index in range(3)
+        ]
+        order = Order(
+            id=uuid4(),
+            order_number="SM-WINDOW-1",
+            subtotal=Decimal("100.00"),
+            tax=Decimal("0"),
+            total=Decimal("100.00"),
+            currency=CurrencyEnum.USD,
+            status=OrderStatusEnum.PENDING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        order_item = OrderItem(
+            id=uuid4(),
+            order=order,
+            product_id=uuid4(),
+            product_title="Window Product",
+            quantity=1,
+            unit_price=Decimal("100.00"),
+            total_price=Decimal("100.00"),
+        )
+        order.items.append(order_item)
+        session.add_all([*providers, order])
+        await session.flush()
+
+        base_time = datetime.now(timezone.utc) - timedelta(hours=1)
+        for provider in providers:
+            for position in range(4):
+                session.add(
+                    FulfillmentProviderOrder(
+                        provider_id=provider.id,
+                        service_id="svc-window",
+                        order_id=order.id,
+                        order_item_id=order_item.id,
+                        amount=Decimal("100.00"),
+                        payload={
+                            "providerCostAmount": "70",
+                            # Only the two newest orders per provider carry a replay.
+                            "replays": [{"status": "executed"}] if position >= 2 else [],
+                            "service": {"metadata": {"guardrails": {"warningMarginPercent": 40}}},
+                        },
+                        created_at=base_time + timedelta(minutes=position),
+                    )
+                )
+        await session.commit()
+
+        statements: list[str] = []
+        engine = session.bind.sync_engine
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            automation = ProviderAutomationService(session)
+            snapshot = await automation.build_snapshot(limit_per_provider=2)
+            order_queries = [sql for sql in statements if "fulfillment_provider_orders" in sql]
+            assert len(order_queries) == 1
+            assert "row_number()" in order_queries[0].lower()
+
+            assert snapshot.aggregated.total_orders == 6
+            assert snapshot.aggregated.replays.executed == 6
+            assert snapshot.aggregated.guardrails.warn == 6
+
+            statements.clear()
+            cached = await automation.build_snapshot(limit_per_provider=2)
+            assert cached == snapshot
+            assert not [sql for sql in statements if "fulfillment_provider_orders" in sql]
+
+            session.add(
+                FulfillmentProviderOrder(
+                    provider_id=providers[0].id,
+                    service_id="svc-window",
+                    order_id=order.id,
+                    order_item_id=order_item.id,
+                    amount=Decimal("100.00"),
+                    payload={"replays": [{"status": "failed"}]},
+                )
+            )
+            await session.commit()
+
+            refreshed = await automation.build_snapshot(limit_per_provider=2)
+            assert refreshed.aggregated.replays.failed == 1
+            assert refreshed.aggregated.replays.executed == 5
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+
 @pytest.mark.asyncio
 async def test_provider_automation_snapshot_endpoint(app_with_db):
     app, session_factory = app_with_db
@@ -669,3 +824,87 @@ async def test_provider_orders_list_endpoint_includes_refills_and_replays(app_wi
     assert entry["refills"][0]["id"] == "refill-entry"
     assert entry["replays"][0]["id"] == "replay-ok"
     assert entry["scheduledReplays"][0]["id"] == "sched-ok"
+
+
+@pytest.mark.asyncio
+async def test_build_incremental_snapshot_applies_only_changed_orders(session_factory):
+    async with session_factory() as session:
+        providers = [
+            FulfillmentProvider(
+                id=f"prov-stream-{index}",
+                name=f"Stream {index}",
+                status=FulfillmentProviderStatusEnum.ACTIVE,
+                health_status=FulfillmentProviderHealthStatusEnum.HEALTHY,
+                metadata_json={},
+            )
+            for index in range(2)
+        ]
+        order = Order(
+            id=uuid4(),
+            order_number="SM-STREAM-1",
+            subtotal=Decimal("100.00"),
+            tax=Decimal("0"),
+            total=Decimal("100.00"),
+            currency=CurrencyEnum.USD,
+            status=OrderStatusEnum.PENDING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        order_item = OrderItem(
+            id=uuid4(),
+            order=order,
+            product_id=uuid4(),
+            product_title="Stream Product",
+            quantity=1,
+            unit_price=Decimal("100.00"),
+            total_price=Decimal("100.00"),
+        )
+        order.items.append(order_item)
+        session.add_all([*providers, order])
+        await session.flush()
+
+        base_time = datetime.now(timezone.utc) - timedelta(hours=1)
+        for provider in providers:
+            for position in range(3):
+                session.add(
+                    FulfillmentProviderOrder(
+                        provider_id=provider.id,
+                        service_id="svc-stream",
+                        order_id=order.id,
+                        order_item_id=order_item.id,
+                        amount=Decimal("100.00"),
+                        payload={"replays": [{"status": "executed"}]},
+                        created_at=base_time + timedelta(minutes=position),
+                    )
+                )
+        await session.commit()
+
+        automation = ProviderAutomationService(session)
+        state = ProviderAutomationTelemetryState()
+        snapshot, changed = await automation.build_incremental_snapshot(state, limit_per_provider=2)
+        assert changed == {"prov-stream-0", "prov-stream-1"}
+        assert snapshot.aggregated.total_orders == 4
+        assert snapshot.aggregated.replays.executed == 4
+
+        unchanged, changed = await automation.build_incremental_snapshot(state, limit_per_provider=2)
+        assert changed == set()
+        assert unchanged == snapshot
+
+        session.add(
+            FulfillmentProviderOrder(
+                provider_id="prov-stream-0",
+                service_id="svc-stream",
+                order_id=order.id,
+                order_item_id=order_item.id,
+                amount=Decimal("100.00"),
+                payload={"replays": [{"status": "failed"}]},
+            )
+        )
+        await session.commit()
+
+        refreshed, changed = await automation.build_incremental_snapshot(state, limit_per_provider=2)
+        assert changed == {"prov-stream-0"}
+        by_provider = {entry.id: entry.telemetry for entry in refreshed.providers}
+        assert by_provider["prov-stream-0"].total_orders == 2
+        assert by_provider["prov-stream-0"].replays.failed == 1
+        assert by_provider["prov-stream-0"].replays.executed == 1
+        assert by_provider["prov-stream-1"] == {entry.id: entry.telemetry for entry in snapshot.providers}["prov-stream-1"]
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from smplat_api.models.customer_profile import CurrencyEnum
+from smplat_api.models.fulfillment import (
+    FulfillmentProvider,
+    FulfillmentProviderCallback,
+    FulfillmentProviderHealthStatusEnum,
+    FulfillmentProviderOrder,
+    FulfillmentProviderStatusEnum,
+)
+from smplat_api.models.order import Order, OrderItem, OrderSourceEnum, OrderStatusEnum
+from smplat_api.models.order_state_event import OrderStateActorTypeEnum, OrderStateEvent
+from smplat_api.services.fulfillment.provider_callbacks import SIGNATURE_HEADER
+from smplat_api.workers.provider_callbacks import ProviderCallbackWorker
+
+SECRET = "callback-secret"
+
+
+def _sign(body: bytes) -> str:
+    return "sha256=" + hmac.new(SECRET.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+async def _bootstrap(session_factory, *, references: list[str]) -> tuple[list, object]:
+    async with session_factory() as session:
+        provider = FulfillmentProvider(
+            id="push-prov",
+            name="Push Provider",
+            status=FulfillmentProviderStatusEnum.ACTIVE,
+            health_status=FulfillmentProviderHealthStatusEnum.HEALTHY,
+            metadata_json={"automation": {"callbacks": {"statusPath": "data.state"}}},
+            credentials={"callbackSecret": SECRET},
+        )
+        order = Order(
+            id=uuid4(),
+            order_number="SM-PUSH-1",
+            subtotal=Decimal("30.00"),
+            tax=Decimal("0"),
+            total=Decimal("30.00"),
+            currency=CurrencyEnum.USD,
+            status=OrderStatusEnum.PROCESSING,
+            source=OrderSourceEnum.CHECKOUT,
+        )
+        order_item = OrderItem(
+            id=uuid4(),
+            order=order,
+            product_id=uuid4(),
+            product_title="Push Product",
+            quantity=1,
+            unit_price=Decimal("30.00"),
+            total_price=Decimal("30.00"),
+        )
+        order.items.append(order_item)
+        provider_orders = [
+            FulfillmentProviderOrder(
+                provider_id=provider.id,
+                provider_name=provider.name,
+                provider_reference=reference,
+                service_id="svc-push",
+                order_id=order.id,
+                order_item_id=order_item.id,
+                payload={"providerOrderId": reference},
+            )
+            for reference in references
+        ]
+        session.add_all([provider, order, *provider_orders])
+        await session.commit()
+        return [provider_order.id for provider_order in provider_orders], order.id
+
+
+@pytest.mark.asyncio
+async def test_callback_endpoint_authenticates_and_deduplicates(app_with_db):
+    app, session_factory = app_with_db
+    await _bootstrap(session_factory, references=["ext-1"])
+    body = json.dumps(
+        {
+            "events": [
+                {"eventId": "evt-1", "orderId": "ext-1", "data": {"state": "in_progress"}},
+                {"eventId": "evt-2", "orderId": "ext-1", "data": {"state": "completed"}},
+                {"eventId": "evt-3", "data": {"state": "completed"}},
+            ]
+        }
+    ).encode("utf-8")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        rejected = await client.post(
+            "/api/v1/fulfillment/providers/push-prov/callbacks",
+            content=body,
+            headers={SIGNATURE_HEADER: "sha256=deadbeef"},
+        )
+        first = await client.post(
+            "/api/v1/fulfillment/providers/push-prov/callbacks",
+            content=body,
+            headers={SIGNATURE_HEADER: _sign(body)},
+        )
+        redelivered = await client.post(
+            "/api/v1/fulfillment/providers/push-prov/callbacks",
+            content=body,
+            headers={SIGNATURE_HEADER: _sign(body)},
+        )
+        unknown = await client.post(
+            "/api/v1/fulfillment/providers/missing/callbacks",
+            content=body,
+            headers={SIGNATURE_HEADER: _sign(body)},
+        )
+
+    assert rejected.status_code == 401
+    assert first.status_code == 202
+    assert first.json() == {"received": 2, "accepted": 2, "duplicates": 0}
+    assert redelivered.json() == {"received": 2, "accepted": 0, "duplicates": 2}
+    assert unknown.status_code == 404
+
+    async with session_factory() as session:
+        rows = (await session.execute(select(FulfillmentProviderCallback))).scalars().all()
+    assert sorted((row.event_id, row.status) for row in rows) == [("evt-1", "in_progress"), ("evt-2", "completed")]
+
+
+@pytest.mark.asyncio
+async def test_worker_applies_batch_and_records_one_event_per_order(session_factory):
+    provider_order_ids, order_id = await _bootstrap(session_factory, references=["ext-1", "ext-2"])
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        session.add_all(
+            [
+                FulfillmentProviderCallback(
+                    provider_id="push-prov",
+                    event_id=event_id,
+                    provider_reference=reference,
+                    status=status,
+                    payload={"orderId": reference, "data": {"state": status}},
+                    received_at=now + timedelta(seconds=offset),
+                )
+                for offset, (event_id, reference, status) in enumerate(
+                    [
+                        ("evt-1", "ext-1", "in_progress"),
+                        ("evt-2", "ext-2", "in_progress"),
+                        ("evt-3", "ext-1", "completed"),
+                        ("evt-4", "ext-unknown", "completed"),
+                    ]
+                )
+            ]
+        )
+        await session.commit()
+
+    worker = ProviderCallbackWorker(session_factory, clock=lambda: now + timedelta(seconds=10), batch_size=50)
+    summary = await worker.run_once()
+
+    assert summary["claimed"] == 4
+    assert summary["applied"] == 3
+    assert summary["deferred"] == 1
+    assert summary["ordersUpdated"] == 2
+    assert summary["timelineEvents"] == 2
+
+    async with session_factory() as session:
+        first = await session.get(FulfillmentProviderOrder, provider_order_ids[0])
+        second = await session.get(FulfillmentProviderOrder, provider_order_ids[1])
+        events = (
+            await session.execute(select(OrderStateEvent).where(OrderStateEvent.order_id == order_id))
+        ).scalars().all()
+        pending = (
+            await session.execute(
+                select(FulfillmentProviderCallback).where(FulfillmentProviderCallback.applied_at.is_(None))
+            )
+        ).scalars().all()
+
+    assert first.payload["providerStatus"] == "completed"
+    assert [entry["eventId"] for entry in first.payload["providerCallbacks"]] == ["evt-1", "evt-3"]
+    assert second.payload["providerStatus"] == "in_progress"
+    assert len(events) == 2
+    assert {event.actor_type for event in events} == {OrderStateActorTypeEnum.PROVIDER}
+    assert [row.event_id for row in pending] == ["evt-4"]
+
+    # The unmatched callback is retried after its lease and settles once the grace period ends.
+    late = ProviderCallbackWorker(session_factory, clock=lambda: now + timedelta(hours=1), batch_size=50)
+    retry_summary = await late.run_once()
+    assert retry_summary["claimed"] == 1
+    assert retry_summary["unmatched"] == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_keeps_newer_status_when_an_older_callback_is_applied_later(session_factory):
+    provider_order_ids, _ = await _bootstrap(session_factory, references=["ext-1"])
+    now = datetime.now(timezone.utc)
+
+    def _callback(event_id: str, status: str, received_at: datetime) -> FulfillmentProviderCallback:
+        return FulfillmentProviderCallback(
+            provider_id="push-prov",
+            event_id=event_id,
+            provider_reference="ext-1",
+            status=status,
+            payload={"orderId": "ext-1", "data": {"state": status}},
+            received_at=received_at,
+        )
+
+    async with session_factory() as session:
+        session.add(_callback("evt-new", "completed", now))
+        await session.commit()
+    await ProviderCallbackWorker(session_factory, clock=lambda: now + timedelta(seconds=5), batch_size=50).run_once()
+
+    # An older callback, e.g. one deferred as unmatched and retried, lands afterwards.
+    async with session_factory() as session:
+        session.add(_callback("evt-old", "in_progress", now - timedelta(minutes=1)))
+        await session.commit()
+    summary = await ProviderCallbackWorker(
+        session_factory, clock=lambda: now + timedelta(seconds=10), batch_size=50
+    ).run_once()
+    assert summary["applied"] == 1
+    assert summary["timelineEvents"] == 0
+
+    async with session_factory() as session:
+        provider_order = await session.get(FulfillmentProviderOrder, provider_order_ids[0])
+
+    assert provider_order.payload["providerStatus"] == "completed"
+    assert provider_order.payload["providerStatusUpdatedAt"] == now.isoformat()
+    assert [entry["eventId"] for entry in provider_order.payload["providerCallbacks"]] == ["evt-new", "evt-old"]
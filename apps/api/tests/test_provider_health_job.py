@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timedelta, timezone
+
 import httpx
 import pytest
 
@@ -11,6 +14,7 @@ from smplat_api.models.fulfillment import (
     FulfillmentService,
     FulfillmentServiceStatusEnum,
 )
+from smplat_api.services.fulfillment.provider_probe_schedule import ProviderProbeScheduler, configure_probe_scheduler
 
 
 @pytest.mark.asyncio
@@ -103,3 +107,108 @@ async def test_provider_health_snapshot_inherits_when_no_service_endpoint(sessio
         assert refreshed_service is not None
         assert refreshed_service.health_status == FulfillmentProviderHealthStatusEnum.HEALTHY
         assert refreshed_service.health_payload.get("inherited") is True
+
+
+@pytest.mark.asyncio
+async def test_provider_health_snapshot_probes_concurrently_within_budget(session_factory):
+    async with session_factory() as session:
+        for index in range(4):
+            session.add(
+                FulfillmentProvider(
+                    id=f"prov-sweep-{index}",
+                    name=f"Sweep {index}",
+                    base_url=f"https://sweep-{index}.test",
+                    status=FulfillmentProviderStatusEnum.ACTIVE,
+                    health_status=FulfillmentProviderHealthStatusEnum.UNKNOWN,
+                )
+            )
+        await session.commit()
+
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            # One provider hangs past the sweep budget; the others answer quickly.
+            await asyncio.sleep(5 if request.url.host == "sweep-3.test" else 0.05)
+        finally:
+            in_flight -= 1
+        return httpx.Response(200, json={"status": "ok"})
+
+    transport = httpx.MockTransport(handler)
+    async with httpx.AsyncClient(transport=transport) as client:
+        summary = await run_provider_health_snapshot(
+            session_factory=session_factory,
+            http_client=client,
+            concurrency=4,
+            sweep_budget_seconds=0.5,
+        )
+
+    assert peak > 1
+    assert summary["providers_checked"] == 3
+    assert summary["healthy"] == 3
+    assert summary["timed_out"] == 1
+
+    async with session_factory() as session:
+        slow = await session.get(FulfillmentProvider, "prov-sweep-3")
+        assert slow.health_status == FulfillmentProviderHealthStatusEnum.UNKNOWN
+        fast = await session.get(FulfillmentProvider, "prov-sweep-0")
+        assert fast.health_status == FulfillmentProviderHealthStatusEnum.HEALTHY
+
+
+@pytest.mark.asyncio
+async def test_adaptive_provider_health_snapshot_probes_only_due_providers(session_factory):
+    configure_probe_scheduler(ProviderProbeScheduler(min_interval_seconds=60, base_interval_seconds=900))
+    checked_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    async with session_factory() as session:
+        for provider_id, health in (
+            ("prov-stable", FulfillmentProviderHealthStatusEnum.HEALTHY),
+            ("prov-flapping", FulfillmentProviderHealthStatusEnum.DEGRADED),
+            ("prov-idle", FulfillmentProviderHealthStatusEnum.OFFLINE),
+        ):
+            provider = FulfillmentProvider(
+                id=provider_id,
+                name=provider_id,
+                base_url=f"https://{provider_id}.test",
+                status=FulfillmentProviderStatusEnum.ACTIVE,
+                health_status=health,
+                last_health_check_at=checked_at,
+            )
+            provider.services.append(
+                FulfillmentService(
+                    id=f"svc-{provider_id}",
+                    provider_id=provider_id,
+                    name="Service",
+                    action="followers",
+                    status=(
+                        FulfillmentServiceStatusEnum.INACTIVE
+                        if provider_id == "prov-idle"
+                        else FulfillmentServiceStatusEnum.ACTIVE
+                    ),
+                )
+            )
+            session.add(provider)
+        await session.commit()
+
+    probed: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        probed.append(request.url.host)
+        return httpx.Response(200, json={"status": "ok"})
+
+    try:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            summary = await run_provider_health_snapshot(
+                session_factory=session_factory,
+                http_client=client,
+                adaptive=True,
+            )
+    finally:
+        configure_probe_scheduler(None)
+
+    assert probed == ["prov-flapping.test"]
+    assert summary["providers_checked"] == 1
+    assert summary["skipped"] == 2
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from smplat_api.domain.fulfillment import provider_registry
+from smplat_api.domain.fulfillment.provider_registry import FulfillmentProviderDescriptor
+from smplat_api.services.fulfillment.http_clients import (
+    HttpClientLimits,
+    HttpClientRegistry,
+    configure_http_client_registry,
+    get_http_client_registry,
+    host_key,
+    provider_http_limits,
+)
+from smplat_api.services.fulfillment.provider_endpoints import invoke_provider_endpoint
+from smplat_api.services.fulfillment.task_processor import TaskProcessor
+
+
+def test_provider_http_limits_reads_metadata_overrides():
+    limits = provider_http_limits(
+        {"http": {"maxConnections": 4, "maxConcurrency": 2, "timeoutSeconds": 3, "connectTimeoutSeconds": 1.5}}
+    )
+
+    assert limits.max_connections == 4
+    assert limits.max_keepalive_connections <= 4
+    assert limits.concurrency == 2
+    assert limits.timeout_seconds == 3.0
+    assert limits.connect_timeout_seconds == 1.5
+
+    fallback = provider_http_limits({"http": {"maxConnections": "lots"}})
+    assert fallback == HttpClientLimits.defaults()
+    assert provider_http_limits(None) == HttpClientLimits.defaults()
+
+
+def test_host_key_normalises_scheme_and_host():
+    assert host_key("https://Ops.Example:8443/hooks/orders?x=1") == "https://ops.example:8443"
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_client_per_key_and_caps_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    registry = HttpClientRegistry(transport=httpx.MockTransport(handler), http2=False)
+    limits = HttpClientLimits(max_connections=5, max_keepalive_connections=5, max_concurrency=2)
+
+    async def call() -> httpx.AsyncClient:
+        async with registry.acquire("prov-a", limits) as client:
+            await client.get("https://provider.test/ping")
+            return client
+
+    clients = await asyncio.gather(*(call() for _ in range(6)))
+
+    assert len({id(client) for client in clients}) == 1
+    async with registry.acquire("prov-b") as other:
+        assert other is not clients[0]
+    assert peak <= 2
+    snapshot = registry.snapshot()
+    assert snapshot["clients"]["prov-a"]["requests"] == 6
+    assert snapshot["clients"]["prov-a"]["inFlight"] == 0
+
+    await registry.aclose()
+    assert clients[0].is_closed
+
+
+@pytest.mark.asyncio
+async def test_invoke_provider_endpoint_uses_pooled_registry():
+    seen: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        return httpx.Response(200, json={"status": "ok"})
+
+    registry = HttpClientRegistry(transport=httpx.MockTransport(handler), http2=False)
+    configure_http_client_registry(registry)
+    try:
+        for _ in range(2):
+            await invoke_provider_endpoint(
+                {"method": "GET", "url": "https://provider.test/balance"},
+                context={},
+                http_client=None,
+                default_timeout=5.0,
+                client_key="prov-pooled",
+            )
+        assert get_http_client_registry() is registry
+        assert registry.snapshot()["clients"]["prov-pooled"]["requests"] == 2
+    finally:
+        configure_http_client_registry(None)
+        await registry.aclose()
+
+    assert seen == ["https://provider.test/balance", "https://provider.test/balance"]
+
+
+@pytest.mark.asyncio
+async def test_registry_closes_replaced_client_once_drained():
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/slow":
+            await release.wait()
+        return httpx.Response(200, json={"ok": True})
+
+    registry = HttpClientRegistry(transport=httpx.MockTransport(handler), http2=False)
+    original = HttpClientLimits(max_connections=5, max_keepalive_connections=5, max_concurrency=2)
+    edited = HttpClientLimits(max_connections=5, max_keepalive_connections=5, max_concurrency=4)
+
+    async def slow_call() -> httpx.AsyncClient:
+        async with registry.acquire("prov-a", original) as client:
+            await client.get("https://provider.test/slow")
+            return client
+
+    in_flight = asyncio.create_task(slow_call())
+    await asyncio.sleep(0)
+    async with registry.acquire("prov-a", edited) as replacement:
+        await replacement.get("https://provider.test/fast")
+
+    release.set()
+    retired = await in_flight
+    assert retired is not replacement
+    assert retired.is_closed
+    assert not replacement.is_closed
+
+    async with registry.acquire("prov-b", original) as idle:
+        pass
+    async with registry.acquire("prov-b", edited):
+        pass
+    assert idle.is_closed
+
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_task_executions_honour_provider_max_concurrency(monkeypatch: pytest.MonkeyPatch):
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"accepted": True})
+
+    provider = FulfillmentProviderDescriptor(
+        id="prov-capped",
+        name="Capped",
+        metadata={"http": {"maxConcurrency": 2, "timeoutSeconds": 7}},
+    )
+    monkeypatch.setattr(
+        provider_registry,
+        "get_provider",
+        lambda provider_id: provider if provider_id == provider.id else None,
+    )
+    registry = HttpClientRegistry(transport=httpx.MockTransport(handler), http2=False)
+    configure_http_client_registry(registry)
+    processor = TaskProcessor(lambda: None)
+    execution = {"method": "POST", "url": "https://provider.test/orders", "provider_id": "prov-capped"}
+    try:
+        results = await asyncio.gather(*(processor._perform_http_execution(dict(execution)) for _ in range(6)))
+        snapshot = registry.snapshot()["clients"]
+    finally:
+        configure_http_client_registry(None)
+        await registry.aclose()
+
+    assert [result["status_code"] for result in results] == [200] * 6
+    assert peak == 2
+    assert snapshot["prov-capped"]["concurrency"] == 2
+    assert snapshot["prov-capped"]["requests"] == 6
+    assert "https://provider.test" not in snapshot
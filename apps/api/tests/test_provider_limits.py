@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import pytest
+
+from smplat_api.services.fulfillment.provider_limits import (
+    ProviderCallGuard,
+    ProviderThrottledError,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self, wait_ms: int = 0, error: Exception | None = None) -> None:
+        self.wait_ms = wait_ms
+        self.error = error
+        self.keys: list[str] = []
+
+    async def eval(self, script: str, numkeys: int, key: str, *args):  # type: ignore[no-untyped-def]
+        if self.error is not None:
+            raise self.error
+        self.keys.append(key)
+        return self.wait_ms
+
+
+def _guard(clock: FakeClock, **kwargs) -> ProviderCallGuard:  # type: ignore[no-untyped-def]
+    kwargs.setdefault("use_redis", False)
+    kwargs.setdefault("failure_threshold", 2)
+    kwargs.setdefault("reset_seconds", 30.0)
+    return ProviderCallGuard(clock=clock, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_throttles_at_rate_limit_and_refills():
+    clock = FakeClock()
+    guard = _guard(clock)
+
+    await guard.acquire("prov-a", provider_rate_limit=2)
+    await guard.acquire("prov-a", provider_rate_limit=2)
+    with pytest.raises(ProviderThrottledError) as excinfo:
+        await guard.acquire("prov-a", provider_rate_limit=2)
+
+    assert excinfo.value.reason == "rate_limited"
+    assert excinfo.value.scope == "provider:prov-a"
+    assert excinfo.value.retry_after == 30
+
+    clock.now += 30
+    await guard.acquire("prov-a", provider_rate_limit=2)
+
+    snapshot = guard.snapshot()["rate_limits"]["provider:prov-a"]
+    assert snapshot["limit_per_minute"] == 2
+    assert snapshot["allowed"] == 3
+    assert snapshot["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_service_limit_is_enforced_separately_from_provider():
+    guard = _guard(FakeClock())
+
+    await guard.acquire("prov-a", "svc-1", service_rate_limit=1)
+    with pytest.raises(ProviderThrottledError) as excinfo:
+        await guard.acquire("prov-a", "svc-1", service_rate_limit=1)
+
+    assert excinfo.value.scope == "service:svc-1"
+    await guard.acquire("prov-a", "svc-2", service_rate_limit=1)
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_failures_and_recovers_with_probe():
+    clock = FakeClock()
+    guard = _guard(clock)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            async with guard.guard("prov-b"):
+                raise RuntimeError("boom")
+
+    with pytest.raises(ProviderThrottledError) as excinfo:
+        await guard.acquire("prov-b")
+    assert excinfo.value.reason == "circuit_open"
+    assert guard.snapshot()["circuits"]["provider:prov-b"]["state"] == "open"
+
+    clock.now += 31
+    await guard.acquire("prov-b")  # half-open probe
+    with pytest.raises(ProviderThrottledError):
+        await guard.acquire("prov-b")
+
+    guard.record_success("prov-b")
+    circuit = guard.snapshot()["circuits"]["provider:prov-b"]
+    assert circuit["state"] == "closed"
+    assert circuit["total_failures"] == 2
+    assert circuit["total_rejections"] == 2
+    await guard.acquire("prov-b")
+
+
+@pytest.mark.asyncio
+async def test_offline_provider_is_deferred():
+    guard = _guard(FakeClock())
+
+    with pytest.raises(ProviderThrottledError) as excinfo:
+        await guard.acquire("prov-c", health_status="offline")
+
+    assert excinfo.value.reason == "provider_offline"
+    assert excinfo.value.retry_after == 30
+
+
+@pytest.mark.asyncio
+async def test_redis_bucket_is_shared_and_falls_back_when_unavailable():
+    clock = FakeClock()
+    redis = FakeRedis(wait_ms=1500)
+    guard = _guard(clock, use_redis=True, redis_client=redis, key_prefix="test:")
+
+    with pytest.raises(ProviderThrottledError) as excinfo:
+        await guard.acquire("prov-d", provider_rate_limit=60)
+    assert excinfo.value.retry_after_seconds == pytest.approx(1.5)
+    assert redis.keys == ["test:provider:prov-d"]
+    assert guard.snapshot()["rate_limits"]["provider:prov-d"]["backend"] == "redis"
+
+    redis.error = ConnectionError("redis down")
+    await guard.acquire("prov-d", provider_rate_limit=60)
+
+    snapshot = guard.snapshot()
+    assert snapshot["redis_degraded"] is True
+    assert snapshot["rate_limits"]["provider:prov-d"]["backend"] == "local"
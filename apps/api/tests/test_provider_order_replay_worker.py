@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any
 from uuid import uuid4
 
 import pytest
+import pytest_asyncio
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from smplat_api.db.base import Base
 from smplat_api.models.customer_profile import CurrencyEnum
 from smplat_api.models.fulfillment import (
     FulfillmentProvider,
     FulfillmentProviderHealthStatusEnum,
     FulfillmentProviderOrder,
+    FulfillmentProviderReplaySchedule,
+    FulfillmentProviderReplayStatusEnum,
     FulfillmentProviderStatusEnum,
 )
 from smplat_api.models.order import Order, OrderItem, OrderSourceEnum, OrderStatusEnum
 from smplat_api.models.order_state_event import OrderStateEvent, OrderStateEventTypeEnum
 from smplat_api.services.fulfillment import ProviderAutomationService
+from smplat_api.services.fulfillment.provider_limits import ProviderThrottledError
+from smplat_api.services.fulfillment.replay_schedule import claim_due_replays
 from smplat_api.workers.provider_automation import ProviderOrderReplayWorker
 
 
@@ -62,6 +70,19 @@ class FailingAutomationService:
         return {"scheduledBacklog": 0, "nextScheduledAt": None}
 
 
+class ThrottledAutomationService:
+    async def replay_provider_order(self, provider_order: FulfillmentProviderOrder, *, amount: float | None = None):
+        raise ProviderThrottledError(
+            "Rate limit of 10/min reached for provider:worker-prov",
+            scope="provider:worker-prov",
+            reason="rate_limited",
+            retry_after_seconds=12.5,
+        )
+
+    async def calculate_replay_backlog_metrics(self) -> dict[str, Any]:
+        return {"scheduledBacklog": 1, "nextScheduledAt": None}
+
+
 async def _bootstrap_provider_order(session_factory):
     async with session_factory() as session:
         provider = FulfillmentProvider(
@@ -238,3 +259,253 @@ async def test_worker_records_failures_and_marks_schedule_entry(session_factory)
         assert scheduled_entry["response"]["error"] == "provider_endpoint_failed"
         assert scheduled_entry["ruleIds"] == ["rule-worker"]
         assert scheduled_entry["ruleMetadata"]["rule-worker"]["conditions"][0]["kind"] == "channel"
+
+
+@pytest.mark.asyncio
+async def test_worker_defers_throttled_replays_without_failing_them(session_factory):
+    provider_order_id, _ = await _bootstrap_provider_order(session_factory)
+    scheduled_time = datetime.now(timezone.utc) - timedelta(minutes=5)
+    now = scheduled_time + timedelta(minutes=1)
+
+    async with session_factory() as session:
+        provider_order = await session.get(FulfillmentProviderOrder, provider_order_id)
+        provider_order.payload = {
+            "scheduledReplays": [
+                {
+                    "id": "sched-throttled",
+                    "requestedAmount": 5.0,
+                    "scheduledFor": scheduled_time.isoformat(),
+                    "status": "scheduled",
+                }
+            ],
+        }
+        await session.commit()
+
+    worker = ProviderOrderReplayWorker(
+        session_factory,
+        automation_factory=lambda session: ThrottledAutomationService(),
+        clock=lambda: now,
+    )
+
+    summary = await worker.process_scheduled(limit=5)
+    assert summary["processed"] == 1
+    assert summary["deferred"] == 1
+    assert summary["failed"] == 0
+
+    async with session_factory() as session:
+        provider_order = await session.get(FulfillmentProviderOrder, provider_order_id)
+        payload = provider_order.payload
+        assert "replays" not in payload
+        entry = payload["scheduledReplays"][0]
+        assert entry["status"] == "scheduled"
+        assert entry["scheduledFor"] == (now + timedelta(seconds=13)).isoformat()
+        assert entry["deferrals"] == 1
+        assert entry["deferredReason"] == "rate_limited"
+
+        schedule = (await session.execute(select(FulfillmentProviderReplaySchedule))).scalar_one()
+        assert schedule.status == FulfillmentProviderReplayStatusEnum.SCHEDULED
+        assert schedule.lease_owner is None
+        assert schedule.scheduled_for.replace(tzinfo=timezone.utc) == now + timedelta(seconds=13)
+
+
+@pytest.mark.asyncio
+async def test_scheduled_replays_are_claimed_with_leases_and_counted_by_index(session_factory):
+    provider_order_id, _ = await _bootstrap_provider_order(session_factory)
+    now = datetime.now(timezone.utc)
+    due_at = now - timedelta(minutes=5)
+
+    async with session_factory() as session:
+        provider_order = await session.get(FulfillmentProviderOrder, provider_order_id)
+        provider_order.payload = {
+            "scheduledReplays": [
+                {"id": "sched-due", "requestedAmount": 3, "scheduledFor": due_at.isoformat(), "status": "scheduled"},
+                {"id": "sched-later", "scheduledFor": (now + timedelta(hours=1)).isoformat(), "status": "scheduled"},
+                {"id": "sched-done", "scheduledFor": due_at.isoformat(), "status": "executed"},
+            ],
+        }
+        await session.commit()
+
+    async with session_factory() as session:
+        rows = (await session.execute(select(FulfillmentProviderReplaySchedule))).scalars().all()
+        assert sorted(row.entry_id for row in rows) == ["sched-due", "sched-later"]
+
+        metrics = await ProviderAutomationService(session).calculate_replay_backlog_metrics()
+        assert metrics["scheduledBacklog"] == 2
+        assert metrics["nextScheduledAt"] == due_at.isoformat()
+
+        claimed = await claim_due_replays(session, "worker-a", now=now, limit=10, lease_seconds=60)
+        assert [row.entry_id for row in claimed] == ["sched-due"]
+        assert claimed[0].provider_order.id == provider_order_id
+
+    async with session_factory() as session:
+        assert await claim_due_replays(session, "worker-b", now=now, limit=10, lease_seconds=60) == []
+        # An expired lease (crashed worker) makes the entry claimable again.
+        reclaimed = await claim_due_replays(
+            session,
+            "worker-b",
+            now=now + timedelta(seconds=61),
+            limit=10,
+            lease_seconds=60,
+        )
+        assert [row.entry_id for row in reclaimed] == ["sched-due"]
+        assert reclaimed[0].lease_owner == "worker-b"
+
+
+@pytest.mark.asyncio
+async def test_repeated_schedule_entry_ids_mirror_to_the_last_entry(session_factory):
+    provider_order_id, _ = await _bootstrap_provider_order(session_factory)
+    now = datetime.now(timezone.utc)
+    first_at = now + timedelta(minutes=5)
+    last_at = now + timedelta(minutes=30)
+
+    async with session_factory() as session:
+        provider_order = await session.get(FulfillmentProviderOrder, provider_order_id)
+        provider_order.payload = {
+            "scheduledReplays": [
+                {"id": "sched-dup", "requestedAmount": 1, "scheduledFor": first_at.isoformat(), "status": "scheduled"},
+                {"id": "sched-dup", "requestedAmount": 4, "scheduledFor": last_at.isoformat(), "status": "scheduled"},
+            ],
+        }
+        await session.commit()
+
+    async with session_factory() as session:
+        schedule = (await session.execute(select(FulfillmentProviderReplaySchedule))).scalar_one()
+        assert schedule.entry_id == "sched-dup"
+        assert schedule.requested_amount == 4
+        assert schedule.scheduled_for.replace(tzinfo=timezone.utc) == last_at
+
+
+class ConcurrencyTrackingAutomationService:
+    def __init__(self, tracker: dict[str, Any]):
+        self._tracker = tracker
+
+    async def replay_provider_order(self, provider_order: FulfillmentProviderOrder, *, amount: float | None = None):
+        in_flight = self._tracker["in_flight"]
+        in_flight[provider_order.provider_id] = in_flight.get(provider_order.provider_id, 0) + 1
+        total = sum(in_flight.values())
+        self._tracker["max_total"] = max(self._tracker["max_total"], total)
+        peaks = self._tracker["max_per_provider"]
+        peaks[provider_order.provider_id] = max(
+            peaks.get(provider_order.provider_id, 0),
+            in_flight[provider_order.provider_id],
+        )
+        await asyncio.sleep(0.02)
+        in_flight[provider_order.provider_id] -= 1
+        return {"id": f"replay-{provider_order.id}", "status": "executed", "requestedAmount": amount}
+
+    async def calculate_replay_backlog_metrics(self) -> dict[str, Any]:
+        return {"scheduledBacklog": 0, "nextScheduledAt": None}
+
+
+@pytest_asyncio.fixture
+async def file_session_factory(tmp_path):
+    # Concurrent replays use one session each; an in-memory engine would share a
+    # single connection (and transaction) between them.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replays.db'}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_replays_concurrently_within_provider_caps(file_session_factory):
+    session_factory = file_session_factory
+    provider_order_id, order_id = await _bootstrap_provider_order(session_factory)
+    due_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+
+    async with session_factory() as session:
+        template = await session.get(FulfillmentProviderOrder, provider_order_id)
+        session.add(
+            FulfillmentProvider(
+                id="worker-prov-b",
+                name="Worker Provider B",
+                status=FulfillmentProviderStatusEnum.ACTIVE,
+                health_status=FulfillmentProviderHealthStatusEnum.HEALTHY,
+                metadata_json={},
+            )
+        )
+        for index, provider_id in enumerate(["worker-prov", "worker-prov", "worker-prov", "worker-prov-b", "worker-prov-b"]):
+            session.add(
+                FulfillmentProviderOrder(
+                    provider_id=provider_id,
+                    service_id="svc-worker",
+                    order_id=template.order_id,
+                    order_item_id=template.order_item_id,
+                    payload={
+                        "scheduledReplays": [
+                            {"id": f"sched-{index}", "scheduledFor": due_at.isoformat(), "status": "scheduled"}
+                        ]
+                    },
+                )
+            )
+        await session.commit()
+
+    tracker: dict[str, Any] = {"in_flight": {}, "max_total": 0, "max_per_provider": {}}
+    worker = ProviderOrderReplayWorker(
+        session_factory,
+        automation_factory=lambda session: ConcurrencyTrackingAutomationService(tracker),
+        concurrency=3,
+        per_provider_concurrency=2,
+    )
+
+    summary = await worker.process_scheduled(limit=10)
+    assert summary["processed"] == 5
+    assert summary["succeeded"] == 5
+    # Three replays are due for worker-prov but it never holds more than its two slots.
+    assert tracker["max_per_provider"]["worker-prov"] == 2
+    assert tracker["max_per_provider"]["worker-prov-b"] <= 2
+    assert tracker["max_total"] == 3
+
+    async with session_factory() as session:
+        statuses = (await session.execute(select(FulfillmentProviderReplaySchedule.status))).scalars().all()
+        assert set(statuses) == {FulfillmentProviderReplayStatusEnum.EXECUTED}
+        result = await session.execute(select(OrderStateEvent).where(OrderStateEvent.order_id == order_id))
+        events = result.scalars().all()
+        assert len(events) == 5
+        assert all(event.metadata_json.get("trigger") == "scheduled_replay" for event in events)
+
+
+class SlowStubAutomationService(StubAutomationService):
+    async def replay_provider_order(self, provider_order: FulfillmentProviderOrder, *, amount: float | None = None):
+        # Yield so concurrent replays of one order would both read the payload first.
+        await asyncio.sleep(0.02)
+        return await super().replay_provider_order(provider_order, amount=amount)
+
+
+@pytest.mark.asyncio
+async def test_worker_serializes_replays_of_the_same_provider_order(file_session_factory):
+    session_factory = file_session_factory
+    provider_order_id, _ = await _bootstrap_provider_order(session_factory)
+    due_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+
+    async with session_factory() as session:
+        provider_order = await session.get(FulfillmentProviderOrder, provider_order_id)
+        provider_order.payload = {
+            "scheduledReplays": [
+                {"id": "sched-a", "requestedAmount": 2, "scheduledFor": due_at.isoformat(), "status": "scheduled"},
+                {"id": "sched-b", "requestedAmount": 3, "scheduledFor": due_at.isoformat(), "status": "scheduled"},
+            ],
+        }
+        await session.commit()
+
+    automation = SlowStubAutomationService(due_at.isoformat())
+    worker = ProviderOrderReplayWorker(
+        session_factory,
+        automation_factory=lambda session: automation,
+        concurrency=4,
+        per_provider_concurrency=4,
+    )
+
+    summary = await worker.process_scheduled(limit=10)
+    assert summary["succeeded"] == 2
+
+    async with session_factory() as session:
+        payload = (await session.get(FulfillmentProviderOrder, provider_order_id)).payload
+        assert sorted(entry["requestedAmount"] for entry in payload["replays"]) == [2, 3]
+        assert {entry["id"]: entry["status"] for entry in payload["scheduledReplays"]} == {
+            "sched-a": "executed",
+            "sched-b": "executed",
+        }
@@ -27,6 +27,33 @@ async def test_platform_context_cache_records_and_updates(session_factory):
     assert entry.platform_id == "instagram::@alpha"
 
 
+@pytest.mark.asyncio
+async def test_platform_context_cache_flushes_buffer_and_limits_per_provider(session_factory):
+    async with session_factory() as session:
+        service = ProviderPlatformContextCacheService(session)
+        for index in range(4):
+            service.buffer_context(
+                "provider-gamma",
+                {"id": f"instagram::@g{index}", "label": f"IG @g{index}", "platformType": "instagram"},
+            )
+        service.buffer_context("provider-gamma", {"id": "instagram::@g0", "label": "IG @g0 renamed"})
+        service.buffer_context("provider-delta", {"id": "tiktok::@d", "label": "TikTok @d"})
+        service.buffer_context("provider-delta", {"id": "", "label": "missing id"})
+
+        assert await service.flush_contexts() == 5
+        assert await service.flush_contexts() == 0
+        await session.commit()
+
+        mapping = await service.fetch_contexts_for_providers(["provider-gamma", "provider-delta"], limit_per_provider=2)
+        everything = await service.fetch_contexts_for_providers(["provider-gamma"], limit_per_provider=10)
+
+    assert len(mapping["provider-gamma"]) == 2
+    assert [entry.platform_id for entry in mapping["provider-delta"]] == ["tiktok::@d"]
+    labels = {entry.platform_id: entry.label for entry in everything["provider-gamma"]}
+    assert len(labels) == 4
+    assert labels["instagram::@g0"] == "IG @g0 renamed"
+
+
 @pytest.mark.asyncio
 async def test_platform_context_endpoint_returns_cached_contexts(app_with_db):
     app, session_factory = app_with_db
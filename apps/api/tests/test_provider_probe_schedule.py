@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from smplat_api.domain.fulfillment.provider_registry import (
+    FulfillmentProviderDescriptor,
+    FulfillmentServiceDescriptor,
+)
+from smplat_api.services.fulfillment.provider_probe_schedule import ProviderProbeScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _scheduler(clock: FakeClock) -> ProviderProbeScheduler:
+    return ProviderProbeScheduler(
+        min_interval_seconds=60,
+        base_interval_seconds=900,
+        max_interval_seconds=3600,
+        clock=clock,
+    )
+
+
+def _provider(provider_id: str, health_status: str, checked_minutes_ago: float | None, clock: FakeClock):
+    last_check = None if checked_minutes_ago is None else clock.now - timedelta(minutes=checked_minutes_ago)
+    return FulfillmentProviderDescriptor(
+        id=provider_id,
+        name=provider_id,
+        status="active",
+        health_status=health_status,
+        last_health_check_at=last_check,
+    )
+
+
+def _service(provider_id: str, status: str = "active") -> FulfillmentServiceDescriptor:
+    return FulfillmentServiceDescriptor(
+        id=f"svc-{provider_id}",
+        provider_id=provider_id,
+        name="Service",
+        action="followers",
+        status=status,
+    )
+
+
+def test_probe_interval_depends_on_health_and_skips_inactive_providers():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    providers = [
+        _provider("never-checked", "unknown", None, clock),
+        _provider("degraded", "degraded", 2, clock),
+        _provider("healthy-recent", "healthy", 5, clock),
+        _provider("healthy-stale", "healthy", 20, clock),
+        _provider("no-active-services", "offline", 30, clock),
+    ]
+    services = [
+        _service("never-checked"),
+        _service("degraded"),
+        _service("healthy-recent"),
+        _service("healthy-stale"),
+        _service("no-active-services", status="inactive"),
+    ]
+
+    due = scheduler.due_providers(providers, services)
+
+    assert due == ["never-checked", "degraded", "healthy-stale"]
+
+
+def test_healthy_streak_backs_off_until_failure_resets_it():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    provider = _provider("prov", "healthy", 0, clock)
+
+    assert scheduler.interval_for(provider) == timedelta(minutes=15)
+    for _ in range(4):
+        scheduler.record_probe("prov", "healthy")
+    assert scheduler.interval_for(provider) == timedelta(hours=1)
+
+    clock.now += timedelta(seconds=1)
+    scheduler.record_call_outcome("prov", success=False)
+    assert scheduler.interval_for(provider) == timedelta(minutes=1)
+
+    scheduler.record_probe("prov", "degraded")
+    assert scheduler.interval_for(_provider("prov", "healthy", 0, clock)) == timedelta(minutes=15)
+
+
+def test_passive_success_defers_active_probe_of_healthy_provider():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    provider = _provider("prov", "healthy", 20, clock)
+    services = [_service("prov")]
+    assert scheduler.due_providers([provider], services) == ["prov"]
+
+    scheduler.record_call_outcome("prov", success=True)
+
+    assert scheduler.due_providers([provider], services) == []
+    assert scheduler.next_probe_at(provider) == clock.now + timedelta(minutes=15)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from smplat_api.core.work_signals import (
+    FULFILLMENT_TASKS,
+    AdaptivePollBackoff,
+    WorkSignal,
+    get_work_signal,
+    notify_work,
+)
+from smplat_api.services.fulfillment.task_processor import TaskProcessor
+
+
+def test_adaptive_backoff_drains_full_batches_and_backs_off_when_idle():
+    backoff = AdaptivePollBackoff(min_seconds=0.5, max_seconds=4.0)
+
+    assert backoff.next_delay(processed=10, capacity=10) == 0.0
+    assert backoff.next_delay(processed=3, capacity=10) == 0.5
+    assert [backoff.next_delay(processed=0, capacity=10) for _ in range(4)] == [1.0, 2.0, 4.0, 4.0]
+    assert backoff.next_delay(processed=10, capacity=10) == 0.0
+    assert backoff.next_delay(processed=0, capacity=10) == 0.5
+
+
+@pytest.mark.asyncio
+async def test_work_signal_wakes_waiter_early():
+    signal = WorkSignal("test-queue")
+
+    waiter = asyncio.create_task(signal.wait(5))
+    await asyncio.sleep(0)
+    signal.wake()
+
+    assert await asyncio.wait_for(waiter, timeout=1) is True
+    assert await signal.wait(0.01) is False
+
+
+@pytest.mark.asyncio
+async def test_task_processor_drains_full_batches_and_wakes_on_notify(monkeypatch: pytest.MonkeyPatch):
+    # Clear wake-ups left behind by orders created in other tests.
+    await get_work_signal(FULFILLMENT_TASKS).wait(0)
+    processor = TaskProcessor(lambda: None, poll_interval_seconds=30, batch_size=5)
+    results = iter([5, 5, 0])
+    calls = 0
+    second_idle_pass = asyncio.Event()
+
+    async def fake_run_once() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 4:
+            processor.stop()
+            second_idle_pass.set()
+        return next(results, 0)
+
+    monkeypatch.setattr(processor, "run_once", fake_run_once)
+
+    loop_task = asyncio.create_task(processor.start())
+    for _ in range(10):
+        await asyncio.sleep(0)
+    # Two full batches drain back-to-back, then the idle pass parks on the signal.
+    assert calls == 3
+
+    notify_work(FULFILLMENT_TASKS)
+    await asyncio.wait_for(second_idle_pass.wait(), timeout=1)
+    await asyncio.wait_for(loop_task, timeout=1)
+
+    assert calls == 4
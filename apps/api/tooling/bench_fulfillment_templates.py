@@ -0,0 +1,86 @@
+"""Microbenchmark for compiled fulfillment execution templates.
+
+Usage:
+    poetry run python tooling/bench_fulfillment_templates.py --renders 20000
+
+Compares the uncached path (parse the execution config on every render, which
+is what ``TaskProcessor`` used to do per task) with rendering a cached plan.
+"""
+
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+
+from smplat_api.services.fulfillment.templating import (
+    clear_template_cache,
+    compile_template,
+    config_fingerprint,
+)
+
+EXECUTION_CONFIG = {
+    "kind": "http",
+    "method": "POST",
+    "url": "{{ env.FULFILLMENT_BASE_URL }}/hooks/orders/{{ order.id }}",
+    "headers": {
+        "Authorization": "Bearer {{ env.FULFILLMENT_TOKEN }}",
+        "X-Order-Number": "{{ order.order_number }}",
+        "Content-Type": "application/json",
+    },
+    "body": {
+        "orderId": "{{ order.id }}",
+        "productId": "{{ product.id }}",
+        "quantity": "{{ item.quantity }}",
+        "total": "{{ item.total_price }}",
+        "customer": {"handle": "{{ item.selected_options.0.value }}", "source": "smplat"},
+        "retry": "{{ task.retry_count }}",
+        "summary": "{{ product.title }} x{{ item.quantity }}",
+    },
+    "timeout_seconds": 15,
+}
+
+CONTEXT = {
+    "env": {"FULFILLMENT_BASE_URL": "https://ops.example", "FULFILLMENT_TOKEN": "token-123"},
+    "order": {"id": "7c1c6a1e", "order_number": "SM-1001"},
+    "product": {"id": "p-42", "title": "Instagram Growth"},
+    "item": {"quantity": 3, "total_price": 149.0, "selected_options": [{"value": "@brand"}]},
+    "task": {"retry_count": 0},
+}
+
+
+def _rate(renders: int, fn) -> float:
+    started = perf_counter()
+    for _ in range(renders):
+        fn()
+    return renders / (perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fulfillment template render benchmark")
+    parser.add_argument("--renders", type=int, default=20000)
+    args = parser.parse_args()
+
+    def uncached() -> None:
+        clear_template_cache()
+        compile_template(EXECUTION_CONFIG).render(CONTEXT)
+
+    fingerprint = config_fingerprint(EXECUTION_CONFIG)
+
+    def cached_by_fingerprint() -> None:
+        compile_template(EXECUTION_CONFIG).render(CONTEXT)
+
+    def cached_by_key() -> None:
+        compile_template(EXECUTION_CONFIG, cache_key=fingerprint).render(CONTEXT)
+
+    results = {
+        "parse per render": _rate(args.renders, uncached),
+        "cached plan (fingerprinted)": _rate(args.renders, cached_by_fingerprint),
+        "cached plan (explicit key)": _rate(args.renders, cached_by_key),
+    }
+    baseline = results["parse per render"]
+    for label, rate in results.items():
+        print(f"{label:<30} {rate:>12,.0f} renders/s  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Benchmark nightly loyalty nudge aggregation.
+
+Usage:
+    poetry run python tooling/bench_loyalty_nudge_aggregation.py --members 5000
+    poetry run python tooling/bench_loyalty_nudge_aggregation.py \
+        --database-url postgresql+asyncpg://localhost/smplat_bench --members 20000
+
+Seeds a scratch database with ``--members`` loyalty members, each holding an
+expiring point grant, a pending checkout intent and a stalled redemption, then
+times two passes of nudge synchronization over all of them: the per-member
+``list_member_nudges`` loop aggregation used to run (three signal queries plus
+a nudge load per member) and the paged, set-based
+``aggregate_nudge_candidates``. The second pass of each mode measures the
+steady state, where most nudges are unchanged. Point ``--database-url`` at a
+throwaway database: tables are created with ``create_all`` and filled with
+synthetic rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from smplat_api.db.base import Base
+from smplat_api.models.loyalty import (
+    LoyaltyCheckoutIntent,
+    LoyaltyCheckoutIntentKind,
+    LoyaltyCheckoutIntentStatus,
+    LoyaltyMember,
+    LoyaltyNudge,
+    LoyaltyPointExpiration,
+    LoyaltyPointExpirationStatus,
+    LoyaltyRedemption,
+    LoyaltyRedemptionStatus,
+)
+from smplat_api.models.user import User
+from smplat_api.services.loyalty import LoyaltyService
+from smplat_api.services.loyalty.loyalty_service import NUDGE_AGGREGATION_PAGE_SIZE
+
+CHUNK = 2_000
+
+
+async def _seed(factory: async_sessionmaker[AsyncSession], members: int, now: datetime) -> list[UUID]:
+    async with factory() as session:
+        existing = (await session.execute(select(func.count()).select_from(LoyaltyMember))).scalar_one()
+        if existing >= members:
+            return list((await session.execute(select(LoyaltyMember.id))).scalars())
+
+        member_ids: list[UUID] = []
+        batches: dict[type, list[dict]] = {
+            User: [],
+            LoyaltyMember: [],
+            LoyaltyPointExpiration: [],
+            LoyaltyCheckoutIntent: [],
+            LoyaltyRedemption: [],
+        }
+        for index in range(members):
+            user_id, member_id = uuid4(), uuid4()
+            member_ids.append(member_id)
+            batches[User].append({"id": user_id, "email": f"bench-{index:08d}@example.com"})
+            batches[LoyaltyMember].append({"id": member_id, "user_id": user_id, "points_balance": Decimal("500")})
+            batches[LoyaltyPointExpiration].append(
+                {
+                    "id": uuid4(),
+                    "member_id": member_id,
+                    "points": Decimal("120"),
+                    "consumed_points": Decimal("0"),
+                    "expires_at": now + timedelta(days=1 + index % 6),
+                    "status": LoyaltyPointExpirationStatus.SCHEDULED,
+                }
+            )
+            batches[LoyaltyCheckoutIntent].append(
+                {
+                    "id": uuid4(),
+                    "member_id": member_id,
+                    "external_id": f"bench-intent-{index:08d}",
+                    "kind": LoyaltyCheckoutIntentKind.REDEMPTION,
+                    "status": LoyaltyCheckoutIntentStatus.PENDING,
+                    "expires_at": now + timedelta(days=2),
+                    "metadata_json": {"rewardName": "Bench reward"},
+                }
+            )
+            batches[LoyaltyRedemption].append(
+                {
+                    "id": uuid4(),
+                    "member_id": member_id,
+                    "status": LoyaltyRedemptionStatus.REQUESTED,
+                    "points_cost": Decimal("100"),
+                    "quantity": 1,
+                    "requested_at": now - timedelta(days=4),
+                }
+            )
+            if len(batches[User]) >= CHUNK:
+                await _flush(session, batches)
+        await _flush(session, batches)
+        await session.commit()
+    return member_ids
+
+
+async def _flush(session: AsyncSession, batches: dict[type, list[dict]]) -> None:
+    for model, rows in batches.items():
+        if rows:
+            await session.execute(insert(model), rows)
+            rows.clear()
+
+
+async def _per_member(factory: async_sessionmaker[AsyncSession], now: datetime) -> int:
+    async with factory() as session:
+        service = LoyaltyService(session)
+        members = (await session.execute(select(LoyaltyMember))).scalars().all()
+        refreshed = 0
+        for member in members:
+            refreshed += len(await service.list_member_nudges(member, now=now))
+        await session.commit()
+    return refreshed
+
+
+async def _bulk(factory: async_sessionmaker[AsyncSession], now: datetime, limit: int, page_size: int) -> int:
+    async with factory() as session:
+        aggregated = await LoyaltyService(session).aggregate_nudge_candidates(
+            limit=limit, page_size=page_size, now=now
+        )
+        await session.commit()
+    return sum(len(cards) for cards in aggregated.values())
+
+
+async def _reset_nudges(factory: async_sessionmaker[AsyncSession]) -> None:
+    async with factory() as session:
+        await session.execute(delete(LoyaltyNudge))
+        await session.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Loyalty nudge aggregation benchmark")
+    parser.add_argument("--members", type=int, default=5_000)
+    parser.add_argument("--page-size", type=int, default=NUDGE_AGGREGATION_PAGE_SIZE)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite+aiosqlite:///{Path(tempfile.gettempdir()) / 'smplat_loyalty_nudges_bench.db'}"
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    now = datetime.now(timezone.utc)
+
+    started = perf_counter()
+    member_ids = await _seed(factory, args.members, now)
+    print(f"seeded/loaded {len(member_ids):,} members in {perf_counter() - started:.1f}s ({database_url})")
+
+    runs = {
+        "per-member sync (before)": lambda: _per_member(factory, now),
+        f"set-based pages of {args.page_size}": lambda: _bulk(factory, now, len(member_ids), args.page_size),
+    }
+    try:
+        for label, run in runs.items():
+            await _reset_nudges(factory)
+            for phase in ("initial", "steady"):
+                started = perf_counter()
+                nudges = await run()
+                elapsed = perf_counter() - started
+                rate = len(member_ids) / elapsed if elapsed else float("inf")
+                print(f"{label:<28} {phase:<8} {elapsed:8.2f}s  {rate:10,.0f} members/s  {nudges:,} nudges")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+"""Benchmark provider-order lookups behind ``GET /orders``.
+
+Usage:
+    poetry run python tooling/bench_provider_order_lookups.py --rows 1000000
+    poetry run python tooling/bench_provider_order_lookups.py \
+        --database-url postgresql+asyncpg://localhost/smplat_bench --rows 1000000
+
+Seeds a scratch database with ``--rows`` provider orders (ten per order) and
+times the page-sized ``list_orders_for_orders`` query the order list issues,
+comparing the old normalized-``order_id`` expression (no usable index) with
+the indexed ``order_lookup_key`` lookup, with and without the dual-read
+fallback. Point ``--database-url`` at a throwaway database: tables are created
+with ``create_all`` and filled with synthetic rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from smplat_api.core.settings import settings
+from smplat_api.db.base import Base
+from smplat_api.models.fulfillment import FulfillmentProviderOrder
+from smplat_api.models.order import Order, OrderItem
+from smplat_api.services.fulfillment import ProviderAutomationService
+
+PROVIDER_ORDERS_PER_ORDER = 10
+CHUNK = 10_000
+
+
+async def _seed(factory: async_sessionmaker[AsyncSession], rows: int) -> list[UUID]:
+    order_ids: list[UUID] = []
+    async with factory() as session:
+        existing = (await session.execute(select(func.count()).select_from(FulfillmentProviderOrder))).scalar_one()
+        if existing >= rows:
+            result = await session.execute(select(Order.id))
+            return list(result.scalars())
+
+        orders, items, provider_orders = [], [], []
+        for index in range(max(rows // PROVIDER_ORDERS_PER_ORDER, 1)):
+            order_id, item_id = uuid4(), uuid4()
+            order_ids.append(order_id)
+            orders.append({"id": order_id, "order_number": f"BENCH-{index:08d}", "subtotal": Decimal("10.00"), "total": Decimal("10.00")})
+            items.append(
+                {
+                    "id": item_id,
+                    "order_id": order_id,
+                    "product_title": "Bench product",
+                    "unit_price": Decimal("10.00"),
+                    "total_price": Decimal("10.00"),
+                }
+            )
+            for slot in range(PROVIDER_ORDERS_PER_ORDER):
+                provider_orders.append(
+                    {
+                        "id": uuid4(),
+                        "order_id": order_id,
+                        "order_item_id": item_id,
+                        "order_lookup_key": order_id.hex,
+                        "provider_id": f"prov-{slot % 4}",
+                        "service_id": f"svc-{slot}",
+                        "payload": {},
+                    }
+                )
+            if len(provider_orders) >= CHUNK:
+                await _flush(session, orders, items, provider_orders)
+        await _flush(session, orders, items, provider_orders)
+        await session.commit()
+    return order_ids
+
+
+async def _flush(session: AsyncSession, orders: list, items: list, provider_orders: list) -> None:
+    for model, rows in ((Order, orders), (OrderItem, items), (FulfillmentProviderOrder, provider_orders)):
+        if rows:
+            await session.execute(insert(model), rows)
+            rows.clear()
+
+
+def _summary(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"median {statistics.median(ordered) * 1000:8.2f} ms   p95 {p95 * 1000:8.2f} ms"
+
+
+async def _time(factory: async_sessionmaker[AsyncSession], pages: list[list[UUID]], run) -> list[float]:
+    samples: list[float] = []
+    async with factory() as session:
+        for page in pages:
+            started = perf_counter()
+            await run(session, page)
+            samples.append(perf_counter() - started)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Provider order lookup benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50, help="orders per GET /orders page")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite+aiosqlite:///{Path(tempfile.gettempdir()) / 'smplat_provider_orders_bench.db'}"
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    started = perf_counter()
+    order_ids = await _seed(factory, args.rows)
+    print(f"seeded/loaded {len(order_ids):,} orders in {perf_counter() - started:.1f}s ({database_url})")
+
+    rng = random.Random(7)
+    pages = [rng.sample(order_ids, min(args.page_size, len(order_ids))) for _ in range(args.iterations)]
+
+    async def legacy(session: AsyncSession, page: list[UUID]) -> None:
+        column = ProviderAutomationService._normalized_uuid_column(FulfillmentProviderOrder.order_id)
+        stmt = (
+            select(FulfillmentProviderOrder)
+            .where(column.in_([order_id.hex for order_id in page]))
+            .order_by(FulfillmentProviderOrder.created_at.desc())
+        )
+        (await session.execute(stmt)).scalars().all()
+
+    async def indexed(session: AsyncSession, page: list[UUID]) -> None:
+        await ProviderAutomationService(session).list_orders_for_orders(page)
+
+    results = {"normalized order_id (before)": await _time(factory, pages, legacy)}
+    previous = settings.provider_order_lookup_dual_read
+    try:
+        settings.provider_order_lookup_dual_read = True
+        results["order_lookup_key + dual read"] = await _time(factory, pages, indexed)
+        settings.provider_order_lookup_dual_read = False
+        results["order_lookup_key only"] = await _time(factory, pages, indexed)
+    finally:
+        settings.provider_order_lookup_dual_read = previous
+        await engine.dispose()
+
+    for label, samples in results.items():
+        print(f"{label:<32} {_summary(samples)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())